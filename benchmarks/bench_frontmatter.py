@@ -0,0 +1,93 @@
+"""Benchmark the frontmatter codec against python-frontmatter.
+
+Builds real project, note and work log files with MarkdownStorage, checks
+that the codec reads and writes them identically to python-frontmatter, and
+times load/dump for both.
+
+Usage:
+    python benchmarks/bench_frontmatter.py [--number N]
+"""
+
+import argparse
+import tempfile
+import timeit
+from datetime import datetime
+
+import frontmatter
+
+from second_brain.storage import MarkdownStorage
+from second_brain.storage import frontmatter_codec
+
+
+def build_samples(base_path: str) -> dict:
+    """Create one file of each shape and return their text by name."""
+    storage = MarkdownStorage(base_path)
+
+    project_path = storage.create_project_file(
+        "API v2 Migration",
+        "api-v2-migration",
+        description="Move every client onto the v2 endpoints.",
+        jira_project_key="API",
+        tags=["backend", "q1", "migration"],
+    )
+    note_path = storage.create_note_file(
+        1234,
+        "Design review notes",
+        "## Decisions\n\n" + "- Keep the v1 shim for one release\n" * 20,
+        project_id=7,
+        task_id=42,
+        tags=["design", "review"],
+    )
+    today = datetime(2025, 1, 15)
+    storage.create_work_log_file(today)
+    for i in range(10):
+        storage.append_to_work_log(today, f"Worked on migration step {i}", task_ref=f"#{i}")
+    work_log_path = storage.work_log_path(today)
+
+    samples = {}
+    for name, path in (
+        ("project", project_path),
+        ("note", note_path),
+        ("work log", work_log_path),
+    ):
+        with open(path, "r", encoding="utf-8") as f:
+            samples[name] = f.read()
+    return samples
+
+
+def check_identical(text: str) -> None:
+    """Assert the codec matches python-frontmatter for a file."""
+    expected = frontmatter.loads(text)
+    post = frontmatter_codec.loads(text)
+    assert post.metadata == expected.metadata
+    assert post.content == expected.content
+    assert frontmatter_codec.dumps(post) == frontmatter.dumps(expected) == text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        samples = build_samples(tmp)
+
+    print(f"{'file':<10} {'op':<6} {'frontmatter':>14} {'codec':>12} {'speedup':>9}")
+    for name, text in samples.items():
+        check_identical(text)
+        post = frontmatter.loads(text)
+
+        for op, baseline, codec in (
+            ("load", lambda: frontmatter.loads(text), lambda: frontmatter_codec.loads(text)),
+            ("dump", lambda: frontmatter.dumps(post), lambda: frontmatter_codec.dumps(post)),
+        ):
+            base_us = timeit.timeit(baseline, number=args.number) / args.number * 1e6
+            codec_us = timeit.timeit(codec, number=args.number) / args.number * 1e6
+            print(
+                f"{name:<10} {op:<6} {base_us:>11.1f} us {codec_us:>9.1f} us "
+                f"{base_us / codec_us:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Benchmark Jira syncs against the local Jira stand-in server.
+
+Seeds ``second_brain.integrations.jira_standin`` with synthetic projects,
+points a real ``JiraClient`` at it over HTTP and syncs into a temporary
+database three times: a full sync, an incremental sync after ``--changed``
+issues were edited, and an incremental sync with nothing to do. Each run
+reports wall time, issues per second, HTTP requests served, retries and
+time spent throttled, and database write statements and rows.
+
+With ``--async-client`` the syncs run through ``AsyncJiraClient`` on an
+event loop, as the MCP server runs them.
+
+Usage:
+    python benchmarks/bench_jira_sync.py [--projects N] [--issues N] [--latency-ms MS]
+        [--rate-limit RPS] [--throttle P] [--changed N] [--combined] [--async-client]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import event
+
+from second_brain.db import ProjectOps, get_session, init_db
+from second_brain.integrations.jira_async import AsyncJiraClient
+from second_brain.integrations.jira_client import DEFAULT_PAGE_SIZE, JiraClient
+from second_brain.integrations.jira_standin import JiraStandIn
+from second_brain.integrations.jira_sync import JiraSyncEngine
+
+
+class WriteCounter:
+    """Count write statements and the rows they carry."""
+
+    def __init__(self, engine):
+        self.statements = 0
+        self.rows = 0
+        event.listen(engine, "before_cursor_execute", self.before_execute)
+
+    def before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE")):
+            self.statements += 1
+            self.rows += len(parameters) if executemany else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=2, help="Projects to sync")
+    parser.add_argument("--issues", type=int, default=10_000, help="Issues per project")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="Search page")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Server latency per request")
+    parser.add_argument("--rate-limit", type=float, help="Server requests/s before 429")
+    parser.add_argument("--throttle", type=float, default=0, help="Chance of a random 429")
+    parser.add_argument("--client-rate", type=float, default=1000, help="Client requests/s")
+    parser.add_argument("--changed", type=int, default=500, help="Issues edited before run 2")
+    parser.add_argument("--combined", action="store_true", help="One query for all projects")
+    parser.add_argument("--async-client", action="store_true", help="Sync with AsyncJiraClient")
+    args = parser.parse_args()
+
+    standin = JiraStandIn(
+        latency=args.latency_ms / 1000,
+        rate_limit=args.rate_limit,
+        throttle_probability=args.throttle,
+    )
+    keys = [f"P{index}" for index in range(1, args.projects + 1)]
+    for key in keys:
+        standin.seed_project(key, args.issues)
+
+    with standin, tempfile.TemporaryDirectory() as tmp:
+        engine = init_db(str(Path(tmp) / "bench.db"))
+        session = get_session(engine)
+        projects = [
+            ProjectOps.create(session, key, key.lower(), f"{key}.md", jira_project_key=key)
+            for key in keys
+        ]
+        loop = asyncio.new_event_loop()
+        client_class = AsyncJiraClient if args.async_client else JiraClient
+        client = client_class(standin.url, "bench", "bench", rate_limit=args.client_rate)
+        syncer = JiraSyncEngine(session, client, page_size=args.page_size, retry_budget=10_000)
+        writes = WriteCounter(engine)
+
+        print(
+            f"{args.projects} project(s) x {args.issues} issues, {args.latency_ms:g} ms latency, "
+            f"page size {args.page_size}{', combined' if args.combined else ''}"
+            f"{', async client' if args.async_client else ''}"
+        )
+        header = (
+            f"{'run':<12} {'issues':>8} {'time':>9} {'issues/s':>9} {'requests':>9} "
+            f"{'retries':>8} {'throttled':>10} {'writes':>7} {'rows':>8}"
+        )
+        print(header)
+
+        runs = [("full", 0), ("incremental", args.changed), ("no-op", 0)]
+        for name, changed in runs:
+            if changed:
+                standin.touch(changed)
+                time.sleep(0.01)
+            requests_before = sum(standin.requests.values())
+            statements_before, rows_before = writes.statements, writes.rows
+
+            start = time.perf_counter()
+            if args.async_client:
+                results = loop.run_until_complete(
+                    syncer.sync_projects_async(
+                        projects, full=name == "full", combined=args.combined
+                    )
+                )
+            else:
+                results = syncer.sync_projects(
+                    projects, full=name == "full", combined=args.combined
+                )
+            seconds = time.perf_counter() - start
+
+            fetched = sum(result.fetched for result in results)
+            print(
+                f"{name:<12} {fetched:>8} {seconds:>7.2f} s {fetched / seconds:>9.0f} "
+                f"{sum(standin.requests.values()) - requests_before:>9} "
+                f"{syncer.stats.retries:>8} {syncer.stats.throttled_seconds:>8.1f} s "
+                f"{writes.statements - statements_before:>7} {writes.rows - rows_before:>8}"
+            )
+
+        if args.async_client:
+            loop.run_until_complete(client.aclose())
+        loop.close()
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
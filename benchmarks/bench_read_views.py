@@ -0,0 +1,120 @@
+"""Benchmark slotted read rows against ORM objects for task and note lists.
+
+Fills a temporary database with tasks and notes, then compares loading them
+with ``session.scalars(select(...)).all()`` against the read views in
+``second_brain.db.views``. Each measurement uses a fresh session, reports
+the best time of ``--repeat`` runs and the peak memory allocated while the
+result is held, and scales both to 100k rows.
+
+Usage:
+    python benchmarks/bench_read_views.py [--rows N] [--repeat N]
+"""
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import insert, select
+
+from second_brain.db import Note, Project, Task, get_session, init_db, note_rows, task_rows
+
+PER_100K = 100_000
+
+
+def populate(engine, rows: int) -> None:
+    """Insert projects, and ``rows`` tasks and notes spread across them."""
+    now = datetime.utcnow()
+    projects = [
+        {"name": f"Project {i}", "slug": f"project-{i}", "markdown_path": f"p{i}.md"}
+        for i in range(1, 51)
+    ]
+    tasks = [
+        {
+            "title": f"Task {i}",
+            "description": "Investigate and fix the reported issue. " * 10,
+            "status": ("todo", "in_progress", "done")[i % 3],
+            "priority": ("low", "medium", "high")[i % 3],
+            "project_id": i % 50 + 1,
+            "time_spent_minutes": i % 240,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(rows)
+    ]
+    notes = [
+        {
+            "title": f"Note {i}",
+            "content": "Meeting notes and follow-ups. " * 40,
+            "markdown_path": f"notes/note-{i}.md",
+            "project_id": i % 50 + 1,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(rows)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(Project), projects)
+        conn.execute(insert(Task), tasks)
+        conn.execute(insert(Note), notes)
+
+
+def measure(engine, load, repeat: int) -> tuple[float, float]:
+    """Return (best seconds, peak MiB) for loading a list in a fresh session."""
+    best = float("inf")
+    for _ in range(repeat):
+        session = get_session(engine)
+        gc.collect()
+        start = time.perf_counter()
+        result = load(session)
+        best = min(best, time.perf_counter() - start)
+        del result
+        session.close()
+
+    session = get_session(engine)
+    gc.collect()
+    tracemalloc.start()
+    result = load(session)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    session.close()
+    return best, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="Tasks and notes to create")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = init_db(str(Path(tmp) / "bench.db"))
+        populate(engine, args.rows)
+
+        cases = [
+            ("tasks", "orm", lambda s: s.scalars(select(Task)).all()),
+            (
+                "tasks",
+                "orm+project",
+                lambda s: [(t, t.project.name) for t in s.scalars(select(Task))],
+            ),
+            ("tasks", "rows", task_rows),
+            ("notes", "orm", lambda s: s.scalars(select(Note)).all()),
+            ("notes", "rows", note_rows),
+        ]
+
+        scale = PER_100K / args.rows
+        print(f"{args.rows} rows, figures per 100k rows")
+        print(f"{'list':<6} {'loader':<12} {'time':>10} {'memory':>12}")
+        for name, loader, load in cases:
+            seconds, mib = measure(engine, load, args.repeat)
+            print(f"{name:<6} {loader:<12} {seconds * scale:>8.3f} s {mib * scale:>8.1f} MiB")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
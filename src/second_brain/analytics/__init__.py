@@ -0,0 +1,21 @@
+"""Analytics over tasks and work logs."""
+
+from .snapshot import NUMPY_AVAILABLE, AnalyticsSnapshot, WeeklyMinutes
+from .forecast import (
+    Forecast,
+    ThroughputHistory,
+    forecast_completion,
+    get_throughput_history,
+    remaining_items,
+)
+
+__all__ = [
+    "NUMPY_AVAILABLE",
+    "AnalyticsSnapshot",
+    "WeeklyMinutes",
+    "Forecast",
+    "ThroughputHistory",
+    "forecast_completion",
+    "get_throughput_history",
+    "remaining_items",
+]
@@ -0,0 +1,297 @@
+"""Monte Carlo delivery forecasts from historical task throughput.
+
+Each trial replays the remaining work by drawing a random day from the
+recent throughput history (tasks completed per calendar day, idle days
+included) until the remaining items are done. Trials run as NumPy arrays of
+shape (trials, days), so 10k+ trials take milliseconds, and the spread of
+finishing days gives P50/P85/P95 completion dates.
+
+``ThroughputHistory`` keeps the completion day of every done task in memory
+and refreshes it incrementally: each refresh only reads tasks whose
+``updated_at`` moved past the last refresh, so a long-running MCP server can
+forecast on demand without rescanning all tasks. A cheap aggregate over the
+done tasks catches changes the watermark misses and triggers a full reload.
+"""
+
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..db.models import Task
+from ..db.operations import ProjectOps
+from ..utils.datetime_utils import day_key, get_timezone
+from .snapshot import NO_PROJECT, require_numpy
+
+try:
+    import numpy as np
+except ImportError:
+    pass
+
+DEFAULT_TRIALS = 10_000
+DEFAULT_HISTORY_DAYS = 90
+PERCENTILES = (50, 85, 95)
+
+# Trials that haven't finished after this many days are reported as unbounded
+MAX_FORECAST_DAYS = 3650
+
+# Days simulated per block; bounds memory at trials * BLOCK_DAYS draws
+BLOCK_DAYS = 365
+
+
+class ThroughputHistory:
+    """Completion day and project of every done task, refreshed incrementally."""
+
+    def __init__(self):
+        """Initialize an empty history (filled by ``refresh``)."""
+        require_numpy()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything so the next refresh reloads all tasks."""
+        self.task_ids = np.empty(0, dtype=np.int64)
+        self.projects = np.empty(0, dtype=np.int32)
+        self.days = np.empty(0, dtype=np.int32)
+        self.watermark: Optional[datetime] = None
+
+    def refresh(self, session: Session) -> int:
+        """Read tasks changed since the last refresh.
+
+        Falls back to a full reload if the done tasks no longer match the
+        history: their count, the sum of their ids and the sum of their
+        completion days are compared, so a deleted task, a done/undone swap
+        or a completion day written without moving ``updated_at`` past the
+        watermark (e.g. by a transaction that committed late) is noticed.
+
+        Returns:
+            Number of task rows read
+        """
+        with self._lock:
+            read = self._apply_changes(session)
+            done = session.execute(
+                select(
+                    func.count(),
+                    func.coalesce(func.sum(Task.id), 0),
+                    func.coalesce(func.sum(Task.completed_day), 0),
+                ).where(Task.status == "done", Task.completed_day.is_not(None))
+            ).one()
+            if tuple(done) != (
+                len(self.task_ids),
+                int(self.task_ids.sum()),
+                int(self.days.sum(dtype=np.int64)),
+            ):
+                self.reset()
+                read += self._apply_changes(session)
+            return read
+
+    def _apply_changes(self, session: Session) -> int:
+        """Merge tasks updated since the watermark into the history."""
+        query = select(Task.id, Task.project_id, Task.status, Task.completed_day, Task.updated_at)
+        if self.watermark is not None:
+            # >= so rows sharing the watermark timestamp are never missed;
+            # re-reading a row is harmless
+            query = query.where(Task.updated_at >= self.watermark)
+        rows = session.execute(query).all()
+        if not rows:
+            return 0
+
+        changed = np.fromiter((row.id for row in rows), dtype=np.int64, count=len(rows))
+        keep = ~np.isin(self.task_ids, changed)
+        done = [row for row in rows if row.status == "done" and row.completed_day is not None]
+
+        self.task_ids = np.concatenate(
+            [self.task_ids[keep], np.array([row.id for row in done], dtype=np.int64)]
+        )
+        self.projects = np.concatenate(
+            [
+                self.projects[keep],
+                np.array([row.project_id or NO_PROJECT for row in done], dtype=np.int32),
+            ]
+        )
+        self.days = np.concatenate(
+            [self.days[keep], np.array([row.completed_day for row in done], dtype=np.int32)]
+        )
+
+        updated = [row.updated_at for row in rows if row.updated_at is not None]
+        if updated:
+            self.watermark = max([*updated, self.watermark] if self.watermark else updated)
+        return len(rows)
+
+    def daily_counts(
+        self, start_day: int, end_day: int, project_id: Optional[int] = None
+    ) -> "np.ndarray":
+        """Tasks completed on each day from ``start_day`` to ``end_day``."""
+        mask = (self.days >= start_day) & (self.days <= end_day)
+        if project_id is not None:
+            mask &= self.projects == project_id
+        return np.bincount(self.days[mask] - start_day, minlength=end_day - start_day + 1)
+
+
+# One history per database, shared by every forecast in this process
+_histories: Dict[str, ThroughputHistory] = {}
+_histories_lock = threading.Lock()
+
+
+def get_throughput_history(engine) -> ThroughputHistory:
+    """Get the process-wide throughput history for a database engine."""
+    key = str(engine.url)
+    with _histories_lock:
+        if key not in _histories:
+            _histories[key] = ThroughputHistory()
+        return _histories[key]
+
+
+def simulate_days(
+    daily: "np.ndarray",
+    remaining: int,
+    trials: int = DEFAULT_TRIALS,
+    max_days: int = MAX_FORECAST_DAYS,
+    seed: Optional[int] = None,
+) -> "np.ndarray":
+    """Simulate how many days it takes to finish ``remaining`` items.
+
+    Args:
+        daily: Historical completions per day to resample
+        remaining: Items left to finish
+        trials: Number of Monte Carlo trials
+        max_days: Give up on trials that take longer than this
+        seed: Random seed for reproducible results
+
+    Returns:
+        Days to finish per trial (-1 for trials that didn't finish)
+
+    Raises:
+        ValueError: If the history has no completions to resample
+    """
+    if remaining <= 0:
+        return np.zeros(trials, dtype=np.int64)
+    if daily.sum() == 0:
+        raise ValueError("No tasks were completed in the history window")
+
+    rng = np.random.default_rng(seed)
+    finished_on = np.full(trials, -1, dtype=np.int64)
+    completed = np.zeros(trials, dtype=np.int64)
+    elapsed = 0
+
+    # Start with a block a bit past the expected duration, then double it
+    # for the trials that are still running
+    expected = remaining / daily.mean()
+    block = int(min(max(expected * 1.5, 7), BLOCK_DAYS))
+
+    while elapsed < max_days:
+        active = np.flatnonzero(finished_on < 0)
+        if len(active) == 0:
+            break
+
+        block = min(block, max_days - elapsed)
+        draws = rng.choice(daily, size=(len(active), block))
+        cumulative = completed[active, None] + draws.cumsum(axis=1)
+        reached = cumulative >= remaining
+        done = reached.any(axis=1)
+        finished_on[active[done]] = elapsed + reached[done].argmax(axis=1) + 1
+        completed[active] = cumulative[:, -1]
+        elapsed += block
+        block = min(block * 2, BLOCK_DAYS)
+
+    return finished_on
+
+
+@dataclass
+class Forecast:
+    """Completion date forecast for a set of remaining items."""
+
+    remaining: int
+    trials: int
+    history_days: int
+    completed_in_history: int
+    dates: Dict[int, Optional[date]]  # percentile -> completion date (None if unbounded)
+
+
+def forecast_completion(
+    history: ThroughputHistory,
+    remaining: int,
+    project_id: Optional[int] = None,
+    trials: int = DEFAULT_TRIALS,
+    history_days: int = DEFAULT_HISTORY_DAYS,
+    today: Optional[date] = None,
+    seed: Optional[int] = None,
+) -> Forecast:
+    """Forecast when ``remaining`` items will be done.
+
+    Args:
+        history: Refreshed throughput history
+        remaining: Items left to finish
+        project_id: Resample only this project's throughput
+        trials: Number of Monte Carlo trials
+        history_days: Days of history to resample (ending yesterday)
+        today: Day the forecast starts from (defaults to today in the
+            configured timezone)
+        seed: Random seed for reproducible results
+
+    Raises:
+        ValueError: If no tasks were completed in the history window
+    """
+    # Today in the configured timezone, like the stored completion days
+    today = today or datetime.now(get_timezone()).date()
+    end_day = day_key(today) - 1
+    daily = history.daily_counts(end_day - history_days + 1, end_day, project_id)
+
+    days = simulate_days(daily, remaining, trials, seed=seed)
+
+    # Unfinished trials rank last; a percentile that lands on one is unbounded
+    ranked = np.where(days < 0, MAX_FORECAST_DAYS + 1, days)
+    dates: Dict[int, Optional[date]] = {}
+    for percentile in PERCENTILES:
+        value = int(np.percentile(ranked, percentile, method="higher"))
+        dates[percentile] = today + timedelta(days=value) if value <= MAX_FORECAST_DAYS else None
+
+    return Forecast(
+        remaining=remaining,
+        trials=trials,
+        history_days=history_days,
+        completed_in_history=int(daily.sum()),
+        dates=dates,
+    )
+
+
+async def remaining_items(
+    session: Session, target: str, project_dir: Optional[str] = None
+) -> Tuple[str, int, Optional[int]]:
+    """Resolve a forecast target to the items left to finish.
+
+    A project slug counts the project's tasks that aren't done and
+    forecasts from that project's throughput. Anything else is looked up as
+    a Beads epic, counting its open child issues and forecasting from
+    overall task throughput.
+
+    Returns:
+        Tuple of (label, remaining items, project id or None)
+
+    Raises:
+        ValueError: If the target is neither a project nor an epic
+    """
+    project = ProjectOps.get_by_slug(session, target)
+    if project:
+        remaining = session.scalar(
+            select(func.count())
+            .select_from(Task)
+            .where(Task.project_id == project.id, Task.status != "done")
+        )
+        return f"Project: {project.name}", remaining, project.id
+
+    from ..integrations.beads_integration import get_beads_client
+
+    client = get_beads_client(project_dir)
+    if client is None:
+        raise ValueError(f"Project '{target}' not found (Beads is not available to look up epics)")
+    try:
+        children = await client.get_epic_children(target)
+    except Exception as e:
+        raise ValueError(f"No project or epic '{target}' found") from e
+
+    remaining = sum(1 for child in children if child.status != "closed")
+    return f"Epic: {target}", remaining, None
@@ -0,0 +1,266 @@
+"""Columnar analytics snapshot of tasks and time entries.
+
+Tasks and time ledger entries are loaded once into NumPy column arrays (epoch
+days as int32, taken from the stored day keys where the tables have them,
+project ids, minutes, status codes) and every aggregation is a vectorized
+``bincount`` over those columns, with dates bucketed into weeks by
+``searchsorted``. Years of history aggregate in milliseconds, which keeps
+``sb stats`` and the ``get_analytics`` tool interactive.
+
+NumPy is optional; install it with ``pip install 'second-brain[analytics]'``.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..db.models import Project, Task, TimeEntry
+from ..utils.datetime_utils import day_key, day_key_to_date, get_timezone
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Task status -> status code column value
+STATUS_CODES = {
+    "todo": 0,
+    "in_progress": 1,
+    "blocked": 2,
+    "done": 3,
+}
+
+# Code for statuses outside STATUS_CODES
+OTHER_STATUS = len(STATUS_CODES)
+
+# Project id used for tasks and entries without a project
+NO_PROJECT = 0
+
+# Epoch day used for missing dates (e.g. tasks that aren't completed)
+NO_DAY = -1
+
+
+def require_numpy() -> None:
+    """Raise ImportError if NumPy is not installed."""
+    if not NUMPY_AVAILABLE:
+        raise ImportError(
+            "numpy is not installed. Install with: uv pip install 'second-brain[analytics]'"
+        )
+
+
+def week_start(day: int) -> int:
+    """Epoch day of the Monday starting the week that contains ``day``."""
+    # 1970-01-01 was a Thursday (weekday 3)
+    return day - (day + 3) % 7
+
+
+@dataclass
+class WeeklyMinutes:
+    """Minutes logged per project per week."""
+
+    week_starts: "np.ndarray"  # epoch day of each week's Monday
+    project_ids: "np.ndarray"  # projects with any minutes in the range
+    minutes: "np.ndarray"  # shape (weeks, projects)
+
+
+class AnalyticsSnapshot:
+    """Tasks and time entries as NumPy columns."""
+
+    def __init__(
+        self,
+        task_project: "np.ndarray",
+        task_status: "np.ndarray",
+        task_created_day: "np.ndarray",
+        task_completed_day: "np.ndarray",
+        task_minutes: "np.ndarray",
+        entry_day: "np.ndarray",
+        entry_project: "np.ndarray",
+        entry_minutes: "np.ndarray",
+        project_names: Dict[int, str],
+    ):
+        """Initialize from column arrays (see ``load``)."""
+        self.task_project = task_project
+        self.task_status = task_status
+        self.task_created_day = task_created_day
+        self.task_completed_day = task_completed_day
+        self.task_minutes = task_minutes
+        self.entry_day = entry_day
+        self.entry_project = entry_project
+        self.entry_minutes = entry_minutes
+        self.project_names = project_names
+
+    @classmethod
+    def load(cls, session: Session) -> "AnalyticsSnapshot":
+        """Load all tasks and time entries from the database.
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        require_numpy()
+
+        tasks = session.execute(
+            select(
+                Task.project_id,
+                Task.status,
+                Task.created_at,
+                Task.completed_day,
+                Task.time_spent_minutes,
+            )
+        ).all()
+        entries = session.execute(
+            select(TimeEntry.day_key, TimeEntry.project_id, TimeEntry.minutes)
+        ).all()
+        project_names = dict(session.execute(select(Project.id, Project.name)).all())
+
+        def column(rows, index, convert, dtype):
+            return np.fromiter((convert(row[index]) for row in rows), dtype=dtype, count=len(rows))
+
+        def project(value):
+            return value or NO_PROJECT
+
+        tz = get_timezone()
+
+        def created_day(value):
+            # Same timezone as the stored completion day keys
+            return NO_DAY if value is None else day_key(value, naive_utc=True, tz=tz)
+
+        def day(value):
+            return NO_DAY if value is None else value
+
+        def minutes(value):
+            return value or 0
+
+        def status(value):
+            return STATUS_CODES.get(value, OTHER_STATUS)
+
+        return cls(
+            task_project=column(tasks, 0, project, np.int32),
+            task_status=column(tasks, 1, status, np.int8),
+            task_created_day=column(tasks, 2, created_day, np.int32),
+            task_completed_day=column(tasks, 3, day, np.int32),
+            task_minutes=column(tasks, 4, minutes, np.int32),
+            entry_day=column(entries, 0, day, np.int32),
+            entry_project=column(entries, 1, project, np.int32),
+            entry_minutes=column(entries, 2, minutes, np.int32),
+            project_names=project_names,
+        )
+
+    def _task_mask(self, project_id: Optional[int]) -> "np.ndarray":
+        """Boolean mask selecting tasks of one project, or all tasks."""
+        if project_id is None:
+            return np.ones(len(self.task_project), dtype=bool)
+        return self.task_project == project_id
+
+    def status_counts(self, project_id: Optional[int] = None) -> Dict[str, int]:
+        """Count tasks by status."""
+        codes = self.task_status[self._task_mask(project_id)]
+        counts = np.bincount(codes, minlength=OTHER_STATUS + 1)
+        result = {name: int(counts[code]) for name, code in STATUS_CODES.items()}
+        if counts[OTHER_STATUS]:
+            result["other"] = int(counts[OTHER_STATUS])
+        return result
+
+    def minutes_per_project_per_week(
+        self, start_day: int, end_day: int, project_id: Optional[int] = None
+    ) -> WeeklyMinutes:
+        """Sum logged minutes per project per week (weeks start on Monday).
+
+        Args:
+            start_day: First epoch day to include
+            end_day: Last epoch day to include
+            project_id: Only include this project
+        """
+        edges = np.arange(week_start(start_day), end_day + 1, 7, dtype=np.int32)
+        mask = (self.entry_day >= start_day) & (self.entry_day <= end_day)
+        if project_id is not None:
+            mask &= self.entry_project == project_id
+
+        days = self.entry_day[mask]
+        projects = self.entry_project[mask]
+        minutes = self.entry_minutes[mask]
+
+        project_ids, project_index = np.unique(projects, return_inverse=True)
+        week_index = np.searchsorted(edges, days, side="right") - 1
+        cells = week_index * len(project_ids) + project_index
+        totals = np.bincount(cells, weights=minutes, minlength=len(edges) * len(project_ids))
+
+        return WeeklyMinutes(
+            week_starts=edges,
+            project_ids=project_ids,
+            minutes=totals.reshape(len(edges), len(project_ids)).astype(np.int64),
+        )
+
+    def throughput(
+        self,
+        start_day: int,
+        end_day: int,
+        bucket_days: int = 7,
+        project_id: Optional[int] = None,
+    ) -> "np.ndarray":
+        """Count tasks completed per bucket of days, starting at ``start_day``."""
+        completed = self.task_completed_day[self._task_mask(project_id)]
+        completed = completed[(completed >= start_day) & (completed <= end_day)]
+        buckets = (end_day - start_day) // bucket_days + 1
+        return np.bincount((completed - start_day) // bucket_days, minlength=buckets)
+
+    def cycle_times(self, project_id: Optional[int] = None) -> "np.ndarray":
+        """Days from creation to completion for each completed task."""
+        mask = self._task_mask(project_id) & (self.task_completed_day != NO_DAY)
+        mask &= self.task_created_day != NO_DAY
+        return self.task_completed_day[mask] - self.task_created_day[mask]
+
+    def summary(
+        self, weeks: int = 8, today: Optional[date] = None, project_id: Optional[int] = None
+    ) -> Dict:
+        """Summarize the last ``weeks`` weeks for display.
+
+        ``today`` defaults to the current date in the configured timezone.
+
+        Returns:
+            Dictionary with status counts, weekly throughput, minutes per
+            project per week and cycle time percentiles
+        """
+        # Today in the configured timezone, like the stored day keys
+        end_day = day_key(today or datetime.now(get_timezone()))
+        start_day = week_start(end_day) - 7 * (weeks - 1)
+
+        weekly = self.minutes_per_project_per_week(start_day, end_day, project_id)
+        throughput = self.throughput(start_day, end_day, 7, project_id)
+        cycle = self.cycle_times(project_id)
+
+        week_labels = [day_key_to_date(day).isoformat() for day in weekly.week_starts]
+        project_minutes: List[Dict] = []
+        for column, pid in enumerate(weekly.project_ids):
+            project_minutes.append(
+                {
+                    "project": self.project_names.get(int(pid), "(no project)"),
+                    "minutes": [int(m) for m in weekly.minutes[:, column]],
+                    "total": int(weekly.minutes[:, column].sum()),
+                }
+            )
+        project_minutes.sort(key=lambda p: p["total"], reverse=True)
+
+        cycle_time = None
+        if len(cycle):
+            p50, p85 = np.percentile(cycle, [50, 85])
+            cycle_time = {
+                "count": int(len(cycle)),
+                "mean": float(cycle.mean()),
+                "p50": float(p50),
+                "p85": float(p85),
+            }
+
+        return {
+            "start": day_key_to_date(start_day).isoformat(),
+            "end": day_key_to_date(end_day).isoformat(),
+            "weeks": week_labels,
+            "status_counts": self.status_counts(project_id),
+            "throughput": [int(n) for n in throughput],
+            "project_minutes": project_minutes,
+            "cycle_time": cycle_time,
+        }
@@ -9,9 +9,9 @@ from rich.console import Console
 from rich.table import Table
 from rich.markdown import Markdown
 
-from .db import init_db, get_session
-from .db.operations import ProjectOps, TaskOps, WorkLogOps, TranscriptOps, NoteOps
-from .storage import StorageIndexer
+from .db import init_db, get_session, task_rows, note_rows
+from .db.operations import ProjectOps, TaskOps, TimeEntryOps, WorkLogOps, TranscriptOps, NoteOps
+from .storage import StorageIndexer, DuplicateTranscriptError
 from .config import get_config
 from .utils import datetime_utils
 
@@ -335,6 +335,56 @@ def log_show(days):
         session.close()
 
 
+@log.command("pack")
+@click.option(
+    "--keep-months",
+    type=int,
+    default=1,
+    help="Number of recent months (including the current one) to leave unpacked",
+)
+def log_pack(keep_months):
+    """Pack closed months of work logs into monthly archives.
+
+    Each month becomes one indexed file under work_logs/archive/. Archived
+    days are still readable by every command.
+    """
+    config = get_app_config()
+    from .storage import MarkdownStorage
+
+    storage = MarkdownStorage(str(config.data_dir), **config.get_storage_config())
+
+    today = datetime_utils.now()
+    year, month = today.year, today.month - (max(keep_months, 1) - 1)
+    while month < 1:
+        year, month = year - 1, month + 12
+
+    packed = storage.pack_work_logs(datetime(year, month, 1))
+    if not packed:
+        console.print("[yellow]No closed months to pack[/yellow]")
+        return
+
+    for y, m, day_count in packed:
+        console.print(f"[green]✓[/green] Packed {y:04d}-{m:02d} ({day_count} days)")
+
+
+@log.command("unpack")
+@click.argument("month")
+def log_unpack(month):
+    """Unpack a monthly archive (YYYY-MM) back into daily files."""
+    config = get_app_config()
+    from .storage import MarkdownStorage
+
+    try:
+        month_date = datetime.strptime(month, "%Y-%m")
+    except ValueError:
+        console.print("[red]Error: Month must be in YYYY-MM format[/red]")
+        return
+
+    storage = MarkdownStorage(str(config.data_dir), **config.get_storage_config())
+    written = storage.unpack_work_logs(month_date.year, month_date.month)
+    console.print(f"[green]✓[/green] Unpacked {month} ({written} files)")
+
+
 # Project commands
 @cli.group()
 def project():
@@ -536,12 +586,22 @@ def task_update(task_id, status, priority, time):
             updates["status"] = status
         if priority:
             updates["priority"] = priority
-        if time:
-            updates["time_spent_minutes"] = task.time_spent_minutes + time
 
+        status_changed = status is not None and status != task.status
         if updates:
             TaskOps.update(session, task, **updates)
+        if time:
+            TimeEntryOps.record(session, time, task_id=task.id, source="task_update")
+
+        if updates or time:
             console.print(f"[green]✓[/green] Task #{task_id} updated")
+            if status_changed:
+                from .integrations.jira_outbox import queue_status_push
+
+                if queue_status_push(session, task):
+                    console.print(
+                        f"  Jira: {task.jira_ticket_key} transition queued (sb jira push)"
+                    )
         else:
             console.print("[yellow]No updates provided[/yellow]")
     finally:
@@ -561,9 +621,9 @@ def task_list(project, status, priority):
             if not proj:
                 console.print(f"[red]Error: Project '{project}' not found[/red]")
                 return
-            tasks = TaskOps.list_by_project(session, proj.id, status=status)
+            tasks = task_rows(session, project_id=proj.id, status=status)
         else:
-            tasks = TaskOps.list_all(session, status=status, priority=priority)
+            tasks = task_rows(session, status=status, priority=priority)
 
         if not tasks:
             console.print("[yellow]No tasks found[/yellow]")
@@ -586,7 +646,7 @@ def task_list(project, status, priority):
                 f"{status_emoji} {t.status}",
                 t.title[:50] + "..." if len(t.title) > 50 else t.title,
                 t.priority or "-",
-                t.project.name if t.project else "-",
+                t.project_name or "-",
             )
 
         console.print(table)
@@ -675,14 +735,14 @@ def note_list(project, task_id, tags):
             if not proj:
                 console.print(f"[red]Error: Project '{project}' not found[/red]")
                 return
-            notes = NoteOps.list_by_project(session, proj.id)
+            notes = note_rows(session, project_id=proj.id)
         elif task_id:
-            notes = NoteOps.list_by_task(session, task_id)
+            notes = note_rows(session, task_id=task_id)
         elif tags:
             tag_list = tags.split(",")
-            notes = NoteOps.list_by_tags(session, tag_list)
+            notes = note_rows(session, tags=tag_list)
         else:
-            notes = NoteOps.list_all(session)
+            notes = note_rows(session)
 
         if not notes:
             console.print("[yellow]No notes found[/yellow]")
@@ -699,7 +759,7 @@ def note_list(project, task_id, tags):
             table.add_row(
                 str(n.id),
                 n.title[:50] + "..." if len(n.title) > 50 else n.title,
-                n.project.name if n.project else "-",
+                n.project_name or "-",
                 f"#{n.task_id}" if n.task_id else "-",
                 n.tags or "-",
             )
@@ -713,11 +773,9 @@ def note_list(project, task_id, tags):
 @click.argument("query")
 def note_search(query):
     """Search notes by title or content."""
-    config = get_app_config()
     session, engine = get_db_session()
     try:
-        indexer = StorageIndexer(session, str(config.data_dir))
-        notes = indexer.search_notes(query)
+        notes = note_rows(session, query_text=query)
 
         if not notes:
             console.print(f"[yellow]No notes found matching '{query}'[/yellow]")
@@ -727,14 +785,14 @@ def note_search(query):
 
         for note in notes:
             console.print(f"[cyan]#{note.id}[/cyan] [bold]{note.title}[/bold]")
-            if note.project:
-                console.print(f"  Project: {note.project.name}")
+            if note.project_name:
+                console.print(f"  Project: {note.project_name}")
             if note.task_id:
                 console.print(f"  Task: #{note.task_id}")
 
             # Show snippet
-            snippet = note.content[:150]
-            if len(note.content) > 150:
+            snippet = note.snippet[:150]
+            if len(note.snippet) > 150:
                 snippet += "..."
             console.print(f"  {snippet}\n")
     finally:
@@ -763,11 +821,60 @@ def note_show(note_id):
             console.print(f"Tags: {note.tags}")
 
         console.print(f"\n{'-' * 60}")
-        md = Markdown(note.content)
+        md = Markdown(note.full_content)
         console.print(md)
         console.print(f"{'-' * 60}\n")
 
         console.print(f"File: {note.markdown_path}")
+        for attachment in note.attachments:
+            console.print(
+                f"Attachment #{attachment.id}: {attachment.filename} "
+                f"({attachment.size_bytes} bytes) -> {attachment.blob.path}"
+            )
+    finally:
+        session.close()
+
+
+@note.command("attach")
+@click.argument("note_id", type=int)
+@click.argument("file_path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--name", help="Attachment name (defaults to the file name)")
+def note_attach(note_id, file_path, name):
+    """Attach a file to a note.
+
+    Files are stored by content hash under data/blobs/, so attaching the
+    same file to several notes stores it only once.
+    """
+    config = get_app_config()
+    session, engine = get_db_session()
+    try:
+        indexer = StorageIndexer(session, str(config.data_dir))
+        attachment = indexer.attach_file_to_note(note_id, file_path, filename=name)
+        if not attachment:
+            console.print(f"[red]Error: Note #{note_id} not found[/red]")
+            return
+
+        console.print(
+            f"[green]✓[/green] Attached {attachment.filename} to note #{note_id} "
+            f"(attachment #{attachment.id})"
+        )
+    finally:
+        session.close()
+
+
+@note.command("detach")
+@click.argument("attachment_id", type=int)
+def note_detach(attachment_id):
+    """Remove an attachment from a note."""
+    config = get_app_config()
+    session, engine = get_db_session()
+    try:
+        indexer = StorageIndexer(session, str(config.data_dir))
+        if not indexer.detach_from_note(attachment_id):
+            console.print(f"[red]Error: Attachment #{attachment_id} not found[/red]")
+            return
+
+        console.print(f"[green]✓[/green] Removed attachment #{attachment_id}")
     finally:
         session.close()
 
@@ -820,7 +927,7 @@ def note_mark_sensitive(note_id, encrypt, unmark):
                     return
 
                 encryptor = Encryptor(km)
-                encrypted_content = encryptor.create_encrypted_block(note.content)
+                encrypted_content = encryptor.create_encrypted_block(note.full_content)
                 
                 # Update note with encrypted content
                 NoteOps.update(session, note, content=encrypted_content, encrypted=True)
@@ -879,7 +986,7 @@ def note_decrypt(note_id, passphrase):
                 pp = click.prompt("Enter key passphrase", hide_input=True)
 
             encryptor = Encryptor(km)
-            decrypted_content = encryptor.decrypt_markdown(note.content, passphrase=pp)
+            decrypted_content = encryptor.decrypt_markdown(note.full_content, passphrase=pp)
             
             # Update note with decrypted content
             NoteOps.update(session, note, content=decrypted_content, encrypted=False)
@@ -901,6 +1008,141 @@ def note_decrypt(note_id, passphrase):
         session.close()
 
 
+# Transcript commands
+@cli.group()
+def transcript():
+    """Transcript commands."""
+    pass
+
+
+@transcript.command("import")
+@click.argument("source", type=click.File("r", encoding="utf-8"))
+@click.option("--title", help="Transcript title (defaults to the file name)")
+@click.option("--type", "transcript_type", default="call", help="Transcript type (call, meeting, etc.)")
+@click.option("--date", help="Transcript date (YYYY-MM-DD), defaults to today")
+@click.option("--tags", help="Comma-separated tags")
+def transcript_import(source, title, transcript_type, date, tags):
+    """Import a raw transcript from a file, or '-' for stdin.
+
+    The text is streamed to disk in chunks, so large transcripts are never
+    loaded into memory at once.
+    """
+    from .storage.raw_transcript import CHUNK_SIZE
+
+    if not title:
+        if source.name == "<stdin>":
+            console.print("[red]--title is required when reading from stdin[/red]")
+            return
+        title = Path(source.name).stem
+
+    if date:
+        trans_date = datetime.strptime(date, "%Y-%m-%d")
+    else:
+        trans_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def read_chunks():
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    config = get_app_config()
+    session, engine = get_db_session()
+    try:
+        indexer = StorageIndexer(session, str(config.data_dir))
+        tag_list = [t.strip() for t in tags.split(",")] if tags else None
+        try:
+            new_transcript = indexer.import_transcript(
+                title,
+                read_chunks(),
+                trans_date,
+                transcript_type=transcript_type,
+                tags=tag_list,
+            )
+        except DuplicateTranscriptError as e:
+            console.print(f"[yellow]{e}[/yellow]")
+            return
+
+        console.print(f"[green]✓[/green] Imported transcript #{new_transcript.id}: {title}")
+        console.print(f"  Words: {new_transcript.word_count}")
+        console.print(f"  Raw file: {new_transcript.raw_path}")
+    finally:
+        session.close()
+
+
+# Storage commands
+@cli.group()
+def storage():
+    """Storage layout and maintenance commands."""
+    pass
+
+
+@storage.command("migrate")
+@click.option(
+    "--notes", "note_layout", type=click.Choice(["flat", "sharded"]), help="Target note layout"
+)
+@click.option(
+    "--transcripts",
+    "transcript_layout",
+    type=click.Choice(["flat", "monthly"]),
+    help="Target transcript layout",
+)
+def storage_migrate(note_layout, transcript_layout):
+    """Move notes and transcripts into a new directory layout.
+
+    Sharded notes live under notes/00/12/note-1234.md and monthly
+    transcripts under transcripts/raw/YYYY/MM/. The chosen layout is saved
+    to config.json so new files use it too.
+    """
+    if not note_layout and not transcript_layout:
+        console.print("[yellow]Provide --notes and/or --transcripts[/yellow]")
+        return
+
+    config = get_app_config()
+    session, engine = get_db_session()
+    try:
+        indexer = StorageIndexer(session, str(config.data_dir))
+        moved = indexer.migrate_layout(note_layout, transcript_layout)
+
+        user_config = dict(config.user_config)
+        storage_config = dict(user_config.get("storage", {}))
+        if note_layout:
+            storage_config["note_layout"] = note_layout
+        if transcript_layout:
+            storage_config["transcript_layout"] = transcript_layout
+        user_config["storage"] = storage_config
+        config.save_user_config(user_config)
+
+        console.print("[green]✓[/green] Storage layout migrated")
+        if note_layout:
+            console.print(f"  Notes ({note_layout}): {moved['notes']} moved")
+        if transcript_layout:
+            console.print(f"  Transcripts ({transcript_layout}): {moved['transcripts']} moved")
+    finally:
+        session.close()
+
+
+@storage.command("sync")
+def storage_sync():
+    """Rewrite project and transcript markdown from the database.
+
+    Only files whose synced fields changed are rewritten; unchanged files
+    are left untouched.
+    """
+    config = get_app_config()
+    session, engine = get_db_session()
+    try:
+        indexer = StorageIndexer(session, str(config.data_dir))
+        counts = indexer.sync_all_to_markdown()
+        console.print(
+            f"[green]✓[/green] Synced markdown: {counts['written']} written, "
+            f"{counts['skipped']} unchanged"
+        )
+    finally:
+        session.close()
+
+
 # Report commands
 @cli.group()
 def report():
@@ -924,10 +1166,9 @@ def report_work(days, project):
         work_logs = WorkLogOps.list_by_date_range(session, start_date, end_date)
 
         # Get completed tasks
-        all_tasks = TaskOps.list_all(session, status="done")
-        completed_tasks = [
-            t for t in all_tasks if t.completed_at and start_date <= t.completed_at <= end_date
-        ]
+        completed_tasks = task_rows(
+            session, status="done", completed_between=(start_date, end_date)
+        )
 
         console.print(f"\n[bold]Work Report[/bold]")
         console.print(f"Period: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}\n")
@@ -938,12 +1179,111 @@ def report_work(days, project):
         if completed_tasks:
             console.print("[bold]Completed Tasks:[/bold]")
             for task in completed_tasks:
-                project_str = f" [{task.project.name}]" if task.project else ""
+                project_str = f" [{task.project_name}]" if task.project_name else ""
                 console.print(f"  ✅ {task.title}{project_str}")
     finally:
         session.close()
 
 
+@cli.command("stats")
+@click.option("--weeks", "-w", type=int, default=8, help="Number of weeks to include")
+@click.option("--project", "-p", help="Filter by project slug")
+def stats(weeks, project):
+    """Show throughput, cycle time and time per project."""
+    from .analytics import AnalyticsSnapshot
+
+    session, engine = get_db_session()
+    try:
+        project_id = None
+        if project:
+            proj = ProjectOps.get_by_slug(session, project)
+            if not proj:
+                console.print(f"[red]Error: Project '{project}' not found[/red]")
+                return
+            project_id = proj.id
+
+        try:
+            snapshot = AnalyticsSnapshot.load(session)
+        except ImportError as e:
+            console.print(f"[red]✗ {e}[/red]")
+            return
+
+        summary = snapshot.summary(weeks=weeks, project_id=project_id)
+
+        console.print("\n[bold]Stats[/bold]")
+        console.print(f"Period: {summary['start']} to {summary['end']}\n")
+
+        counts = ", ".join(f"{status}: {n}" for status, n in summary["status_counts"].items())
+        console.print(f"Tasks by status: {counts}")
+
+        cycle = summary["cycle_time"]
+        if cycle:
+            console.print(
+                f"Cycle time: median {cycle['p50']:.1f}d, P85 {cycle['p85']:.1f}d, "
+                f"mean {cycle['mean']:.1f}d ({cycle['count']} completed)"
+            )
+        console.print()
+
+        table = Table(title="Weekly")
+        table.add_column("Week of", style="cyan")
+        table.add_column("Done", justify="right")
+        projects = summary["project_minutes"]
+        for project_stats in projects:
+            table.add_column(project_stats["project"], justify="right")
+
+        for i, week in enumerate(summary["weeks"]):
+            hours = [f"{p['minutes'][i] / 60:.1f}h" if p["minutes"][i] else "-" for p in projects]
+            table.add_row(week, str(summary["throughput"][i]), *hours)
+
+        console.print(table)
+    finally:
+        session.close()
+
+
+@cli.command("forecast")
+@click.argument("target")
+@click.option("--trials", type=int, default=10000, help="Number of Monte Carlo trials")
+@click.option("--history-days", type=int, default=90, help="Days of throughput history to resample")
+def forecast(target, trials, history_days):
+    """Forecast completion dates for a project (slug) or epic (ID)."""
+    from .analytics import forecast_completion, get_throughput_history, remaining_items
+    import asyncio
+
+    session, engine = get_db_session()
+    try:
+        try:
+            history = get_throughput_history(engine)
+            history.refresh(session)
+            label, remaining, project_id = asyncio.run(remaining_items(session, target))
+            result = forecast_completion(
+                history,
+                remaining,
+                project_id=project_id,
+                trials=trials,
+                history_days=history_days,
+            )
+        except (ImportError, ValueError) as e:
+            console.print(f"[red]✗ {e}[/red]")
+            return
+
+        console.print(f"\n[bold]Forecast[/bold] - {label}")
+        console.print(f"Open items: {result.remaining}")
+        console.print(
+            f"History: {result.completed_in_history} tasks completed "
+            f"in the last {result.history_days} days ({result.trials} trials)\n"
+        )
+
+        if result.remaining == 0:
+            console.print("[green]Nothing left to do[/green]")
+            return
+
+        for percentile, day in result.dates.items():
+            when = day.isoformat() if day else "not within 10 years"
+            console.print(f"  P{percentile}: [cyan]{when}[/cyan]")
+    finally:
+        session.close()
+
+
 # Jira commands
 @cli.group()
 def jira():
@@ -953,14 +1293,21 @@ def jira():
 
 @jira.command("sync")
 @click.option("--project", "-p", help="Project slug to sync")
-def jira_sync(project):
-    """Sync Jira issues to local tasks."""
+@click.option("--full", is_flag=True, help="Fetch every issue, not just changes since the last sync")
+@click.option("--combined", is_flag=True, help="Fetch all projects with one combined query")
+def jira_sync(project, full, combined):
+    """Sync Jira issues to local tasks.
+
+    After the first sync of a project only issues updated since the
+    previous sync are fetched; use --full to fetch everything again.
+    """
     session, engine = get_db_session()
     try:
-        from .integrations.jira_client import JiraClient
+        from .integrations.jira_client import get_jira_client
+        from .integrations.jira_sync import JiraSyncEngine
 
         try:
-            client = JiraClient()
+            client = get_jira_client()
         except ValueError as e:
             console.print(f"[red]Error: {e}[/red]")
             return
@@ -987,38 +1334,209 @@ def jira_sync(project):
             console.print("[yellow]No projects with Jira integration found[/yellow]")
             return
 
+        syncer = JiraSyncEngine(session, client)
         total_synced = 0
-        for proj in projects:
-            console.print(f"\nSyncing {proj.name} ({proj.jira_project_key})...")
-            issues = client.get_project_issues(proj.jira_project_key)
+        console.print(f"Syncing {len(projects)} project(s)...")
+        results = syncer.sync_projects(projects, full=full, combined=combined)
+        for proj, result in zip(projects, results):
+            console.print(f"\n{proj.name} ({proj.jira_project_key})")
+            if result.since:
+                console.print(f"  Changes since {result.since.strftime('%Y-%m-%d %H:%M')} UTC")
+            console.print(
+                f"  Synced {result.fetched} issues "
+                f"({result.created} created, {result.updated} updated, "
+                f"{result.unchanged} unchanged)"
+            )
+            total_synced += result.fetched
 
-            for issue in issues:
-                existing = TaskOps.get_by_jira_key(session, issue["key"])
-                if existing:
-                    TaskOps.update(
-                        session,
-                        existing,
-                        title=issue["summary"],
-                        description=issue["description"],
-                    )
-                else:
-                    TaskOps.create(
-                        session,
-                        title=issue["summary"],
-                        description=issue["description"],
-                        project_id=proj.id,
-                        jira_ticket_id=issue["id"],
-                        jira_ticket_key=issue["key"],
-                    )
-                total_synced += 1
+        stats = syncer.stats
+        if stats.retries or stats.throttled_seconds >= 1:
+            console.print(
+                f"\n[yellow]Rate limited: {stats.retries} retries, "
+                f"{stats.throttled_seconds:.1f}s waiting ({stats.requests} requests)[/yellow]"
+            )
+        console.print(f"\n[green]✓[/green] Total issues synced: {total_synced}")
+    finally:
+        session.close()
 
-            console.print(f"  Synced {len(issues)} issues")
 
-        console.print(f"\n[green]✓[/green] Total issues synced: {total_synced}")
+@jira.command("comment")
+@click.argument("issue_key")
+@click.argument("text")
+def jira_comment(issue_key, text):
+    """Queue a comment on a Jira issue (sent by sb jira push or sync)."""
+    session, engine = get_db_session()
+    try:
+        from .integrations.jira_outbox import queue_comment
+
+        item = queue_comment(session, issue_key, text)
+        console.print(f"[green]✓[/green] Comment on {item.issue_key} queued")
+    finally:
+        session.close()
+
+
+@jira.command("push")
+def jira_push():
+    """Send queued Jira changes (transitions and comments)."""
+    session, engine = get_db_session()
+    try:
+        from .db.operations import JiraOutboxOps
+        from .integrations.jira_client import get_jira_client
+        from .integrations.jira_outbox import drain_outbox
+
+        try:
+            client = get_jira_client()
+        except ValueError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            return
+
+        result = drain_outbox(session, client)
+        console.print(
+            f"[green]✓[/green] Sent {result.sent}, "
+            f"{result.deferred} to retry, {result.failed} failed"
+        )
+
+        counts = JiraOutboxOps.counts(session)
+        queued = counts.get("pending", 0) + counts.get("sending", 0)
+        if queued:
+            console.print(f"[yellow]{queued} change(s) still queued[/yellow]")
+        failed = JiraOutboxOps.list_by_state(session, "failed")
+        if failed:
+            table = Table(title="Failed Jira changes")
+            table.add_column("ID", style="cyan")
+            table.add_column("Issue")
+            table.add_column("Action")
+            table.add_column("Error")
+            for item in failed:
+                table.add_row(str(item.id), item.issue_key, item.action, item.last_error or "-")
+            console.print(table)
     finally:
         session.close()
 
 
+@jira.command("show")
+@click.argument("issue_key")
+@click.option("--offline", is_flag=True, help="Only use the local snapshot")
+@click.option(
+    "--max-age", type=int, default=15, help="Minutes a local snapshot is used without asking Jira"
+)
+def jira_show(issue_key, offline, max_age):
+    """Show a Jira issue, from the local snapshot when it's recent."""
+    session, engine = get_db_session()
+    try:
+        from datetime import timedelta
+
+        from .integrations import jira_cache
+
+        try:
+            lookup = jira_cache.get_issue(
+                session, issue_key, max_age=timedelta(minutes=max_age), offline=offline
+            )
+        except ValueError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            return
+
+        issue = lookup.issue
+        if not issue:
+            if lookup.error:
+                console.print(f"[red]Error: Issue '{issue_key}' is not cached locally[/red]")
+            else:
+                console.print(f"[red]Error: Issue '{issue_key}' not found in Jira[/red]")
+            return
+
+        console.print(f"[bold]{issue['key']}: {issue['summary']}[/bold]")
+        console.print(f"Status: {issue['status']}")
+        if issue.get("priority"):
+            console.print(f"Priority: {issue['priority']}")
+        if issue.get("assignee"):
+            console.print(f"Assignee: {issue['assignee']}")
+        console.print(f"Updated: {issue['updated']}")
+        if issue.get("description"):
+            console.print(f"\n{issue['description']}")
+
+        if lookup.source == jira_cache.SOURCE_STALE:
+            note = f"Offline copy fetched {lookup.fetched_at.strftime('%Y-%m-%d %H:%M')} UTC"
+            if lookup.error:
+                note += f" (Jira unavailable: {lookup.error})"
+            console.print(f"\n[yellow]{note}[/yellow]")
+    finally:
+        session.close()
+
+
+@jira.group("webhook")
+def jira_webhook():
+    """Receive Jira webhooks instead of polling."""
+    pass
+
+
+@jira_webhook.command("serve")
+@click.option("--host", help="Interface to listen on (default: jira.webhook_host or 127.0.0.1)")
+@click.option("--port", type=int, help="Port to listen on (default: jira.webhook_port or 8765)")
+def jira_webhook_serve(host, port):
+    """Apply Jira issue webhooks to tasks as they arrive, until Ctrl-C."""
+    import time
+
+    from .integrations.jira_webhook import DEFAULT_WEBHOOK_PORT, JiraWebhookReceiver
+
+    jira_config = get_app_config().get_jira_config()
+    session, engine = get_db_session()
+    session.close()
+
+    receiver = JiraWebhookReceiver(
+        engine,
+        host=host or jira_config["webhook_host"],
+        port=port or jira_config["webhook_port"] or DEFAULT_WEBHOOK_PORT,
+        secret=jira_config["webhook_secret"],
+    )
+    try:
+        url = receiver.start()
+    except (OSError, ValueError) as e:
+        console.print(f"[red]Error: {e}[/red]")
+        return
+    console.print(f"[green]✓[/green] Receiving Jira webhooks at {url}")
+    if not receiver.secret:
+        console.print("[yellow]No webhook secret set; deliveries are not verified[/yellow]")
+    console.print("Press Ctrl-C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        receiver.stop()
+
+    totals = receiver.totals
+    console.print(
+        f"Received {receiver.received} event(s): {totals.created} created, "
+        f"{totals.updated} updated, {totals.deleted} deleted, "
+        f"{receiver.duplicates + totals.skipped} skipped, {receiver.rejected} rejected"
+    )
+
+
+@jira_webhook.command("replay")
+@click.argument("files", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option("--url", help="Receiver URL (default: the configured local receiver)")
+def jira_webhook_replay(files, url):
+    """POST recorded webhook payloads to a receiver, signed with the webhook secret."""
+    from .integrations.jira_webhook import DEFAULT_WEBHOOK_PORT, WEBHOOK_PATH, post_webhook
+
+    jira_config = get_app_config().get_jira_config()
+    if not url:
+        port = jira_config["webhook_port"] or DEFAULT_WEBHOOK_PORT
+        url = f"http://{jira_config['webhook_host']}:{port}{WEBHOOK_PATH}"
+
+    for path in files:
+        try:
+            status, message = post_webhook(
+                url, Path(path).read_bytes(), jira_config["webhook_secret"]
+            )
+        except OSError as e:
+            console.print(f"[red]Error: Could not reach {url}: {e}[/red]")
+            return
+        color = "green" if status < 300 else "red"
+        console.print(f"[{color}]{status}[/{color}] {path}: {message}")
+
+
 # Epic and Issue commands (using Beads integration)
 @cli.group()
 def epic():
@@ -2117,7 +2635,7 @@ def mark_sensitive(note_id, log_id, passphrase):
     from .db.operations import NoteOps, WorkLogOps
     from .storage.markdown import MarkdownStorage
     import getpass
-    import frontmatter
+    from .storage import frontmatter_codec
     from pathlib import Path
 
     config = get_app_config()
@@ -2164,7 +2682,7 @@ def mark_sensitive(note_id, log_id, passphrase):
                 return
 
             # Check if already encrypted
-            if "<!-- ENCRYPTED:" in note.content:
+            if "<!-- ENCRYPTED:" in note.full_content:
                 console.print(f"[yellow]⚠ Note #{note_id} appears to already contain encrypted content[/yellow]")
                 console.print("Proceeding will encrypt it again...")
 
@@ -2175,11 +2693,11 @@ def mark_sensitive(note_id, log_id, passphrase):
                 return
 
             with open(markdown_path, 'r', encoding='utf-8') as f:
-                post = frontmatter.load(f)
+                post = frontmatter_codec.load(f)
 
             # Encrypt the content
             console.print(f"[cyan]Encrypting note #{note_id}: {note.title}[/cyan]")
-            encrypted_block = encryptor.create_encrypted_block(note.content)
+            encrypted_block = encryptor.create_encrypted_block(note.full_content)
 
             # Update frontmatter
             post.metadata['is_sensitive'] = True
@@ -2191,12 +2709,10 @@ def mark_sensitive(note_id, log_id, passphrase):
 
             # Save markdown file
             with open(markdown_path, 'w', encoding='utf-8') as f:
-                f.write(frontmatter.dumps(post))
+                f.write(frontmatter_codec.dumps(post))
 
-            # Update database record
-            note.content = encrypted_block
-            note.updated_at = datetime.utcnow()
-            session.commit()
+            # Update database record (replaces any appended chunks)
+            NoteOps.update(session, note, content=encrypted_block)
 
             console.print(f"[green]✓ Note #{note_id} marked as sensitive and encrypted![/green]")
             console.print(f"\nMarkdown file updated: {markdown_path}")
@@ -2220,6 +2736,11 @@ def mark_sensitive(note_id, log_id, passphrase):
             work_log = entry.work_log
             markdown_path = Path(work_log.markdown_path)
 
+            # Days packed into a monthly archive are restored to a live file
+            if not markdown_path.exists():
+                storage = MarkdownStorage(str(config.data_dir), **config.get_storage_config())
+                storage.restore_work_log(work_log.date)
+
             if not markdown_path.exists():
                 console.print(f"[red]✗ Error: Work log file not found: {markdown_path}[/red]")
                 return
@@ -2237,7 +2758,7 @@ def mark_sensitive(note_id, log_id, passphrase):
                 content = f.read()
 
             # Read as frontmatter doc
-            post = frontmatter.loads(content)
+            post = frontmatter_codec.loads(content)
 
             # Mark as having sensitive content in frontmatter
             if 'has_encrypted_entries' not in post.metadata:
@@ -2245,7 +2766,7 @@ def mark_sensitive(note_id, log_id, passphrase):
                 post.metadata['updated_at'] = datetime.utcnow().isoformat()
 
                 with open(markdown_path, 'w', encoding='utf-8') as f:
-                    f.write(frontmatter.dumps(post))
+                    f.write(frontmatter_codec.dumps(post))
 
             console.print(f"[green]✓ Work log entry #{log_id} marked as sensitive and encrypted![/green]")
             console.print(f"\nWork log file: {markdown_path}")
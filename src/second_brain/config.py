@@ -156,6 +156,7 @@ class Config:
             Dictionary with Jira configuration
         """
         jira_config = self.user_config.get("jira", {})
+        webhook_port = os.getenv("JIRA_WEBHOOK_PORT", jira_config.get("webhook_port"))
 
         # Override with environment variables if present
         return {
@@ -163,8 +164,35 @@ class Config:
             "email": os.getenv("JIRA_EMAIL", jira_config.get("email")),
             "api_token": os.getenv("JIRA_API_TOKEN", jira_config.get("api_token")),
             "default_project": jira_config.get("default_project"),
+            "push_status": bool(jira_config.get("push_status", False)),
+            "webhook_host": jira_config.get("webhook_host", "127.0.0.1"),
+            "webhook_port": int(webhook_port) if webhook_port else None,
+            "webhook_secret": os.getenv("JIRA_WEBHOOK_SECRET", jira_config.get("webhook_secret")),
         }
 
+    def get_storage_config(self) -> dict:
+        """Get markdown storage options from user config.
+
+        Returns:
+            Dictionary of keyword arguments for MarkdownStorage
+        """
+        storage_config = self.user_config.get("storage", {})
+
+        return {
+            "note_layout": storage_config.get("note_layout", "flat"),
+            "transcript_layout": storage_config.get("transcript_layout", "flat"),
+            "raw_compression": storage_config.get("raw_compression", "none"),
+            "durability": storage_config.get("durability", "rename"),
+        }
+
+    def get_write_behind_ms(self) -> int:
+        """Get the write-behind window for long-running processes.
+
+        Returns:
+            Milliseconds to coalesce markdown updates for (0 disables)
+        """
+        return int(self.user_config.get("storage", {}).get("write_behind_ms", 500))
+
     def get_user_info(self) -> dict:
         """Get user information from config.
 
@@ -221,6 +249,13 @@ class Config:
                     "auto_link_tasks": True,
                     "timezone": "America/New_York"
                 },
+                "storage": {
+                    "note_layout": "flat",
+                    "transcript_layout": "flat",
+                    "raw_compression": "none",
+                    "durability": "rename",
+                    "write_behind_ms": 500
+                },
                 "paths": {
                     "data_dir": "data",
                     "projects_dir": "data/projects",
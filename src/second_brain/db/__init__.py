@@ -1,7 +1,34 @@
 """Database models and operations."""
 
-from .models import init_db, get_session, Project, Task, WorkLog, WorkLogEntry, Note, Transcript
-from .operations import ProjectOps, TaskOps, WorkLogOps, NoteOps, TranscriptOps
+from .models import (
+    init_db,
+    get_session,
+    Project,
+    Task,
+    WorkLog,
+    WorkLogEntry,
+    Note,
+    NoteChunk,
+    Transcript,
+    Blob,
+    NoteAttachment,
+    TimeEntry,
+    JiraIssue,
+    JiraOutboxItem,
+)
+from .operations import (
+    ProjectOps,
+    TaskOps,
+    WorkLogOps,
+    NoteOps,
+    TranscriptOps,
+    BlobOps,
+    NoteAttachmentOps,
+    TimeEntryOps,
+    JiraIssueOps,
+    JiraOutboxOps,
+)
+from .views import TaskRow, NoteRow, WorkLogEntryRow, task_rows, note_rows, work_log_entry_rows
 
 __all__ = [
     "init_db",
@@ -11,10 +38,27 @@ __all__ = [
     "WorkLog",
     "WorkLogEntry",
     "Note",
+    "NoteChunk",
     "Transcript",
+    "Blob",
+    "NoteAttachment",
+    "TimeEntry",
+    "JiraIssue",
+    "JiraOutboxItem",
     "ProjectOps",
     "TaskOps",
     "WorkLogOps",
     "NoteOps",
     "TranscriptOps",
+    "BlobOps",
+    "NoteAttachmentOps",
+    "TimeEntryOps",
+    "JiraIssueOps",
+    "JiraOutboxOps",
+    "TaskRow",
+    "NoteRow",
+    "WorkLogEntryRow",
+    "task_rows",
+    "note_rows",
+    "work_log_entry_rows",
 ]
@@ -1,5 +1,6 @@
 """SQLite database models for indexing and metadata."""
 
+import json
 from datetime import datetime
 from typing import Optional
 from sqlalchemy import (
@@ -9,9 +10,24 @@ from sqlalchemy import (
     Text,
     ForeignKey,
     create_engine,
+    inspect,
+    text,
     Index,
+    bindparam,
+    select,
+    update,
 )
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, Session
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    mapped_column,
+    query_expression,
+    relationship,
+    Session,
+    validates,
+)
+
+from ..utils.datetime_utils import day_key, get_timezone
 
 
 class Base(DeclarativeBase):
@@ -33,8 +49,14 @@ class Project(Base):
         String(50), default="active", nullable=False
     )  # active, completed, archived
     jira_project_key: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    jira_last_synced_updated: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, nullable=True
+    )  # Jira sync watermark: issues updated before this (UTC) are already synced
     tags: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Comma-separated
     markdown_path: Mapped[str] = mapped_column(String(500), nullable=False)
+    markdown_hash: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True
+    )  # Hash of the fields last synced to markdown
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
@@ -70,6 +92,12 @@ class Task(Base):
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    completed_day: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True
+    )  # Day key of completed_at in the configured timezone
+
+    # Start of the description, set by list queries (which defer the full text)
+    description_snippet: Mapped[Optional[str]] = query_expression()
 
     # Relationships
     project: Mapped[Optional["Project"]] = relationship("Project", back_populates="tasks")
@@ -78,6 +106,12 @@ class Task(Base):
     )
     notes: Mapped[list["Note"]] = relationship("Note", back_populates="task")
 
+    @validates("completed_at")
+    def _set_completed_day(self, key, value):
+        """Keep ``completed_day`` in step with ``completed_at`` (naive UTC)."""
+        self.completed_day = day_key(value, naive_utc=True) if value else None
+        return value
+
 
 class WorkLog(Base):
     """Daily work log."""
@@ -86,6 +120,9 @@ class WorkLog(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     date: Mapped[datetime] = mapped_column(DateTime, unique=True, nullable=False, index=True)
+    day_key: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True
+    )  # Day key of date in the configured timezone
     markdown_path: Mapped[str] = mapped_column(String(500), nullable=False)
     summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -96,6 +133,12 @@ class WorkLog(Base):
     # Relationships
     entries: Mapped[list["WorkLogEntry"]] = relationship("WorkLogEntry", back_populates="work_log")
 
+    @validates("date")
+    def _set_day_key(self, key, value):
+        """Keep ``day_key`` in step with ``date`` (naive dates are local)."""
+        self.day_key = day_key(value)
+        return value
+
 
 class WorkLogEntry(Base):
     """Individual entry within a work log."""
@@ -108,12 +151,82 @@ class WorkLogEntry(Base):
     entry_text: Mapped[str] = mapped_column(Text, nullable=False)
     time_spent_minutes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     timestamp: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    day_key: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True
+    )  # Day key of the work log this entry belongs to
 
     # Relationships
     work_log: Mapped["WorkLog"] = relationship("WorkLog", back_populates="entries")
     task: Mapped[Optional["Task"]] = relationship("Task", back_populates="work_log_entries")
 
 
+class TimeEntry(Base):
+    """Minutes logged against a task or project; rows are only ever inserted.
+
+    ``Task.time_spent_minutes`` caches the sum of a task's entries and is
+    incremented in the same transaction as each insert.
+    """
+
+    __tablename__ = "time_entries"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    task_id: Mapped[Optional[int]] = mapped_column(ForeignKey("tasks.id"), nullable=True)
+    project_id: Mapped[Optional[int]] = mapped_column(ForeignKey("projects.id"), nullable=True)
+    day_key: Mapped[int] = mapped_column(
+        Integer, nullable=False
+    )  # Day the time was spent, in the configured timezone
+    minutes: Mapped[int] = mapped_column(Integer, nullable=False)
+    source: Mapped[str] = mapped_column(
+        String(50), nullable=False
+    )  # work_log, task_update, migrated
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class JiraIssue(Base):
+    """Local snapshot of a Jira issue, as formatted by ``JiraClient``."""
+
+    __tablename__ = "jira_issues"
+
+    key: Mapped[str] = mapped_column(String(50), primary_key=True)
+    project_key: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    data: Mapped[str] = mapped_column(Text, nullable=False)  # JSON of the formatted issue
+    updated: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, nullable=True
+    )  # Jira's updated time (UTC)
+    fetched_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow
+    )  # When the snapshot was last confirmed against Jira
+
+    @property
+    def issue(self) -> dict:
+        """The formatted issue."""
+        return json.loads(self.data)
+
+
+class JiraOutboxItem(Base):
+    """Jira change waiting to be sent, drained by ``integrations.jira_outbox``."""
+
+    __tablename__ = "jira_outbox"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    issue_key: Mapped[str] = mapped_column(String(50), nullable=False)
+    action: Mapped[str] = mapped_column(String(20), nullable=False)  # transition, comment
+    payload: Mapped[str] = mapped_column(Text, nullable=False)  # JSON arguments of the action
+    state: Mapped[str] = mapped_column(
+        String(20), default="pending"
+    )  # pending, sending, sent, failed
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    @property
+    def arguments(self) -> dict:
+        """The action's arguments."""
+        return json.loads(self.payload)
+
+
 class Note(Base):
     """Rich markdown note attached to project or task."""
 
@@ -121,7 +234,7 @@ class Note(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     title: Mapped[str] = mapped_column(String(500), nullable=False)
-    content: Mapped[str] = mapped_column(Text, nullable=False)  # Markdown content
+    content: Mapped[str] = mapped_column(Text, nullable=False)  # Markdown content (before appends)
     markdown_path: Mapped[str] = mapped_column(String(500), nullable=False)
     project_id: Mapped[Optional[int]] = mapped_column(ForeignKey("projects.id"), nullable=True)
     task_id: Mapped[Optional[int]] = mapped_column(ForeignKey("tasks.id"), nullable=True)
@@ -133,9 +246,76 @@ class Note(Base):
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    # Start of the content, set by list queries (which defer the full text)
+    snippet: Mapped[Optional[str]] = query_expression()
+
     # Relationships
     project: Mapped[Optional["Project"]] = relationship("Project", back_populates="notes")
     task: Mapped[Optional["Task"]] = relationship("Task", back_populates="notes")
+    attachments: Mapped[list["NoteAttachment"]] = relationship(
+        "NoteAttachment", back_populates="note", cascade="all, delete-orphan"
+    )
+    chunks: Mapped[list["NoteChunk"]] = relationship(
+        "NoteChunk",
+        back_populates="note",
+        cascade="all, delete-orphan",
+        order_by="NoteChunk.seq",
+    )
+
+    @property
+    def full_content(self) -> str:
+        """Note content including appended chunks.
+
+        Chunks are only loaded when this is accessed, so listing notes never
+        reads appended text.
+        """
+        if not self.chunks:
+            return self.content
+        return "\n\n".join([self.content, *(chunk.content for chunk in self.chunks)])
+
+
+class NoteChunk(Base):
+    """Content appended to a note, stored separately so appends don't rewrite it."""
+
+    __tablename__ = "note_chunks"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    note_id: Mapped[int] = mapped_column(ForeignKey("notes.id"), nullable=False)
+    seq: Mapped[int] = mapped_column(Integer, nullable=False)  # 1-based order within the note
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    note: Mapped["Note"] = relationship("Note", back_populates="chunks")
+
+
+class Blob(Base):
+    """Content-addressed file in data/blobs, shared by everything that stores it."""
+
+    __tablename__ = "blobs"
+
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)  # SHA-256
+    path: Mapped[str] = mapped_column(String(500), nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, default=0)
+    ref_count: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class NoteAttachment(Base):
+    """File attached to a note, stored in the blob store."""
+
+    __tablename__ = "note_attachments"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    note_id: Mapped[int] = mapped_column(ForeignKey("notes.id"), nullable=False, index=True)
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    content_hash: Mapped[str] = mapped_column(ForeignKey("blobs.content_hash"), nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    note: Mapped["Note"] = relationship("Note", back_populates="attachments")
+    blob: Mapped["Blob"] = relationship("Blob")
 
 
 class Transcript(Base):
@@ -156,12 +336,22 @@ class Transcript(Base):
         Text, nullable=True
     )  # Comma-separated project IDs
     tags: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    content_hash: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True, index=True
+    )  # SHA-256 of the raw text
+    word_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    markdown_hash: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True
+    )  # Hash of the fields last synced to markdown
     transcript_date: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    # Start of the summary, set by list queries (which defer the full text)
+    summary_snippet: Mapped[Optional[str]] = query_expression()
+
 
 # Create indexes for common queries
 Index("idx_project_status", Project.status)
@@ -170,7 +360,16 @@ Index("idx_task_project", Task.project_id)
 Index("idx_task_issue", Task.issue_id)
 Index("idx_note_project", Note.project_id)
 Index("idx_note_task", Note.task_id)
+Index("idx_note_chunk_seq", NoteChunk.note_id, NoteChunk.seq, unique=True)
 Index("idx_worklog_date", WorkLog.date)
+Index("idx_worklog_day", WorkLog.day_key)
+Index("idx_worklog_entry_day", WorkLogEntry.day_key)
+Index("idx_task_completed_day", Task.completed_day)
+Index("idx_time_entry_day", TimeEntry.day_key)
+Index("idx_time_entry_task", TimeEntry.task_id)
+Index("idx_time_entry_project_day", TimeEntry.project_id, TimeEntry.day_key)
+Index("idx_jira_issue_project", JiraIssue.project_key)
+Index("idx_jira_outbox_due", JiraOutboxItem.state, JiraOutboxItem.next_attempt_at)
 Index("idx_transcript_date", Transcript.transcript_date)
 
 
@@ -178,9 +377,174 @@ def init_db(db_path: str = "data/index.db") -> None:
     """Initialize the database with all tables."""
     engine = create_engine(f"sqlite:///{db_path}", echo=False)
     Base.metadata.create_all(engine)
+    upgrade_schema(engine)
+    fill_day_keys(engine)
+    seed_time_entries(engine)
     return engine
 
 
+def upgrade_schema(engine) -> list[str]:
+    """Add columns that were introduced after a database was created.
+
+    ``create_all`` only creates missing tables, so databases from earlier
+    versions are brought up to date here with additive ``ALTER TABLE``
+    statements. New columns are always nullable or have a default, so
+    existing rows stay valid. Indexes on added columns are created too.
+
+    Returns:
+        List of added columns as "table.column"
+    """
+    inspector = inspect(engine)
+    added = []
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            new_columns = [column for column in table.columns if column.name not in existing]
+            for column in new_columns:
+                column_type = column.type.compile(dialect=engine.dialect)
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                if column.default is not None and column.default.is_scalar:
+                    ddl += f" DEFAULT {column.default.arg!r}"
+                conn.execute(text(ddl))
+                added.append(f"{table.name}.{column.name}")
+
+            if new_columns:
+                for index in table.indexes:
+                    index.create(conn, checkfirst=True)
+
+    return added
+
+
+def fill_day_keys(engine) -> int:
+    """Compute day keys that are missing.
+
+    Rows written before the day key columns existed, or inserted in bulk
+    without the ORM, have NULL keys. Only those rows are read, so this is
+    a few index lookups once every row has its key.
+
+    Returns:
+        Number of rows updated
+    """
+    tz = get_timezone()
+    filled = 0
+
+    with engine.begin() as conn:
+        logs = conn.execute(
+            select(WorkLog.id, WorkLog.date).where(WorkLog.day_key.is_(None))
+        ).all()
+        if logs:
+            conn.execute(
+                update(WorkLog.__table__)
+                .where(WorkLog.__table__.c.id == bindparam("row_id"))
+                .values(day_key=bindparam("key")),
+                [{"row_id": row.id, "key": day_key(row.date, tz=tz)} for row in logs],
+            )
+            filled += len(logs)
+
+        tasks = conn.execute(
+            select(Task.id, Task.completed_at).where(
+                Task.completed_at.is_not(None), Task.completed_day.is_(None)
+            )
+        ).all()
+        if tasks:
+            # updated_at moves so incremental readers (ThroughputHistory) see the new keys
+            conn.execute(
+                update(Task.__table__)
+                .where(Task.__table__.c.id == bindparam("row_id"))
+                .values(completed_day=bindparam("key"), updated_at=datetime.utcnow()),
+                [
+                    {"row_id": row.id, "key": day_key(row.completed_at, naive_utc=True, tz=tz)}
+                    for row in tasks
+                ],
+            )
+            filled += len(tasks)
+
+        result = conn.execute(
+            update(WorkLogEntry.__table__)
+            .where(WorkLogEntry.__table__.c.day_key.is_(None))
+            .values(
+                day_key=select(WorkLog.__table__.c.day_key)
+                .where(WorkLog.__table__.c.id == WorkLogEntry.__table__.c.work_log_id)
+                .scalar_subquery()
+            )
+        )
+        filled += result.rowcount
+
+    return filled
+
+
+def seed_time_entries(engine) -> int:
+    """Fill an empty time ledger from time tracked before it existed.
+
+    Each work log entry with minutes becomes a ledger row on its day. Task
+    time not covered by work log entries is added as one ``migrated`` row
+    on the day the task was completed (or last updated), so every task's
+    ledger sums to its ``time_spent_minutes``.
+
+    Returns:
+        Number of ledger rows inserted
+    """
+    with engine.begin() as conn:
+        if conn.scalar(select(TimeEntry.id).limit(1)) is not None:
+            return 0
+
+        tz = get_timezone()
+        rows = [
+            {
+                "task_id": row.task_id,
+                "project_id": row.project_id,
+                "day_key": row.day_key,
+                "minutes": row.minutes,
+                "source": "work_log",
+            }
+            for row in conn.execute(
+                select(
+                    WorkLogEntry.task_id,
+                    Task.project_id,
+                    WorkLogEntry.day_key,
+                    WorkLogEntry.time_spent_minutes.label("minutes"),
+                )
+                .outerjoin(Task, WorkLogEntry.task_id == Task.id)
+                .where(WorkLogEntry.time_spent_minutes > 0, WorkLogEntry.day_key.is_not(None))
+            )
+        ]
+
+        logged: dict[int, int] = {}
+        for row in rows:
+            if row["task_id"]:
+                logged[row["task_id"]] = logged.get(row["task_id"], 0) + row["minutes"]
+
+        for task in conn.execute(
+            select(
+                Task.id, Task.project_id, Task.time_spent_minutes, Task.completed_day, Task.updated_at
+            ).where(Task.time_spent_minutes > 0)
+        ):
+            residual = task.time_spent_minutes - logged.get(task.id, 0)
+            if residual <= 0:
+                continue
+            if task.completed_day is not None:
+                day = task.completed_day
+            else:
+                day = day_key(task.updated_at or datetime.utcnow(), naive_utc=True, tz=tz)
+            rows.append(
+                {
+                    "task_id": task.id,
+                    "project_id": task.project_id,
+                    "day_key": day,
+                    "minutes": residual,
+                    "source": "migrated",
+                }
+            )
+
+        if rows:
+            conn.execute(TimeEntry.__table__.insert(), rows)
+        return len(rows)
+
+
 def get_session(engine) -> Session:
     """Get a database session."""
     return Session(engine)
@@ -1,11 +1,66 @@
 """Database operations for CRUD and queries."""
 
-from datetime import datetime
-from typing import Optional, List
-from sqlalchemy import select, and_, or_
-from sqlalchemy.orm import Session
-
-from .models import Project, Task, WorkLog, WorkLogEntry, Note, Transcript
+import json
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, List, Union
+from sqlalchemy import select, and_, or_, func, update, delete, insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, defer, with_expression
+
+from .models import (
+    Project,
+    Task,
+    WorkLog,
+    WorkLogEntry,
+    Note,
+    NoteChunk,
+    Transcript,
+    Blob,
+    NoteAttachment,
+    TimeEntry,
+    JiraIssue,
+    JiraOutboxItem,
+)
+from ..utils import datetime_utils
+from ..utils.datetime_utils import day_key
+
+
+# List views show at most this many characters of long text columns
+SNIPPET_LENGTH = 150
+
+
+def _snippet(column):
+    """SQL for the start of a text column, for list views that defer it.
+
+    One character more than ``SNIPPET_LENGTH`` is selected so callers can
+    tell whether the text was cut off.
+    """
+    return func.substr(column, 1, SNIPPET_LENGTH + 1)
+
+
+def _note_search_condition(query_text: str):
+    """SQL condition matching notes whose title, content or a chunk contains text."""
+    search_pattern = f"%{query_text}%"
+    chunk_matches = select(NoteChunk.note_id).where(NoteChunk.content.like(search_pattern))
+    return or_(
+        Note.title.like(search_pattern),
+        Note.content.like(search_pattern),
+        Note.id.in_(chunk_matches),
+    )
+
+
+def _apply_changes(instance, changes: dict) -> bool:
+    """Set the attributes whose values differ from the given ones.
+
+    Returns:
+        True if any attribute changed
+    """
+    changed = False
+    for key, value in changes.items():
+        if hasattr(instance, key) and getattr(instance, key) != value:
+            setattr(instance, key, value)
+            changed = True
+    return changed
 
 
 class ProjectOps:
@@ -61,10 +116,13 @@ class ProjectOps:
 
     @staticmethod
     def update(session: Session, project: Project, **kwargs) -> Project:
-        """Update project fields."""
-        for key, value in kwargs.items():
-            if hasattr(project, key):
-                setattr(project, key, value)
+        """Update project fields.
+
+        Values equal to the current ones are ignored; if nothing changes the
+        row is not written and ``updated_at`` is left alone.
+        """
+        if not _apply_changes(project, kwargs):
+            return project
         project.updated_at = datetime.utcnow()
         session.commit()
         session.refresh(project)
@@ -114,12 +172,23 @@ class TaskOps:
         """Get task by Jira ticket key."""
         return session.scalar(select(Task).where(Task.jira_ticket_key == jira_key))
 
+    @staticmethod
+    def _list_query():
+        """Select tasks for a list view, deferring the description."""
+        return select(Task).options(
+            defer(Task.description),
+            with_expression(Task.description_snippet, _snippet(Task.description)),
+        )
+
     @staticmethod
     def list_by_project(
         session: Session, project_id: int, status: Optional[str] = None
     ) -> List[Task]:
-        """List tasks for a project."""
-        query = select(Task).where(Task.project_id == project_id)
+        """List tasks for a project.
+
+        The description is deferred; ``description_snippet`` holds its start.
+        """
+        query = TaskOps._list_query().where(Task.project_id == project_id)
         if status:
             query = query.where(Task.status == status)
         return list(session.scalars(query).all())
@@ -131,8 +200,11 @@ class TaskOps:
         priority: Optional[str] = None,
         tags: Optional[List[str]] = None,
     ) -> List[Task]:
-        """List all tasks with optional filters."""
-        query = select(Task)
+        """List all tasks with optional filters.
+
+        The description is deferred; ``description_snippet`` holds its start.
+        """
+        query = TaskOps._list_query()
         conditions = []
         if status:
             conditions.append(Task.status == status)
@@ -148,13 +220,18 @@ class TaskOps:
 
     @staticmethod
     def update(session: Session, task: Task, **kwargs) -> Task:
-        """Update task fields."""
-        for key, value in kwargs.items():
-            if hasattr(task, key):
-                setattr(task, key, value)
-        task.updated_at = datetime.utcnow()
+        """Update task fields.
+
+        Values equal to the current ones are ignored; if nothing changes the
+        row is not written and ``updated_at`` is left alone.
+        """
+        changed = _apply_changes(task, kwargs)
         if kwargs.get("status") == "done" and not task.completed_at:
             task.completed_at = datetime.utcnow()
+            changed = True
+        if not changed:
+            return task
+        task.updated_at = datetime.utcnow()
         session.commit()
         session.refresh(task)
         return task
@@ -174,8 +251,12 @@ class WorkLogOps:
 
     @staticmethod
     def get_by_date(session: Session, date: datetime) -> Optional[WorkLog]:
-        """Get work log by date."""
-        return session.scalar(select(WorkLog).where(WorkLog.date == date))
+        """Get the work log for the day containing ``date``.
+
+        Matches on the day key, so aware and naive datetimes for the same
+        local day find the same log.
+        """
+        return session.scalar(select(WorkLog).where(WorkLog.day_key == day_key(date)))
 
     @staticmethod
     def get_or_create(session: Session, date: datetime, markdown_path: str) -> WorkLog:
@@ -196,15 +277,21 @@ class WorkLogOps:
         """Add an entry to a work log."""
         entry = WorkLogEntry(
             work_log_id=work_log.id,
+            day_key=work_log.day_key,
             task_id=task_id,
             entry_text=entry_text,
             time_spent_minutes=time_spent_minutes,
         )
         session.add(entry)
-        if task_id and time_spent_minutes:
-            task = session.get(Task, task_id)
-            if task:
-                task.time_spent_minutes += time_spent_minutes
+        if time_spent_minutes:
+            TimeEntryOps.record(
+                session,
+                time_spent_minutes,
+                task_id=task_id,
+                day=work_log.day_key,
+                source="work_log",
+                commit=False,
+            )
         session.commit()
         session.refresh(entry)
         return entry
@@ -213,13 +300,338 @@ class WorkLogOps:
     def list_by_date_range(
         session: Session, start_date: datetime, end_date: datetime
     ) -> List[WorkLog]:
-        """List work logs within a date range."""
-        query = select(WorkLog).where(
-            and_(WorkLog.date >= start_date, WorkLog.date <= end_date)
+        """List work logs for the days from ``start_date`` to ``end_date`` (inclusive)."""
+        query = (
+            select(WorkLog)
+            .where(WorkLog.day_key.between(day_key(start_date), day_key(end_date)))
+            .order_by(WorkLog.day_key)
         )
         return list(session.scalars(query).all())
 
 
+class TimeEntryOps:
+    """Operations for the append-only TimeEntry ledger."""
+
+    @staticmethod
+    def record(
+        session: Session,
+        minutes: int,
+        task_id: Optional[int] = None,
+        project_id: Optional[int] = None,
+        day: Optional[Union[int, date, datetime]] = None,
+        source: str = "task_update",
+        commit: bool = True,
+    ) -> TimeEntry:
+        """Log minutes against a task or project.
+
+        Inserts a ledger row and increments the task's cached
+        ``time_spent_minutes`` with a single SQL ``UPDATE``, so concurrent
+        writers never overwrite each other's time.
+
+        Args:
+            session: Database session
+            minutes: Minutes spent
+            task_id: Task the time was spent on
+            project_id: Project the time was spent on (defaults to the task's)
+            day: Day key or date the time was spent (defaults to today)
+            source: What logged the time (work_log, task_update, ...)
+            commit: Commit the transaction (pass False to commit with other writes)
+        """
+        if task_id and project_id is None:
+            project_id = session.scalar(select(Task.project_id).where(Task.id == task_id))
+        if day is None:
+            day = datetime_utils.now()
+        if not isinstance(day, int):
+            day = day_key(day)
+
+        entry = TimeEntry(
+            task_id=task_id,
+            project_id=project_id,
+            day_key=day,
+            minutes=minutes,
+            source=source,
+        )
+        session.add(entry)
+        if task_id:
+            session.execute(
+                update(Task)
+                .where(Task.id == task_id)
+                .values(time_spent_minutes=func.coalesce(Task.time_spent_minutes, 0) + minutes)
+            )
+        if commit:
+            session.commit()
+        return entry
+
+    @staticmethod
+    def _range_query(column, start_date, end_date, task_id, project_id):
+        """Select ``column`` over ledger rows matching the filters."""
+        query = select(column)
+        if start_date is not None:
+            query = query.where(TimeEntry.day_key >= day_key(start_date))
+        if end_date is not None:
+            query = query.where(TimeEntry.day_key <= day_key(end_date))
+        if task_id is not None:
+            query = query.where(TimeEntry.task_id == task_id)
+        if project_id is not None:
+            query = query.where(TimeEntry.project_id == project_id)
+        return query
+
+    @staticmethod
+    def total(
+        session: Session,
+        start_date: Optional[Union[date, datetime]] = None,
+        end_date: Optional[Union[date, datetime]] = None,
+        task_id: Optional[int] = None,
+        project_id: Optional[int] = None,
+    ) -> int:
+        """Sum minutes logged on the days from ``start_date`` to ``end_date`` (inclusive)."""
+        query = TimeEntryOps._range_query(
+            func.coalesce(func.sum(TimeEntry.minutes), 0), start_date, end_date, task_id, project_id
+        )
+        return session.scalar(query)
+
+    @staticmethod
+    def minutes_by_project(
+        session: Session,
+        start_date: Optional[Union[date, datetime]] = None,
+        end_date: Optional[Union[date, datetime]] = None,
+    ) -> Dict[Optional[int], int]:
+        """Sum minutes per project id (None for time without a project)."""
+        query = TimeEntryOps._range_query(
+            TimeEntry.project_id, start_date, end_date, None, None
+        ).add_columns(func.sum(TimeEntry.minutes))
+        return dict(session.execute(query.group_by(TimeEntry.project_id)).all())
+
+
+class JiraIssueOps:
+    """Operations for JiraIssue snapshots."""
+
+    @staticmethod
+    def get(session: Session, key: str) -> Optional[JiraIssue]:
+        """Get the snapshot of an issue by key."""
+        return session.get(JiraIssue, key)
+
+    @staticmethod
+    def upsert_many(session: Session, issues: List[dict], commit: bool = True) -> int:
+        """Store snapshots of formatted issues, replacing older ones.
+
+        Written with one ``INSERT ... ON CONFLICT DO UPDATE`` executemany. A
+        stored snapshot with a later Jira ``updated`` time is kept, so a
+        stale copy (say, from a sync that overlaps a webhook) never replaces
+        a newer one. Snapshots without an ``updated`` time are always replaced.
+
+        Returns:
+            Number of issues given
+        """
+        from ..integrations.jira_client import parse_jira_datetime
+
+        if not issues:
+            return 0
+        now = datetime.utcnow()
+        rows = [
+            {
+                "key": issue["key"],
+                "project_key": issue.get("project_key"),
+                "data": json.dumps(issue, default=str),
+                "updated": parse_jira_datetime(issue.get("updated")),
+                "fetched_at": now,
+            }
+            for issue in issues
+        ]
+        statement = sqlite_insert(JiraIssue)
+        statement = statement.on_conflict_do_update(
+            index_elements=[JiraIssue.key],
+            set_={
+                name: statement.excluded[name]
+                for name in ("project_key", "data", "updated", "fetched_at")
+            },
+            where=or_(
+                JiraIssue.updated.is_(None),
+                statement.excluded.updated.is_(None),
+                statement.excluded.updated >= JiraIssue.updated,
+            ),
+        )
+        session.execute(statement, rows)
+        if commit:
+            session.commit()
+        return len(rows)
+
+    @staticmethod
+    def mark_fresh(session: Session, key: str) -> None:
+        """Record that a snapshot was just confirmed to match Jira."""
+        session.execute(
+            update(JiraIssue).where(JiraIssue.key == key).values(fetched_at=datetime.utcnow())
+        )
+        session.commit()
+
+    @staticmethod
+    def updated_times(session: Session, keys: List[str]) -> Dict[str, Optional[datetime]]:
+        """Jira ``updated`` times of the stored snapshots among ``keys``."""
+        rows = session.execute(
+            select(JiraIssue.key, JiraIssue.updated).where(JiraIssue.key.in_(keys))
+        )
+        return {row.key: row.updated for row in rows}
+
+    @staticmethod
+    def delete_many(session: Session, keys: List[str], commit: bool = True) -> int:
+        """Delete the snapshots of issues.
+
+        Returns:
+            Number of snapshots deleted
+        """
+        if not keys:
+            return 0
+        deleted = session.execute(delete(JiraIssue).where(JiraIssue.key.in_(keys))).rowcount
+        if commit:
+            session.commit()
+        return deleted
+
+
+class JiraOutboxOps:
+    """Operations for the outbound Jira queue."""
+
+    @staticmethod
+    def enqueue(
+        session: Session, issue_key: str, action: str, arguments: dict, commit: bool = True
+    ) -> JiraOutboxItem:
+        """Queue a change to send to Jira.
+
+        Only the latest status matters, so a transition replaces one that is
+        still pending for the same issue instead of queueing another. The
+        replacement only applies while the item is unclaimed; once a drainer
+        is sending it, the new status is queued behind it instead.
+        """
+        payload = json.dumps(arguments)
+        now = datetime.utcnow()
+        if action == "transition":
+            pending_id = session.scalar(
+                select(JiraOutboxItem.id).where(
+                    JiraOutboxItem.issue_key == issue_key,
+                    JiraOutboxItem.action == "transition",
+                    JiraOutboxItem.state == "pending",
+                )
+            )
+            if pending_id is not None:
+                replaced = session.execute(
+                    update(JiraOutboxItem)
+                    .where(JiraOutboxItem.id == pending_id, JiraOutboxItem.state == "pending")
+                    .values(payload=payload, attempts=0, last_error=None, next_attempt_at=now)
+                ).rowcount
+                if replaced:
+                    if commit:
+                        session.commit()
+                    return session.get(JiraOutboxItem, pending_id)
+
+        item = JiraOutboxItem(
+            issue_key=issue_key, action=action, payload=payload, attempts=0, next_attempt_at=now
+        )
+        session.add(item)
+        if commit:
+            session.commit()
+        return item
+
+    @staticmethod
+    def claim(session: Session, item: JiraOutboxItem, lease: timedelta) -> bool:
+        """Claim an item for sending, so no other drainer sends it too.
+
+        The claim is a conditional ``UPDATE`` committed at once, so only one
+        drainer (in this process or another) wins it. It lasts for ``lease``:
+        an item left in ``sending`` by a drainer that died is claimable again
+        afterwards. Each claim counts as an attempt.
+
+        Returns:
+            True if this session now owns the item
+        """
+        now = datetime.utcnow()
+        claimed = session.execute(
+            update(JiraOutboxItem)
+            .where(
+                JiraOutboxItem.id == item.id,
+                or_(
+                    JiraOutboxItem.state == "pending",
+                    and_(
+                        JiraOutboxItem.state == "sending", JiraOutboxItem.next_attempt_at <= now
+                    ),
+                ),
+            )
+            .values(
+                state="sending",
+                attempts=JiraOutboxItem.attempts + 1,
+                next_attempt_at=now + lease,
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        # Committing also expires the item, so it is reloaded with the claimed values
+        session.commit()
+        return bool(claimed)
+
+    @staticmethod
+    def due(
+        session: Session, limit: int, after_id: int = 0, now: Optional[datetime] = None
+    ) -> List[JiraOutboxItem]:
+        """Get items that are ready to send, oldest first.
+
+        Includes items whose ``sending`` claim has expired.
+        """
+        return session.scalars(
+            select(JiraOutboxItem)
+            .where(
+                JiraOutboxItem.state.in_(("pending", "sending")),
+                JiraOutboxItem.next_attempt_at <= (now or datetime.utcnow()),
+                JiraOutboxItem.id > after_id,
+            )
+            .order_by(JiraOutboxItem.id)
+            .limit(limit)
+        ).all()
+
+    @staticmethod
+    def waiting_issues(session: Session, now: Optional[datetime] = None) -> set:
+        """Get keys of issues with an item waiting for a retry or being sent."""
+        return set(
+            session.scalars(
+                select(JiraOutboxItem.issue_key).where(
+                    JiraOutboxItem.state.in_(("pending", "sending")),
+                    JiraOutboxItem.next_attempt_at > (now or datetime.utcnow()),
+                )
+            )
+        )
+
+    @staticmethod
+    def unsent_transition_keys(session: Session) -> set:
+        """Get keys of issues with a status transition not yet sent to Jira.
+
+        Includes failed transitions: Jira doesn't have the local status until
+        they are resolved.
+        """
+        return set(
+            session.scalars(
+                select(JiraOutboxItem.issue_key).where(
+                    JiraOutboxItem.action == "transition",
+                    JiraOutboxItem.state.in_(("pending", "sending", "failed")),
+                )
+            )
+        )
+
+    @staticmethod
+    def list_by_state(session: Session, state: str, limit: int = 50) -> List[JiraOutboxItem]:
+        """Get items in a state, oldest first."""
+        return session.scalars(
+            select(JiraOutboxItem)
+            .where(JiraOutboxItem.state == state)
+            .order_by(JiraOutboxItem.id)
+            .limit(limit)
+        ).all()
+
+    @staticmethod
+    def counts(session: Session) -> Dict[str, int]:
+        """Count items per state."""
+        return dict(
+            session.execute(
+                select(JiraOutboxItem.state, func.count()).group_by(JiraOutboxItem.state)
+            ).all()
+        )
+
+
 class TranscriptOps:
     """Operations for Transcript model."""
 
@@ -235,6 +647,8 @@ class TranscriptOps:
         action_items: Optional[str] = None,
         linked_projects: Optional[str] = None,
         tags: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        word_count: Optional[int] = None,
     ) -> Transcript:
         """Create a new transcript."""
         transcript = Transcript(
@@ -246,6 +660,8 @@ class TranscriptOps:
             action_items=action_items,
             linked_projects=linked_projects,
             tags=tags,
+            content_hash=content_hash,
+            word_count=word_count,
             transcript_date=transcript_date,
         )
         session.add(transcript)
@@ -258,6 +674,12 @@ class TranscriptOps:
         """Get transcript by ID."""
         return session.get(Transcript, transcript_id)
 
+    @staticmethod
+    def get_by_content_hash(session: Session, content_hash: str) -> Optional[Transcript]:
+        """Get the transcript with the given raw content hash (indexed lookup)."""
+        query = select(Transcript).where(Transcript.content_hash == content_hash).limit(1)
+        return session.scalars(query).first()
+
     @staticmethod
     def list_all(
         session: Session,
@@ -265,9 +687,20 @@ class TranscriptOps:
         tags: Optional[List[str]] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
+        load_text: bool = False,
     ) -> List[Transcript]:
-        """List transcripts with optional filters."""
+        """List transcripts with optional filters.
+
+        The summary and action items are deferred unless ``load_text`` is
+        set; ``summary_snippet`` holds the start of the summary.
+        """
         query = select(Transcript)
+        if not load_text:
+            query = query.options(
+                defer(Transcript.summary),
+                defer(Transcript.action_items),
+                with_expression(Transcript.summary_snippet, _snippet(Transcript.summary)),
+            )
         conditions = []
 
         if transcript_type:
@@ -287,9 +720,8 @@ class TranscriptOps:
     @staticmethod
     def update(session: Session, transcript: Transcript, **kwargs) -> Transcript:
         """Update transcript fields."""
-        for key, value in kwargs.items():
-            if hasattr(transcript, key):
-                setattr(transcript, key, value)
+        if not _apply_changes(transcript, kwargs):
+            return transcript
         transcript.updated_at = datetime.utcnow()
         session.commit()
         session.refresh(transcript)
@@ -328,10 +760,21 @@ class NoteOps:
         """Get note by ID."""
         return session.get(Note, note_id)
 
+    @staticmethod
+    def _list_query():
+        """Select notes for a list view, deferring the content.
+
+        ``Note.snippet`` holds the start of the content instead.
+        """
+        return select(Note).options(
+            defer(Note.content),
+            with_expression(Note.snippet, _snippet(Note.content)),
+        )
+
     @staticmethod
     def list_all(session: Session, tags: Optional[List[str]] = None) -> List[Note]:
         """List all notes, optionally filtered by tags."""
-        query = select(Note)
+        query = NoteOps._list_query()
         if tags:
             tag_conditions = [Note.tags.like(f"%{tag}%") for tag in tags]
             query = query.where(or_(*tag_conditions))
@@ -340,47 +783,184 @@ class NoteOps:
     @staticmethod
     def list_by_project(session: Session, project_id: int) -> List[Note]:
         """List notes for a specific project."""
-        query = select(Note).where(Note.project_id == project_id)
+        query = NoteOps._list_query().where(Note.project_id == project_id)
         return list(session.scalars(query).all())
 
     @staticmethod
     def list_by_task(session: Session, task_id: int) -> List[Note]:
         """List notes for a specific task."""
-        query = select(Note).where(Note.task_id == task_id)
+        query = NoteOps._list_query().where(Note.task_id == task_id)
         return list(session.scalars(query).all())
 
     @staticmethod
     def list_by_tags(session: Session, tags: List[str]) -> List[Note]:
         """List notes that match any of the given tags."""
         tag_conditions = [Note.tags.like(f"%{tag}%") for tag in tags]
-        query = select(Note).where(or_(*tag_conditions))
+        query = NoteOps._list_query().where(or_(*tag_conditions))
         return list(session.scalars(query).all())
 
     @staticmethod
     def search(session: Session, query_text: str) -> List[Note]:
-        """Search notes by title or content (case-insensitive)."""
-        search_pattern = f"%{query_text}%"
-        query = select(Note).where(
-            or_(
-                Note.title.like(search_pattern),
-                Note.content.like(search_pattern),
-            )
-        )
+        """Search notes by title or content (case-insensitive).
+
+        Appended chunks are matched individually, so a phrase split across
+        two appends is not found.
+        """
+        query = NoteOps._list_query().where(_note_search_condition(query_text))
         return list(session.scalars(query).all())
 
+    @staticmethod
+    def append_chunk(session: Session, note_id: int, content: str) -> NoteChunk:
+        """Append content to a note as a new chunk.
+
+        Neither the note's content nor its existing chunks are loaded, so
+        the cost of an append doesn't grow with the size of the note. The
+        next ``seq`` is computed inside the ``INSERT``, so concurrent appends
+        to the same note never pick the same one.
+        """
+        now = datetime.utcnow()
+        next_seq = (
+            select(func.coalesce(func.max(NoteChunk.seq), 0) + 1)
+            .where(NoteChunk.note_id == note_id)
+            .scalar_subquery()
+        )
+        chunk_id = session.execute(
+            insert(NoteChunk)
+            .values(note_id=note_id, seq=next_seq, content=content, created_at=now)
+            .returning(NoteChunk.id)
+        ).scalar_one()
+        session.execute(update(Note).where(Note.id == note_id).values(updated_at=now))
+        session.commit()
+        return session.get(NoteChunk, chunk_id)
+
     @staticmethod
     def update(session: Session, note: Note, **kwargs) -> Note:
-        """Update note fields."""
-        for key, value in kwargs.items():
-            if hasattr(note, key):
-                setattr(note, key, value)
+        """Update note fields.
+
+        Setting ``content`` replaces the whole note, so appended chunks are
+        dropped.
+        """
+        chunks_dropped = "content" in kwargs and bool(note.chunks)
+        if chunks_dropped:
+            note.chunks.clear()
+        if not _apply_changes(note, kwargs) and not chunks_dropped:
+            return note
         note.updated_at = datetime.utcnow()
         session.commit()
         session.refresh(note)
         return note
 
     @staticmethod
-    def delete(session: Session, note: Note) -> None:
-        """Delete a note."""
+    def delete(session: Session, note: Note) -> List[str]:
+        """Delete a note and its attachments.
+
+        The attachments' blob references are released; the caller is
+        responsible for deleting the files of blobs left unreferenced.
+
+        Returns:
+            Content hashes of the blobs no longer referenced
+        """
+        hashes = [attachment.content_hash for attachment in note.attachments]
         session.delete(note)
+        session.flush()
+        unreferenced = []
+        for content_hash in dict.fromkeys(hashes):
+            remaining = BlobOps.release(session, content_hash, hashes.count(content_hash), False)
+            if remaining == 0:
+                unreferenced.append(content_hash)
+        session.commit()
+        return unreferenced
+
+
+class BlobOps:
+    """Operations for Blob model (blob store reference counts)."""
+
+    @staticmethod
+    def get(session: Session, content_hash: str) -> Optional[Blob]:
+        """Get blob by content hash."""
+        return session.get(Blob, content_hash)
+
+    @staticmethod
+    def add_ref(session: Session, content_hash: str, path: str, size_bytes: int = 0) -> Blob:
+        """Record one more reference to a blob, creating its row if needed."""
+        blob = session.get(Blob, content_hash)
+        if blob is None:
+            blob = Blob(content_hash=content_hash, path=path, size_bytes=size_bytes, ref_count=0)
+            session.add(blob)
+        blob.ref_count += 1
+        session.commit()
+        return blob
+
+    @staticmethod
+    def release(session: Session, content_hash: str, count: int = 1, commit: bool = True) -> int:
+        """Drop references to a blob.
+
+        The row is deleted when no references remain; the caller is
+        responsible for deleting the file.
+
+        Args:
+            session: Database session
+            content_hash: Blob to release
+            count: References to drop
+            commit: Whether to commit
+
+        Returns:
+            Remaining reference count
+        """
+        blob = session.get(Blob, content_hash)
+        if blob is None:
+            return 0
+
+        blob.ref_count -= count
+        remaining = blob.ref_count
+        if remaining <= 0:
+            session.delete(blob)
+            remaining = 0
+        if commit:
+            session.commit()
+        return remaining
+
+
+class NoteAttachmentOps:
+    """Operations for NoteAttachment model."""
+
+    @staticmethod
+    def create(
+        session: Session,
+        note_id: int,
+        filename: str,
+        content_hash: str,
+        size_bytes: int = 0,
+    ) -> NoteAttachment:
+        """Create a new note attachment."""
+        attachment = NoteAttachment(
+            note_id=note_id,
+            filename=filename,
+            content_hash=content_hash,
+            size_bytes=size_bytes,
+        )
+        session.add(attachment)
+        session.commit()
+        session.refresh(attachment)
+        return attachment
+
+    @staticmethod
+    def get_by_id(session: Session, attachment_id: int) -> Optional[NoteAttachment]:
+        """Get attachment by ID."""
+        return session.get(NoteAttachment, attachment_id)
+
+    @staticmethod
+    def list_by_note(session: Session, note_id: int) -> List[NoteAttachment]:
+        """List attachments for a note."""
+        query = (
+            select(NoteAttachment)
+            .where(NoteAttachment.note_id == note_id)
+            .order_by(NoteAttachment.id)
+        )
+        return list(session.scalars(query).all())
+
+    @staticmethod
+    def delete(session: Session, attachment: NoteAttachment) -> None:
+        """Delete an attachment."""
+        session.delete(attachment)
         session.commit()
@@ -0,0 +1,179 @@
+"""Read-only row views for list and report paths.
+
+CLI tables, MCP listings and reports only read the rows they display, yet
+loading them as ORM objects costs an identity-map entry, instance state and
+a lazy query per related project for every row. The functions here select
+just the displayed columns with Core ``select()`` (joining related names
+into the same query) and return small ``__slots__`` dataclasses the session
+never tracks.
+
+Use ``operations`` when a row will be modified; use these views when it is
+only shown.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from .models import Note, Project, Task, WorkLog, WorkLogEntry
+from .operations import _note_search_condition, _snippet
+from ..utils.datetime_utils import day_key
+
+
+@dataclass(frozen=True, slots=True)
+class TaskRow:
+    """Task as shown in task lists and reports."""
+
+    id: int
+    title: str
+    status: str
+    priority: Optional[str]
+    project_id: Optional[int]
+    project_name: Optional[str]
+    jira_ticket_key: Optional[str]
+    time_spent_minutes: int
+    completed_at: Optional[datetime]
+    description_snippet: Optional[str]
+
+
+@dataclass(frozen=True, slots=True)
+class NoteRow:
+    """Note as shown in note lists and search results."""
+
+    id: int
+    title: str
+    project_name: Optional[str]
+    task_id: Optional[int]
+    tags: Optional[str]
+    markdown_path: str
+    snippet: str
+
+
+@dataclass(frozen=True, slots=True)
+class WorkLogEntryRow:
+    """Work log entry with its log and task, as shown in reports.
+
+    A work log without entries yields one row whose entry fields are None.
+    """
+
+    work_log_id: int
+    date: datetime
+    summary: Optional[str]
+    entry_id: Optional[int]
+    timestamp: Optional[datetime]
+    entry_text: Optional[str]
+    time_spent_minutes: Optional[int]
+    task_id: Optional[int]
+    task_title: Optional[str]
+    project_id: Optional[int]
+    project_name: Optional[str]
+
+
+def task_rows(
+    session: Session,
+    project_id: Optional[int] = None,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+    completed_between: Optional[Tuple[date, date]] = None,
+) -> List[TaskRow]:
+    """List tasks with optional filters (same filters as ``TaskOps.list_all``).
+
+    ``completed_between`` keeps tasks completed on the days from the first
+    to the second date (inclusive, in the configured timezone).
+    """
+    query = select(
+        Task.id,
+        Task.title,
+        Task.status,
+        Task.priority,
+        Task.project_id,
+        Project.name,
+        Task.jira_ticket_key,
+        Task.time_spent_minutes,
+        Task.completed_at,
+        _snippet(Task.description),
+    ).outerjoin(Project, Task.project_id == Project.id)
+
+    conditions = []
+    if project_id is not None:
+        conditions.append(Task.project_id == project_id)
+    if status:
+        conditions.append(Task.status == status)
+    if priority:
+        conditions.append(Task.priority == priority)
+    if tags:
+        conditions.append(or_(*[Task.tags.like(f"%{tag}%") for tag in tags]))
+    if completed_between:
+        start, end = completed_between
+        conditions.append(Task.completed_day.between(day_key(start), day_key(end)))
+    if conditions:
+        query = query.where(and_(*conditions))
+
+    return [TaskRow(*row) for row in session.execute(query.order_by(Task.id))]
+
+
+def note_rows(
+    session: Session,
+    project_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    tags: Optional[List[str]] = None,
+    query_text: Optional[str] = None,
+) -> List[NoteRow]:
+    """List notes with optional filters, or search them with ``query_text``.
+
+    Tags match any of the given tags; search matches like ``NoteOps.search``.
+    """
+    query = select(
+        Note.id,
+        Note.title,
+        Project.name,
+        Note.task_id,
+        Note.tags,
+        Note.markdown_path,
+        _snippet(Note.content),
+    ).outerjoin(Project, Note.project_id == Project.id)
+
+    if project_id is not None:
+        query = query.where(Note.project_id == project_id)
+    if task_id is not None:
+        query = query.where(Note.task_id == task_id)
+    if tags:
+        query = query.where(or_(*[Note.tags.like(f"%{tag}%") for tag in tags]))
+    if query_text:
+        query = query.where(_note_search_condition(query_text))
+
+    return [NoteRow(*row) for row in session.execute(query.order_by(Note.id))]
+
+
+def work_log_entry_rows(
+    session: Session, start_date: datetime, end_date: datetime
+) -> List[WorkLogEntryRow]:
+    """List work log entries for the days from ``start_date`` to ``end_date`` (inclusive).
+
+    Ordered by day, then entry.
+    """
+    query = (
+        select(
+            WorkLog.id,
+            WorkLog.date,
+            WorkLog.summary,
+            WorkLogEntry.id,
+            WorkLogEntry.timestamp,
+            WorkLogEntry.entry_text,
+            WorkLogEntry.time_spent_minutes,
+            Task.id,
+            Task.title,
+            Project.id,
+            Project.name,
+        )
+        .outerjoin(WorkLogEntry, WorkLogEntry.work_log_id == WorkLog.id)
+        .outerjoin(Task, WorkLogEntry.task_id == Task.id)
+        .outerjoin(Project, Task.project_id == Project.id)
+        .where(WorkLog.day_key.between(day_key(start_date), day_key(end_date)))
+        .order_by(WorkLog.day_key, WorkLogEntry.id)
+    )
+    return [WorkLogEntryRow(*row) for row in session.execute(query)]
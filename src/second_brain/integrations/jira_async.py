@@ -0,0 +1,413 @@
+"""Asynchronous Jira client for the MCP server.
+
+The MCP server runs every tool on one asyncio event loop. ``JiraClient``
+wraps the blocking jira library, so a sync started from a tool would hold
+the loop, and every other tool, until it finished. ``AsyncJiraClient``
+speaks the same REST API over httpx instead. Requests are awaited, a pooled
+``httpx.AsyncClient`` keeps ``max_concurrency`` connections to Jira open,
+and up to that many requests are in flight at once while other tools keep
+running.
+
+It mirrors ``JiraClient``: the same rate limiting, retries and retry
+budgets (see ``jira_ratelimit``), the same issue dictionaries, and the same
+idempotent ``transition_to`` and ``post_comment``. So the sync engine,
+cached lookups and the outbox have async variants that take it. The CLI
+keeps using the blocking client.
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+import httpx
+from jira.exceptions import JIRAError
+
+from .jira_client import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_PAGE_SIZE,
+    PROBE_PAGE_SIZE,
+    format_issue,
+    issue_fields,
+    jira_credentials,
+)
+from .jira_ratelimit import (
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_RATE_LIMIT,
+    RequestStats,
+    RetryBudget,
+    TokenBucket,
+    backoff_delay,
+    retry_reason,
+)
+
+# REST API the client talks to (the version the jira library uses)
+API_PATH = "/rest/api/2/"
+
+# Seconds to wait for Jira to connect or answer
+DEFAULT_TIMEOUT = 30.0
+
+
+class AsyncJiraClient:
+    """Jira REST client for asyncio code, with pooled connections."""
+
+    def __init__(
+        self,
+        server: Optional[str] = None,
+        email: Optional[str] = None,
+        api_token: Optional[str] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        fields: Optional[Sequence[str]] = None,
+        rate_limit: Optional[float] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        timeout: float = DEFAULT_TIMEOUT,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize the client (see ``JiraClient`` for the shared arguments).
+
+        Args:
+            server: Jira server URL (defaults to JIRA_SERVER)
+            email: User email (defaults to JIRA_EMAIL)
+            api_token: API token (defaults to JIRA_API_TOKEN)
+            max_concurrency: Requests in flight at once; also the number of
+                pooled connections
+            fields: Issue fields to request
+            rate_limit: Requests per second to start from
+            max_retries: Retries of a throttled or failed request
+            timeout: Seconds to wait for Jira to connect or answer
+            transport: httpx transport to use instead of the network
+
+        Raises:
+            ValueError: If Jira credentials are not configured
+        """
+        self.server, self.email, self.api_token = jira_credentials(server, email, api_token)
+        self.fields = issue_fields(fields)
+        self.max_retries = max_retries
+        self.stats = RequestStats()  # Totals for the client's lifetime
+
+        self._http = httpx.AsyncClient(
+            base_url=self.server.rstrip("/") + API_PATH,
+            auth=(self.email, self.api_token),
+            headers={"Accept": "application/json"},
+            limits=httpx.Limits(
+                max_connections=max_concurrency, max_keepalive_connections=max_concurrency
+            ),
+            timeout=timeout,
+            transport=transport,
+        )
+        self._request_slots = asyncio.Semaphore(max_concurrency)
+        self._bucket = TokenBucket(rate_limit or _env_rate_limit())
+        self._setup_lock = asyncio.Lock()  # Concurrent fetches look these up once
+        self._cloud: Optional[bool] = None
+        self._timezone: Optional[ZoneInfo] = None
+        self._transition_ids: Dict[Tuple[str, str, str], Dict[str, str]] = {}
+
+    async def __aenter__(self) -> "AsyncJiraClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        await self._http.aclose()
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        budget: Optional[RetryBudget] = None,
+        idempotent: bool = True,
+        **kwargs,
+    ) -> Any:
+        """
+        Send a request under the rate limit, retrying transient failures.
+
+        Retries follow ``JiraClient._call``: 429, 502/503/504 and dropped
+        connections are retried with backoff, writes only after 429 or 503.
+        Waiting for the bucket and backing off yield to the event loop.
+
+        Args:
+            method: HTTP method
+            path: Path below the REST API root (e.g. ``issue/PROJ-1``)
+            budget: Retry budget of the sync run making the request
+            idempotent: Whether the request is safe to repeat after a lost response
+
+        Returns:
+            Decoded JSON response (None for an empty body)
+
+        Raises:
+            JIRAError: If Jira answers with an error, for good
+            httpx.TransportError: If Jira can't be reached
+        """
+        attempt = 0
+        while True:
+            waited = await self._acquire()
+            async with self._request_slots:
+                try:
+                    response = await self._http.request(method, path, **kwargs)
+                    error = _response_error(response)
+                except httpx.TransportError as e:
+                    response, error = None, e
+            self._record(budget, requests=1, seconds=waited)
+            if error is None:
+                self._bucket.succeeded()
+                return response.json() if response.content else None
+
+            reason = retry_reason(error)
+            if reason is None:
+                raise error
+            throttled, retry_after = reason
+            if throttled:
+                self._bucket.throttled(retry_after)
+                self._record(budget, throttled=1)
+            elif not idempotent and getattr(error, "status_code", None) != 503:
+                raise error
+            if attempt >= self.max_retries or (budget is not None and not budget.spend()):
+                raise error
+
+            delay = backoff_delay(attempt, retry_after)
+            self._record(budget, retries=1, seconds=delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _acquire(self) -> float:
+        """Take a token from the bucket, sleeping on the loop while it's empty."""
+        waited = 0.0
+        while True:
+            wait = self._bucket.try_acquire()
+            if not wait:
+                return waited
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def _record(self, budget: Optional[RetryBudget], **counts) -> None:
+        """Add to the client's stats and the run's budget."""
+        self.stats.add(**counts)
+        if budget is not None:
+            budget.record(**counts)
+
+    async def test_connection(self) -> bool:
+        """Test if the Jira connection is working."""
+        try:
+            await self._request("GET", "myself")
+            return True
+        except JIRAError:
+            return False
+
+    async def get_timezone(self) -> ZoneInfo:
+        """Get the timezone Jira reads JQL dates in (UTC if unknown)."""
+        async with self._setup_lock:
+            if self._timezone is None:
+                try:
+                    myself = await self._request("GET", "myself")
+                    self._timezone = ZoneInfo(myself.get("timeZone") or "UTC")
+                except Exception:
+                    self._timezone = ZoneInfo("UTC")
+        return self._timezone
+
+    async def is_cloud(self) -> bool:
+        """Whether the server is Jira Cloud (which pages searches by token)."""
+        async with self._setup_lock:
+            if self._cloud is None:
+                info = await self._request("GET", "serverInfo")
+                self._cloud = info.get("deploymentType") == "Cloud"
+        return self._cloud
+
+    async def iter_issue_pages(
+        self, jql: str, page_size: int = DEFAULT_PAGE_SIZE, budget: Optional[RetryBudget] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield every issue matching a JQL query, one page at a time.
+
+        Args:
+            jql: JQL query (should include an ORDER BY for stable paging)
+            page_size: Issues per request
+            budget: Retry budget of the sync run
+
+        Yields:
+            Lists of issue dictionaries
+
+        Raises:
+            JIRAError: If a request fails (after any retries)
+        """
+        async for page in self._search_pages(jql, page_size, self.fields, budget):
+            yield [format_issue(issue, self.fields) for issue in page]
+
+    async def iter_issue_updates(
+        self, jql: str, page_size: int = PROBE_PAGE_SIZE, budget: Optional[RetryBudget] = None
+    ) -> AsyncIterator[Dict[str, str]]:
+        """Yield the key and ``updated`` time of every matching issue, one dict per page."""
+        async for page in self._search_pages(jql, page_size, ["updated"], budget):
+            yield {issue["key"]: issue["fields"]["updated"] for issue in page}
+
+    async def _search_pages(
+        self,
+        jql: str,
+        page_size: int,
+        fields: Sequence[str],
+        budget: Optional[RetryBudget] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield the raw issues of each search page (startAt, or nextPageToken on Cloud)."""
+        cloud = await self.is_cloud()
+        params: Dict[str, Any] = {"jql": jql, "maxResults": page_size, "fields": ",".join(fields)}
+        start = 0
+        while True:
+            if cloud:
+                page = await self._request("GET", "search/jql", budget=budget, params=params)
+            else:
+                params["startAt"] = start
+                page = await self._request("GET", "search", budget=budget, params=params)
+
+            issues = page.get("issues", [])
+            if issues:
+                yield issues
+            start += len(issues)
+            if cloud:
+                if not page.get("nextPageToken"):
+                    return
+                params["nextPageToken"] = page["nextPageToken"]
+            elif not issues or start >= page.get("total", 0):
+                return
+
+    async def get_issue(self, issue_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a specific issue by key.
+
+        Returns:
+            Issue dictionary or None if not found
+
+        Raises:
+            httpx.TransportError: If Jira can't be reached
+        """
+        try:
+            raw = await self._request(
+                "GET", f"issue/{issue_key}", params={"fields": ",".join(self.fields)}
+            )
+        except JIRAError:
+            return None
+        return format_issue(raw, self.fields)
+
+    async def get_issue_updated(self, issue_key: str) -> Optional[str]:
+        """
+        Get only the ``updated`` timestamp of an issue (None if not found).
+
+        Raises:
+            httpx.TransportError: If Jira can't be reached
+        """
+        try:
+            raw = await self._request("GET", f"issue/{issue_key}", params={"fields": "updated"})
+        except JIRAError:
+            return None
+        return raw["fields"]["updated"]
+
+    async def transition_to(self, issue_key: str, status: str) -> bool:
+        """
+        Move an issue to a status (see ``JiraClient.transition_to``).
+
+        Returns:
+            True if the issue is now in the status, False if no transition
+            leads there
+
+        Raises:
+            JIRAError: If a request fails
+        """
+        raw = await self._request(
+            "GET", f"issue/{issue_key}", params={"fields": "status,issuetype,project"}
+        )
+        fields = raw["fields"]
+        current = fields["status"]["name"]
+        if current.lower() == status.lower():
+            return True
+
+        cache_key = (fields["project"]["key"], fields["issuetype"]["name"], current.lower())
+        transitions = self._transition_ids.get(cache_key)
+        if transitions is None:
+            transitions = {}
+            found = await self._request("GET", f"issue/{issue_key}/transitions")
+            for transition in found.get("transitions", []):
+                transitions.setdefault(transition["name"].lower(), transition["id"])
+                target = (transition.get("to") or {}).get("name")
+                if target:
+                    transitions.setdefault(target.lower(), transition["id"])
+            self._transition_ids[cache_key] = transitions
+
+        transition_id = transitions.get(status.lower())
+        if transition_id is None:
+            return False
+        try:
+            await self._request(
+                "POST",
+                f"issue/{issue_key}/transitions",
+                idempotent=False,
+                json={"transition": {"id": transition_id}},
+            )
+        except JIRAError:
+            # The workflow may have changed; look the transitions up again next time
+            self._transition_ids.pop(cache_key, None)
+            raise
+        return True
+
+    async def post_comment(self, issue_key: str, body: str, skip_if_present: bool = False) -> None:
+        """
+        Add a comment to an issue (see ``JiraClient.post_comment``).
+
+        Raises:
+            JIRAError: If a request fails
+        """
+        path = f"issue/{issue_key}/comment"
+        if skip_if_present:
+            found = await self._request("GET", path)
+            if any(comment.get("body") == body for comment in found.get("comments", [])):
+                return
+        await self._request("POST", path, idempotent=False, json={"body": body})
+
+
+def _env_rate_limit() -> float:
+    """Starting rate from JIRA_RATE_LIMIT, as ``JiraClient`` reads it."""
+    return float(os.getenv("JIRA_RATE_LIMIT") or DEFAULT_RATE_LIMIT)
+
+
+def _response_error(response: httpx.Response) -> Optional[JIRAError]:
+    """The JIRAError for an error response (None for success), as the jira library raises."""
+    if response.status_code < 400:
+        return None
+    try:
+        messages = response.json().get("errorMessages") or []
+    except ValueError:
+        messages = []
+    return JIRAError(
+        text="; ".join(messages) or response.text,
+        status_code=response.status_code,
+        url=str(response.url),
+        response=response,
+    )
+
+
+# Clients per event loop (httpx connections belong to the loop that opened
+# them), then per set of credentials
+_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+def get_async_jira_client() -> AsyncJiraClient:
+    """
+    Get the shared async Jira client for the running event loop.
+
+    Like ``get_jira_client``, the client and its connection pool are created
+    on first use and reused by every later tool call on the same loop.
+    Must be called from a coroutine.
+
+    Raises:
+        ValueError: If Jira credentials are not configured
+    """
+    loop = asyncio.get_running_loop()
+    key = (os.getenv("JIRA_SERVER"), os.getenv("JIRA_EMAIL"), os.getenv("JIRA_API_TOKEN"))
+    with _clients_lock:
+        clients = _clients.setdefault(loop, {})
+        if key not in clients:
+            clients[key] = AsyncJiraClient(*key)
+        return clients[key]
@@ -0,0 +1,158 @@
+"""Cached Jira issue lookups backed by the local ``jira_issues`` snapshots.
+
+Every sync stores the formatted issues it fetched, and single-issue lookups
+store what they fetch too. A lookup serves the snapshot while it is younger
+than ``max_age``. An older snapshot is revalidated by fetching only the
+issue's ``updated`` field: if that hasn't moved, the snapshot is marked
+fresh and served without downloading the whole issue again.
+
+In offline mode, or when Jira can't be reached, lookups serve whatever
+snapshot exists, however old, and say how old it is.
+
+``get_issue_async`` does the same with an ``AsyncJiraClient``, for the MCP
+server's event loop.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from ..db.models import JiraIssue
+from ..db.operations import JiraIssueOps
+from .jira_async import get_async_jira_client
+from .jira_client import get_jira_client, parse_jira_datetime
+
+# How long a snapshot is served without checking Jira
+DEFAULT_MAX_AGE = timedelta(minutes=15)
+
+# Where a lookup's issue came from
+SOURCE_CACHE = "cache"  # Fresh snapshot, Jira not contacted
+SOURCE_REVALIDATED = "revalidated"  # Snapshot confirmed unchanged by Jira
+SOURCE_JIRA = "jira"  # Fetched from Jira (and stored)
+SOURCE_STALE = "stale"  # Old snapshot served offline or because Jira failed
+
+
+@dataclass
+class CachedIssue:
+    """Result of a cached issue lookup."""
+
+    issue: Optional[Dict[str, Any]]  # Formatted issue (None if not found)
+    source: str
+    fetched_at: Optional[datetime] = None  # When the snapshot was last confirmed (UTC)
+    error: Optional[str] = None  # Why Jira couldn't be used, for stale results
+
+    @property
+    def age(self) -> Optional[timedelta]:
+        """How old the served snapshot is."""
+        if self.fetched_at is None:
+            return None
+        return datetime.utcnow() - self.fetched_at
+
+
+def get_issue(
+    session: Session,
+    issue_key: str,
+    max_age: timedelta = DEFAULT_MAX_AGE,
+    offline: bool = False,
+    client_factory: Callable[[], Any] = get_jira_client,
+) -> CachedIssue:
+    """
+    Look up an issue, preferring the local snapshot.
+
+    Args:
+        session: Database session
+        issue_key: Issue key (e.g., 'PROJ-123')
+        max_age: Serve snapshots younger than this without asking Jira
+        offline: Never contact Jira
+        client_factory: Returns the Jira client (only called when needed)
+
+    Returns:
+        The issue and where it came from
+
+    Raises:
+        ValueError: If Jira isn't configured and there is no snapshot
+        requests.RequestException: If Jira can't be reached and there is no
+            snapshot
+    """
+    issue_key = issue_key.upper()
+    snapshot = JiraIssueOps.get(session, issue_key)
+    local = _local_lookup(snapshot, max_age, offline)
+    if local is not None:
+        return local
+
+    try:
+        client = client_factory()
+        if snapshot is not None and snapshot.updated is not None:
+            updated = parse_jira_datetime(client.get_issue_updated(issue_key))
+            if updated == snapshot.updated:
+                return _revalidated(session, snapshot)
+        issue = client.get_issue(issue_key)
+    except Exception as e:
+        if snapshot is None:
+            raise
+        return CachedIssue(snapshot.issue, SOURCE_STALE, snapshot.fetched_at, error=str(e))
+    return _fetched(session, issue)
+
+
+async def get_issue_async(
+    session: Session,
+    issue_key: str,
+    max_age: timedelta = DEFAULT_MAX_AGE,
+    offline: bool = False,
+    client_factory: Callable[[], Any] = get_async_jira_client,
+) -> CachedIssue:
+    """
+    Look up an issue like ``get_issue``, with an ``AsyncJiraClient``.
+
+    Raises:
+        ValueError: If Jira isn't configured and there is no snapshot
+        httpx.TransportError: If Jira can't be reached and there is no
+            snapshot
+    """
+    issue_key = issue_key.upper()
+    snapshot = JiraIssueOps.get(session, issue_key)
+    local = _local_lookup(snapshot, max_age, offline)
+    if local is not None:
+        return local
+
+    try:
+        client = client_factory()
+        if snapshot is not None and snapshot.updated is not None:
+            updated = parse_jira_datetime(await client.get_issue_updated(issue_key))
+            if updated == snapshot.updated:
+                return _revalidated(session, snapshot)
+        issue = await client.get_issue(issue_key)
+    except Exception as e:
+        if snapshot is None:
+            raise
+        return CachedIssue(snapshot.issue, SOURCE_STALE, snapshot.fetched_at, error=str(e))
+    return _fetched(session, issue)
+
+
+def _local_lookup(
+    snapshot: Optional[JiraIssue], max_age: timedelta, offline: bool
+) -> Optional[CachedIssue]:
+    """The result if the snapshot alone answers the lookup, else None."""
+    if snapshot is not None and datetime.utcnow() - snapshot.fetched_at < max_age:
+        return CachedIssue(snapshot.issue, SOURCE_CACHE, snapshot.fetched_at)
+    if offline:
+        if snapshot is None:
+            return CachedIssue(None, SOURCE_STALE, error="offline and not cached")
+        return CachedIssue(snapshot.issue, SOURCE_STALE, snapshot.fetched_at)
+    return None
+
+
+def _revalidated(session: Session, snapshot: JiraIssue) -> CachedIssue:
+    """Mark a snapshot Jira confirmed unchanged as fresh."""
+    JiraIssueOps.mark_fresh(session, snapshot.key)
+    return CachedIssue(snapshot.issue, SOURCE_REVALIDATED, datetime.utcnow())
+
+
+def _fetched(session: Session, issue: Optional[Dict[str, Any]]) -> CachedIssue:
+    """Store an issue fetched from Jira."""
+    if issue is None:
+        return CachedIssue(None, SOURCE_JIRA)
+    JiraIssueOps.upsert_many(session, [issue])
+    return CachedIssue(issue, SOURCE_JIRA, datetime.utcnow())
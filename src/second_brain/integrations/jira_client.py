@@ -1,9 +1,49 @@
 """Jira integration client."""
 
 import os
-from typing import Optional, List, Dict, Any
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Iterator, Sequence, Tuple, Union
+from zoneinfo import ZoneInfo
 from jira import JIRA
 from jira.exceptions import JIRAError
+import requests
+from requests.adapters import HTTPAdapter
+
+from .jira_ratelimit import (
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_RATE_LIMIT,
+    RequestStats,
+    RetryBudget,
+    TokenBucket,
+    backoff_delay,
+    retry_reason,
+)
+
+# Issues requested per search call when paging through results
+DEFAULT_PAGE_SIZE = 100
+
+# Issues requested per probe call (only keys and updated times are returned)
+PROBE_PAGE_SIZE = 1000
+
+# Issue fields requested by default: what _format_issue reads
+ISSUE_FIELDS = (
+    "summary",
+    "description",
+    "status",
+    "priority",
+    "assignee",
+    "reporter",
+    "created",
+    "updated",
+    "project",
+    "issuetype",
+    "labels",
+)
+
+# Requests allowed in flight to the Jira host at once (also the connection pool size)
+DEFAULT_MAX_CONCURRENCY = 4
 
 
 class JiraClient:
@@ -14,6 +54,10 @@ class JiraClient:
         server: Optional[str] = None,
         email: Optional[str] = None,
         api_token: Optional[str] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        fields: Optional[Sequence[str]] = None,
+        rate_limit: Optional[float] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
     ):
         """
         Initialize Jira client.
@@ -22,28 +66,113 @@ class JiraClient:
             server: Jira server URL (e.g., https://company.atlassian.net)
             email: User email for authentication
             api_token: API token for authentication
+            max_concurrency: Searches allowed in flight at once; the HTTP
+                connection pool keeps this many connections open
+            fields: Issue fields to request (defaults to ISSUE_FIELDS, or
+                the comma-separated JIRA_FIELDS environment variable). Fields
+                outside ISSUE_FIELDS are returned under "extra_fields"
+            rate_limit: Requests per second to start from (defaults to the
+                JIRA_RATE_LIMIT environment variable or DEFAULT_RATE_LIMIT);
+                lowered automatically while Jira answers 429
+            max_retries: Retries of a throttled or failed request
 
         If not provided, will attempt to read from environment variables:
         - JIRA_SERVER
         - JIRA_EMAIL
         - JIRA_API_TOKEN
         """
-        self.server = server or os.getenv("JIRA_SERVER")
-        self.email = email or os.getenv("JIRA_EMAIL")
-        self.api_token = api_token or os.getenv("JIRA_API_TOKEN")
+        self.server, self.email, self.api_token = jira_credentials(server, email, api_token)
 
-        if not all([self.server, self.email, self.api_token]):
-            raise ValueError(
-                "Jira credentials not provided. Set JIRA_SERVER, JIRA_EMAIL, "
-                "and JIRA_API_TOKEN environment variables or pass them to the constructor."
-            )
+        # Retries are handled by _call, so the library's own are turned off
+        self.client = JIRA(
+            server=self.server, basic_auth=(self.email, self.api_token), max_retries=0
+        )
+        self._timezone: Optional[ZoneInfo] = None
+
+        self.fields = issue_fields(fields)
+
+        # One keep-alive pool sized for the concurrency limit, shared by all threads
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.client._session.mount("https://", adapter)
+        self.client._session.mount("http://", adapter)
+        self._request_slots = threading.BoundedSemaphore(max_concurrency)
+
+        self._bucket = TokenBucket(
+            rate_limit or float(os.getenv("JIRA_RATE_LIMIT") or DEFAULT_RATE_LIMIT)
+        )
+        self.max_retries = max_retries
+        self.stats = RequestStats()  # Totals for the client's lifetime
+        self._stats_lock = threading.Lock()
+
+        # (project key, issue type, current status) -> target name -> transition id
+        self._transition_ids: Dict[Tuple[str, str, str], Dict[str, str]] = {}
 
-        self.client = JIRA(server=self.server, basic_auth=(self.email, self.api_token))
+    def _call(
+        self,
+        func,
+        *args,
+        budget: Optional[RetryBudget] = None,
+        idempotent: bool = True,
+        **kwargs,
+    ):
+        """
+        Call the Jira API under the rate limit, retrying transient failures.
+
+        429, 502/503/504 responses and dropped connections are retried with
+        backoff (at least as long as Retry-After asks). Writes are only
+        retried after 429 or 503, when Jira certainly didn't apply them.
+        Backoff sleeps happen outside the concurrency slot.
+
+        Args:
+            func: Bound method of the underlying ``JIRA`` client
+            budget: Retry budget of the sync run making the call
+            idempotent: Whether the call is safe to repeat after a lost response
+
+        Raises:
+            JIRAError: If the request fails for good
+            requests.RequestException: If Jira can't be reached
+        """
+        attempt = 0
+        while True:
+            waited = self._bucket.acquire()
+            with self._request_slots:
+                try:
+                    result, error = func(*args, **kwargs), None
+                except (JIRAError, requests.RequestException) as e:
+                    result, error = None, e
+            self._record(budget, requests=1, seconds=waited)
+            if error is None:
+                self._bucket.succeeded()
+                return result
+
+            reason = retry_reason(error)
+            if reason is None:
+                raise error
+            throttled, retry_after = reason
+            if throttled:
+                self._bucket.throttled(retry_after)
+                self._record(budget, throttled=1)
+            elif not idempotent and getattr(error, "status_code", None) != 503:
+                raise error
+            if attempt >= self.max_retries or (budget is not None and not budget.spend()):
+                raise error
+
+            delay = backoff_delay(attempt, retry_after)
+            self._record(budget, retries=1, seconds=delay)
+            time.sleep(delay)
+            attempt += 1
+
+    def _record(self, budget: Optional[RetryBudget], **counts) -> None:
+        """Add to the client's stats and the run's budget."""
+        with self._stats_lock:
+            self.stats.add(**counts)
+        if budget is not None:
+            budget.record(**counts)
 
     def test_connection(self) -> bool:
         """Test if the Jira connection is working."""
         try:
-            self.client.myself()
+            self._call(self.client.myself)
             return True
         except JIRAError:
             return False
@@ -69,12 +198,131 @@ class JiraClient:
         jql += " ORDER BY updated DESC"
 
         try:
-            issues = self.client.search_issues(jql, maxResults=max_results)
+            issues = self._call(
+                self.client.search_issues, jql, maxResults=max_results, fields=list(self.fields)
+            )
             return [self._format_issue(issue) for issue in issues]
         except JIRAError as e:
             print(f"Error fetching issues: {e}")
             return []
 
+    def iter_issue_pages(
+        self, jql: str, page_size: int = DEFAULT_PAGE_SIZE, budget: Optional[RetryBudget] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield every issue matching a JQL query, one page at a time.
+
+        Pages with ``startAt`` on Jira Server/Data Center. Jira Cloud's
+        search API no longer accepts offsets, so there the ``nextPageToken``
+        of each page is followed instead. Safe to call from several threads;
+        at most ``max_concurrency`` requests run at once.
+
+        Args:
+            jql: JQL query (should include an ORDER BY for stable paging)
+            page_size: Issues per request
+            budget: Retry budget of the sync run
+
+        Yields:
+            Lists of issue dictionaries
+
+        Raises:
+            JIRAError: If a request fails (after any retries)
+        """
+        for page in self._search_pages(jql, page_size, self.fields, budget=budget):
+            yield [self._format_issue(issue) for issue in page]
+
+    def iter_issue_updates(
+        self, jql: str, page_size: int = PROBE_PAGE_SIZE, budget: Optional[RetryBudget] = None
+    ) -> Iterator[Dict[str, str]]:
+        """
+        Yield the key and ``updated`` time of every issue matching a JQL query.
+
+        A lightweight probe for change detection: only the ``updated``
+        field is requested and pages are read as plain JSON without
+        building issue objects, so large result sets cost a fraction of a
+        full search.
+
+        Args:
+            jql: JQL query (should include an ORDER BY for stable paging)
+            page_size: Issues per request
+            budget: Retry budget of the sync run
+
+        Yields:
+            Dictionaries of issue key to Jira ``updated`` timestamp, one per page
+
+        Raises:
+            JIRAError: If a request fails (after any retries)
+        """
+        pages = self._search_pages(jql, page_size, ["updated"], json_result=True, budget=budget)
+        for page in pages:
+            yield {issue["key"]: issue["fields"]["updated"] for issue in page}
+
+    def _search_pages(
+        self,
+        jql: str,
+        page_size: int,
+        fields: Sequence[str],
+        json_result: bool = False,
+        budget: Optional[RetryBudget] = None,
+    ) -> Iterator[List[Any]]:
+        """Yield the issues of each search page (Issue objects, or dicts for JSON)."""
+        cloud = getattr(self.client, "_is_cloud", False)
+        token = None
+        start = 0
+        while True:
+            # The jira library rewrites field lists in place, so pass a copy
+            if cloud:
+                page = self._call(
+                    self.client.enhanced_search_issues,
+                    jql,
+                    nextPageToken=token,
+                    maxResults=page_size,
+                    fields=list(fields),
+                    json_result=json_result,
+                    budget=budget,
+                )
+            else:
+                page = self._call(
+                    self.client.search_issues,
+                    jql,
+                    startAt=start,
+                    maxResults=page_size,
+                    fields=list(fields),
+                    json_result=json_result,
+                    budget=budget,
+                )
+
+            if json_result:
+                issues = page.get("issues", [])
+                token = page.get("nextPageToken")
+                total = page.get("total", 0)
+            else:
+                issues = page
+                token = page.nextPageToken
+                total = page.total
+
+            if issues:
+                yield issues
+            start += len(issues)
+            if cloud and not token:
+                return
+            if not cloud and (not issues or start >= total):
+                return
+
+    def get_timezone(self) -> ZoneInfo:
+        """
+        Get the timezone Jira uses to interpret dates in JQL.
+
+        JQL dates are read in the authenticated user's profile timezone;
+        falls back to UTC if it can't be determined.
+        """
+        if self._timezone is None:
+            try:
+                self._timezone = ZoneInfo(self._call(self.client.myself).get("timeZone") or "UTC")
+            except Exception:
+                self._timezone = ZoneInfo("UTC")
+        return self._timezone
+
     def get_assigned_issues(
         self, assignee: Optional[str] = None, status: Optional[str] = None, max_results: int = 50
     ) -> List[Dict[str, Any]]:
@@ -101,7 +349,9 @@ class JiraClient:
         jql += " ORDER BY updated DESC"
 
         try:
-            issues = self.client.search_issues(jql, maxResults=max_results)
+            issues = self._call(
+                self.client.search_issues, jql, maxResults=max_results, fields=list(self.fields)
+            )
             return [self._format_issue(issue) for issue in issues]
         except JIRAError as e:
             print(f"Error fetching assigned issues: {e}")
@@ -118,28 +368,101 @@ class JiraClient:
             Issue dictionary or None if not found
         """
         try:
-            issue = self.client.issue(issue_key)
+            issue = self._call(self.client.issue, issue_key, fields=",".join(self.fields))
             return self._format_issue(issue)
         except JIRAError:
             return None
 
+    def get_issue_updated(self, issue_key: str) -> Optional[str]:
+        """
+        Get only the ``updated`` timestamp of an issue.
+
+        A cheap check of whether a cached copy of the issue is still current.
+
+        Args:
+            issue_key: Issue key (e.g., 'PROJ-123')
+
+        Returns:
+            Jira ``updated`` timestamp, or None if the issue wasn't found
+
+        Raises:
+            requests.RequestException: If Jira can't be reached
+        """
+        try:
+            issue = self._call(self.client.issue, issue_key, fields="updated")
+        except JIRAError:
+            return None
+        return issue.fields.updated
+
     def _format_issue(self, issue) -> Dict[str, Any]:
-        """Format a Jira issue into a dictionary."""
-        return {
-            "key": issue.key,
-            "id": issue.id,
-            "summary": issue.fields.summary,
-            "description": issue.fields.description or "",
-            "status": issue.fields.status.name,
-            "priority": issue.fields.priority.name if issue.fields.priority else None,
-            "assignee": issue.fields.assignee.displayName if issue.fields.assignee else None,
-            "reporter": issue.fields.reporter.displayName if issue.fields.reporter else None,
-            "created": issue.fields.created,
-            "updated": issue.fields.updated,
-            "project_key": issue.fields.project.key,
-            "issue_type": issue.fields.issuetype.name,
-            "labels": issue.fields.labels if hasattr(issue.fields, "labels") else [],
-        }
+        """Format a Jira issue into a dictionary (see ``format_issue``)."""
+        return format_issue(issue.raw, self.fields)
+
+    def transition_to(self, issue_key: str, status: str) -> bool:
+        """
+        Move an issue to a status.
+
+        Transitions depend on the workflow, so the available ones are cached
+        per (project, issue type, current status) and most calls only cost
+        a small issue read and the transition itself. An issue that is
+        already in the status counts as moved, which makes retries safe.
+
+        Args:
+            issue_key: Issue key
+            status: Target status (or transition) name
+
+        Returns:
+            True if the issue is now in the status, False if no transition
+            leads there
+
+        Raises:
+            JIRAError: If a request fails
+        """
+        issue = self._call(self.client.issue, issue_key, fields="status,issuetype,project")
+        current = issue.fields.status.name
+        if current.lower() == status.lower():
+            return True
+
+        cache_key = (issue.fields.project.key, issue.fields.issuetype.name, current.lower())
+        transitions = self._transition_ids.get(cache_key)
+        if transitions is None:
+            transitions = {}
+            for transition in self._call(self.client.transitions, issue):
+                transitions.setdefault(transition["name"].lower(), transition["id"])
+                target = (transition.get("to") or {}).get("name")
+                if target:
+                    transitions.setdefault(target.lower(), transition["id"])
+            self._transition_ids[cache_key] = transitions
+
+        transition_id = transitions.get(status.lower())
+        if transition_id is None:
+            return False
+        try:
+            self._call(self.client.transition_issue, issue, transition_id, idempotent=False)
+        except JIRAError:
+            # The workflow may have changed; look the transitions up again next time
+            self._transition_ids.pop(cache_key, None)
+            raise
+        return True
+
+    def post_comment(self, issue_key: str, body: str, skip_if_present: bool = False) -> None:
+        """
+        Add a comment to an issue.
+
+        Args:
+            issue_key: Issue key
+            body: Comment text
+            skip_if_present: Don't post if the issue already has a comment
+                with this text (for retrying a post whose response was lost)
+
+        Raises:
+            JIRAError: If a request fails
+        """
+        if skip_if_present:
+            comments = self._call(self.client.comments, issue_key)
+            if any(comment.body == body for comment in comments):
+                return
+        self._call(self.client.add_comment, issue_key, body, idempotent=False)
 
     def update_issue_status(self, issue_key: str, status: str) -> bool:
         """
@@ -155,15 +478,8 @@ class JiraClient:
             True if successful
         """
         try:
-            issue = self.client.issue(issue_key)
-            transitions = self.client.transitions(issue)
-
-            # Find the transition that matches the target status
-            for transition in transitions:
-                if transition["name"].lower() == status.lower():
-                    self.client.transition_issue(issue, transition["id"])
-                    return True
-
+            if self.transition_to(issue_key, status):
+                return True
             print(f"No valid transition found to status: {status}")
             return False
         except JIRAError as e:
@@ -182,8 +498,135 @@ class JiraClient:
             True if successful
         """
         try:
-            self.client.add_comment(issue_key, comment)
+            self.post_comment(issue_key, comment)
             return True
         except JIRAError as e:
             print(f"Error adding comment: {e}")
             return False
+
+
+def jira_credentials(
+    server: Optional[str] = None, email: Optional[str] = None, api_token: Optional[str] = None
+) -> Tuple[str, str, str]:
+    """
+    Resolve Jira credentials, falling back to the environment.
+
+    Raises:
+        ValueError: If any of the server, email or token is missing
+    """
+    server = server or os.getenv("JIRA_SERVER")
+    email = email or os.getenv("JIRA_EMAIL")
+    api_token = api_token or os.getenv("JIRA_API_TOKEN")
+    if not all([server, email, api_token]):
+        raise ValueError(
+            "Jira credentials not provided. Set JIRA_SERVER, JIRA_EMAIL, "
+            "and JIRA_API_TOKEN environment variables or pass them to the constructor."
+        )
+    return server, email, api_token
+
+
+def issue_fields(fields: Optional[Sequence[str]] = None) -> List[str]:
+    """Issue fields to request: ``fields``, else JIRA_FIELDS, else ISSUE_FIELDS."""
+    env_fields = os.getenv("JIRA_FIELDS")
+    if fields is None and env_fields:
+        fields = [field.strip() for field in env_fields.split(",") if field.strip()]
+    return list(fields or ISSUE_FIELDS)
+
+
+def format_issue(raw: Dict[str, Any], fields: Sequence[str] = ISSUE_FIELDS) -> Dict[str, Any]:
+    """Format an issue's JSON into a dictionary.
+
+    Fields that weren't requested are None (empty for labels and
+    description); requested fields outside ISSUE_FIELDS are passed
+    through as raw JSON under "extra_fields".
+
+    Args:
+        raw: Issue JSON as returned by the REST API
+        fields: Fields that were requested
+    """
+    values = raw.get("fields") or {}
+
+    def name_of(name, attribute="name"):
+        value = values.get(name)
+        return value.get(attribute) if value else None
+
+    return {
+        "key": raw["key"],
+        "id": raw["id"],
+        "summary": values.get("summary"),
+        "description": values.get("description") or "",
+        "status": name_of("status"),
+        "priority": name_of("priority"),
+        "assignee": name_of("assignee", "displayName"),
+        "reporter": name_of("reporter", "displayName"),
+        "created": values.get("created"),
+        "updated": values.get("updated"),
+        "project_key": name_of("project", "key"),
+        "issue_type": name_of("issuetype"),
+        "labels": values.get("labels") or [],
+        "extra_fields": {name: values.get(name) for name in fields if name not in ISSUE_FIELDS},
+    }
+
+
+# One client per set of credentials, shared by every caller in this process
+_clients: Dict[Tuple[Optional[str], ...], JiraClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_jira_client() -> JiraClient:
+    """
+    Get the process-wide Jira client for the credentials in the environment.
+
+    The client (and its HTTP connection pool) is created on first use and
+    reused by every later sync or lookup in this process.
+
+    Raises:
+        ValueError: If Jira credentials are not configured
+    """
+    key = (os.getenv("JIRA_SERVER"), os.getenv("JIRA_EMAIL"), os.getenv("JIRA_API_TOKEN"))
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = JiraClient(*key)
+        return _clients[key]
+
+
+def project_issues_jql(
+    project_key: Union[str, Sequence[str]],
+    status: Optional[str] = None,
+    updated_since: Optional[datetime] = None,
+    tz: Optional[ZoneInfo] = None,
+) -> str:
+    """
+    Build the JQL for one or more projects' issues, ordered for stable paging.
+
+    Issues are ordered by creation, which edits don't change, so an issue
+    edited while the search is paged through keeps its position.
+
+    Args:
+        project_key: Jira project key, or several keys for one combined query
+        status: Only issues in this status
+        updated_since: Only issues updated at or after this naive UTC time
+            (JQL has minute precision, so this is rounded down)
+        tz: Timezone Jira reads JQL dates in (defaults to UTC)
+
+    Returns:
+        JQL string
+    """
+    if isinstance(project_key, str):
+        jql = f'project = "{project_key}"'
+    else:
+        jql = "project in ({})".format(", ".join(f'"{key}"' for key in project_key))
+    if status:
+        jql += f" AND status = '{status}'"
+    if updated_since is not None:
+        since = updated_since.replace(tzinfo=timezone.utc).astimezone(tz or timezone.utc)
+        jql += f' AND updated >= "{since.strftime("%Y/%m/%d %H:%M")}"'
+    return jql + " ORDER BY created ASC, key ASC"
+
+
+def parse_jira_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse a Jira timestamp (e.g. ``2024-05-01T10:22:33.000+0000``) to naive UTC."""
+    if not value:
+        return None
+    parsed = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z")
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,338 @@
+"""Outbound queue for Jira changes.
+
+Changes meant for Jira (status transitions of linked tasks, comments) are
+written to the ``jira_outbox`` table when the local change is made, so a
+local update never waits on Jira and nothing is lost while Jira is slow or
+unreachable. The queue is drained in batches: before each
+sync, by ``sb jira push``, and by a background thread in the MCP server.
+
+Items for one issue are sent in order. If one has to wait for a retry, the
+issue's later items wait with it. Transient failures (rate limiting, Jira
+unavailable, no connection) are retried with exponential backoff, up to
+``MAX_ATTEMPTS`` times. Other failures, such as a status with no
+transition leading to it, are marked failed with the error.
+
+Each item is claimed (moved to ``sending``) before it is sent, so drainers
+running at the same time, in this process or another, never send the same
+item twice.
+
+Retries are idempotent. A transition to the status the issue already has
+is a no-op. A comment is re-posted only if the issue doesn't have it yet.
+"""
+
+import sys
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Set
+
+import requests
+from sqlalchemy.orm import Session
+
+from ..config import get_config
+from ..db.models import JiraOutboxItem, Task, get_session
+from ..db.operations import JiraOutboxOps
+from .jira_ratelimit import backoff_delay, retry_reason
+
+# Items read per batch while draining
+OUTBOX_BATCH_SIZE = 50
+
+# Sends attempted before an item is marked failed
+MAX_ATTEMPTS = 8
+
+# Delay before the first retry, doubling per attempt up to OUTBOX_RETRY_MAX (seconds)
+OUTBOX_RETRY_BASE = 30.0
+OUTBOX_RETRY_MAX = 3600.0
+
+# How long a drainer owns a claimed item; one left ``sending`` by a drainer that
+# died is sent again afterwards
+CLAIM_LEASE = timedelta(minutes=5)
+
+# Seconds between background drains (queueing a change wakes the drainer early)
+DRAIN_INTERVAL = 60.0
+
+# Local task status -> Jira status name
+JIRA_STATUS_NAMES = {
+    "todo": "To Do",
+    "in_progress": "In Progress",
+    "done": "Done",
+    "blocked": "Blocked",
+}
+
+
+class OutboxError(Exception):
+    """An outbox item that can't be sent, however often it's retried."""
+
+
+@dataclass
+class DrainResult:
+    """Outcome of draining the outbox."""
+
+    sent: int = 0
+    deferred: int = 0  # Will be retried later
+    failed: int = 0
+
+
+def queue_status_push(session: Session, task: Task, commit: bool = True) -> bool:
+    """
+    Queue a transition of a task's Jira issue to the task's status.
+
+    Only queued when pushing is enabled (``jira.push_status`` in the user
+    config) and the task is linked to an issue.
+
+    Returns:
+        True if a transition was queued
+    """
+    if not task.jira_ticket_key or not get_config().get_jira_config()["push_status"]:
+        return False
+    status = JIRA_STATUS_NAMES.get(task.status, task.status)
+    JiraOutboxOps.enqueue(session, task.jira_ticket_key, "transition", {"status": status}, commit)
+    wake_outbox_drainer(session.get_bind())
+    return True
+
+
+def queue_comment(session: Session, issue_key: str, body: str) -> JiraOutboxItem:
+    """Queue a comment on a Jira issue."""
+    item = JiraOutboxOps.enqueue(session, issue_key.upper(), "comment", {"body": body})
+    wake_outbox_drainer(session.get_bind())
+    return item
+
+
+def drain_outbox(
+    session: Session,
+    client,
+    batch_size: int = OUTBOX_BATCH_SIZE,
+    max_attempts: int = MAX_ATTEMPTS,
+) -> DrainResult:
+    """
+    Send every outbox item that is due.
+
+    Args:
+        session: Database session
+        client: JiraClient (or anything with ``transition_to`` and ``post_comment``)
+        batch_size: Items read at a time
+        max_attempts: Sends attempted before an item is marked failed
+
+    Returns:
+        Counts of sent, deferred and failed items
+    """
+    result = DrainResult()
+    now = datetime.utcnow()
+    waiting = JiraOutboxOps.waiting_issues(session, now)  # Issues with an item waiting for a retry
+    after_id = 0
+    while True:
+        batch = JiraOutboxOps.due(session, batch_size, after_id=after_id, now=now)
+        if not batch:
+            return result
+        after_id = batch[-1].id
+
+        for item in batch:
+            if not _claim(session, item, waiting):
+                continue
+            try:
+                _send(client, item)
+                error = None
+            except Exception as e:
+                error = e
+            _settle(item, error, waiting, result, max_attempts)
+        session.commit()
+
+
+async def drain_outbox_async(
+    session: Session,
+    client,
+    batch_size: int = OUTBOX_BATCH_SIZE,
+    max_attempts: int = MAX_ATTEMPTS,
+) -> DrainResult:
+    """Send every outbox item that is due with an ``AsyncJiraClient`` (see ``drain_outbox``)."""
+    result = DrainResult()
+    now = datetime.utcnow()
+    waiting = JiraOutboxOps.waiting_issues(session, now)
+    after_id = 0
+    while True:
+        batch = JiraOutboxOps.due(session, batch_size, after_id=after_id, now=now)
+        if not batch:
+            return result
+        after_id = batch[-1].id
+
+        for item in batch:
+            if not _claim(session, item, waiting):
+                continue
+            try:
+                await _send_async(client, item)
+                error = None
+            except Exception as e:
+                error = e
+            _settle(item, error, waiting, result, max_attempts)
+        session.commit()
+
+
+def _claim(session: Session, item: JiraOutboxItem, waiting: Set[str]) -> bool:
+    """Claim an item unless its issue is waiting; True if it's ours to send."""
+    if item.issue_key in waiting:
+        return False
+    if JiraOutboxOps.claim(session, item, CLAIM_LEASE):
+        return True
+    # Another drainer got it first; the issue's later items wait for it
+    waiting.add(item.issue_key)
+    return False
+
+
+def _settle(
+    item: JiraOutboxItem,
+    error: Optional[Exception],
+    waiting: Set[str],
+    result: DrainResult,
+    max_attempts: int,
+) -> None:
+    """Mark an item sent, deferred for a retry, or failed, after a send attempt."""
+    if error is None:
+        item.state = "sent"
+        item.sent_at = datetime.utcnow()
+        item.last_error = None
+        result.sent += 1
+        return
+
+    item.last_error = str(error) or type(error).__name__
+    reason = _transient(error)
+    if reason is not None and item.attempts < max_attempts:
+        delay = backoff_delay(
+            item.attempts - 1,
+            reason,
+            base=OUTBOX_RETRY_BASE,
+            cap=OUTBOX_RETRY_MAX,
+        )
+        item.state = "pending"
+        item.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+        waiting.add(item.issue_key)
+        result.deferred += 1
+    else:
+        item.state = "failed"
+        result.failed += 1
+
+
+def _send(client, item: JiraOutboxItem) -> None:
+    """Send one item to Jira."""
+    arguments = item.arguments
+    if item.action == "transition":
+        if not client.transition_to(item.issue_key, arguments["status"]):
+            raise OutboxError(f"No transition to '{arguments['status']}'")
+    elif item.action == "comment":
+        client.post_comment(item.issue_key, arguments["body"], skip_if_present=item.attempts > 1)
+    else:
+        raise OutboxError(f"Unknown action '{item.action}'")
+
+
+async def _send_async(client, item: JiraOutboxItem) -> None:
+    """Send one item to Jira with an async client."""
+    arguments = item.arguments
+    if item.action == "transition":
+        if not await client.transition_to(item.issue_key, arguments["status"]):
+            raise OutboxError(f"No transition to '{arguments['status']}'")
+    elif item.action == "comment":
+        await client.post_comment(
+            item.issue_key, arguments["body"], skip_if_present=item.attempts > 1
+        )
+    else:
+        raise OutboxError(f"Unknown action '{item.action}'")
+
+
+def _transient(error: Exception) -> Optional[float]:
+    """Retry-After seconds (0 if none) for failures worth retrying, else None."""
+    if isinstance(error, requests.RequestException):
+        return 0.0
+    reason = retry_reason(error)
+    if reason is None:
+        return None
+    return reason[1] or 0.0
+
+
+class OutboxDrainer:
+    """Background thread that drains the outbox of one database."""
+
+    def __init__(self, engine, interval: float = DRAIN_INTERVAL, client_factory=None):
+        """
+        Initialize the drainer (see ``start_outbox_drainer``).
+
+        Args:
+            engine: Database engine
+            interval: Seconds between drains
+            client_factory: Returns the Jira client (defaults to ``get_jira_client``)
+        """
+        from .jira_client import get_jira_client
+
+        self.engine = engine
+        self.interval = interval
+        self.client_factory = client_factory or get_jira_client
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="jira-outbox", daemon=True)
+
+    def start(self) -> None:
+        """Start draining in the background."""
+        self._thread.start()
+
+    def wake(self) -> None:
+        """Drain now instead of at the next interval."""
+        self._wake.set()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the thread after its current drain."""
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join(timeout)
+
+    def drain(self) -> Optional[DrainResult]:
+        """Drain once; None if nothing was due or Jira isn't configured."""
+        session = get_session(self.engine)
+        try:
+            if not JiraOutboxOps.due(session, 1):
+                return None
+            try:
+                client = self.client_factory()
+            except ValueError:
+                return None
+            return drain_outbox(session, client)
+        finally:
+            session.close()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.drain()
+            except Exception as e:
+                # stdout may carry a protocol stream (the MCP server's stdio)
+                print(f"Error draining Jira outbox: {e}", file=sys.stderr)
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+
+# One drainer per database, started by long-running processes
+_drainers: Dict[str, OutboxDrainer] = {}
+_drainers_lock = threading.Lock()
+
+
+def start_outbox_drainer(engine, interval: float = DRAIN_INTERVAL) -> OutboxDrainer:
+    """Start the process-wide outbox drainer for a database (idempotent)."""
+    key = str(engine.url)
+    with _drainers_lock:
+        if key not in _drainers:
+            _drainers[key] = OutboxDrainer(engine, interval)
+            _drainers[key].start()
+        return _drainers[key]
+
+
+def stop_outbox_drainers() -> None:
+    """Stop every running drainer."""
+    with _drainers_lock:
+        drainers = list(_drainers.values())
+        _drainers.clear()
+    for drainer in drainers:
+        drainer.stop()
+
+
+def wake_outbox_drainer(engine) -> None:
+    """Wake the drainer for a database, if this process runs one."""
+    drainer = _drainers.get(str(engine.url))
+    if drainer is not None:
+        drainer.wake()
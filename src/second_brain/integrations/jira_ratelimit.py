@@ -0,0 +1,224 @@
+"""Rate limiting and retries for Jira requests.
+
+Every request the Jira client makes first takes a token from an adaptive
+``TokenBucket``. The bucket starts at ``DEFAULT_RATE_LIMIT`` requests per
+second. It halves its rate whenever Jira answers 429 Too Many Requests and
+grows back by ``RATE_RECOVERY`` of itself for each successful request, so a
+long sync settles just under whatever rate the server tolerates. A Retry-After
+header pauses the whole bucket, which holds back every thread sharing the
+client rather than only the one that was throttled.
+
+Throttled (429), unavailable (502/503/504) and dropped-connection requests
+are retried with exponential backoff and full jitter, waiting at least as
+long as Retry-After asks. A ``RetryBudget`` caps the retries of one sync
+run, so a server that keeps failing fails the run instead of stalling it,
+and records how many requests, retries and seconds of throttling the run
+cost.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+import httpx
+import requests
+from jira.exceptions import JIRAError
+
+# Requests per second allowed before Jira has pushed back
+DEFAULT_RATE_LIMIT = 10.0
+
+# Lowest rate the bucket backs off to
+MIN_RATE_LIMIT = 0.5
+
+# Fraction of the current rate regained after each successful request
+# (about 30 successes recover from the minimum rate to the default)
+RATE_RECOVERY = 0.1
+
+# Retries of a single request before giving up
+DEFAULT_MAX_RETRIES = 5
+
+# Retries allowed across one sync run
+DEFAULT_RETRY_BUDGET = 50
+
+# Backoff before the first retry, doubling per attempt up to BACKOFF_MAX
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+# Responses worth retrying besides 429
+RETRYABLE_STATUS = (502, 503, 504)
+
+
+@dataclass
+class RequestStats:
+    """Counts of requests, retries and time spent throttled."""
+
+    requests: int = 0
+    retries: int = 0
+    throttled: int = 0  # 429 responses
+    throttled_seconds: float = 0.0  # Time spent waiting for the bucket or backing off
+
+    def add(self, requests: int = 0, retries: int = 0, throttled: int = 0, seconds: float = 0.0):
+        """Add to the counters (callers hold the owner's lock)."""
+        self.requests += requests
+        self.retries += retries
+        self.throttled += throttled
+        self.throttled_seconds += seconds
+
+
+class TokenBucket:
+    """Thread-safe token bucket whose rate adapts to 429 responses."""
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE_LIMIT,
+        burst: Optional[float] = None,
+        min_rate: float = MIN_RATE_LIMIT,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Requests per second (also the ceiling the rate recovers to)
+            burst: Tokens the bucket holds (defaults to one second's worth)
+            min_rate: Rate the bucket never backs off below
+            clock: Monotonic clock in seconds
+            sleep: Sleep function
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.burst = burst or max(rate, 1.0)
+        self._tokens = self.burst
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take a token, waiting until one is available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return waited
+            self._sleep(wait)
+            waited += wait
+
+    def try_acquire(self) -> float:
+        """
+        Take a token if one is available, without waiting.
+
+        Async callers use this to wait with ``asyncio.sleep`` instead.
+
+        Returns:
+            0 if a token was taken, else seconds to wait before trying again
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if now >= self._paused_until and self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return max(self._paused_until - now, (1 - self._tokens) / self.rate)
+
+    def throttled(self, retry_after: Optional[float] = None) -> None:
+        """Halve the rate, and pause every caller for ``retry_after`` seconds."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._paused_until = max(self._paused_until, self._clock() + retry_after)
+
+    def succeeded(self) -> None:
+        """Recover some of the rate after a successful request."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate * (1 + RATE_RECOVERY))
+
+
+class RetryBudget:
+    """Retries shared by every request of one sync run, with the run's stats."""
+
+    def __init__(self, retries: int = DEFAULT_RETRY_BUDGET):
+        """Initialize with the number of retries the run may spend."""
+        self.remaining = retries
+        self.stats = RequestStats()
+        self._lock = threading.Lock()
+
+    def spend(self) -> bool:
+        """Take one retry; False once the budget is used up."""
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+    def record(self, **counts) -> None:
+        """Add to the run's stats (see ``RequestStats.add``)."""
+        with self._lock:
+            self.stats.add(**counts)
+
+
+def backoff_delay(
+    attempt: int,
+    retry_after: Optional[float] = None,
+    base: float = BACKOFF_BASE,
+    cap: float = BACKOFF_MAX,
+) -> float:
+    """Exponential backoff with full jitter, but never shorter than Retry-After.
+
+    Args:
+        attempt: Retries already made for this request (0 for the first)
+        retry_after: Seconds the server asked to wait
+        base: Backoff before the first retry
+        cap: Longest backoff
+    """
+    delay = random.uniform(0, min(cap, base * 2**attempt))
+    return max(delay, retry_after or 0.0)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta seconds or an HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def retry_reason(error: Exception) -> Optional[tuple]:
+    """
+    Decide whether a failed request should be retried.
+
+    Returns:
+        Tuple of (throttled, Retry-After seconds) if it should, else None
+    """
+    if isinstance(error, (requests.ConnectionError, requests.Timeout, httpx.TransportError)):
+        return False, None
+    if not isinstance(error, JIRAError):
+        return None
+    status = error.status_code
+    if status != 429 and status not in RETRYABLE_STATUS:
+        return None
+    headers = getattr(error.response, "headers", None) or {}
+    return status == 429, parse_retry_after(headers.get("Retry-After"))
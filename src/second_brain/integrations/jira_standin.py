@@ -0,0 +1,471 @@
+"""Local stand-in for the parts of the Jira REST API the client uses.
+
+Serves synthetic projects from memory over HTTP so Jira syncs can be
+tested and benchmarked offline and reproducibly. It implements the Jira
+Server (REST API v2) endpoints the client uses:
+
+- ``GET serverInfo``, ``GET myself`` and ``GET field``
+- ``GET search`` with JQL paging (``startAt``/``maxResults``) and field selection
+- ``GET issue/{key}``
+- ``GET``/``POST issue/{key}/transitions``
+- ``GET``/``POST issue/{key}/comment``
+
+Only the JQL the client generates is understood: ``project = "A"``,
+``project in ("A", "B")``, ``key = "A-1"``, ``status = 'Done'`` and
+``updated >= "yyyy/MM/dd HH:mm"``, joined with AND. Results are always
+ordered by creation.
+
+Latency is added to every request. 429 responses can be injected either
+by a sustained rate limit or at random.
+
+Usage:
+    python -m second_brain.integrations.jira_standin --issues 10000 --port 8080
+
+Then point the client at it:
+    JIRA_SERVER=http://127.0.0.1:8080 JIRA_EMAIL=x JIRA_API_TOKEN=x sb jira sync
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+API_PREFIX = "/rest/api/2/"
+
+# Largest page a search returns, whatever maxResults asks for
+MAX_PAGE_SIZE = 1000
+
+# Workflow of every issue: status -> statuses it can move to
+WORKFLOW = {
+    "To Do": ("In Progress",),
+    "In Progress": ("In Review", "To Do"),
+    "In Review": ("Done", "In Progress"),
+    "Done": ("To Do",),
+}
+
+FIELD_NAMES = (
+    "summary",
+    "description",
+    "status",
+    "priority",
+    "assignee",
+    "reporter",
+    "created",
+    "updated",
+    "project",
+    "issuetype",
+    "labels",
+)
+
+PRIORITIES = ("Highest", "High", "Medium", "Low", "Lowest")
+ISSUE_TYPES = ("Task", "Bug", "Story")
+LABELS = ("backend", "frontend", "infra", "docs", "tech-debt")
+PEOPLE = ("Ada Lovelace", "Grace Hopper", "Alan Turing", "Edsger Dijkstra")
+
+
+def format_jira_datetime(value: datetime) -> str:
+    """Format a naive UTC datetime the way Jira does."""
+    return value.strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+
+
+class JiraStandIn:
+    """In-memory Jira with synthetic issues, served over HTTP."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        rate_limit: Optional[float] = None,
+        throttle_probability: float = 0.0,
+        retry_after: int = 1,
+        seed: int = 0,
+    ):
+        """
+        Initialize an empty stand-in.
+
+        Args:
+            latency: Seconds added to every request
+            rate_limit: Requests per second served before answering 429
+                (None for no limit)
+            throttle_probability: Chance of answering any request with 429
+            retry_after: Retry-After seconds sent with 429 responses
+            seed: Random seed for generated issues and injected 429s
+        """
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.throttle_probability = throttle_probability
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+
+        self.issues: Dict[str, Dict[str, Any]] = {}  # key -> raw issue JSON
+        self.ordered: List[Dict[str, Any]] = []  # issues by creation
+        self.comments: Dict[str, List[Dict[str, Any]]] = {}
+        self.requests: Counter = Counter()  # "METHOD endpoint" -> count
+        self.throttled = 0
+
+        self._lock = threading.Lock()
+        self._version = 0  # Bumped on every change, invalidating cached searches
+        self._searches: Dict[str, tuple] = {}
+        self._tokens = float(rate_limit or 0)
+        self._refilled = time.monotonic()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # Data
+
+    def seed_project(self, project_key: str, count: int, start: Optional[datetime] = None) -> None:
+        """
+        Add ``count`` synthetic issues to a project.
+
+        Issues are created a few minutes apart, ending now, and were last
+        updated somewhere between their creation and now.
+        """
+        now = datetime.utcnow().replace(microsecond=0)
+        start = start or now - timedelta(minutes=5 * count)
+        step = (now - start) / max(count, 1)
+        first = sum(1 for key in self.issues if key.startswith(f"{project_key}-")) + 1
+        statuses = list(WORKFLOW)
+
+        with self._lock:
+            for number in range(first, first + count):
+                created = start + step * (number - first)
+                updated = created + (now - created) * self.random.random()
+                key = f"{project_key}-{number}"
+                issue = {
+                    "id": str(len(self.issues) + 10000),
+                    "key": key,
+                    "fields": {
+                        "summary": f"{project_key} issue {number}",
+                        "description": f"Synthetic issue {number} of project {project_key}.",
+                        "status": {"name": self.random.choice(statuses)},
+                        "priority": {"name": self.random.choice(PRIORITIES)},
+                        "assignee": {"displayName": self.random.choice(PEOPLE)},
+                        "reporter": {"displayName": self.random.choice(PEOPLE)},
+                        "created": format_jira_datetime(created),
+                        "updated": format_jira_datetime(updated),
+                        "project": {"key": project_key, "name": f"Project {project_key}"},
+                        "issuetype": {"name": self.random.choice(ISSUE_TYPES)},
+                        "labels": self.random.sample(LABELS, self.random.randint(0, 2)),
+                    },
+                }
+                self.issues[key] = issue
+                self.ordered.append(issue)
+            self._version += 1
+
+    def touch(self, count: int, project_key: Optional[str] = None) -> List[str]:
+        """
+        Edit ``count`` random issues (new summary, updated now).
+
+        Returns:
+            Keys of the edited issues
+        """
+        with self._lock:
+            candidates = [
+                issue
+                for issue in self.ordered
+                if project_key is None or issue["fields"]["project"]["key"] == project_key
+            ]
+            edited = self.random.sample(candidates, min(count, len(candidates)))
+            now = format_jira_datetime(datetime.utcnow())
+            for issue in edited:
+                issue["fields"]["summary"] += " (edited)"
+                issue["fields"]["updated"] = now
+            self._version += 1
+        return [issue["key"] for issue in edited]
+
+    # Server
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Serve on a background thread.
+
+        Returns:
+            Base URL to use as the Jira server
+        """
+        standin = self
+
+        class Handler(StandInHandler):
+            pass
+
+        Handler.standin = standin
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "JiraStandIn":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # Request handling
+
+    def should_throttle(self) -> bool:
+        """Decide whether the next request gets a 429."""
+        with self._lock:
+            if self.throttle_probability and self.random.random() < self.throttle_probability:
+                self.throttled += 1
+                return True
+            if self.rate_limit:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.rate_limit, self._tokens + (now - self._refilled) * self.rate_limit
+                )
+                self._refilled = now
+                if self._tokens < 1:
+                    self.throttled += 1
+                    return True
+                self._tokens -= 1
+            return False
+
+    def search(self, jql: str, start: int, limit: int, fields: Optional[List[str]]) -> dict:
+        """Run a search and return one page."""
+        with self._lock:
+            cached = self._searches.get(jql)
+            if cached is None or cached[0] != self._version:
+                cached = (self._version, [issue for issue in self.ordered if matches(issue, jql)])
+                self._searches[jql] = cached
+            found = cached[1]
+            limit = min(limit, MAX_PAGE_SIZE)
+            page = [select_fields(issue, fields) for issue in found[start : start + limit]]
+        return {"startAt": start, "maxResults": limit, "total": len(found), "issues": page}
+
+    def transitions(self, key: str) -> List[dict]:
+        """Transitions available from an issue's current status."""
+        status = self.issues[key]["fields"]["status"]["name"]
+        names = list(WORKFLOW)
+        return [
+            {"id": str(11 + names.index(target)), "name": target, "to": {"name": target}}
+            for target in WORKFLOW[status]
+        ]
+
+    def transition(self, key: str, transition_id: str) -> bool:
+        """Apply a transition; False if it isn't available."""
+        with self._lock:
+            target = {t["id"]: t["name"] for t in self.transitions(key)}.get(str(transition_id))
+            if target is None:
+                return False
+            fields = self.issues[key]["fields"]
+            fields["status"] = {"name": target}
+            fields["updated"] = format_jira_datetime(datetime.utcnow())
+            self._version += 1
+            return True
+
+    def add_comment(self, key: str, body: str) -> dict:
+        """Add a comment to an issue."""
+        with self._lock:
+            comments = self.comments.setdefault(key, [])
+            comment = {
+                "id": str(sum(len(c) for c in self.comments.values()) + 1),
+                "body": body,
+                "created": format_jira_datetime(datetime.utcnow()),
+            }
+            comments.append(comment)
+            return comment
+
+
+def select_fields(issue: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Copy of an issue with only the requested fields."""
+    if not fields or "*all" in fields or "*navigable" in fields:
+        return issue
+    return {
+        "id": issue["id"],
+        "key": issue["key"],
+        "fields": {name: issue["fields"][name] for name in fields if name in issue["fields"]},
+    }
+
+
+_CLAUSES = (
+    (re.compile(r'project\s*=\s*"?([\w-]+)"?', re.I), "project"),
+    (re.compile(r"project\s+in\s*\(([^)]*)\)", re.I), "projects"),
+    (re.compile(r'key\s*=\s*"?([\w-]+)"?', re.I), "key"),
+    (re.compile(r"status\s*=\s*['\"]([^'\"]+)['\"]", re.I), "status"),
+    (re.compile(r'updated\s*>=\s*"([^"]+)"', re.I), "updated"),
+)
+
+
+def matches(issue: Dict[str, Any], jql: str) -> bool:
+    """Whether an issue matches the supported subset of JQL."""
+    query = re.split(r"\s+ORDER\s+BY\s+", jql, flags=re.I)[0]
+    fields = issue["fields"]
+    for clause in re.split(r"\s+AND\s+", query, flags=re.I):
+        for pattern, kind in _CLAUSES:
+            found = pattern.fullmatch(clause.strip())
+            if not found:
+                continue
+            value = found.group(1)
+            if kind == "project" and fields["project"]["key"].upper() != value.upper():
+                return False
+            if kind == "projects":
+                keys = {key.strip().strip("\"'").upper() for key in value.split(",")}
+                if fields["project"]["key"].upper() not in keys:
+                    return False
+            if kind == "key" and issue["key"].upper() != value.upper():
+                return False
+            if kind == "status" and fields["status"]["name"].lower() != value.lower():
+                return False
+            if kind == "updated":
+                since = datetime.strptime(value, "%Y/%m/%d %H:%M")
+                updated = datetime.strptime(fields["updated"], "%Y-%m-%dT%H:%M:%S.%f%z")
+                if updated.astimezone(timezone.utc).replace(tzinfo=None) < since:
+                    return False
+            break
+        else:
+            raise ValueError(f"Unsupported JQL clause: {clause}")
+    return True
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """HTTP handler dispatching Jira REST calls to a ``JiraStandIn``."""
+
+    standin: JiraStandIn
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY every
+    # keep-alive response stalls on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):  # noqa: A002 - signature of the base class
+        """Keep the console quiet."""
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def _handle(self, method: str) -> None:
+        url = urlparse(self.path)
+        path = url.path[len(API_PREFIX) :] if url.path.startswith(API_PREFIX) else url.path
+        params = parse_qs(url.query)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+        parts = path.strip("/").split("/")
+        endpoint = "/".join("{key}" if index == 1 else part for index, part in enumerate(parts))
+        standin = self.standin
+        standin.requests[f"{method} {endpoint}"] += 1
+
+        if standin.latency:
+            time.sleep(standin.latency)
+        if standin.should_throttle():
+            self._send(
+                429,
+                {"errorMessages": ["Rate limit exceeded"]},
+                {"Retry-After": str(standin.retry_after)},
+            )
+            return
+
+        try:
+            status, payload = self._route(method, parts, params, body)
+        except ValueError as e:
+            status, payload = 400, {"errorMessages": [str(e)]}
+        self._send(status, payload)
+
+    def _route(self, method: str, parts: List[str], params: dict, body: dict) -> tuple:
+        standin = self.standin
+        if parts == ["serverInfo"]:
+            return 200, {
+                "baseUrl": standin.url,
+                "version": "9.12.0",
+                "versionNumbers": [9, 12, 0],
+                "deploymentType": "Server",
+            }
+        if parts == ["field"]:
+            return 200, [
+                {"id": name, "key": name, "name": name, "clauseNames": [name]}
+                for name in FIELD_NAMES
+            ]
+        if parts == ["myself"]:
+            return 200, {"name": "standin", "displayName": "Stand-in", "timeZone": "UTC"}
+        if parts == ["search"] and method == "GET":
+            fields = [
+                name for value in params.get("fields", []) for name in value.split(",") if name
+            ]
+            return 200, standin.search(
+                params.get("jql", [""])[0],
+                int(params.get("startAt", ["0"])[0]),
+                int(params.get("maxResults", ["50"])[0]),
+                fields or None,
+            )
+        if parts[0] == "issue" and len(parts) >= 2:
+            key = parts[1].upper()
+            if key not in standin.issues:
+                return 404, {"errorMessages": ["Issue does not exist"]}
+            action = parts[2] if len(parts) > 2 else None
+            if action is None and method == "GET":
+                fields = params.get("fields", [""])[0]
+                selected = fields.split(",") if fields else None
+                return 200, select_fields(standin.issues[key], selected)
+            if action == "transitions" and method == "GET":
+                return 200, {"transitions": standin.transitions(key)}
+            if action == "transitions" and method == "POST":
+                if standin.transition(key, body.get("transition", {}).get("id")):
+                    return 204, None
+                return 400, {"errorMessages": ["Transition is not valid"]}
+            if action == "comment" and method == "GET":
+                comments = standin.comments.get(key, [])
+                return 200, {"comments": comments, "total": len(comments)}
+            if action == "comment" and method == "POST":
+                return 201, standin.add_comment(key, body.get("body", ""))
+        return 404, {"errorMessages": [f"Not implemented: {method} {'/'.join(parts)}"]}
+
+    def _send(self, status: int, payload: Any, headers: Optional[dict] = None) -> None:
+        data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument("--projects", default="DEMO", help="Comma-separated project keys")
+    parser.add_argument("--issues", type=int, default=10_000, help="Issues per project")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Latency per request")
+    parser.add_argument("--rate-limit", type=float, help="Requests per second before 429")
+    parser.add_argument("--throttle", type=float, default=0, help="Chance of a random 429")
+    args = parser.parse_args()
+
+    standin = JiraStandIn(
+        latency=args.latency_ms / 1000,
+        rate_limit=args.rate_limit,
+        throttle_probability=args.throttle,
+    )
+    for key in args.projects.split(","):
+        standin.seed_project(key.strip().upper(), args.issues)
+    print(f"Serving {len(standin.issues)} issues on {standin.start(port=args.port)}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        standin.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,449 @@
+"""Incremental Jira to task synchronization.
+
+Each project records a watermark (``Project.jira_last_synced_updated``).
+A sync pages through every issue updated at or after the watermark, or
+through all of the project's issues on the first run or when a full
+resync is requested, and creates or updates the matching tasks.
+
+The new watermark is the latest ``updated`` time seen, but never later
+than the moment the sync started. An issue edited while the sync is paging
+may already have been read in its old state, and capping the watermark
+makes sure the next run fetches it again. Each query also reaches back
+``SYNC_OVERLAP`` before the watermark, which absorbs clock skew and
+JQL's minute precision. Re-reading an issue is harmless.
+
+Several projects are fetched concurrently (or with one combined query)
+and then written on the calling thread. Fetched issues are upserted in
+bulk: the existing tasks for all fetched keys are loaded with a few ``IN``
+queries and diffed in memory. Inserts and updates are batched, and the
+tasks are written in the same transaction as the new watermarks.
+
+All requests of one run share a ``RetryBudget``, so a rate-limited run
+backs off and retries rather than failing, but gives up once the budget
+is spent. The run's request, retry and throttling counts are kept in
+``JiraSyncEngine.stats``.
+
+Queued outbound changes (see ``jira_outbox``) are sent before issues are
+fetched. A task whose status transition still couldn't be sent (deferred
+or failed) keeps its local status, so a pull doesn't overwrite a local
+status change with the old Jira status.
+
+``sync_projects_async`` runs the same sync with an ``AsyncJiraClient``
+(see ``jira_async``), for callers on an event loop such as the MCP server.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from ..db.models import Project, Task
+from ..db.operations import JiraIssueOps, JiraOutboxOps
+from ..utils.datetime_utils import day_key
+from .jira_client import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_PAGE_SIZE,
+    parse_jira_datetime,
+    project_issues_jql,
+)
+from .jira_outbox import drain_outbox, drain_outbox_async
+from .jira_ratelimit import DEFAULT_RETRY_BUDGET, RequestStats, RetryBudget
+
+# How far before the watermark each incremental query starts
+SYNC_OVERLAP = timedelta(minutes=5)
+
+# Jira keys per IN query when loading existing tasks
+PREFETCH_CHUNK = 500
+
+
+def map_jira_status(jira_status: str) -> str:
+    """Map Jira status to internal status."""
+    status_map = {
+        "to do": "todo",
+        "todo": "todo",
+        "open": "todo",
+        "in progress": "in_progress",
+        "in review": "in_progress",
+        "done": "done",
+        "closed": "done",
+        "resolved": "done",
+        "blocked": "blocked",
+        "on hold": "blocked",
+    }
+    return status_map.get((jira_status or "").lower(), "todo")
+
+
+def map_jira_priority(jira_priority: Optional[str]) -> Optional[str]:
+    """Map Jira priority to internal priority."""
+    if not jira_priority:
+        return None
+
+    priority_map = {
+        "highest": "urgent",
+        "high": "high",
+        "medium": "medium",
+        "low": "low",
+        "lowest": "low",
+    }
+    return priority_map.get(jira_priority.lower(), "medium")
+
+
+@dataclass
+class JiraSyncResult:
+    """Outcome of syncing one project."""
+
+    project_key: str
+    full: bool
+    since: Optional[datetime] = None  # Watermark the sync started from (None for full)
+    fetched: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    watermark: Optional[datetime] = None  # Watermark after the sync
+
+
+class JiraSyncEngine:
+    """Sync Jira issues into tasks, incrementally by ``updated`` time."""
+
+    def __init__(
+        self,
+        session: Session,
+        client,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        retry_budget: int = DEFAULT_RETRY_BUDGET,
+    ):
+        """
+        Initialize the sync engine.
+
+        Args:
+            session: Database session
+            client: JiraClient (or anything with ``iter_issue_pages`` and
+                ``get_timezone``)
+            page_size: Issues per search request
+            retry_budget: Retries allowed across all requests of one run
+        """
+        self.session = session
+        self.client = client
+        self.page_size = page_size
+        self.retry_budget = retry_budget
+        self.stats = RequestStats()  # Requests, retries and throttling of the latest run
+
+    def sync_project(
+        self, project: Project, full: bool = False, status: Optional[str] = None
+    ) -> JiraSyncResult:
+        """
+        Sync a project's Jira issues into tasks.
+
+        Args:
+            project: Project with a ``jira_project_key``
+            full: Ignore the watermark and fetch every issue
+            status: Only sync issues in this Jira status. A filtered sync
+                doesn't see every change, so it never moves the watermark
+
+        Returns:
+            Counts of fetched, created, updated and unchanged issues
+
+        Raises:
+            JIRAError: If a Jira request fails (the watermark is left as is)
+        """
+        return self.sync_projects([project], full=full, status=status)[0]
+
+    def sync_projects(
+        self,
+        projects: List[Project],
+        full: bool = False,
+        status: Optional[str] = None,
+        combined: bool = False,
+        max_workers: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> List[JiraSyncResult]:
+        """
+        Sync several projects, fetching from Jira concurrently.
+
+        Each project's issues are fetched on a thread pool of
+        ``max_workers`` threads (the client also caps requests in flight),
+        so the fetch takes about as long as the slowest project. Tasks are
+        then written on the calling thread, since the session isn't
+        thread-safe.
+
+        Args:
+            projects: Projects with a ``jira_project_key``
+            full: Ignore the watermarks and fetch every issue
+            status: Only sync issues in this Jira status
+            combined: Fetch all projects with a single ``project in (...)``
+                query from the oldest watermark, which costs fewer requests
+                when projects only have a few changes each
+            max_workers: Projects fetched at once
+
+        Returns:
+            One result per project, in order
+
+        Raises:
+            JIRAError: If a Jira request fails, even after retrying within
+                the run's retry budget (no watermark is moved)
+        """
+        drain_outbox(self.session, self.client)
+
+        started, budget, results = self._begin(projects, full, status)
+        if combined and results:
+            keys, since = self._combined_query(results)
+            fetched = _split_by_project(keys, self._fetch(keys, since, status, budget))
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(results)))) as pool:
+                futures = [
+                    pool.submit(self._fetch, result.project_key, result.since, status, budget)
+                    for result in results
+                ]
+                fetched = [future.result() for future in futures]
+        return self._finish(projects, results, fetched, status, started)
+
+    async def sync_projects_async(
+        self,
+        projects: List[Project],
+        full: bool = False,
+        status: Optional[str] = None,
+        combined: bool = False,
+    ) -> List[JiraSyncResult]:
+        """
+        Sync several projects with an ``AsyncJiraClient``, without blocking the loop.
+
+        Works like ``sync_projects``, but the outbox drain and every fetch
+        are awaited, and the projects are fetched as concurrent tasks on
+        the running loop instead of a thread pool. Only the bulk writes at
+        the end run on the loop itself.
+
+        Raises:
+            JIRAError: If a Jira request fails (no watermark is moved)
+        """
+        await drain_outbox_async(self.session, self.client)
+
+        started, budget, results = self._begin(projects, full, status)
+        if combined and results:
+            keys, since = self._combined_query(results)
+            fetched = _split_by_project(keys, await self._fetch_async(keys, since, status, budget))
+        else:
+            fetched = await asyncio.gather(
+                *(
+                    self._fetch_async(result.project_key, result.since, status, budget)
+                    for result in results
+                )
+            )
+        return self._finish(projects, results, fetched, status, started)
+
+    def _begin(
+        self, projects: List[Project], full: bool, status: Optional[str]
+    ) -> Tuple[datetime, RetryBudget, List[JiraSyncResult]]:
+        """Start a run: its start time, retry budget and an empty result per project."""
+        budget = RetryBudget(self.retry_budget)
+        self.stats = budget.stats
+        results = []
+        for project in projects:
+            since = None if full or status else project.jira_last_synced_updated
+            results.append(
+                JiraSyncResult(
+                    project_key=project.jira_project_key, full=since is None, since=since
+                )
+            )
+        return datetime.utcnow(), budget, results
+
+    @staticmethod
+    def _combined_query(results: List[JiraSyncResult]) -> Tuple[List[str], Optional[datetime]]:
+        """Project keys and watermark of one query covering every project."""
+        keys = [result.project_key for result in results]
+        full_fetch = any(result.full for result in results)
+        return keys, None if full_fetch else min(result.since for result in results)
+
+    def _finish(
+        self,
+        projects: List[Project],
+        results: List[JiraSyncResult],
+        fetched: List[Dict[str, Dict[str, Any]]],
+        status: Optional[str],
+        started: datetime,
+    ) -> List[JiraSyncResult]:
+        """Write the fetched issues and new watermarks in one transaction."""
+        for project, result, issues in zip(projects, results, fetched):
+            result.fetched = len(issues)
+            self.apply_issues(project, list(issues.values()), result)
+
+            updated = [parse_jira_datetime(issue.get("updated")) for issue in issues.values()]
+            updated = [value for value in updated if value]
+            if updated and not status:
+                project.jira_last_synced_updated = min(max(updated), started)
+
+        self.session.commit()
+        for project, result in zip(projects, results):
+            result.watermark = project.jira_last_synced_updated
+        return results
+
+    def _jql(
+        self,
+        project_key: Union[str, List[str]],
+        since: Optional[datetime],
+        status: Optional[str],
+        tz: ZoneInfo,
+    ) -> str:
+        """JQL for a fetch, reaching back SYNC_OVERLAP before the watermark."""
+        return project_issues_jql(
+            project_key,
+            status=status,
+            updated_since=since - SYNC_OVERLAP if since else None,
+            tz=tz,
+        )
+
+    def _fetch(
+        self,
+        project_key: Union[str, List[str]],
+        since: Optional[datetime],
+        status: Optional[str],
+        budget: Optional[RetryBudget] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch issues by key (runs on worker threads, so never touches the session)."""
+        jql = self._jql(project_key, since, status, self.client.get_timezone())
+        issues: Dict[str, Dict[str, Any]] = {}
+        for page in self.client.iter_issue_pages(jql, page_size=self.page_size, budget=budget):
+            # Later copies of an issue win if paging returned it twice
+            issues.update((issue["key"], issue) for issue in page)
+        return issues
+
+    async def _fetch_async(
+        self,
+        project_key: Union[str, List[str]],
+        since: Optional[datetime],
+        status: Optional[str],
+        budget: Optional[RetryBudget] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch issues by key with the async client (never touches the session)."""
+        jql = self._jql(project_key, since, status, await self.client.get_timezone())
+        issues: Dict[str, Dict[str, Any]] = {}
+        pages = self.client.iter_issue_pages(jql, page_size=self.page_size, budget=budget)
+        async for page in pages:
+            issues.update((issue["key"], issue) for issue in page)
+        return issues
+
+    def apply_issues(
+        self, project: Project, issues: List[Dict[str, Any]], result: JiraSyncResult
+    ) -> None:
+        """
+        Upsert tasks for a batch of issues without committing.
+
+        Existing tasks for the batch are loaded with one ``IN`` query per
+        ``PREFETCH_CHUNK`` keys and compared in memory. New issues are
+        inserted and changed ones updated with one executemany each;
+        unchanged tasks aren't written at all. Every row of an executemany
+        carries the same columns (None included), since the ORM splits a
+        bulk write wherever the set of keys changes. The issue snapshots used for
+        offline lookups are refreshed in the same transaction.
+
+        A task whose status change is still queued for Jira (pending,
+        deferred for a retry, or failed) keeps its local status, since
+        Jira's is older. Issues older than the stored snapshot (a webhook
+        already applied a newer copy) leave their task alone.
+        """
+        existing: Dict[str, Any] = {}
+        stored: Dict[str, Optional[datetime]] = {}
+        keys = [issue["key"] for issue in issues]
+        for start in range(0, len(keys), PREFETCH_CHUNK):
+            stored.update(
+                JiraIssueOps.updated_times(self.session, keys[start : start + PREFETCH_CHUNK])
+            )
+            rows = self.session.execute(
+                select(
+                    Task.id,
+                    Task.jira_ticket_key,
+                    Task.title,
+                    Task.description,
+                    Task.status,
+                    Task.priority,
+                    Task.completed_at,
+                    Task.completed_day,
+                ).where(Task.jira_ticket_key.in_(keys[start : start + PREFETCH_CHUNK]))
+            )
+            existing.update((row.jira_ticket_key, row) for row in rows)
+
+        unsent = JiraOutboxOps.unsent_transition_keys(self.session) if existing else set()
+        now = datetime.utcnow()
+        inserts: List[Dict[str, Any]] = []
+        updates: List[Dict[str, Any]] = []
+        for issue in issues:
+            fields = issue_task_fields(issue)
+            row = existing.get(issue["key"])
+            if row is not None and row.jira_ticket_key in unsent:
+                fields["status"] = row.status
+            if row is None:
+                inserts.append(
+                    {
+                        **fields,
+                        **_completion(fields["status"], None, None, now),
+                        "project_id": project.id,
+                        "jira_ticket_id": issue["id"],
+                        "jira_ticket_key": issue["key"],
+                        "tags": ",".join(issue["labels"]) if issue.get("labels") else None,
+                    }
+                )
+                continue
+
+            if _older_than(issue, stored.get(issue["key"])) or all(
+                getattr(row, name) == value for name, value in fields.items()
+            ):
+                result.unchanged += 1
+                continue
+            updates.append(
+                {
+                    "id": row.id,
+                    "updated_at": now,
+                    **fields,
+                    **_completion(fields["status"], row.completed_at, row.completed_day, now),
+                }
+            )
+
+        if inserts:
+            # render_nulls keeps None values in the rows, so they don't split the batch
+            self.session.execute(insert(Task).execution_options(render_nulls=True), inserts)
+        if updates:
+            self.session.execute(update(Task), updates)
+        JiraIssueOps.upsert_many(self.session, issues, commit=False)
+        result.created += len(inserts)
+        result.updated += len(updates)
+
+
+def _split_by_project(
+    keys: List[str], issues: Dict[str, Dict[str, Any]]
+) -> List[Dict[str, Dict[str, Any]]]:
+    """Split the issues of a combined query per project key, in order."""
+    by_project: Dict[str, Dict[str, Dict[str, Any]]] = {key.upper(): {} for key in keys}
+    for key, issue in issues.items():
+        by_project.setdefault(issue.get("project_key", "").upper(), {})[key] = issue
+    return [by_project[key.upper()] for key in keys]
+
+
+def issue_task_fields(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Task fields that mirror a Jira issue."""
+    return {
+        "title": issue["summary"],
+        "description": issue["description"],
+        "status": map_jira_status(issue["status"]),
+        "priority": map_jira_priority(issue.get("priority")),
+    }
+
+
+def _older_than(issue: Dict[str, Any], stored: Optional[datetime]) -> bool:
+    """Whether an issue is older than the stored snapshot's ``updated`` time."""
+    updated = parse_jira_datetime(issue.get("updated"))
+    return bool(updated and stored and updated < stored)
+
+
+def _completion(
+    status: str, completed_at: Optional[datetime], completed_day: Optional[int], now: datetime
+) -> Dict[str, Any]:
+    """Completion columns of a task, stamped when it becomes done (as ``TaskOps.update`` does).
+
+    Bulk writes skip ORM validators, so ``completed_day`` is set here too.
+    """
+    if status == "done" and not completed_at:
+        return {"completed_at": now, "completed_day": day_key(now, naive_utc=True)}
+    return {"completed_at": completed_at, "completed_day": completed_day}
@@ -0,0 +1,525 @@
+"""Receive Jira webhooks and apply issue changes as they happen.
+
+Jira can POST an event to a URL whenever an issue is created, updated or
+deleted, which keeps tasks current without polling. ``JiraWebhookReceiver``
+is a small HTTP server (standard library only) that accepts those events
+at ``WEBHOOK_PATH``. The MCP server starts one when ``jira.webhook_port``
+is configured, and ``sb jira webhook serve`` runs one in the foreground.
+
+Each delivery is checked before it is accepted. With a secret configured
+(``jira.webhook_secret``), the ``X-Hub-Signature`` header must carry the
+HMAC-SHA256 of the body, as Jira sends it for webhooks with a secret;
+otherwise the delivery is refused with 401. Without a secret anyone who
+can reach the receiver can change tasks, so it then only listens on a
+loopback interface (``start`` refuses other hosts). The body must be a JSON issue
+event with the issue's key and id (400 if not). Other events are
+acknowledged and ignored.
+
+Accepted events are answered with 202 at once and queued. A writer thread
+applies them in batches: it collects events for up to ``BATCH_WINDOW``
+seconds (at most ``MAX_BATCH``), keeps the newest event per issue, and
+writes the batch in one transaction with the same bulk upserts as a sync
+(``JiraSyncEngine.apply_issues``), refreshing the issue snapshots too.
+
+Applying is idempotent, since Jira retries deliveries and doesn't promise
+their order:
+
+- A delivery whose ``X-Atlassian-Webhook-Identifier`` was seen recently is
+  skipped.
+- An event older than the stored snapshot is skipped, so a late delivery
+  never rolls an issue back.
+- Applying an event that is already stored changes nothing.
+
+A deleted issue's snapshot is removed and its task is unlinked from Jira
+but kept. Issues of projects without a matching ``jira_project_key`` only
+update the snapshot. Webhooks never move sync watermarks, so anything a
+missed delivery lost is still picked up by the next sync.
+"""
+
+import hashlib
+import hmac
+import ipaddress
+import json
+import queue
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from ..db.models import Project, Task, get_session
+from ..db.operations import JiraIssueOps
+from .jira_client import format_issue, issue_fields, parse_jira_datetime
+from .jira_sync import JiraSyncEngine, JiraSyncResult
+
+# Path Jira posts to
+WEBHOOK_PATH = "/jira/webhook"
+
+# Port ``sb jira webhook`` uses when none is configured
+DEFAULT_WEBHOOK_PORT = 8765
+
+# Seconds the writer waits for more events before applying a batch
+BATCH_WINDOW = 0.5
+
+# Events applied per transaction
+MAX_BATCH = 500
+
+# Largest body accepted (bytes)
+MAX_BODY = 5 * 1024 * 1024
+
+# Delivery ids remembered for skipping redeliveries
+SEEN_DELIVERIES = 10_000
+
+# Webhook event -> what it does to the issue
+ISSUE_EVENTS = {
+    "jira:issue_created": "upsert",
+    "jira:issue_updated": "upsert",
+    "jira:issue_deleted": "delete",
+}
+
+
+class WebhookError(ValueError):
+    """A delivery that can't be accepted, with the HTTP status to answer."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class WebhookEvent:
+    """An issue event from a webhook delivery."""
+
+    action: str  # "upsert" or "delete"
+    issue: Dict[str, Any]  # Formatted issue (see ``format_issue``)
+    delivery_id: Optional[str] = None
+
+
+@dataclass
+class WebhookResult:
+    """Outcome of applying a batch of events."""
+
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    skipped: int = 0  # Older than the stored snapshot, or superseded in the batch
+
+    def add(self, other: "WebhookResult") -> None:
+        """Add another batch's counts to these."""
+        self.created += other.created
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+        self.deleted += other.deleted
+        self.skipped += other.skipped
+
+
+def is_loopback(host: str) -> bool:
+    """Whether a listen address only accepts connections from this machine."""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def sign_payload(body: bytes, secret: str) -> str:
+    """``X-Hub-Signature`` value for a body, as Jira computes it."""
+    return "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(body: bytes, signature: Optional[str], secret: str) -> bool:
+    """Whether a ``X-Hub-Signature`` header matches the body."""
+    if not signature or not signature.lower().startswith("sha256="):
+        return False
+    return hmac.compare_digest(sign_payload(body, secret), "sha256=" + signature[7:].lower())
+
+
+def parse_event(
+    body: bytes, fields: Sequence[str], delivery_id: Optional[str] = None
+) -> Optional[WebhookEvent]:
+    """
+    Read an issue event from a delivery body.
+
+    Args:
+        body: Raw request body
+        fields: Issue fields to keep (see ``issue_fields``)
+        delivery_id: ``X-Atlassian-Webhook-Identifier`` of the delivery
+
+    Returns:
+        The event, or None for events other than issue changes
+
+    Raises:
+        WebhookError: If the body isn't a well-formed issue event
+    """
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise WebhookError("Body is not JSON")
+    if not isinstance(payload, dict):
+        raise WebhookError("Body is not a JSON object")
+
+    action = ISSUE_EVENTS.get(payload.get("webhookEvent"))
+    if action is None:
+        return None
+    raw = payload.get("issue")
+    if not isinstance(raw, dict) or not raw.get("key") or not raw.get("id"):
+        raise WebhookError("Issue event without an issue key and id")
+    if not isinstance(raw.get("fields") or {}, dict):
+        raise WebhookError("Issue fields are not an object")
+
+    issue = format_issue(raw, fields)
+    issue["key"] = issue["key"].upper()
+    try:
+        parse_jira_datetime(issue["updated"])
+    except (TypeError, ValueError):
+        raise WebhookError(f"Unreadable updated time: {issue['updated']}")
+    return WebhookEvent(action, issue, delivery_id)
+
+
+def apply_events(session: Session, events: List[WebhookEvent]) -> WebhookResult:
+    """
+    Apply a batch of issue events in one transaction.
+
+    Only the last event per issue counts, and events older than the stored
+    snapshot are skipped.
+
+    Args:
+        session: Database session
+        events: Events in the order they arrived
+
+    Returns:
+        Counts of created, updated, unchanged, deleted and skipped issues
+    """
+    result = WebhookResult()
+    latest: Dict[str, WebhookEvent] = {}
+    for event in events:
+        key = event.issue["key"]
+        if key in latest:
+            result.skipped += 1
+            if _older(event.issue, latest[key].issue):
+                continue
+        latest[key] = event
+    if not latest:
+        return result
+
+    stored = JiraIssueOps.updated_times(session, list(latest))
+    upserts: Dict[str, List[Dict[str, Any]]] = {}
+    deletes: List[str] = []
+    for key, event in latest.items():
+        updated = parse_jira_datetime(event.issue["updated"])
+        if updated and stored.get(key) and updated < stored[key]:
+            result.skipped += 1
+        elif event.action == "delete":
+            deletes.append(key)
+        else:
+            project_key = (event.issue.get("project_key") or key.rsplit("-", 1)[0]).upper()
+            upserts.setdefault(project_key, []).append(event.issue)
+
+    projects = {
+        project.jira_project_key.upper(): project
+        for project in session.scalars(
+            select(Project).where(func.upper(Project.jira_project_key).in_(list(upserts)))
+        )
+    }
+    syncer = JiraSyncEngine(session, client=None)
+    for project_key, issues in upserts.items():
+        project = projects.get(project_key)
+        if project is None:
+            JiraIssueOps.upsert_many(session, issues, commit=False)
+            continue
+        applied = JiraSyncResult(project_key=project_key, full=False)
+        syncer.apply_issues(project, issues, applied)
+        result.created += applied.created
+        result.updated += applied.updated
+        result.unchanged += applied.unchanged
+
+    if deletes:
+        JiraIssueOps.delete_many(session, deletes, commit=False)
+        result.deleted = session.execute(
+            update(Task)
+            .where(Task.jira_ticket_key.in_(deletes))
+            .values(jira_ticket_key=None, jira_ticket_id=None, updated_at=datetime.utcnow())
+        ).rowcount
+    session.commit()
+    return result
+
+
+def _older(issue: Dict[str, Any], than: Dict[str, Any]) -> bool:
+    """Whether an issue's ``updated`` time is before another copy's."""
+    updated, other = parse_jira_datetime(issue["updated"]), parse_jira_datetime(than["updated"])
+    return bool(updated and other and updated < other)
+
+
+class JiraWebhookReceiver:
+    """HTTP endpoint for Jira webhooks with a batching writer thread."""
+
+    def __init__(
+        self,
+        engine,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        secret: Optional[str] = None,
+        batch_window: float = BATCH_WINDOW,
+        max_batch: int = MAX_BATCH,
+        fields: Optional[Sequence[str]] = None,
+    ):
+        """
+        Initialize the receiver (``start`` begins serving).
+
+        Args:
+            engine: Database engine
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one)
+            secret: Webhook secret; when set, deliveries must be signed with it
+            batch_window: Seconds to collect events before writing them
+            max_batch: Events written per transaction
+            fields: Issue fields to keep (defaults to ``issue_fields()``)
+        """
+        self.engine = engine
+        self.host = host
+        self.port = port
+        self.secret = secret
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.fields = issue_fields(fields)
+        self.totals = WebhookResult()  # Applied since the receiver started
+        self.received = 0
+        self.rejected = 0
+        self.duplicates = 0
+
+        self._queue: "queue.Queue[Optional[WebhookEvent]]" = queue.Queue()
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._writer = threading.Thread(target=self._write, name="jira-webhook", daemon=True)
+
+    def start(self) -> str:
+        """
+        Serve on background threads.
+
+        Returns:
+            URL to register as the webhook in Jira
+
+        Raises:
+            ValueError: If no secret is set and the host isn't a loopback interface
+        """
+        if not self.secret and not is_loopback(self.host):
+            raise ValueError(
+                f"Refusing to receive unsigned Jira webhooks on {self.host or 'all interfaces'}; "
+                "set jira.webhook_secret (or JIRA_WEBHOOK_SECRET) or listen on 127.0.0.1"
+            )
+        receiver = self
+
+        class Handler(WebhookHandler):
+            pass
+
+        Handler.receiver = receiver
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self._writer.start()
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.url
+
+    @property
+    def url(self) -> str:
+        """Webhook URL of the running server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{WEBHOOK_PATH}"
+
+    def stop(self) -> None:
+        """Stop serving, after writing the events already accepted."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._queue.put(None)
+            self._writer.join()
+
+    def __enter__(self) -> "JiraWebhookReceiver":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def flush(self) -> None:
+        """Wait until every accepted event has been written."""
+        self._queue.join()
+
+    def submit(self, body: bytes, headers: Dict[str, str]) -> Tuple[int, str]:
+        """
+        Verify a delivery and queue its event.
+
+        Args:
+            body: Request body
+            headers: Request headers
+
+        Returns:
+            HTTP status and message to answer with
+        """
+        try:
+            if self.secret and not verify_signature(
+                body, headers.get("X-Hub-Signature"), self.secret
+            ):
+                raise WebhookError("Invalid signature", status=401)
+            delivery_id = headers.get("X-Atlassian-Webhook-Identifier")
+            event = parse_event(body, self.fields, delivery_id)
+        except WebhookError as e:
+            with self._lock:
+                self.rejected += 1
+            return e.status, str(e)
+        if event is None:
+            return 200, "Ignored"
+
+        with self._lock:
+            self.received += 1
+            if delivery_id:
+                if delivery_id in self._seen:
+                    self.duplicates += 1
+                    return 200, "Duplicate"
+                self._seen[delivery_id] = None
+                if len(self._seen) > SEEN_DELIVERIES:
+                    self._seen.popitem(last=False)
+        self._queue.put(event)
+        return 202, "Accepted"
+
+    def _write(self) -> None:
+        """Writer thread: apply queued events in batches until stopped."""
+        while True:
+            event = self._queue.get()
+            if event is None:
+                self._queue.task_done()
+                return
+            batch = [event]
+            deadline = time.monotonic() + self.batch_window
+            stopping = False
+            while len(batch) < self.max_batch:
+                try:
+                    event = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if event is None:
+                    stopping = True
+                    break
+                batch.append(event)
+
+            session = get_session(self.engine)
+            try:
+                applied = apply_events(session, batch)
+                with self._lock:
+                    self.totals.add(applied)
+            except Exception as e:
+                # Dropped events are picked up again by the next sync
+                session.rollback()
+                print(f"Error applying Jira webhook events: {e}", file=sys.stderr)
+            finally:
+                session.close()
+                for _ in range(len(batch) + stopping):
+                    self._queue.task_done()
+            if stopping:
+                return
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    """HTTP handler passing webhook deliveries to a ``JiraWebhookReceiver``."""
+
+    receiver: JiraWebhookReceiver
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):  # noqa: A002 - signature of the base class
+        """Keep the console quiet."""
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip("/") != WEBHOOK_PATH:
+            self._send(404, "Not found")
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            self.close_connection = True
+            self._send(413, "Payload too large")
+            return
+        body = self.rfile.read(length)
+        self._send(*self.receiver.submit(body, self.headers))
+
+    def do_GET(self):
+        self._send(405, "Use POST")
+
+    def _send(self, status: int, message: str) -> None:
+        data = json.dumps({"message": message}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def post_webhook(
+    url: str, payload: Any, secret: Optional[str] = None, delivery_id: Optional[str] = None
+) -> Tuple[int, str]:
+    """
+    POST a webhook payload the way Jira does, e.g. to replay a recorded one.
+
+    Args:
+        url: Receiver URL
+        payload: JSON payload (or its encoded bytes)
+        secret: Webhook secret to sign the body with
+        delivery_id: ``X-Atlassian-Webhook-Identifier`` to send
+
+    Returns:
+        HTTP status and message of the response
+    """
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    if secret:
+        headers["X-Hub-Signature"] = sign_payload(body, secret)
+    if delivery_id:
+        headers["X-Atlassian-Webhook-Identifier"] = delivery_id
+    request = urllib.request.Request(url, data=body, headers=headers, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            status, data = response.status, response.read()
+    except urllib.error.HTTPError as e:
+        status, data = e.code, e.read()
+    try:
+        return status, json.loads(data).get("message", "")
+    except ValueError:
+        return status, data.decode("utf-8", "replace")
+
+
+# One receiver per database, started by long-running processes
+_receivers: Dict[str, JiraWebhookReceiver] = {}
+_receivers_lock = threading.Lock()
+
+
+def start_webhook_receiver(
+    engine, port: int, host: str = "127.0.0.1", secret: Optional[str] = None
+) -> JiraWebhookReceiver:
+    """Start the process-wide webhook receiver for a database (idempotent)."""
+    key = str(engine.url)
+    with _receivers_lock:
+        if key not in _receivers:
+            receiver = JiraWebhookReceiver(engine, host=host, port=port, secret=secret)
+            receiver.start()
+            _receivers[key] = receiver
+        return _receivers[key]
+
+
+def stop_webhook_receivers() -> None:
+    """Stop every running receiver."""
+    with _receivers_lock:
+        receivers = list(_receivers.values())
+        _receivers.clear()
+    for receiver in receivers:
+        receiver.stop()
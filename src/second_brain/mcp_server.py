@@ -1,11 +1,13 @@
 """MCP server for Second Brain work tracking."""
 
 import os
+import sys
 from pathlib import Path
 from fastmcp import FastMCP
 
 from .db import init_db
 from .config import get_config
+from .storage import writes
 from .tools.work_log import create_work_log_entry_tool, get_work_logs_tool
 from .tools.projects import (
     create_project_tool,
@@ -15,12 +17,17 @@ from .tools.projects import (
     get_tasks_tool,
 )
 from .tools.reports import generate_report_tool, get_project_status_tool
-from .tools.jira_sync import sync_jira_issues_tool, get_jira_issue_tool
+from .tools.analytics import get_analytics_tool, forecast_delivery_tool
+from .tools.jira_sync import sync_jira_issues_tool, get_jira_issue_tool, comment_jira_issue_tool
 from .tools.transcripts import (
     create_transcript_tool,
     update_transcript_tool,
     get_transcripts_tool,
     get_transcript_content_tool,
+    begin_transcript_upload_tool,
+    append_transcript_chunk_tool,
+    finish_transcript_upload_tool,
+    abort_transcript_upload_tool,
 )
 from .tools.epics import (
     create_epic_tool,
@@ -42,6 +49,7 @@ from .tools.notes import (
     get_notes_tool,
     get_note_tool,
     search_notes_tool,
+    attach_file_to_note_tool,
 )
 
 # Initialize MCP server
@@ -290,11 +298,46 @@ async def get_project_status(project_slug: str) -> str:
     return await tool_func(project_slug)
 
 
+@mcp.tool()
+async def get_analytics(weeks: int = 8, project_slug: str | None = None) -> str:
+    """
+    Summarize throughput, cycle time and time spent per project.
+
+    Args:
+        weeks: Number of weeks to include (default: 8)
+        project_slug: Filter by project slug (optional)
+    """
+    from .tools.analytics import AnalyticsInput
+
+    input_data = AnalyticsInput(weeks=weeks, project_slug=project_slug)
+    tool_func = get_analytics_tool(engine)
+    return await tool_func(input_data)
+
+
+@mcp.tool()
+async def forecast_delivery(target: str, trials: int = 10000, history_days: int = 90) -> str:
+    """
+    Forecast P50/P85/P95 completion dates for a project or epic.
+
+    Args:
+        target: Project slug or Beads epic ID
+        trials: Number of Monte Carlo trials (default: 10000)
+        history_days: Days of throughput history to resample (default: 90)
+    """
+    from .tools.analytics import ForecastInput
+
+    input_data = ForecastInput(target=target, trials=trials, history_days=history_days)
+    tool_func = forecast_delivery_tool(engine)
+    return await tool_func(input_data)
+
+
 # Register Jira tools
 @mcp.tool()
 async def sync_jira_issues(
     project_slug: str | None = None,
     status_filter: str | None = None,
+    full_resync: bool = False,
+    combined: bool = False,
 ) -> str:
     """
     Synchronize Jira issues to local tasks.
@@ -302,29 +345,56 @@ async def sync_jira_issues(
     Args:
         project_slug: Project slug to sync (syncs all projects if not specified)
         status_filter: Filter by issue status (optional)
+        full_resync: Fetch every issue instead of only those changed since the last sync
+        combined: Fetch all projects with one combined query (fewer requests)
     """
     from .tools.jira_sync import JiraSyncInput
 
-    input_data = JiraSyncInput(project_slug=project_slug, status_filter=status_filter)
+    input_data = JiraSyncInput(
+        project_slug=project_slug,
+        status_filter=status_filter,
+        full_resync=full_resync,
+        combined=combined,
+    )
     tool_func = sync_jira_issues_tool(engine)
     return await tool_func(input_data)
 
 
 @mcp.tool()
-async def get_jira_issue(issue_key: str) -> str:
+async def get_jira_issue(issue_key: str, offline: bool = False, max_age_minutes: int = 15) -> str:
     """
     Fetch a specific Jira issue by key.
 
     Args:
         issue_key: Jira issue key (e.g., PROJ-123)
+        offline: Only use the local snapshot, never contact Jira
+        max_age_minutes: Serve a local snapshot younger than this without asking Jira
     """
     from .tools.jira_sync import JiraIssueInput
 
-    input_data = JiraIssueInput(issue_key=issue_key)
+    input_data = JiraIssueInput(
+        issue_key=issue_key, offline=offline, max_age_minutes=max_age_minutes
+    )
     tool_func = get_jira_issue_tool(engine)
     return await tool_func(input_data)
 
 
+@mcp.tool()
+async def comment_jira_issue(issue_key: str, comment: str) -> str:
+    """
+    Comment on a Jira issue. The comment is queued and sent in the background.
+
+    Args:
+        issue_key: Jira issue key (e.g., PROJ-123)
+        comment: Comment text
+    """
+    from .tools.jira_sync import JiraCommentInput
+
+    input_data = JiraCommentInput(issue_key=issue_key, comment=comment)
+    tool_func = comment_jira_issue_tool(engine)
+    return await tool_func(input_data)
+
+
 # Register transcript tools
 @mcp.tool()
 async def create_transcript(
@@ -357,6 +427,77 @@ async def create_transcript(
     return await tool_func(input_data)
 
 
+@mcp.tool()
+async def begin_transcript_upload(
+    title: str,
+    transcript_type: str = "call",
+    transcript_date: str | None = None,
+    tags: list[str] | None = None,
+) -> str:
+    """
+    Start a chunked upload for a large transcript.
+
+    Use this instead of create_transcript for long transcripts. Send the text
+    with append_transcript_chunk and complete with finish_transcript_upload.
+
+    Args:
+        title: Transcript title
+        transcript_type: Type of transcript (call, meeting, etc.)
+        transcript_date: Date of transcript (YYYY-MM-DD), defaults to today
+        tags: List of tags
+    """
+    from .tools.transcripts import TranscriptUploadBeginInput
+
+    input_data = TranscriptUploadBeginInput(
+        title=title,
+        transcript_type=transcript_type,
+        transcript_date=transcript_date,
+        tags=tags,
+    )
+    tool_func = begin_transcript_upload_tool(engine)
+    return await tool_func(input_data)
+
+
+@mcp.tool()
+async def append_transcript_chunk(upload_id: str, chunk: str) -> str:
+    """
+    Append the next chunk of text to a transcript upload.
+
+    Args:
+        upload_id: Upload ID from begin_transcript_upload
+        chunk: Next chunk of raw transcript text
+    """
+    from .tools.transcripts import TranscriptChunkInput
+
+    input_data = TranscriptChunkInput(upload_id=upload_id, chunk=chunk)
+    tool_func = append_transcript_chunk_tool(engine)
+    return await tool_func(input_data)
+
+
+@mcp.tool()
+async def finish_transcript_upload(upload_id: str) -> str:
+    """
+    Finish a chunked transcript upload and create the transcript.
+
+    Args:
+        upload_id: Upload ID from begin_transcript_upload
+    """
+    tool_func = finish_transcript_upload_tool(engine)
+    return await tool_func(upload_id)
+
+
+@mcp.tool()
+async def abort_transcript_upload(upload_id: str) -> str:
+    """
+    Abort a chunked transcript upload and discard what was sent.
+
+    Args:
+        upload_id: Upload ID from begin_transcript_upload
+    """
+    tool_func = abort_transcript_upload_tool(engine)
+    return await tool_func(upload_id)
+
+
 @mcp.tool()
 async def update_transcript(
     transcript_id: int,
@@ -417,15 +558,17 @@ async def get_transcripts(
 
 
 @mcp.tool()
-async def get_transcript_content(transcript_id: int) -> str:
+async def get_transcript_content(transcript_id: int, offset: int = 0, limit: int = 5000) -> str:
     """
-    Get the full content of a specific transcript.
+    Get the content of a specific transcript, paged by character offset.
 
     Args:
         transcript_id: Transcript ID
+        offset: Character offset into the raw transcript (default 0)
+        limit: Maximum number of raw transcript characters to return (default 5000)
     """
     tool_func = get_transcript_content_tool(engine)
-    return await tool_func(transcript_id)
+    return await tool_func(transcript_id, offset=offset, limit=limit)
 
 
 # Register note tools
@@ -547,6 +690,25 @@ async def search_notes(query: str) -> str:
     return await tool_func(input_data)
 
 
+@mcp.tool()
+async def attach_file_to_note(note_id: int, file_path: str, filename: str | None = None) -> str:
+    """
+    Attach a local file to a note.
+
+    Identical files are stored only once, however many notes attach them.
+
+    Args:
+        note_id: Note ID
+        file_path: Path of the file to attach
+        filename: Attachment name (defaults to the file name)
+    """
+    from .tools.notes import NoteAttachInput
+
+    input_data = NoteAttachInput(note_id=note_id, file_path=file_path, filename=filename)
+    tool_func = attach_file_to_note_tool(engine)
+    return await tool_func(input_data)
+
+
 # Register epic and issue tools
 @mcp.tool()
 async def create_epic(
@@ -825,7 +987,37 @@ async def get_epic_stats() -> str:
 
 def main():
     """Run the MCP server."""
-    mcp.run()
+    # Coalesce repeated markdown updates while the server is running
+    write_behind_ms = config.get_write_behind_ms()
+    if write_behind_ms > 0:
+        writes.enable_write_behind(write_behind_ms / 1000)
+
+    # Send queued Jira changes in the background
+    from .integrations.jira_outbox import start_outbox_drainer, stop_outbox_drainers
+    from .integrations.jira_webhook import start_webhook_receiver, stop_webhook_receivers
+
+    start_outbox_drainer(engine)
+
+    # Apply Jira webhooks as they arrive, if a port is configured
+    jira_config = config.get_jira_config()
+    if jira_config["webhook_port"]:
+        try:
+            start_webhook_receiver(
+                engine,
+                jira_config["webhook_port"],
+                host=jira_config["webhook_host"],
+                secret=jira_config["webhook_secret"],
+            )
+        except (OSError, ValueError) as e:
+            # stdout carries the MCP stdio stream
+            print(f"Not receiving Jira webhooks: {e}", file=sys.stderr)
+
+    try:
+        mcp.run()
+    finally:
+        stop_webhook_receivers()
+        stop_outbox_drainers()
+        writes.flush()
 
 
 if __name__ == "__main__":
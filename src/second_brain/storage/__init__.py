@@ -1,6 +1,7 @@
 """Storage layer for markdown and database synchronization."""
 
 from .markdown import MarkdownStorage
-from .indexer import StorageIndexer
+from .indexer import StorageIndexer, DuplicateTranscriptError
+from .blobs import BlobStore
 
-__all__ = ["MarkdownStorage", "StorageIndexer"]
+__all__ = ["MarkdownStorage", "StorageIndexer", "DuplicateTranscriptError", "BlobStore"]
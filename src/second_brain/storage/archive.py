@@ -0,0 +1,166 @@
+"""Packed monthly archives for closed work log months.
+
+A closed month of daily ``work_logs/YYYY-MM-DD.md`` files is packed into a
+single ``work_logs/archive/YYYY-MM.sbpack`` file. The file starts with an
+offset table so one day can be sliced out through mmap without reading or
+unpacking the rest of the month.
+
+Archive layout (little-endian):
+
+    magic    8 bytes   b"SBWLPK1\\n"
+    count    uint32    number of days in the archive
+    table    count x (day uint8, offset uint64, length uint64)
+    data     the original markdown files, UTF-8, back to back
+"""
+
+import mmap
+import os
+import re
+import struct
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+MAGIC = b"SBWLPK1\n"
+HEADER = struct.Struct("<8sI")
+TABLE_ENTRY = struct.Struct("<BQQ")
+
+ARCHIVE_NAME_RE = re.compile(r"^(\d{4})-(\d{2})\.sbpack$")
+
+
+class ArchiveFormatError(Exception):
+    """Raised when an archive file is truncated or not an archive."""
+
+    pass
+
+
+class WorkLogArchive:
+    """Read and write packed monthly work log archives."""
+
+    def __init__(self, archive_dir: Path):
+        """Initialize with the directory that holds ``.sbpack`` files."""
+        self.archive_dir = Path(archive_dir)
+
+    def archive_path(self, year: int, month: int) -> Path:
+        """Get the archive file path for a month."""
+        return self.archive_dir / f"{year:04d}-{month:02d}.sbpack"
+
+    def has_day(self, date: datetime) -> bool:
+        """Check whether a day is stored in its month's archive."""
+        return date.day in self.list_days(date.year, date.month)
+
+    def list_months(self) -> List[Tuple[int, int]]:
+        """List archived (year, month) pairs in chronological order."""
+        if not self.archive_dir.exists():
+            return []
+
+        months = []
+        for entry in os.scandir(self.archive_dir):
+            match = ARCHIVE_NAME_RE.match(entry.name)
+            if match:
+                months.append((int(match.group(1)), int(match.group(2))))
+        return sorted(months)
+
+    def list_days(self, year: int, month: int) -> List[int]:
+        """List the days stored in a month's archive."""
+        path = self.archive_path(year, month)
+        if not path.exists():
+            return []
+
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return sorted(self._read_table(mm))
+
+    def read_day(self, date: datetime) -> Optional[str]:
+        """Read one day's markdown from the archive without unpacking the month.
+
+        Returns:
+            The original file content, or None if the day is not archived
+        """
+        path = self.archive_path(date.year, date.month)
+        if not path.exists():
+            return None
+
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            table = self._read_table(mm)
+            if date.day not in table:
+                return None
+            offset, length = table[date.day]
+            return mm[offset : offset + length].decode("utf-8")
+
+    def read_month(self, year: int, month: int) -> Dict[int, bytes]:
+        """Read every day of a month's archive.
+
+        Returns:
+            Dictionary mapping day of month to raw file bytes
+        """
+        path = self.archive_path(year, month)
+        if not path.exists():
+            return {}
+
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            table = self._read_table(mm)
+            return {day: mm[offset : offset + length] for day, (offset, length) in table.items()}
+
+    def write_month(self, year: int, month: int, days: Dict[int, bytes]) -> Optional[Path]:
+        """Write (or replace) a month's archive.
+
+        The archive is written to a temporary file and renamed into place, so
+        readers never see a partially written archive. An empty ``days`` dict
+        removes the archive.
+
+        Returns:
+            Archive path, or None if the archive was removed
+        """
+        path = self.archive_path(year, month)
+        if not days:
+            if path.exists():
+                path.unlink()
+            return None
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+
+        ordered = sorted(days.items())
+        offset = HEADER.size + TABLE_ENTRY.size * len(ordered)
+        table = []
+        for day, data in ordered:
+            table.append(TABLE_ENTRY.pack(day, offset, len(data)))
+            offset += len(data)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.archive_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(HEADER.pack(MAGIC, len(ordered)))
+                f.write(b"".join(table))
+                for _, data in ordered:
+                    f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        return path
+
+    def remove_month(self, year: int, month: int) -> None:
+        """Delete a month's archive if it exists."""
+        self.write_month(year, month, {})
+
+    def _read_table(self, mm: mmap.mmap) -> Dict[int, Tuple[int, int]]:
+        """Parse the offset table at the start of an archive."""
+        if len(mm) < HEADER.size:
+            raise ArchiveFormatError("Archive is truncated")
+
+        magic, count = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            raise ArchiveFormatError("Not a work log archive")
+        if len(mm) < HEADER.size + TABLE_ENTRY.size * count:
+            raise ArchiveFormatError("Archive offset table is truncated")
+
+        table = {}
+        for i in range(count):
+            day, offset, length = TABLE_ENTRY.unpack_from(mm, HEADER.size + TABLE_ENTRY.size * i)
+            if offset + length > len(mm):
+                raise ArchiveFormatError(f"Archive entry for day {day} is truncated")
+            table[day] = (offset, length)
+        return table
@@ -0,0 +1,144 @@
+"""Content-addressed blob storage for large payloads.
+
+Raw transcripts and note attachments are stored once under
+``data/blobs/`` in a file named after the SHA-256 of their content:
+
+    blobs/3f/a2/3fa2...e9        uncompressed
+    blobs/3f/a2/3fa2...e9.gz     gzip-compressed text
+
+Identical content always maps to the same file, so re-importing a
+transcript or attaching the same file twice stores nothing new. Content
+stored both compressed (a raw transcript) and uncompressed (an attachment)
+has one file per compression under the same hash. Reference counts live in
+the database (``blobs`` table, one row per hash); this module only manages
+files.
+"""
+
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import BinaryIO, Optional, Tuple
+
+from .raw_transcript import CHUNK_SIZE, RawTranscriptWriter
+
+# Compression name -> blob file suffix
+BLOB_SUFFIXES = {
+    "none": "",
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
+
+class BlobStore:
+    """Hash-named files under a blobs directory."""
+
+    def __init__(self, blobs_path: Path):
+        """Initialize with the blobs directory (created on first write)."""
+        self.blobs_path = Path(blobs_path)
+        self.tmp_path = self.blobs_path / "tmp"
+
+    def blob_path(self, content_hash: str, compression: str = "none") -> Path:
+        """Get the path a blob is stored at."""
+        name = content_hash + BLOB_SUFFIXES[compression]
+        return self.blobs_path / content_hash[:2] / content_hash[2:4] / name
+
+    def find(self, content_hash: str, compression: str = "none") -> Optional[Path]:
+        """Locate a stored blob by hash and compression.
+
+        Returns:
+            Blob path, or None if no such blob exists
+        """
+        path = self.blob_path(content_hash, compression)
+        return path if path.exists() else None
+
+    def contains(self, path: Path) -> bool:
+        """Check whether a path lives inside the blob store."""
+        return self.blobs_path in Path(path).parents
+
+    def open_writer(self, compression: str = "none") -> RawTranscriptWriter:
+        """Open a text writer whose output is committed with ``commit_writer``."""
+        return RawTranscriptWriter(self.tmp_path / uuid.uuid4().hex, compression)
+
+    def commit_writer(self, writer: RawTranscriptWriter) -> Tuple[Path, bool]:
+        """Move a finished writer's output to its content-addressed path.
+
+        If a blob with the same content already exists, the new file is
+        discarded and the existing blob is returned.
+
+        Returns:
+            Tuple of (blob path, whether a new blob was created)
+        """
+        existing = self.find(writer.content_hash, writer.compression)
+        if existing is not None:
+            writer.abort()
+            return existing, False
+
+        path = writer.commit(self.blob_path(writer.content_hash, writer.compression))
+        return path, True
+
+    def put_stream(self, source: BinaryIO) -> Tuple[str, Path, bool]:
+        """Store a binary stream, reading it in chunks.
+
+        Returns:
+            Tuple of (content hash, blob path, whether a new blob was created)
+        """
+        self.tmp_path.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.tmp_path / f"{uuid.uuid4().hex}.part"
+        digest = hashlib.sha256()
+
+        try:
+            with open(tmp_file, "wb") as f:
+                while True:
+                    chunk = source.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    f.write(chunk)
+
+            content_hash = digest.hexdigest()
+            existing = self.find(content_hash)
+            if existing is not None:
+                tmp_file.unlink()
+                return content_hash, existing, False
+
+            path = self.blob_path(content_hash)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_file, path)
+            return content_hash, path, True
+        except BaseException:
+            if tmp_file.exists():
+                tmp_file.unlink()
+            raise
+
+    def put_file(self, source_path: Path) -> Tuple[str, Path, bool]:
+        """Store a file's content.
+
+        Returns:
+            Tuple of (content hash, blob path, whether a new blob was created)
+        """
+        with open(source_path, "rb") as f:
+            return self.put_stream(f)
+
+    def delete(self, content_hash: str) -> bool:
+        """Delete a blob, in every compression, and prune its empty shard directories.
+
+        Returns:
+            True if a blob was deleted
+        """
+        paths = [
+            path
+            for path in (self.blob_path(content_hash, name) for name in BLOB_SUFFIXES)
+            if path.exists()
+        ]
+        if not paths:
+            return False
+
+        for path in paths:
+            path.unlink()
+        for directory in (paths[0].parent, paths[0].parent.parent):
+            try:
+                directory.rmdir()
+            except OSError:
+                break
+        return True
@@ -0,0 +1,60 @@
+"""Change detection for syncing database rows to markdown files.
+
+Each synced entity stores a hash of the fields it last wrote to markdown
+(``markdown_hash``). Re-syncing an entity whose fields hash the same is a
+no-op: the file is neither read nor rewritten, so unchanged entities don't
+churn ``updated_at`` timestamps or git history.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+def field_hash(fields: Dict[str, Any]) -> str:
+    """Hash a set of field values independently of key order."""
+    payload = json.dumps(fields, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def fields_match(metadata: Dict[str, Any], fields: Dict[str, Any]) -> bool:
+    """Check whether frontmatter already holds the given field values.
+
+    Empty values (None, "", []) are treated as equal to a missing key.
+    """
+    return all((metadata.get(key) or None) == (value or None) for key, value in fields.items())
+
+
+class DirtySet:
+    """Entities queued for a batch markdown sync, keyed by (model, id).
+
+    Marking an entity twice keeps a single entry, so it is written at most
+    once per batch.
+    """
+
+    def __init__(self):
+        """Initialize an empty dirty set."""
+        self._entities: Dict[Tuple[str, int], Any] = {}
+
+    def add(self, entity: Any) -> None:
+        """Mark an entity as dirty."""
+        self._entities[(type(entity).__name__, entity.id)] = entity
+
+    def discard(self, entity: Any) -> None:
+        """Remove an entity from the dirty set if present."""
+        self._entities.pop((type(entity).__name__, entity.id), None)
+
+    def drain(self) -> List[Any]:
+        """Return all dirty entities and clear the set."""
+        entities = list(self._entities.values())
+        self._entities.clear()
+        return entities
+
+    def __contains__(self, entity: Any) -> bool:
+        return (type(entity).__name__, entity.id) in self._entities
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(list(self._entities.values()))
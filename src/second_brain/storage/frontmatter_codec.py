@@ -0,0 +1,229 @@
+"""Fast frontmatter reader/writer for the flat metadata this project writes.
+
+``python-frontmatter`` runs every file through the pure-Python PyYAML
+loader and dumper, which dominates the cost of small markdown operations.
+Our metadata is always a flat mapping of scalars (strings, ISO timestamps,
+ints, bools, None) and lists of strings, so this module reads and writes
+that shape directly.
+
+The output is byte-identical to ``frontmatter.dumps`` and the parsed
+metadata is identical to ``frontmatter.load``. Anything outside the flat
+schema (nested mappings, floats, block scalars, long lines that PyYAML would
+wrap, ...) falls back to PyYAML for the whole block, so behavior never
+differs from the library.
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO, Union
+
+import yaml
+from frontmatter import Post
+from frontmatter.default_handlers import YAMLHandler
+
+__all__ = ["Post", "load", "loads", "dumps", "parse_metadata", "format_metadata"]
+
+# Same delimiter rule as frontmatter.YAMLHandler
+FM_BOUNDARY = YAMLHandler.FM_BOUNDARY
+
+# PyYAML wraps plain and quoted scalars past this column
+YAML_WIDTH = 80
+
+KEY_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Strings PyYAML writes as plain scalars in block context (provided they do
+# not resolve to another type). Deliberately narrower than what YAML allows.
+PLAIN_RE = re.compile(r"^\w[\w .,/()+-]*(?<! )$")
+
+# Strings safe to write single-quoted when they would otherwise resolve to
+# another type (ISO timestamps, dates, numeric strings, "yes", ...)
+QUOTABLE_RE = re.compile(r"^[\w .,:/+-]*$")
+
+INT_RE = re.compile(r"^-?(?:0|[1-9][0-9]*)$")
+
+STR_TAG = "tag:yaml.org,2002:str"
+INT_TAG = "tag:yaml.org,2002:int"
+BOOL_TAG = "tag:yaml.org,2002:bool"
+NULL_TAG = "tag:yaml.org,2002:null"
+
+# PyYAML's implicit resolvers, keyed by first character
+_IMPLICIT = yaml.resolver.Resolver.yaml_implicit_resolvers
+
+
+class _Fallback(Exception):
+    """Raised internally when a value needs full PyYAML."""
+
+
+def _resolve(value: str) -> str:
+    """Get the tag PyYAML would resolve a plain scalar to."""
+    for tag, regexp in _IMPLICIT.get(value[:1], ()):
+        if regexp.match(value):
+            return tag
+    return STR_TAG
+
+
+@lru_cache(maxsize=256)
+def _is_plain_key(key: str) -> bool:
+    """Check whether a key is written and read back as a plain string."""
+    return bool(KEY_RE.match(key)) and _resolve(key) == STR_TAG
+
+
+# Writing
+
+
+def _format_scalar(value: Any) -> str:
+    """Format a scalar exactly as PyYAML's SafeDumper would."""
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if type(value) is int:
+        return str(value)
+    if type(value) is not str:
+        raise _Fallback
+
+    if value == "":
+        return "''"
+    if _resolve(value) == STR_TAG:
+        if PLAIN_RE.match(value):
+            return value
+    elif QUOTABLE_RE.match(value) and value.strip() == value:
+        # Would read back as another type, so PyYAML single-quotes it
+        return f"'{value}'"
+    raise _Fallback
+
+
+def _format_lines(metadata: Dict[str, Any]) -> List[str]:
+    """Format metadata as YAML lines, raising _Fallback if unsupported."""
+    lines = []
+    for key in sorted(metadata):
+        if type(key) is not str or not _is_plain_key(key):
+            raise _Fallback
+
+        value = metadata[key]
+        if type(value) is list:
+            if not value:
+                lines.append(f"{key}: []")
+                continue
+            lines.append(f"{key}:")
+            lines.extend(f"- {_format_scalar(item)}" for item in value)
+        else:
+            lines.append(f"{key}: {_format_scalar(value)}")
+
+    for line in lines:
+        if len(line) > YAML_WIDTH:
+            raise _Fallback
+    return lines
+
+
+def format_metadata(metadata: Dict[str, Any]) -> str:
+    """Format metadata as frontmatter YAML (without delimiters)."""
+    if not metadata:
+        return YAMLHandler().export(metadata)
+    try:
+        return "\n".join(_format_lines(metadata))
+    except _Fallback:
+        return YAMLHandler().export(metadata)
+
+
+def dumps(post: Post) -> str:
+    """Serialize a post to text, like ``frontmatter.dumps``."""
+    metadata = format_metadata(post.metadata)
+    return f"---\n{metadata}\n---\n\n{post.content}\n".strip()
+
+
+# Reading
+
+
+def _parse_scalar(text: str) -> Any:
+    """Parse a scalar exactly as PyYAML's SafeLoader would."""
+    if len(text) >= 2 and text[0] == "'" and text[-1] == "'":
+        inner = text[1:-1]
+        if "'" in inner.replace("''", ""):
+            raise _Fallback
+        return inner.replace("''", "'")
+
+    if not PLAIN_RE.match(text):
+        raise _Fallback
+
+    tag = _resolve(text)
+    if tag == STR_TAG:
+        return text
+    if tag == INT_TAG and INT_RE.match(text):
+        return int(text)
+    if tag == BOOL_TAG and text in ("true", "false"):
+        return text == "true"
+    if tag == NULL_TAG and text == "null":
+        return None
+    raise _Fallback
+
+
+def _parse_lines(fm: str) -> Dict[str, Any]:
+    """Parse flat frontmatter YAML, raising _Fallback if unsupported."""
+    metadata: Dict[str, Any] = {}
+    list_key: Optional[str] = None
+
+    for line in fm.strip().split("\n"):
+        if line.startswith("- "):
+            if list_key is None:
+                raise _Fallback
+            if metadata[list_key] is None:
+                metadata[list_key] = []
+            metadata[list_key].append(_parse_scalar(line[2:]))
+            continue
+
+        key, sep, value = line.partition(":")
+        if not sep or not _is_plain_key(key):
+            raise _Fallback
+
+        list_key = None
+        if not value:
+            # Start of a block list, or null if no items follow
+            metadata[key] = None
+            list_key = key
+        elif value == " []":
+            metadata[key] = []
+        elif value[0] == " ":
+            metadata[key] = _parse_scalar(value[1:])
+        else:
+            raise _Fallback
+
+    return metadata
+
+
+def parse_metadata(fm: str) -> Any:
+    """Parse the YAML between the frontmatter delimiters."""
+    if not fm.strip():
+        return None
+    try:
+        return _parse_lines(fm)
+    except _Fallback:
+        return YAMLHandler().load(fm)
+
+
+def loads(text: str) -> Post:
+    """Parse text with frontmatter, like ``frontmatter.loads``."""
+    text = text.strip()
+    if not FM_BOUNDARY.match(text):
+        return Post(text)
+
+    try:
+        _, fm, content = FM_BOUNDARY.split(text, 2)
+    except ValueError:
+        return Post(text)
+
+    metadata = parse_metadata(fm)
+    if not isinstance(metadata, dict):
+        metadata = {}
+    return Post(content.strip(), **metadata)
+
+
+def load(fd: Union[str, Path, TextIO]) -> Post:
+    """Load a file or file-like object, like ``frontmatter.load``."""
+    if hasattr(fd, "read"):
+        return loads(fd.read())
+    with open(fd, "r", encoding="utf-8") as f:
+        return loads(f.read())
@@ -2,12 +2,34 @@
 
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Dict, Iterable, Optional, List
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-
-from ..db import Project, Task, WorkLog, Note, Transcript
-from ..db.operations import ProjectOps, WorkLogOps, NoteOps, TranscriptOps
+from sqlalchemy.orm.attributes import set_committed_value
+
+from ..db import Project, Task, WorkLog, Note, NoteAttachment, Transcript
+from ..db.operations import (
+    ProjectOps,
+    WorkLogOps,
+    NoteOps,
+    TranscriptOps,
+    BlobOps,
+    NoteAttachmentOps,
+)
+from .change_tracking import DirtySet, field_hash, fields_match
 from .markdown import MarkdownStorage
+from .raw_transcript import RawTranscriptWriter
+
+
+class DuplicateTranscriptError(Exception):
+    """Raised when importing a transcript whose raw text is already stored."""
+
+    def __init__(self, transcript: Transcript):
+        """Initialize with the transcript that already has this content."""
+        self.transcript = transcript
+        super().__init__(
+            f"Transcript already imported as #{transcript.id}: {transcript.title}"
+        )
 
 
 class StorageIndexer:
@@ -22,13 +44,18 @@ class StorageIndexer:
         """
         self.session = session
 
+        from ..config import get_config
+        config = get_config()
+
         # Use global config if base_path not provided
         if base_path is None:
-            from ..config import get_config
-            config = get_config()
             base_path = str(config.data_dir)
 
-        self.storage = MarkdownStorage(base_path)
+        self.storage = MarkdownStorage(base_path, **config.get_storage_config())
+
+        # Entities queued for a batch markdown sync (sync_all_to_markdown); single
+        # updates are written directly by sync_*_to_markdown
+        self.dirty = DirtySet()
 
     def sync_project_to_db(self, slug: str) -> Optional[Project]:
         """Read project markdown and sync to database."""
@@ -68,27 +95,49 @@ class StorageIndexer:
         return project
 
     def sync_project_to_markdown(self, project: Project) -> bool:
-        """Sync project from database to markdown file."""
+        """Sync project from database to markdown file.
+
+        Skipped when the synced fields are unchanged since the last sync, or
+        when the file already holds them.
+
+        Returns:
+            True if the markdown file was written
+        """
+        written = self._write_project_markdown(project)
+        self.session.commit()
+        return written
+
+    def _project_fields(self, project: Project) -> Dict[str, Any]:
+        """Fields of a project that are mirrored into its markdown file."""
+        return {
+            "name": project.name,
+            "slug": project.slug,
+            "status": project.status,
+            "description": project.description,
+            "jira_project_key": project.jira_project_key,
+            "tags": project.tags.split(",") if project.tags else [],
+        }
+
+    def _write_project_markdown(self, project: Project) -> bool:
+        """Write a project's markdown if its fields changed (no commit)."""
+        fields = self._project_fields(project)
+        digest = field_hash(fields)
+        if project.markdown_hash == digest and Path(project.markdown_path).exists():
+            return False
+
         # Read existing file or create template
         project_data = self.storage.read_project_file(project.slug)
 
+        written = True
         if project_data:
-            # Update metadata
             metadata = project_data["metadata"]
-            metadata.update(
-                {
-                    "name": project.name,
-                    "slug": project.slug,
-                    "status": project.status,
-                    "description": project.description,
-                    "jira_project_key": project.jira_project_key,
-                    "tags": project.tags.split(",") if project.tags else [],
-                    "updated_at": datetime.utcnow().isoformat(),
-                }
-            )
-            return self.storage.update_project_file(
-                project.slug, metadata, project_data["content"]
-            )
+            if fields_match(metadata, fields):
+                written = False
+            else:
+                metadata.update(fields)
+                self.storage.update_project_file(
+                    project.slug, metadata, project_data["content"]
+                )
         else:
             # Create new file
             self.storage.create_project_file(
@@ -96,9 +145,21 @@ class StorageIndexer:
                 slug=project.slug,
                 description=project.description,
                 jira_project_key=project.jira_project_key,
-                tags=project.tags.split(",") if project.tags else None,
+                tags=fields["tags"] or None,
             )
-            return True
+
+        self._store_markdown_hash(project, digest)
+        return written
+
+    def _store_markdown_hash(self, entity, digest: str) -> None:
+        """Record the synced field hash without touching ``updated_at``."""
+        model = type(entity)
+        self.session.execute(
+            update(model)
+            .where(model.id == entity.id)
+            .values(markdown_hash=digest, updated_at=model.updated_at)
+        )
+        set_committed_value(entity, "markdown_hash", digest)
 
     def sync_work_log_to_db(self, date: datetime) -> Optional[WorkLog]:
         """Read work log markdown and sync to database."""
@@ -141,9 +202,12 @@ class StorageIndexer:
         # Parse date
         transcript_date = datetime.fromisoformat(metadata["date"])
 
-        # Check if transcript already exists by path
-        # For simplicity, we'll create new for now
-        # In production, you'd want to check for duplicates
+        # Identical raw content is already indexed
+        content_hash = metadata.get("content_hash")
+        if content_hash:
+            existing = TranscriptOps.get_by_content_hash(self.session, content_hash)
+            if existing:
+                return existing
 
         transcript = TranscriptOps.create(
             self.session,
@@ -154,31 +218,99 @@ class StorageIndexer:
             transcript_type=metadata.get("type", "call"),
             summary=metadata.get("summary"),
             tags=",".join(metadata.get("tags", [])) if metadata.get("tags") else None,
+            content_hash=content_hash,
+            word_count=metadata.get("word_count"),
         )
+        self._add_blob_ref(transcript.raw_path, content_hash)
 
         return transcript
 
     def sync_transcript_to_markdown(self, transcript: Transcript) -> bool:
-        """Sync transcript from database to markdown file."""
+        """Sync transcript from database to markdown file.
+
+        Skipped when the synced fields are unchanged since the last sync, or
+        when the file already holds them.
+
+        Returns:
+            True if the markdown file was written
+        """
+        written = self._write_transcript_markdown(transcript)
+        self.session.commit()
+        return written
+
+    def _write_transcript_markdown(self, transcript: Transcript) -> bool:
+        """Write a transcript's processed markdown if its fields changed (no commit)."""
+        if not transcript.processed_path:
+            return False
+
+        fields = {
+            "title": transcript.title,
+            "type": transcript.transcript_type,
+            "summary": transcript.summary,
+            "tags": transcript.tags.split(",") if transcript.tags else [],
+        }
+        digest = field_hash(fields)
+        if transcript.markdown_hash == digest and Path(transcript.processed_path).exists():
+            return False
+
         # Read existing processed file
-        if transcript.processed_path:
-            transcript_data = self.storage.read_transcript_file(transcript.processed_path)
-            if transcript_data:
-                metadata = transcript_data["metadata"]
-                metadata.update(
-                    {
-                        "title": transcript.title,
-                        "type": transcript.transcript_type,
-                        "summary": transcript.summary,
-                        "tags": transcript.tags.split(",") if transcript.tags else [],
-                        "updated_at": datetime.utcnow().isoformat(),
-                    }
-                )
-                return self.storage.update_transcript_file(
-                    transcript.processed_path, metadata, transcript_data["content"]
-                )
+        transcript_data = self.storage.read_transcript_file(transcript.processed_path)
+        if not transcript_data:
+            return False
+
+        written = False
+        metadata = transcript_data["metadata"]
+        if not fields_match(metadata, fields):
+            metadata.update(fields)
+            written = self.storage.update_transcript_file(
+                transcript.processed_path, metadata, transcript_data["content"]
+            )
 
-        return False
+        self._store_markdown_hash(transcript, digest)
+        return written
+
+    def mark_dirty(self, entity) -> None:
+        """Queue a project or transcript for the next ``flush_dirty``.
+
+        Nothing is marked automatically: entity updates write their markdown
+        directly through ``sync_project_to_markdown`` and
+        ``sync_transcript_to_markdown``. The queue is for callers syncing
+        many entities at once, such as ``sync_all_to_markdown``.
+        """
+        self.dirty.add(entity)
+
+    def flush_dirty(self, batch_size: int = 100) -> Dict[str, int]:
+        """Sync every entity queued with ``mark_dirty`` to markdown.
+
+        Unchanged entities are skipped without touching their files. Hash
+        updates are committed every ``batch_size`` entities.
+
+        Returns:
+            Dictionary with "written" and "skipped" counts
+        """
+        counts = {"written": 0, "skipped": 0}
+        for i, entity in enumerate(self.dirty.drain(), start=1):
+            if isinstance(entity, Project):
+                written = self._write_project_markdown(entity)
+            elif isinstance(entity, Transcript):
+                written = self._write_transcript_markdown(entity)
+            else:
+                raise TypeError(f"Cannot sync {type(entity).__name__} to markdown")
+
+            counts["written" if written else "skipped"] += 1
+            if i % batch_size == 0:
+                self.session.commit()
+
+        self.session.commit()
+        return counts
+
+    def sync_all_to_markdown(self) -> Dict[str, int]:
+        """Sync all projects and transcripts to markdown, skipping unchanged ones."""
+        for project in ProjectOps.list_all(self.session):
+            self.mark_dirty(project)
+        for transcript in TranscriptOps.list_all(self.session, load_text=True):
+            self.mark_dirty(transcript)
+        return self.flush_dirty()
 
     def create_project(
         self,
@@ -221,8 +353,7 @@ class StorageIndexer:
     ) -> WorkLog:
         """Add an entry to work log (markdown and database)."""
         # Get or create work log
-        date_str = date.strftime("%Y-%m-%d")
-        filepath = str(self.storage.work_logs_path / f"{date_str}.md")
+        filepath = str(self.storage.work_log_path(date))
         work_log = WorkLogOps.get_or_create(self.session, date, filepath)
 
         # Add to markdown
@@ -248,11 +379,59 @@ class StorageIndexer:
         tags: Optional[list] = None,
     ) -> Transcript:
         """Create a new transcript with files and database entry."""
-        # Create markdown files
-        raw_path, processed_path = self.storage.create_transcript_file(
+        return self.import_transcript(
+            title, [raw_content], transcript_date, transcript_type=transcript_type, tags=tags
+        )
+
+    def import_transcript(
+        self,
+        title: str,
+        chunks: Iterable[str],
+        transcript_date: datetime,
+        transcript_type: str = "call",
+        tags: Optional[list] = None,
+    ) -> Transcript:
+        """Create a transcript from an iterable of text chunks.
+
+        Chunks are written to disk as they arrive, so the full transcript is
+        never held in memory. The content hash and word count are computed
+        while writing.
+        """
+        writer = self.storage.open_transcript_writer()
+        try:
+            for chunk in chunks:
+                writer.write(chunk)
+        except BaseException:
+            writer.abort()
+            raise
+
+        return self.finish_transcript(
+            writer, title, transcript_date, transcript_type=transcript_type, tags=tags
+        )
+
+    def finish_transcript(
+        self,
+        writer: RawTranscriptWriter,
+        title: str,
+        transcript_date: datetime,
+        transcript_type: str = "call",
+        tags: Optional[list] = None,
+    ) -> Transcript:
+        """Commit a raw transcript writer and create the database entry.
+
+        Raises:
+            DuplicateTranscriptError: If a transcript with identical raw text
+                already exists. The written text is discarded.
+        """
+        existing = TranscriptOps.get_by_content_hash(self.session, writer.content_hash)
+        if existing:
+            writer.abort()
+            raise DuplicateTranscriptError(existing)
+
+        raw_path, processed_path = self.storage.finish_transcript_file(
+            writer,
             title=title,
             transcript_date=transcript_date,
-            raw_content=raw_content,
             transcript_type=transcript_type,
             tags=tags,
         )
@@ -266,10 +445,82 @@ class StorageIndexer:
             transcript_date=transcript_date,
             transcript_type=transcript_type,
             tags=",".join(tags) if tags else None,
+            content_hash=writer.content_hash,
+            word_count=writer.word_count,
         )
+        self._add_blob_ref(raw_path, writer.content_hash)
 
         return transcript
 
+    def _add_blob_ref(self, path: str, content_hash: Optional[str]) -> None:
+        """Count a reference to a blob-stored file."""
+        if content_hash and path and self.storage.blobs.contains(Path(path)):
+            BlobOps.add_ref(self.session, content_hash, path, Path(path).stat().st_size)
+
+    def _release_blob(self, content_hash: str) -> None:
+        """Drop a blob reference and delete the file once unreferenced."""
+        if BlobOps.release(self.session, content_hash) == 0:
+            self.storage.blobs.delete(content_hash)
+
+    def attach_file_to_note(
+        self, note_id: int, source_path: str, filename: Optional[str] = None
+    ) -> Optional[NoteAttachment]:
+        """Attach a file to a note.
+
+        The file content is stored once in the blob store no matter how many
+        notes attach it. The note's frontmatter lists its attachments.
+
+        Args:
+            note_id: Note to attach to
+            source_path: File to attach
+            filename: Display name (defaults to the source file name)
+
+        Returns:
+            The attachment, or None if the note does not exist
+        """
+        note = NoteOps.get_by_id(self.session, note_id)
+        if not note:
+            return None
+
+        content_hash, blob_path, _ = self.storage.blobs.put_file(Path(source_path))
+        size_bytes = blob_path.stat().st_size
+        blob = BlobOps.add_ref(self.session, content_hash, str(blob_path), size_bytes)
+        if blob.path != str(blob_path):
+            # The row was created for a compressed transcript; point it at the readable file
+            blob.path = str(blob_path)
+            blob.size_bytes = size_bytes
+            self.session.commit()
+
+        attachment = NoteAttachmentOps.create(
+            self.session,
+            note_id=note_id,
+            filename=filename or Path(source_path).name,
+            content_hash=content_hash,
+            size_bytes=size_bytes,
+        )
+        self._sync_note_attachments(note_id)
+        return attachment
+
+    def detach_from_note(self, attachment_id: int) -> bool:
+        """Remove a note attachment, deleting the blob if nothing else uses it."""
+        attachment = NoteAttachmentOps.get_by_id(self.session, attachment_id)
+        if not attachment:
+            return False
+
+        note_id = attachment.note_id
+        content_hash = attachment.content_hash
+        NoteAttachmentOps.delete(self.session, attachment)
+        self._release_blob(content_hash)
+        self._sync_note_attachments(note_id)
+        return True
+
+    def _sync_note_attachments(self, note_id: int) -> None:
+        """Write a note's attachment list into its frontmatter."""
+        attachments = NoteAttachmentOps.list_by_note(self.session, note_id)
+        self.storage.set_note_attachments(
+            note_id, [f"{a.content_hash} {a.filename}" for a in attachments]
+        )
+
     def create_note(
         self,
         title: str,
@@ -321,7 +572,7 @@ class StorageIndexer:
 
         # Use existing values if not provided
         updated_title = title if title is not None else note.title
-        updated_content = content if content is not None else note.content
+        updated_content = content if content is not None else note.full_content
         updated_tags = ",".join(tags) if tags is not None else note.tags
 
         # Update markdown file
@@ -344,7 +595,12 @@ class StorageIndexer:
         return note
 
     def append_to_note(self, note_id: int, additional_content: str) -> Optional[Note]:
-        """Append content to an existing note."""
+        """Append content to an existing note.
+
+        The content is stored as a new chunk and appended to the markdown
+        file; neither the note's existing content nor its file is rewritten.
+        ``Note.full_content`` materializes the whole note when it is read.
+        """
         note = NoteOps.get_by_id(self.session, note_id)
         if not note:
             return None
@@ -352,12 +608,56 @@ class StorageIndexer:
         # Append to markdown file
         self.storage.append_to_note(note_id, additional_content)
 
-        # Update database content
-        updated_content = note.content + f"\n\n{additional_content}"
-        NoteOps.update(self.session, note, content=updated_content)
+        # Store the appended content as a chunk
+        NoteOps.append_chunk(self.session, note_id, additional_content)
 
         return note
 
     def search_notes(self, query_text: str) -> List[Note]:
         """Search notes by title or content."""
         return NoteOps.search(self.session, query_text)
+
+    def migrate_layout(
+        self,
+        note_layout: Optional[str] = None,
+        transcript_layout: Optional[str] = None,
+    ) -> dict:
+        """Move note and transcript files into a new directory layout.
+
+        Files are moved one by one and the stored paths (``Note.markdown_path``,
+        ``Transcript.raw_path``/``processed_path``) are updated in a single
+        commit at the end.
+
+        Args:
+            note_layout: Target note layout (unchanged if None)
+            transcript_layout: Target transcript layout (unchanged if None)
+
+        Returns:
+            Dictionary with counts of moved notes and transcripts
+        """
+        moved = {"notes": 0, "transcripts": 0}
+
+        if note_layout:
+            for note in NoteOps.list_all(self.session):
+                new_path = self.storage.migrate_note_file(note.id, note_layout)
+                if new_path and new_path != note.markdown_path:
+                    note.markdown_path = new_path
+                    moved["notes"] += 1
+            self.storage.note_layout = note_layout
+
+        if transcript_layout:
+            for transcript in TranscriptOps.list_all(self.session):
+                raw_path, processed_path = self.storage.migrate_transcript_files(
+                    transcript.raw_path,
+                    transcript.processed_path,
+                    transcript.transcript_date,
+                    transcript_layout,
+                )
+                if (raw_path, processed_path) != (transcript.raw_path, transcript.processed_path):
+                    transcript.raw_path = raw_path
+                    transcript.processed_path = processed_path
+                    moved["transcripts"] += 1
+            self.storage.transcript_layout = transcript_layout
+
+        self.session.commit()
+        return moved
@@ -4,19 +4,63 @@ import os
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, Optional
-import frontmatter
+
+from . import frontmatter_codec, writes
+from .archive import WorkLogArchive
+from .blobs import BlobStore
+from .raw_transcript import (
+    RawTranscript,
+    RawTranscriptWriter,
+    check_compression,
+)
+
+
+# Supported directory layouts. "flat" keeps every file in one directory;
+# "sharded" spreads notes over two levels of id-derived subdirectories and
+# "monthly" files transcripts under YYYY/MM/.
+NOTE_LAYOUTS = ("flat", "sharded")
+TRANSCRIPT_LAYOUTS = ("flat", "monthly")
 
 
 class MarkdownStorage:
     """Handle markdown file operations."""
 
-    def __init__(self, base_path: str = "data"):
-        """Initialize with base data path."""
+    def __init__(
+        self,
+        base_path: str = "data",
+        note_layout: str = "flat",
+        transcript_layout: str = "flat",
+        raw_compression: str = "none",
+        durability: str = "rename",
+    ):
+        """Initialize with base data path.
+
+        Args:
+            base_path: Base data directory
+            note_layout: Directory layout for notes (flat, sharded)
+            transcript_layout: Directory layout for transcripts (flat, monthly)
+            raw_compression: Compression for new raw transcripts (none, gzip, zstd)
+            durability: "rename" for atomic temp-file writes, "fsync" to also
+                fsync each write to disk
+        """
+        if note_layout not in NOTE_LAYOUTS:
+            raise ValueError(f"Unknown note layout: {note_layout}")
+        if transcript_layout not in TRANSCRIPT_LAYOUTS:
+            raise ValueError(f"Unknown transcript layout: {transcript_layout}")
+        check_compression(raw_compression)
+        writes.check_durability(durability)
+
         self.base_path = Path(base_path)
+        self.note_layout = note_layout
+        self.transcript_layout = transcript_layout
+        self.raw_compression = raw_compression
+        self.durability = durability
         self.projects_path = self.base_path / "projects"
         self.work_logs_path = self.base_path / "work_logs"
         self.notes_path = self.base_path / "notes"
         self.transcripts_path = self.base_path / "transcripts"
+        self.archive = WorkLogArchive(self.work_logs_path / "archive")
+        self.blobs = BlobStore(self.base_path / "blobs")
 
         # Ensure directories exist
         self.projects_path.mkdir(parents=True, exist_ok=True)
@@ -28,6 +72,81 @@ class MarkdownStorage:
         """Convert text to slug format."""
         return text.lower().replace(" ", "-").replace("_", "-")
 
+    # File I/O
+    def _read_post(self, filepath: Path) -> frontmatter_codec.Post:
+        """Read a markdown file, including any write still pending in the queue."""
+        return frontmatter_codec.loads(writes.read_text(filepath))
+
+    def _write_post(self, filepath: Path, post: frontmatter_codec.Post) -> None:
+        """Write a markdown file atomically (possibly deferred by write-behind)."""
+        writes.write_text(filepath, frontmatter_codec.dumps(post), self.durability)
+
+    def flush(self) -> int:
+        """Write out any markdown updates pending in the write-behind queue.
+
+        Returns:
+            Number of files written
+        """
+        return writes.flush()
+
+    # Path resolution
+    def note_path(self, note_id: int, layout: Optional[str] = None) -> Path:
+        """Get the path of a note file under the given (or configured) layout.
+
+        The sharded layout zero-pads the ID to six digits and uses the first
+        two pairs as directories, e.g. note 1234 -> notes/00/12/note-1234.md.
+        """
+        layout = layout or self.note_layout
+        filename = f"note-{note_id}.md"
+        if layout == "sharded":
+            digits = f"{note_id:06d}"
+            return self.notes_path / digits[:2] / digits[2:4] / filename
+        return self.notes_path / filename
+
+    def find_note_path(self, note_id: int) -> Optional[Path]:
+        """Locate an existing note file.
+
+        Checks the configured layout first, then the other layouts so notes
+        written before a layout change are still found. Never globs.
+        """
+        layouts = [self.note_layout] + [
+            layout for layout in NOTE_LAYOUTS if layout != self.note_layout
+        ]
+        for layout in layouts:
+            filepath = self.note_path(note_id, layout)
+            if filepath.exists():
+                return filepath
+        return None
+
+    def transcript_dir(
+        self, kind: str, transcript_date: datetime, layout: Optional[str] = None
+    ) -> Path:
+        """Get the directory for raw or processed transcripts.
+
+        Args:
+            kind: "raw" or "processed"
+            transcript_date: Date of the transcript
+            layout: Layout override (defaults to the configured layout)
+        """
+        layout = layout or self.transcript_layout
+        directory = self.transcripts_path / kind
+        if layout == "monthly":
+            directory = directory / transcript_date.strftime("%Y") / transcript_date.strftime("%m")
+        return directory
+
+    def _iter_note_files(self, directory: Optional[Path] = None):
+        """Yield note file paths by walking shard directories with scandir."""
+        directory = directory or self.notes_path
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if entry.is_dir():
+                yield from self._iter_note_files(Path(entry.path))
+            elif entry.name.startswith("note-") and entry.name.endswith(".md"):
+                yield Path(entry.path)
+
     # Project operations
     def create_project_file(
         self,
@@ -70,9 +189,8 @@ class MarkdownStorage:
 <!-- Add project notes here -->
 """
 
-        post = frontmatter.Post(content, **metadata)
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(frontmatter.dumps(post))
+        post = frontmatter_codec.Post(content, **metadata)
+        self._write_post(filepath, post)
 
         return str(filepath)
 
@@ -82,8 +200,7 @@ class MarkdownStorage:
         if not filepath.exists():
             return None
 
-        with open(filepath, "r", encoding="utf-8") as f:
-            post = frontmatter.load(f)
+        post = self._read_post(filepath)
 
         return {
             "metadata": post.metadata,
@@ -98,10 +215,9 @@ class MarkdownStorage:
             return False
 
         metadata["updated_at"] = datetime.utcnow().isoformat()
-        post = frontmatter.Post(content, **metadata)
+        post = frontmatter_codec.Post(content, **metadata)
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(frontmatter.dumps(post))
+        self._write_post(filepath, post)
 
         return True
 
@@ -131,42 +247,51 @@ class MarkdownStorage:
 <!-- Additional notes -->
 """
 
-        post = frontmatter.Post(content, **metadata)
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(frontmatter.dumps(post))
+        post = frontmatter_codec.Post(content, **metadata)
+        self._write_post(filepath, post)
 
         return str(filepath)
 
+    def work_log_path(self, date: datetime) -> Path:
+        """Get the live work log file path for a date."""
+        return self.work_logs_path / f"{date.strftime('%Y-%m-%d')}.md"
+
     def read_work_log_file(self, date: datetime) -> Optional[Dict[str, Any]]:
-        """Read a work log markdown file."""
-        date_str = date.strftime("%Y-%m-%d")
-        filepath = self.work_logs_path / f"{date_str}.md"
+        """Read a work log markdown file.
 
-        if not filepath.exists():
-            return None
+        Live files take precedence; days that have been packed into a monthly
+        archive are read from the archive without unpacking it.
+        """
+        filepath = self.work_log_path(date)
 
-        with open(filepath, "r", encoding="utf-8") as f:
-            post = frontmatter.load(f)
+        archived = False
+        if filepath.exists():
+            post = self._read_post(filepath)
+        else:
+            text = self.archive.read_day(date)
+            if text is None:
+                return None
+            post = frontmatter_codec.loads(text)
+            archived = True
 
         return {
             "metadata": post.metadata,
             "content": post.content,
             "filepath": str(filepath),
+            "archived": archived,
         }
 
     def append_to_work_log(
         self, date: datetime, entry: str, task_ref: Optional[str] = None
     ) -> bool:
         """Append an entry to a work log file."""
-        date_str = date.strftime("%Y-%m-%d")
-        filepath = self.work_logs_path / f"{date_str}.md"
+        filepath = self.work_log_path(date)
 
-        # Create file if it doesn't exist
-        if not filepath.exists():
+        # Restore an archived day, or create the file if it doesn't exist
+        if not filepath.exists() and not self.restore_work_log(date):
             self.create_work_log_file(date)
 
-        with open(filepath, "r", encoding="utf-8") as f:
-            post = frontmatter.load(f)
+        post = self._read_post(filepath)
 
         # Add entry to content
         timestamp = datetime.now().strftime("%H:%M")
@@ -196,11 +321,87 @@ class MarkdownStorage:
         post.content = "\n".join(content_lines)
         post.metadata["updated_at"] = datetime.utcnow().isoformat()
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(frontmatter.dumps(post))
+        self._write_post(filepath, post)
+
+        return True
+
+    def restore_work_log(self, date: datetime) -> bool:
+        """Copy an archived day back into a live work log file.
 
+        The archive keeps its copy; the live file wins on read and replaces
+        the archived copy the next time the month is packed.
+
+        Returns:
+            True if the day was found in the archive
+        """
+        text = self.archive.read_day(date)
+        if text is None:
+            return False
+
+        writes.write_text(self.work_log_path(date), text, self.durability)
         return True
 
+    def list_live_work_log_dates(self) -> list[datetime]:
+        """List dates that have a live (unpacked) work log file."""
+        dates = []
+        for entry in os.scandir(self.work_logs_path):
+            if not entry.is_file() or not entry.name.endswith(".md"):
+                continue
+            try:
+                dates.append(datetime.strptime(entry.name[:-3], "%Y-%m-%d"))
+            except ValueError:
+                continue
+        return sorted(dates)
+
+    def pack_work_logs(self, before: datetime) -> list[tuple[int, int, int]]:
+        """Pack live work logs of every month before ``before``'s month.
+
+        Days already in a month's archive are kept; live files replace their
+        archived copy and are deleted once the archive has been written.
+
+        Returns:
+            List of (year, month, days in archive) for each packed month
+        """
+        self.flush()
+
+        cutoff = (before.year, before.month)
+        by_month: Dict[tuple[int, int], list[datetime]] = {}
+        for date in self.list_live_work_log_dates():
+            if (date.year, date.month) < cutoff:
+                by_month.setdefault((date.year, date.month), []).append(date)
+
+        packed = []
+        for (year, month), dates in sorted(by_month.items()):
+            days = self.archive.read_month(year, month)
+            for date in dates:
+                days[date.day] = self.work_log_path(date).read_bytes()
+
+            self.archive.write_month(year, month, days)
+            for date in dates:
+                self.work_log_path(date).unlink()
+            packed.append((year, month, len(days)))
+
+        return packed
+
+    def unpack_work_logs(self, year: int, month: int) -> int:
+        """Unpack a month's archive back into live work log files.
+
+        Existing live files are left untouched since they are newer than
+        their archived copy.
+
+        Returns:
+            Number of files written
+        """
+        written = 0
+        for day, data in self.archive.read_month(year, month).items():
+            filepath = self.work_log_path(datetime(year, month, day))
+            if not filepath.exists():
+                writes.atomic_write_bytes(filepath, data, self.durability)
+                written += 1
+
+        self.archive.remove_month(year, month)
+        return written
+
     # Note operations
     def create_note_file(
         self,
@@ -212,7 +413,8 @@ class MarkdownStorage:
         tags: Optional[list] = None,
     ) -> str:
         """Create a note markdown file."""
-        filepath = self.notes_path / f"note-{note_id}.md"
+        filepath = self.note_path(note_id)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
 
         metadata = {
             "id": note_id,
@@ -234,20 +436,18 @@ class MarkdownStorage:
 {content}
 """
 
-        post = frontmatter.Post(full_content, **metadata)
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(frontmatter.dumps(post))
+        post = frontmatter_codec.Post(full_content, **metadata)
+        self._write_post(filepath, post)
 
         return str(filepath)
 
     def read_note_file(self, note_id: int) -> Optional[Dict[str, Any]]:
         """Read a note markdown file."""
-        filepath = self.notes_path / f"note-{note_id}.md"
-        if not filepath.exists():
+        filepath = self.find_note_path(note_id)
+        if filepath is None:
             return None
 
-        with open(filepath, "r", encoding="utf-8") as f:
-            post = frontmatter.load(f)
+        post = self._read_post(filepath)
 
         return {
             "metadata": post.metadata,
@@ -263,13 +463,12 @@ class MarkdownStorage:
         metadata: Optional[Dict[str, Any]] = None,
     ) -> bool:
         """Update a note markdown file."""
-        filepath = self.notes_path / f"note-{note_id}.md"
-        if not filepath.exists():
+        filepath = self.find_note_path(note_id)
+        if filepath is None:
             return False
 
         # Read existing metadata
-        with open(filepath, "r", encoding="utf-8") as f:
-            existing_post = frontmatter.load(f)
+        existing_post = self._read_post(filepath)
 
         # Merge metadata
         updated_metadata = existing_post.metadata.copy()
@@ -284,40 +483,60 @@ class MarkdownStorage:
 {content}
 """
 
-        post = frontmatter.Post(full_content, **updated_metadata)
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(frontmatter.dumps(post))
+        post = frontmatter_codec.Post(full_content, **updated_metadata)
+        self._write_post(filepath, post)
 
         return True
 
     def append_to_note(self, note_id: int, additional_content: str) -> bool:
-        """Append content to an existing note."""
-        filepath = self.notes_path / f"note-{note_id}.md"
-        if not filepath.exists():
+        """Append content to an existing note.
+
+        The new segment is appended to the end of the file without reading
+        or rewriting it, so appends stay cheap however large the note gets.
+        The frontmatter ``updated_at`` is left as is; the database records
+        when the note was last appended to.
+        """
+        filepath = self.find_note_path(note_id)
+        if filepath is None:
             return False
 
-        with open(filepath, "r", encoding="utf-8") as f:
-            post = frontmatter.load(f)
-
         # Add timestamp separator
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
         separator = f"\n\n---\n\n**Added {timestamp}:**\n\n"
 
-        post.content = post.content + separator + additional_content
+        writes.append_text(filepath, separator + additional_content.rstrip(), self.durability)
+
+        return True
+
+    def set_note_attachments(self, note_id: int, attachments: list[str]) -> bool:
+        """Record a note's attachments in its frontmatter.
+
+        Args:
+            note_id: Note ID
+            attachments: Entries of the form "<sha256> <filename>"
+        """
+        filepath = self.find_note_path(note_id)
+        if filepath is None:
+            return False
+
+        post = self._read_post(filepath)
+
+        if attachments:
+            post.metadata["attachments"] = attachments
+        else:
+            post.metadata.pop("attachments", None)
         post.metadata["updated_at"] = datetime.utcnow().isoformat()
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(frontmatter.dumps(post))
+        self._write_post(filepath, post)
 
         return True
 
     def list_note_files(self) -> list[Dict[str, Any]]:
         """List all note markdown files."""
         notes = []
-        for filepath in self.notes_path.glob("note-*.md"):
+        for filepath in self._iter_note_files():
             try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    post = frontmatter.load(f)
+                post = self._read_post(filepath)
                 notes.append({
                     "metadata": post.metadata,
                     "filepath": str(filepath),
@@ -328,6 +547,14 @@ class MarkdownStorage:
         return notes
 
     # Transcript operations
+    def open_transcript_writer(self) -> RawTranscriptWriter:
+        """Open an incremental writer for a new raw transcript.
+
+        Raw text goes to the content-addressed blob store. Finish with
+        ``finish_transcript_file`` once all text has been written.
+        """
+        return self.blobs.open_writer(self.raw_compression)
+
     def create_transcript_file(
         self,
         title: str,
@@ -337,28 +564,44 @@ class MarkdownStorage:
         tags: Optional[list] = None,
     ) -> tuple[str, str]:
         """Create transcript files (raw and processed)."""
-        # Create slug from title and date
-        date_str = transcript_date.strftime("%Y-%m-%d")
-        slug = self.slugify(title)
-        filename_base = f"{date_str}_{slug}"
+        writer = self.open_transcript_writer()
+        try:
+            writer.write(raw_content)
+        except BaseException:
+            writer.abort()
+            raise
+        return self.finish_transcript_file(writer, title, transcript_date, transcript_type, tags)
+
+    def finish_transcript_file(
+        self,
+        writer: RawTranscriptWriter,
+        title: str,
+        transcript_date: datetime,
+        transcript_type: str = "call",
+        tags: Optional[list] = None,
+    ) -> tuple[str, str]:
+        """Commit a raw transcript writer and create the processed markdown file.
 
-        raw_filepath = self.transcripts_path / "raw" / f"{filename_base}.txt"
-        processed_filepath = self.transcripts_path / "processed" / f"{filename_base}.md"
+        The raw text is stored once per distinct content; if an identical
+        blob already exists it is reused.
+        """
+        raw_filepath, _ = self.blobs.commit_writer(writer)
 
-        # Ensure subdirectories exist
-        raw_filepath.parent.mkdir(parents=True, exist_ok=True)
+        date_str = transcript_date.strftime("%Y-%m-%d")
+        slug = self.slugify(title)
+        processed_filepath = (
+            self.transcript_dir("processed", transcript_date) / f"{date_str}_{slug}.md"
+        )
         processed_filepath.parent.mkdir(parents=True, exist_ok=True)
 
-        # Save raw transcript
-        with open(raw_filepath, "w", encoding="utf-8") as f:
-            f.write(raw_content)
-
         # Create processed markdown template
         metadata = {
             "title": title,
             "type": transcript_type,
             "date": transcript_date.isoformat(),
             "raw_file": str(raw_filepath),
+            "content_hash": writer.content_hash,
+            "word_count": writer.word_count,
             "created_at": datetime.utcnow().isoformat(),
         }
 
@@ -391,33 +634,33 @@ class MarkdownStorage:
 See raw file: `{raw_filepath.name}`
 """
 
-        post = frontmatter.Post(content, **metadata)
-        with open(processed_filepath, "w", encoding="utf-8") as f:
-            f.write(frontmatter.dumps(post))
+        post = frontmatter_codec.Post(content, **metadata)
+        self._write_post(processed_filepath, post)
 
         return str(raw_filepath), str(processed_filepath)
 
     def read_transcript_file(self, processed_path: str) -> Optional[Dict[str, Any]]:
-        """Read a processed transcript markdown file."""
+        """Read a processed transcript markdown file.
+
+        The raw transcript is not read; ``raw`` is a lazy ``RawTranscript``
+        handle (or None) that callers can page through or stream.
+        """
         filepath = Path(processed_path)
         if not filepath.exists():
             return None
 
-        with open(filepath, "r", encoding="utf-8") as f:
-            post = frontmatter.load(f)
+        post = self._read_post(filepath)
 
-        # Also read raw transcript if referenced
-        raw_content = None
+        raw = None
         if "raw_file" in post.metadata:
-            raw_path = Path(post.metadata["raw_file"])
-            if raw_path.exists():
-                with open(raw_path, "r", encoding="utf-8") as rf:
-                    raw_content = rf.read()
+            raw_handle = RawTranscript(Path(post.metadata["raw_file"]))
+            if raw_handle.exists:
+                raw = raw_handle
 
         return {
             "metadata": post.metadata,
             "content": post.content,
-            "raw_content": raw_content,
+            "raw": raw,
             "filepath": str(filepath),
         }
 
@@ -430,9 +673,92 @@ See raw file: `{raw_filepath.name}`
             return False
 
         metadata["updated_at"] = datetime.utcnow().isoformat()
-        post = frontmatter.Post(content, **metadata)
+        post = frontmatter_codec.Post(content, **metadata)
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(frontmatter.dumps(post))
+        self._write_post(filepath, post)
 
         return True
+
+    # Layout migration
+    def migrate_note_file(self, note_id: int, layout: str) -> Optional[str]:
+        """Move a note file into the given layout.
+
+        Returns:
+            New file path, or None if the note file does not exist
+        """
+        if layout not in NOTE_LAYOUTS:
+            raise ValueError(f"Unknown note layout: {layout}")
+
+        current = self.find_note_path(note_id)
+        if current is None:
+            return None
+
+        self.flush()
+
+        target = self.note_path(note_id, layout)
+        if current != target:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(current, target)
+            self._prune_empty_dirs(current.parent, self.notes_path)
+        return str(target)
+
+    def migrate_transcript_files(
+        self,
+        raw_path: str,
+        processed_path: Optional[str],
+        transcript_date: datetime,
+        layout: str,
+    ) -> tuple[str, Optional[str]]:
+        """Move a transcript's raw and processed files into the given layout.
+
+        The processed file's ``raw_file`` frontmatter is rewritten to point at
+        the new raw location. Raw files in the blob store are not moved.
+
+        Returns:
+            Tuple of (new raw path, new processed path)
+        """
+        if layout not in TRANSCRIPT_LAYOUTS:
+            raise ValueError(f"Unknown transcript layout: {layout}")
+
+        self.flush()
+
+        new_raw = Path(raw_path)
+        if not self.blobs.contains(new_raw):
+            new_raw = self._move_into(new_raw, self.transcript_dir("raw", transcript_date, layout))
+
+        new_processed = None
+        if processed_path:
+            new_processed = self._move_into(
+                Path(processed_path), self.transcript_dir("processed", transcript_date, layout)
+            )
+            if new_processed.exists():
+                post = self._read_post(new_processed)
+                if post.metadata.get("raw_file") != str(new_raw):
+                    post.metadata["raw_file"] = str(new_raw)
+                    self._write_post(new_processed, post)
+
+        return str(new_raw), str(new_processed) if new_processed else None
+
+    def _move_into(self, source: Path, directory: Path) -> Path:
+        """Move a file into a directory, keeping its name.
+
+        Returns:
+            The new path, or ``source`` unchanged if it doesn't exist
+        """
+        target = directory / source.name
+        if not source.exists():
+            return source
+        if source != target:
+            directory.mkdir(parents=True, exist_ok=True)
+            os.replace(source, target)
+            self._prune_empty_dirs(source.parent, self.transcripts_path)
+        return target
+
+    def _prune_empty_dirs(self, directory: Path, stop_at: Path) -> None:
+        """Remove empty shard directories up to (not including) stop_at."""
+        while directory != stop_at and stop_at in directory.parents:
+            try:
+                directory.rmdir()
+            except OSError:
+                return
+            directory = directory.parent
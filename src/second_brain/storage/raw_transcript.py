@@ -0,0 +1,295 @@
+"""Lazy, optionally compressed access to raw transcript text.
+
+Raw transcripts can be megabytes each, so callers get a ``RawTranscript``
+handle instead of the full text. The handle streams from disk (decompressing
+on the fly for ``.gz``/``.zst`` files) and supports character range reads for
+paging. Where each page ends, a cursor is kept so that the next page resumes
+there instead of re-reading the file from the start. ``RawTranscriptWriter``
+is the matching incremental writer used for streaming ingest.
+"""
+
+import gzip
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterator, Optional, TextIO, Tuple
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Compression name -> raw file suffix
+RAW_SUFFIXES = {
+    "none": ".txt",
+    "gzip": ".txt.gz",
+    "zstd": ".txt.zst",
+}
+
+CHUNK_SIZE = 64 * 1024
+
+# Page cursors: (path, mtime_ns, size, char offset) -> resume point. For an
+# uncompressed file the resume point is a seek cookie. For a compressed file
+# it is the open decompressing stream plus the one character already read
+# ahead of the offset, since those streams cannot seek cheaply.
+MAX_PAGE_CURSORS = 32
+_page_cursors: "OrderedDict[tuple, object]" = OrderedDict()
+_page_cursors_lock = threading.Lock()
+
+
+def _close_cursor(cursor: object) -> None:
+    if not isinstance(cursor, int):
+        cursor[0].close()
+
+
+def _take_cursor(file_key: tuple, offset: int) -> Tuple[int, object]:
+    """Pop the cached cursor closest to ``offset`` without passing it.
+
+    Returns:
+        Tuple of (character offset of the cursor, cursor), or (0, None)
+    """
+    with _page_cursors_lock:
+        best = None
+        for key in _page_cursors:
+            if key[:3] == file_key and key[3] <= offset and (best is None or key[3] > best[3]):
+                best = key
+        if best is None:
+            return 0, None
+        return best[3], _page_cursors.pop(best)
+
+
+def _put_cursor(file_key: tuple, offset: int, cursor: object) -> None:
+    """Remember a resume point, evicting the oldest beyond ``MAX_PAGE_CURSORS``."""
+    evicted = []
+    with _page_cursors_lock:
+        old = _page_cursors.pop(file_key + (offset,), None)
+        if old is not None:
+            evicted.append(old)
+        _page_cursors[file_key + (offset,)] = cursor
+        while len(_page_cursors) > MAX_PAGE_CURSORS:
+            evicted.append(_page_cursors.popitem(last=False)[1])
+    for cursor in evicted:
+        _close_cursor(cursor)
+
+
+def check_compression(compression: str) -> None:
+    """Validate a compression setting.
+
+    Raises:
+        ValueError: If the compression name is unknown
+        ImportError: If zstd is requested but zstandard is not installed
+    """
+    if compression not in RAW_SUFFIXES:
+        raise ValueError(f"Unknown raw transcript compression: {compression}")
+    if compression == "zstd" and not ZSTD_AVAILABLE:
+        raise ImportError(
+            "zstandard is not installed. Install with: uv pip install 'second-brain[zstd]'"
+        )
+
+
+def compression_for_path(path: Path) -> str:
+    """Infer the compression of a raw transcript file from its suffix."""
+    name = Path(path).name
+    if name.endswith(".gz"):
+        return "gzip"
+    if name.endswith(".zst"):
+        return "zstd"
+    return "none"
+
+
+def open_raw_text(path: Path, mode: str = "r", compression: Optional[str] = None) -> TextIO:
+    """Open a raw transcript file as a text stream.
+
+    Args:
+        path: File path
+        mode: "r" to read or "w" to write
+        compression: Compression override (inferred from the suffix if None)
+
+    Returns:
+        A text stream that (de)compresses incrementally
+    """
+    compression = compression or compression_for_path(path)
+    check_compression(compression)
+
+    if compression == "gzip":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+
+    if compression == "zstd":
+        raw = open(path, mode + "b")
+        if mode == "r":
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        else:
+            stream = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding="utf-8")
+
+    return open(path, mode, encoding="utf-8")
+
+
+class RawTranscript:
+    """Lazy handle to a raw transcript file."""
+
+    def __init__(self, path: Path):
+        """Initialize with the raw file path. Nothing is read until asked."""
+        self.path = Path(path)
+        self.compression = compression_for_path(self.path)
+
+    @property
+    def exists(self) -> bool:
+        """Whether the raw file exists on disk."""
+        return self.path.exists()
+
+    @property
+    def size_bytes(self) -> int:
+        """Size of the file on disk (compressed size for compressed files)."""
+        return self.path.stat().st_size
+
+    def open(self) -> TextIO:
+        """Open the raw transcript as a streaming text reader."""
+        return open_raw_text(self.path, "r", self.compression)
+
+    def iter_chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+        """Yield the transcript text in chunks of at most ``chunk_size`` characters."""
+        with self.open() as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def read_page(self, offset: int = 0, limit: int = 5000) -> Tuple[str, bool]:
+        """Read a character range without loading the whole transcript.
+
+        Reading continues from the nearest cursor left by an earlier page, so
+        paging through a transcript in order costs O(page) per call. Only
+        characters between that cursor and ``offset`` are streamed and
+        discarded.
+
+        Returns:
+            Tuple of (text, whether more text follows)
+        """
+        stat = self.path.stat()
+        file_key = (str(self.path), stat.st_mtime_ns, stat.st_size)
+        position, cursor = _take_cursor(file_key, offset)
+
+        pending = ""
+        if cursor is None or isinstance(cursor, int):
+            f = self.open()
+            if cursor is not None:
+                f.seek(cursor)
+        else:
+            f, pending = cursor
+
+        keep = False
+        try:
+            remaining = offset - position
+            if remaining > 0 and pending:
+                pending = ""
+                remaining -= 1
+            while remaining > 0:
+                skipped = f.read(min(remaining, CHUNK_SIZE))
+                if not skipped:
+                    return "", False
+                remaining -= len(skipped)
+
+            if pending and limit == 0:
+                text, lookahead = "", pending
+            else:
+                text = pending + f.read(limit - len(pending))
+                lookahead = None
+            end = offset + len(text)
+            if self.compression == "none":
+                _put_cursor(file_key, end, f.tell())
+                has_more = bool(f.read(1))
+            else:
+                if lookahead is None:
+                    lookahead = f.read(1)
+                has_more = bool(lookahead)
+                if has_more:
+                    _put_cursor(file_key, end, (f, lookahead))
+                    keep = True
+            return text, has_more
+        finally:
+            if not keep:
+                f.close()
+
+    def read(self) -> str:
+        """Read the full transcript text."""
+        with self.open() as f:
+            return f.read()
+
+
+class RawTranscriptWriter:
+    """Incrementally write a raw transcript without holding it in memory.
+
+    Text is written to a ``.part`` file next to the final path while a
+    SHA-256 content hash and a word count are computed on the fly.
+    ``commit()`` renames the file into place; ``abort()`` discards it.
+    """
+
+    def __init__(self, path: Path, compression: str = "none"):
+        """Open a partial file for the raw transcript at ``path``."""
+        check_compression(compression)
+        self.compression = compression
+        self.path = Path(path)
+        self.part_path = self.path.with_name(self.path.name + ".part")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._file = open_raw_text(self.part_path, "w", compression)
+        self._hash = hashlib.sha256()
+        self._in_word = False
+        self.word_count = 0
+        self.char_count = 0
+        self.closed = False
+
+    @property
+    def content_hash(self) -> str:
+        """Hex SHA-256 of the UTF-8 text written so far."""
+        return self._hash.hexdigest()
+
+    def write(self, chunk: str) -> None:
+        """Append a chunk of text.
+
+        Words split across chunk boundaries are counted once.
+        """
+        if not chunk:
+            return
+
+        self._file.write(chunk)
+        self._hash.update(chunk.encode("utf-8"))
+        self.char_count += len(chunk)
+
+        words = len(chunk.split())
+        if words and self._in_word and not chunk[0].isspace():
+            words -= 1
+        self.word_count += words
+        self._in_word = not chunk[-1].isspace()
+
+    def close(self) -> None:
+        """Finish writing without moving the partial file."""
+        if not self.closed:
+            self._file.close()
+            self.closed = True
+
+    def commit(self, path: Optional[Path] = None) -> Path:
+        """Finish writing and move the file to its final path.
+
+        Args:
+            path: Final path override, e.g. once the content hash is known
+        """
+        self.close()
+        if path is not None:
+            self.path = Path(path)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(self.part_path, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        """Discard the partially written file."""
+        self.close()
+        if self.part_path.exists():
+            self.part_path.unlink()
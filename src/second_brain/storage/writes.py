@@ -0,0 +1,258 @@
+"""Crash-safe file writes with an optional write-behind queue.
+
+Every markdown write goes to a temporary file in the target directory and is
+renamed over the target, so readers and crashes never see a torn file.
+
+Long-running processes (the MCP server) can enable a write-behind queue:
+updates to existing files are held for a short window and repeated updates
+to the same file are coalesced into a single write. Appends stay appends:
+queued appends to a file are written with a single append on flush rather
+than by rewriting the file. Reads through
+``read_text`` see pending content, and ``flush()`` writes everything out
+immediately. The queue is flushed at interpreter exit.
+"""
+
+import atexit
+import os
+import stat
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# "rename": atomic temp-file + rename. "fsync": also fsync the file and its
+# directory before returning, so the write survives power loss.
+DURABILITY_LEVELS = ("rename", "fsync")
+
+
+# The process umask, for the mode of new files (mkstemp creates them 0600)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def check_durability(durability: str) -> None:
+    """Validate a durability setting.
+
+    Raises:
+        ValueError: If the durability level is unknown
+    """
+    if durability not in DURABILITY_LEVELS:
+        raise ValueError(f"Unknown durability level: {durability}")
+
+
+def atomic_write_bytes(path: Path, data: bytes, durability: str = "rename") -> None:
+    """Atomically replace a file's content.
+
+    The file keeps its permissions; a new file gets the usual mode for the
+    process umask.
+
+    Args:
+        path: Target file
+        data: New content
+        durability: "rename" or "fsync"
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if durability == "fsync":
+                f.flush()
+                os.fsync(f.fileno())
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    if durability == "fsync":
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def atomic_write_text(path: Path, text: str, durability: str = "rename") -> None:
+    """Atomically replace a file's content with UTF-8 text."""
+    atomic_write_bytes(path, text.encode("utf-8"), durability)
+
+
+def append_bytes(path: Path, data: bytes, durability: str = "rename") -> None:
+    """Append to a file without rewriting it.
+
+    A single ``write`` in append mode never leaves earlier content torn; at
+    worst a crash loses part of the appended data.
+    """
+    with open(path, "ab") as f:
+        f.write(data)
+        if durability == "fsync":
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class WriteBehindQueue:
+    """Coalesce repeated writes to the same file within a short window."""
+
+    def __init__(self, delay: float = 0.5):
+        """Initialize the queue.
+
+        Args:
+            delay: Seconds to hold the first pending write before flushing
+        """
+        self.delay = delay
+        # path -> (text, durability, whether text is appended to the file)
+        self._pending: Dict[Path, Tuple[str, str, bool]] = {}
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        self.writes_requested = 0
+        self.writes_performed = 0
+
+    def put(self, path: Path, text: str, durability: str = "rename") -> None:
+        """Queue the new content of a file, replacing any pending content."""
+        with self._lock:
+            self._pending[Path(path)] = (text, durability, False)
+            self._requested()
+
+    def append(self, path: Path, text: str, durability: str = "rename") -> None:
+        """Queue text to append to a file, after any pending content."""
+        path = Path(path)
+        with self._lock:
+            pending = self._pending.get(path)
+            if pending is None:
+                self._pending[path] = (text, durability, True)
+            else:
+                self._pending[path] = (pending[0] + text, durability, pending[2])
+            self._requested()
+
+    def _requested(self) -> None:
+        """Count a queued write and start the flush timer if needed."""
+        self.writes_requested += 1
+        if self._timer is None:
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def get(self, path: Path) -> Optional[str]:
+        """Get the pending content of a file, if any."""
+        with self._lock:
+            pending = self._pending.get(Path(path))
+            if pending is None:
+                return None
+            text, _, is_append = pending
+            if is_append:
+                with open(path, "r", encoding="utf-8") as f:
+                    return f.read() + text
+            return text
+
+    def flush(self) -> int:
+        """Write all pending files now.
+
+        A file that fails to write stays queued for the next flush; the
+        other files are still written, then the first error is raised.
+
+        Returns:
+            Number of files written
+
+        Raises:
+            OSError: If a file couldn't be written
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            written = 0
+            errors = []
+            for path, (text, durability, is_append) in list(self._pending.items()):
+                try:
+                    if is_append:
+                        append_bytes(path, text.encode("utf-8"), durability)
+                    else:
+                        atomic_write_text(path, text, durability)
+                except OSError as e:
+                    errors.append(e)
+                    continue
+                del self._pending[path]
+                written += 1
+            self.writes_performed += written
+            if errors:
+                raise errors[0]
+            return written
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+
+# Process-wide queue, shared by every MarkdownStorage instance
+_queue: Optional[WriteBehindQueue] = None
+
+
+def enable_write_behind(delay: float = 0.5) -> WriteBehindQueue:
+    """Enable the process-wide write-behind queue (idempotent)."""
+    global _queue
+    if _queue is None:
+        _queue = WriteBehindQueue(delay)
+        atexit.register(flush)
+    return _queue
+
+
+def disable_write_behind() -> None:
+    """Flush and disable the write-behind queue."""
+    global _queue
+    if _queue is not None:
+        _queue.flush()
+        _queue = None
+
+
+def get_write_queue() -> Optional[WriteBehindQueue]:
+    """Get the write-behind queue, or None if writes are synchronous."""
+    return _queue
+
+
+def flush() -> int:
+    """Write out any pending files.
+
+    Returns:
+        Number of files written
+    """
+    return _queue.flush() if _queue is not None else 0
+
+
+def write_text(path: Path, text: str, durability: str = "rename") -> None:
+    """Write a file atomically, deferring updates if write-behind is enabled.
+
+    New files are always written immediately so existence checks stay
+    accurate; only updates to existing files are queued.
+    """
+    queue = _queue
+    if queue is not None and Path(path).exists():
+        queue.put(path, text, durability)
+    else:
+        atomic_write_text(path, text, durability)
+
+
+def append_text(path: Path, text: str, durability: str = "rename") -> None:
+    """Append to an existing file, deferring the append if write-behind is enabled."""
+    queue = _queue
+    if queue is not None:
+        queue.append(path, text, durability)
+    else:
+        append_bytes(path, text.encode("utf-8"), durability)
+
+
+def read_text(path: Path) -> str:
+    """Read a file, including content still pending in the write-behind queue."""
+    queue = _queue
+    if queue is not None:
+        pending = queue.get(path)
+        if pending is not None:
+            return pending
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
@@ -0,0 +1,161 @@
+"""MCP tools for task and time analytics."""
+
+from typing import Optional
+from pydantic import BaseModel, Field
+
+from ..analytics import (
+    AnalyticsSnapshot,
+    forecast_completion,
+    get_throughput_history,
+    remaining_items,
+)
+from ..db import get_session
+from ..db.operations import ProjectOps
+
+
+class AnalyticsInput(BaseModel):
+    """Input for analytics queries."""
+
+    weeks: int = Field(8, ge=1, le=520, description="Number of weeks to include")
+    project_slug: Optional[str] = Field(None, description="Filter by project slug (optional)")
+
+
+class ForecastInput(BaseModel):
+    """Input for forecasting completion of a project or epic."""
+
+    target: str = Field(..., description="Project slug or Beads epic ID")
+    trials: int = Field(10000, ge=100, le=200000, description="Number of Monte Carlo trials")
+    history_days: int = Field(
+        90, ge=7, le=3650, description="Days of throughput history to resample"
+    )
+
+
+def format_minutes(minutes: int) -> str:
+    """Format minutes as 'Xh Ym'."""
+    return f"{minutes // 60}h {minutes % 60}m"
+
+
+def get_analytics_tool(engine):
+    """Get task and time analytics tool."""
+
+    async def get_analytics(query: AnalyticsInput) -> str:
+        """
+        Summarize throughput, cycle time and time spent per project.
+
+        Covers the last N weeks: tasks completed per week, minutes logged
+        per project per week, task counts by status and cycle time from
+        creation to completion.
+        """
+        session = get_session(engine)
+        try:
+            project_id = None
+            if query.project_slug:
+                project = ProjectOps.get_by_slug(session, query.project_slug)
+                if not project:
+                    return f"Error: Project with slug '{query.project_slug}' not found"
+                project_id = project.id
+
+            try:
+                snapshot = AnalyticsSnapshot.load(session)
+            except ImportError as e:
+                return f"Error: {e}"
+
+            stats = snapshot.summary(weeks=query.weeks, project_id=project_id)
+
+            result = "# Analytics\n\n"
+            result += f"**Period:** {stats['start']} to {stats['end']}\n"
+            if query.project_slug:
+                result += f"**Project:** {query.project_slug}\n"
+            result += "\n"
+
+            result += "## Tasks by Status\n\n"
+            for status, count in stats["status_counts"].items():
+                result += f"- {status}: {count}\n"
+            result += "\n"
+
+            result += "## Throughput (tasks completed per week)\n\n"
+            for week, count in zip(stats["weeks"], stats["throughput"]):
+                result += f"- Week of {week}: {count}\n"
+            result += "\n"
+
+            result += "## Time per Project\n\n"
+            if stats["project_minutes"]:
+                for project_stats in stats["project_minutes"]:
+                    result += (
+                        f"### {project_stats['project']} "
+                        f"({format_minutes(project_stats['total'])})\n\n"
+                    )
+                    for week, minutes in zip(stats["weeks"], project_stats["minutes"]):
+                        if minutes:
+                            result += f"- Week of {week}: {format_minutes(minutes)}\n"
+                    result += "\n"
+            else:
+                result += "No time logged in this period.\n\n"
+
+            result += "## Cycle Time\n\n"
+            cycle = stats["cycle_time"]
+            if cycle:
+                result += f"- Completed tasks: {cycle['count']}\n"
+                result += f"- Mean: {cycle['mean']:.1f} days\n"
+                result += f"- Median (P50): {cycle['p50']:.1f} days\n"
+                result += f"- P85: {cycle['p85']:.1f} days\n"
+            else:
+                result += "No completed tasks yet.\n"
+
+            return result
+        finally:
+            session.close()
+
+    return get_analytics
+
+
+def forecast_delivery_tool(engine, project_dir: Optional[str] = None):
+    """Forecast completion dates tool."""
+
+    async def forecast_delivery(query: ForecastInput) -> str:
+        """
+        Forecast when a project or epic will be done.
+
+        Runs a Monte Carlo simulation that resamples recent daily task
+        throughput and reports P50/P85/P95 completion dates for the items
+        that are still open.
+        """
+        session = get_session(engine)
+        try:
+            try:
+                history = get_throughput_history(engine)
+                history.refresh(session)
+                label, remaining, project_id = await remaining_items(
+                    session, query.target, project_dir
+                )
+                forecast = forecast_completion(
+                    history,
+                    remaining,
+                    project_id=project_id,
+                    trials=query.trials,
+                    history_days=query.history_days,
+                )
+            except (ImportError, ValueError) as e:
+                return f"Error: {e}"
+
+            result = f"# Forecast\n\n**{label}**\n"
+            result += f"**Open items:** {forecast.remaining}\n"
+            result += (
+                f"**History:** {forecast.completed_in_history} tasks completed "
+                f"in the last {forecast.history_days} days\n"
+            )
+            result += f"**Trials:** {forecast.trials}\n\n"
+
+            if forecast.remaining == 0:
+                result += "Nothing left to do.\n"
+                return result
+
+            for percentile, day in forecast.dates.items():
+                when = day.isoformat() if day else "not within 10 years"
+                result += f"- P{percentile}: {when}\n"
+
+            return result
+        finally:
+            session.close()
+
+    return forecast_delivery
@@ -1,11 +1,15 @@
 """MCP tools for Jira synchronization."""
 
+from datetime import timedelta
 from typing import Optional
 from pydantic import BaseModel, Field
 
 from ..db import get_session
 from ..db.operations import TaskOps, ProjectOps
-from ..integrations.jira_client import JiraClient
+from ..integrations import jira_cache
+from ..integrations.jira_async import get_async_jira_client
+from ..integrations.jira_outbox import queue_comment
+from ..integrations.jira_sync import JiraSyncEngine
 
 
 class JiraSyncInput(BaseModel):
@@ -15,12 +19,29 @@ class JiraSyncInput(BaseModel):
         None, description="Project slug to sync (syncs all projects if not specified)"
     )
     status_filter: Optional[str] = Field(None, description="Filter by issue status (optional)")
+    full_resync: bool = Field(
+        False, description="Fetch every issue instead of only those changed since the last sync"
+    )
+    combined: bool = Field(
+        False, description="Fetch all projects with one combined query (fewer requests)"
+    )
 
 
 class JiraIssueInput(BaseModel):
     """Input for getting a specific Jira issue."""
 
     issue_key: str = Field(..., description="Jira issue key (e.g., PROJ-123)")
+    offline: bool = Field(False, description="Only use the local snapshot, never contact Jira")
+    max_age_minutes: int = Field(
+        15, ge=0, description="Serve a local snapshot younger than this without asking Jira"
+    )
+
+
+class JiraCommentInput(BaseModel):
+    """Input for commenting on a Jira issue."""
+
+    issue_key: str = Field(..., description="Jira issue key (e.g., PROJ-123)")
+    comment: str = Field(..., min_length=1, description="Comment text")
 
 
 def sync_jira_issues_tool(engine):
@@ -32,24 +53,25 @@ def sync_jira_issues_tool(engine):
 
         This tool pulls tickets from Jira and creates or updates corresponding
         tasks in the second brain. Useful for keeping track of assigned work
-        and linking Jira tickets to your local workflow.
+        and linking Jira tickets to your local workflow. After the first
+        sync only issues changed since the previous one are fetched. Other
+        tools keep responding while a sync runs.
         """
         session = get_session(engine)
         try:
             # Initialize Jira client
             try:
-                jira = JiraClient()
+                jira = get_async_jira_client()
             except ValueError as e:
-                return f"Error: {str(e)}\nPlease configure Jira credentials in environment variables."
+                return (
+                    f"Error: {str(e)}\n"
+                    "Please configure Jira credentials in environment variables."
+                )
 
             # Test connection
-            if not jira.test_connection():
+            if not await jira.test_connection():
                 return "Error: Failed to connect to Jira. Check your credentials."
 
-            synced_count = 0
-            updated_count = 0
-            created_count = 0
-
             # Get project(s) to sync
             projects = []
             if sync.project_slug:
@@ -65,61 +87,56 @@ def sync_jira_issues_tool(engine):
                 projects = [p for p in all_projects if p.jira_project_key]
 
             if not projects:
-                return "No projects with Jira integration found. Add a Jira project key to your projects first."
+                return (
+                    "No projects with Jira integration found. "
+                    "Add a Jira project key to your projects first."
+                )
+
+            syncer = JiraSyncEngine(session, jira)
+            synced_count = 0
+            updated_count = 0
+            created_count = 0
+            unchanged_count = 0
 
             result = f"Syncing Jira issues for {len(projects)} project(s)...\n\n"
 
-            for project in projects:
+            outcomes = await syncer.sync_projects_async(
+                projects,
+                full=sync.full_resync,
+                status=sync.status_filter,
+                combined=sync.combined,
+            )
+
+            for project, outcome in zip(projects, outcomes):
                 result += f"## {project.name} ({project.jira_project_key})\n\n"
 
-                # Fetch issues from Jira
-                issues = jira.get_project_issues(
-                    project.jira_project_key, status=sync.status_filter
-                )
+                if outcome.since:
+                    result += f"Changes since {outcome.since.strftime('%Y-%m-%d %H:%M')} UTC\n"
+                else:
+                    result += "Full sync\n"
 
-                if not issues:
+                if not outcome.fetched:
                     result += "No issues found.\n\n"
                     continue
 
-                for issue in issues:
-                    # Check if task already exists
-                    existing_task = TaskOps.get_by_jira_key(session, issue["key"])
-
-                    if existing_task:
-                        # Update existing task
-                        TaskOps.update(
-                            session,
-                            existing_task,
-                            title=issue["summary"],
-                            description=issue["description"],
-                            status=_map_jira_status(issue["status"]),
-                            priority=_map_jira_priority(issue.get("priority")),
-                        )
-                        updated_count += 1
-                    else:
-                        # Create new task
-                        TaskOps.create(
-                            session,
-                            title=issue["summary"],
-                            description=issue["description"],
-                            status=_map_jira_status(issue["status"]),
-                            priority=_map_jira_priority(issue.get("priority")),
-                            project_id=project.id,
-                            jira_ticket_id=issue["id"],
-                            jira_ticket_key=issue["key"],
-                            tags=",".join(issue.get("labels", [])) if issue.get("labels") else None,
-                        )
-                        created_count += 1
-
-                    synced_count += 1
-
-                result += f"Synced {len(issues)} issue(s)\n\n"
+                synced_count += outcome.fetched
+                created_count += outcome.created
+                updated_count += outcome.updated
+                unchanged_count += outcome.unchanged
+                result += f"Synced {outcome.fetched} issue(s)\n\n"
 
             result += "---\n\n"
-            result += f"**Summary:**\n"
+            result += "**Summary:**\n"
             result += f"- Total issues synced: {synced_count}\n"
             result += f"- Created: {created_count}\n"
             result += f"- Updated: {updated_count}\n"
+            result += f"- Unchanged: {unchanged_count}\n"
+            stats = syncer.stats
+            if stats.retries or stats.throttled_seconds >= 1:
+                result += (
+                    f"- Rate limited: {stats.retries} retries, "
+                    f"{stats.throttled_seconds:.1f}s waiting\n"
+                )
 
             return result
         except Exception as e:
@@ -137,24 +154,36 @@ def get_jira_issue_tool(engine):
         """
         Fetch a specific Jira issue by key.
 
-        Retrieves detailed information about a Jira ticket. If a task with
-        this ticket doesn't exist locally, you can create one based on the
-        issue details.
+        Retrieves detailed information about a Jira ticket. Recently
+        fetched or synced issues are served from the local snapshot, and
+        offline mode (or an unreachable Jira) falls back to it. If a task
+        with this ticket doesn't exist locally, you can create one based on
+        the issue details.
         """
         session = get_session(engine)
         try:
-            # Initialize Jira client
             try:
-                jira = JiraClient()
+                lookup = await jira_cache.get_issue_async(
+                    session,
+                    issue_input.issue_key,
+                    max_age=timedelta(minutes=issue_input.max_age_minutes),
+                    offline=issue_input.offline,
+                )
             except ValueError as e:
                 return f"Error: {str(e)}"
 
-            # Fetch issue
-            issue = jira.get_issue(issue_input.issue_key)
+            issue = lookup.issue
             if not issue:
+                if lookup.error:
+                    return f"Error: Issue '{issue_input.issue_key}' is not cached locally"
                 return f"Error: Issue '{issue_input.issue_key}' not found in Jira"
 
             result = f"# {issue['key']}: {issue['summary']}\n\n"
+            if lookup.source == jira_cache.SOURCE_STALE:
+                result += (
+                    f"*Offline copy fetched {lookup.fetched_at.strftime('%Y-%m-%d %H:%M')} UTC"
+                )
+                result += f" (Jira unavailable: {lookup.error})*\n\n" if lookup.error else "*\n\n"
             result += f"**Status:** {issue['status']}\n"
             if issue.get("priority"):
                 result += f"**Priority:** {issue['priority']}\n"
@@ -176,10 +205,15 @@ def get_jira_issue_tool(engine):
             # Check if task exists locally
             existing_task = TaskOps.get_by_jira_key(session, issue["key"])
             if existing_task:
-                result += f"\n\n---\n\n**Local Task:** #{existing_task.id} - {existing_task.title}\n"
+                result += (
+                    f"\n\n---\n\n**Local Task:** #{existing_task.id} - {existing_task.title}\n"
+                )
                 result += f"Status: {existing_task.status}\n"
             else:
-                result += "\n\n---\n\n*No local task exists for this issue. Use create_task tool to create one.*\n"
+                result += (
+                    "\n\n---\n\n"
+                    "*No local task exists for this issue. Use create_task tool to create one.*\n"
+                )
 
             return result
         except Exception as e:
@@ -190,33 +224,21 @@ def get_jira_issue_tool(engine):
     return get_jira_issue
 
 
-def _map_jira_status(jira_status: str) -> str:
-    """Map Jira status to internal status."""
-    status_map = {
-        "to do": "todo",
-        "todo": "todo",
-        "open": "todo",
-        "in progress": "in_progress",
-        "in review": "in_progress",
-        "done": "done",
-        "closed": "done",
-        "resolved": "done",
-        "blocked": "blocked",
-        "on hold": "blocked",
-    }
-    return status_map.get(jira_status.lower(), "todo")
-
-
-def _map_jira_priority(jira_priority: Optional[str]) -> Optional[str]:
-    """Map Jira priority to internal priority."""
-    if not jira_priority:
-        return None
-
-    priority_map = {
-        "highest": "urgent",
-        "high": "high",
-        "medium": "medium",
-        "low": "low",
-        "lowest": "low",
-    }
-    return priority_map.get(jira_priority.lower(), "medium")
+def comment_jira_issue_tool(engine):
+    """Queue a comment on a Jira issue tool."""
+
+    async def comment_jira_issue(comment_input: JiraCommentInput) -> str:
+        """
+        Comment on a Jira issue.
+
+        The comment is queued locally and sent in the background (or on the
+        next sync), so this works offline and never waits on Jira.
+        """
+        session = get_session(engine)
+        try:
+            item = queue_comment(session, comment_input.issue_key, comment_input.comment)
+            return f"Comment on {item.issue_key} queued for Jira (#{item.id})"
+        finally:
+            session.close()
+
+    return comment_jira_issue
@@ -1,9 +1,10 @@
 """MCP tools for note operations."""
 
+from pathlib import Path
 from typing import Optional, List
 from pydantic import BaseModel, Field
 
-from ..db import get_session
+from ..db import get_session, note_rows
 from ..db.operations import NoteOps, ProjectOps, TaskOps
 from ..storage import StorageIndexer
 
@@ -48,6 +49,14 @@ class NoteSearchInput(BaseModel):
     query: str = Field(..., description="Search query (searches title and content)")
 
 
+class NoteAttachInput(BaseModel):
+    """Input for attaching a file to a note."""
+
+    note_id: int = Field(..., description="Note ID")
+    file_path: str = Field(..., description="Path of the file to attach")
+    filename: Optional[str] = Field(None, description="Attachment name (defaults to the file name)")
+
+
 def create_note_tool(engine):
     """Create a new note tool."""
 
@@ -189,13 +198,13 @@ def get_notes_tool(engine):
                 project = ProjectOps.get_by_slug(session, query.project_slug)
                 if not project:
                     return f"Error: Project '{query.project_slug}' not found"
-                notes = NoteOps.list_by_project(session, project.id)
+                notes = note_rows(session, project_id=project.id)
             elif query.task_id:
-                notes = NoteOps.list_by_task(session, query.task_id)
+                notes = note_rows(session, task_id=query.task_id)
             elif query.tags:
-                notes = NoteOps.list_by_tags(session, query.tags)
+                notes = note_rows(session, tags=query.tags)
             else:
-                notes = NoteOps.list_all(session)
+                notes = note_rows(session)
 
             if not notes:
                 filters = []
@@ -212,16 +221,16 @@ def get_notes_tool(engine):
 
             for n in notes:
                 result += f"**{n.title}** (#{n.id})\n"
-                if n.project:
-                    result += f"  Project: {n.project.name}\n"
+                if n.project_name:
+                    result += f"  Project: {n.project_name}\n"
                 if n.task_id:
                     result += f"  Task: #{n.task_id}\n"
                 if n.tags:
                     result += f"  Tags: {n.tags}\n"
 
                 # Show content snippet
-                snippet = n.content[:150]
-                if len(n.content) > 150:
+                snippet = n.snippet[:150]
+                if len(n.snippet) > 150:
                     snippet += "..."
                 result += f"  Content: {snippet}\n"
                 result += f"  File: {n.markdown_path}\n\n"
@@ -259,9 +268,14 @@ def get_note_tool(engine):
                 result += f"Tags: {note.tags}\n"
             result += f"Created: {note.created_at}\n"
             result += f"Updated: {note.updated_at}\n"
-            result += f"File: {note.markdown_path}\n\n"
-            result += "---\n\n"
-            result += note.content
+            result += f"File: {note.markdown_path}\n"
+            for attachment in note.attachments:
+                result += (
+                    f"Attachment #{attachment.id}: {attachment.filename} "
+                    f"({attachment.size_bytes} bytes) - {attachment.blob.path}\n"
+                )
+            result += "\n---\n\n"
+            result += note.full_content
 
             return result
         finally:
@@ -282,8 +296,7 @@ def search_notes_tool(engine):
         """
         session = get_session(engine)
         try:
-            indexer = StorageIndexer(session)
-            notes = indexer.search_notes(search.query)
+            notes = note_rows(session, query_text=search.query)
 
             if not notes:
                 return f"No notes found matching '{search.query}'"
@@ -292,14 +305,14 @@ def search_notes_tool(engine):
 
             for n in notes:
                 result += f"**{n.title}** (#{n.id})\n"
-                if n.project:
-                    result += f"  Project: {n.project.name}\n"
+                if n.project_name:
+                    result += f"  Project: {n.project_name}\n"
                 if n.task_id:
                     result += f"  Task: #{n.task_id}\n"
 
                 # Show content snippet
-                snippet = n.content[:150]
-                if len(n.content) > 150:
+                snippet = n.snippet[:150]
+                if len(n.snippet) > 150:
                     snippet += "..."
                 result += f"  {snippet}\n\n"
 
@@ -308,3 +321,37 @@ def search_notes_tool(engine):
             session.close()
 
     return search_notes
+
+
+def attach_file_to_note_tool(engine):
+    """Attach a file to a note tool."""
+
+    async def attach_file_to_note(attach: NoteAttachInput) -> str:
+        """
+        Attach a local file to a note.
+
+        The file is stored by content hash, so identical files attached to
+        several notes are stored only once.
+        """
+        session = get_session(engine)
+        try:
+            if not Path(attach.file_path).is_file():
+                return f"Error: File '{attach.file_path}' not found"
+
+            indexer = StorageIndexer(session)
+            attachment = indexer.attach_file_to_note(
+                attach.note_id, attach.file_path, filename=attach.filename
+            )
+            if not attachment:
+                return f"Error: Note #{attach.note_id} not found"
+
+            return (
+                f"Attached {attachment.filename} to note #{attach.note_id}\n"
+                f"Attachment ID: {attachment.id}\n"
+                f"Size: {attachment.size_bytes} bytes\n"
+                f"Stored at: {attachment.blob.path}"
+            )
+        finally:
+            session.close()
+
+    return attach_file_to_note
@@ -3,8 +3,9 @@
 from typing import Optional, List
 from pydantic import BaseModel, Field
 
-from ..db import get_session
-from ..db.operations import ProjectOps, TaskOps
+from ..db import get_session, task_rows
+from ..db.operations import ProjectOps, TaskOps, TimeEntryOps
+from ..integrations.jira_outbox import queue_status_push
 from ..storage import StorageIndexer
 
 
@@ -255,13 +256,17 @@ def update_task_tool(engine):
                 updates["status"] = update.status
             if update.priority is not None:
                 updates["priority"] = update.priority
-            if update.time_spent_minutes is not None:
-                updates["time_spent_minutes"] = task.time_spent_minutes + update.time_spent_minutes
 
-            if not updates:
+            if not updates and not update.time_spent_minutes:
                 return "No updates provided"
 
+            status_changed = update.status is not None and update.status != task.status
             updated_task = TaskOps.update(session, task, **updates)
+            jira_queued = status_changed and queue_status_push(session, updated_task)
+            if update.time_spent_minutes:
+                TimeEntryOps.record(
+                    session, update.time_spent_minutes, task_id=task.id, source="task_update"
+                )
 
             result = f"Task #{updated_task.id} updated successfully!\n"
             result += f"Title: {updated_task.title}\n"
@@ -272,6 +277,8 @@ def update_task_tool(engine):
                 hours = updated_task.time_spent_minutes // 60
                 minutes = updated_task.time_spent_minutes % 60
                 result += f"Total time spent: {hours}h {minutes}m\n"
+            if jira_queued:
+                result += f"Jira: transition of {updated_task.jira_ticket_key} queued\n"
 
             return result
         finally:
@@ -299,9 +306,9 @@ def get_tasks_tool(engine):
                 project = ProjectOps.get_by_slug(session, query.project_slug)
                 if not project:
                     return f"Error: Project with slug '{query.project_slug}' not found"
-                tasks = TaskOps.list_by_project(session, project.id, status=query.status)
+                tasks = task_rows(session, project_id=project.id, status=query.status)
             else:
-                tasks = TaskOps.list_all(
+                tasks = task_rows(
                     session, status=query.status, priority=query.priority, tags=query.tags
                 )
 
@@ -324,14 +331,18 @@ def get_tasks_tool(engine):
                 if t.priority:
                     result += f" | Priority: {t.priority}"
 
-                if t.project:
-                    result += f" | Project: {t.project.name}"
+                if t.project_name:
+                    result += f" | Project: {t.project_name}"
 
                 result += "\n"
 
-                if t.description:
+                if t.description_snippet:
                     # Truncate long descriptions
-                    desc = t.description[:100] + "..." if len(t.description) > 100 else t.description
+                    desc = (
+                        t.description_snippet[:100] + "..."
+                        if len(t.description_snippet) > 100
+                        else t.description_snippet
+                    )
                     result += f"  Description: {desc}\n"
 
                 if t.jira_ticket_key:
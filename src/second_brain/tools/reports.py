@@ -4,8 +4,8 @@ from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel, Field
 
-from ..db import get_session
-from ..db.operations import WorkLogOps, TaskOps, ProjectOps
+from ..db import get_session, task_rows, work_log_entry_rows
+from ..db.operations import ProjectOps, TimeEntryOps
 
 
 class ReportInput(BaseModel):
@@ -44,18 +44,18 @@ def generate_report_tool(engine):
                 if not project:
                     return f"Error: Project with slug '{report.project_slug}' not found"
 
-            # Get work logs
-            work_logs = WorkLogOps.list_by_date_range(session, start_date, end_date)
+            # Get work log entries, grouped by day
+            work_logs = {}
+            for row in work_log_entry_rows(session, start_date, end_date):
+                work_logs.setdefault(row.work_log_id, []).append(row)
 
             # Get tasks completed in this period
-            all_tasks = TaskOps.list_all(session, status="done")
-            completed_tasks = [
-                t
-                for t in all_tasks
-                if t.completed_at
-                and start_date <= t.completed_at <= end_date
-                and (not project or t.project_id == project.id)
-            ]
+            completed_tasks = task_rows(
+                session,
+                project_id=project.id if project else None,
+                status="done",
+                completed_between=(start_date, end_date),
+            )
 
             # Build report
             result = "# Work Report\n\n"
@@ -70,7 +70,9 @@ def generate_report_tool(engine):
             result += f"- Tasks completed: {len(completed_tasks)}\n"
 
             if report.include_time_spent:
-                total_time = sum(t.time_spent_minutes for t in all_tasks if t.time_spent_minutes)
+                total_time = TimeEntryOps.total(
+                    session, start_date, end_date, project_id=project.id if project else None
+                )
                 total_hours = total_time // 60
                 total_minutes = total_time % 60
                 result += f"- Total time tracked: {total_hours}h {total_minutes}m\n"
@@ -82,13 +84,13 @@ def generate_report_tool(engine):
                 result += "## Tasks Completed\n\n"
                 for task in completed_tasks:
                     result += f"- **{task.title}** (#{task.id})\n"
-                    if task.project:
-                        result += f"  - Project: {task.project.name}\n"
-                    if task.description:
+                    if task.project_name:
+                        result += f"  - Project: {task.project_name}\n"
+                    if task.description_snippet:
                         desc = (
-                            task.description[:100] + "..."
-                            if len(task.description) > 100
-                            else task.description
+                            task.description_snippet[:100] + "..."
+                            if len(task.description_snippet) > 100
+                            else task.description_snippet
                         )
                         result += f"  - Description: {desc}\n"
                     if task.completed_at:
@@ -102,26 +104,28 @@ def generate_report_tool(engine):
             # Daily work logs
             if work_logs:
                 result += "## Daily Work Logs\n\n"
-                for wl in work_logs:
+                for entries in work_logs.values():
+                    wl = entries[0]
                     result += f"### {wl.date.strftime('%Y-%m-%d')}\n\n"
                     if wl.summary:
                         result += f"{wl.summary}\n\n"
 
-                    if wl.entries:
-                        for entry in wl.entries:
-                            # Filter by project if specified
-                            if project and entry.task and entry.task.project_id != project.id:
-                                continue
+                    for entry in entries:
+                        if entry.entry_id is None:
+                            continue
+                        # Filter by project if specified
+                        if project and entry.task_id and entry.project_id != project.id:
+                            continue
 
-                            time_str = entry.timestamp.strftime("%H:%M")
-                            task_str = ""
-                            if entry.task:
-                                task_str = f" **[{entry.task.title}]**"
-                            time_spent_str = ""
-                            if report.include_time_spent and entry.time_spent_minutes:
-                                time_spent_str = f" ({entry.time_spent_minutes}m)"
+                        time_str = entry.timestamp.strftime("%H:%M")
+                        task_str = ""
+                        if entry.task_id:
+                            task_str = f" **[{entry.task_title}]**"
+                        time_spent_str = ""
+                        if report.include_time_spent and entry.time_spent_minutes:
+                            time_spent_str = f" ({entry.time_spent_minutes}m)"
 
-                            result += f"- {time_str}{task_str}{time_spent_str}: {entry.entry_text}\n"
+                        result += f"- {time_str}{task_str}{time_spent_str}: {entry.entry_text}\n"
 
                     result += "\n"
 
@@ -129,27 +133,29 @@ def generate_report_tool(engine):
             if not project:
                 result += "## Project Breakdown\n\n"
 
-                # Get all projects with activity in this period
+                # Get all projects with activity in this period, as (id, name)
                 active_projects = set()
                 for task in completed_tasks:
-                    if task.project:
-                        active_projects.add(task.project)
+                    if task.project_id:
+                        active_projects.add((task.project_id, task.project_name))
+
+                for entries in work_logs.values():
+                    for entry in entries:
+                        if entry.project_id:
+                            active_projects.add((entry.project_id, entry.project_name))
 
-                for wl in work_logs:
-                    for entry in wl.entries:
-                        if entry.task and entry.task.project:
-                            active_projects.add(entry.task.project)
+                project_time = {}
+                if report.include_time_spent:
+                    project_time = TimeEntryOps.minutes_by_project(session, start_date, end_date)
 
                 if active_projects:
-                    for proj in sorted(active_projects, key=lambda p: p.name):
-                        proj_tasks = [t for t in completed_tasks if t.project_id == proj.id]
-                        result += f"### {proj.name}\n\n"
+                    for proj_id, proj_name in sorted(active_projects, key=lambda p: p[1]):
+                        proj_tasks = [t for t in completed_tasks if t.project_id == proj_id]
+                        result += f"### {proj_name}\n\n"
                         result += f"- Tasks completed: {len(proj_tasks)}\n"
 
                         if report.include_time_spent:
-                            proj_time = sum(
-                                t.time_spent_minutes for t in proj_tasks if t.time_spent_minutes
-                            )
+                            proj_time = project_time.get(proj_id, 0)
                             if proj_time > 0:
                                 hours = proj_time // 60
                                 minutes = proj_time % 60
@@ -205,7 +211,7 @@ def get_project_status_tool(engine):
             result += "\n---\n\n"
 
             # Task breakdown
-            tasks = TaskOps.list_by_project(session, project.id)
+            tasks = task_rows(session, project_id=project.id)
 
             if tasks:
                 result += "## Tasks Overview\n\n"
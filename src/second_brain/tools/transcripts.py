@@ -1,12 +1,16 @@
 """MCP tools for transcript processing."""
 
+import time
+import uuid
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel, Field
 
 from ..db import get_session
 from ..db.operations import TranscriptOps
-from ..storage import StorageIndexer
+from ..storage import StorageIndexer, DuplicateTranscriptError
+from ..storage.raw_transcript import RawTranscriptWriter
 
 
 class TranscriptCreateInput(BaseModel):
@@ -21,6 +25,24 @@ class TranscriptCreateInput(BaseModel):
     tags: Optional[List[str]] = Field(None, description="List of tags")
 
 
+class TranscriptUploadBeginInput(BaseModel):
+    """Input for starting a chunked transcript upload."""
+
+    title: str = Field(..., description="Transcript title")
+    transcript_type: str = Field("call", description="Type of transcript (call, meeting, etc.)")
+    transcript_date: Optional[str] = Field(
+        None, description="Date of transcript (YYYY-MM-DD), defaults to today"
+    )
+    tags: Optional[List[str]] = Field(None, description="List of tags")
+
+
+class TranscriptChunkInput(BaseModel):
+    """Input for appending a chunk to a transcript upload."""
+
+    upload_id: str = Field(..., description="Upload ID from begin_transcript_upload")
+    chunk: str = Field(..., description="Next chunk of raw transcript text")
+
+
 class TranscriptUpdateInput(BaseModel):
     """Input for updating a transcript."""
 
@@ -42,6 +64,69 @@ class TranscriptQueryInput(BaseModel):
     end_date: Optional[str] = Field(None, description="End date (YYYY-MM-DD)")
 
 
+@dataclass
+class TranscriptUpload:
+    """An in-progress chunked transcript upload."""
+
+    writer: RawTranscriptWriter
+    title: str
+    transcript_date: datetime
+    transcript_type: str = "call"
+    tags: Optional[List[str]] = None
+    chunks: int = field(default=0)
+    last_active: float = field(default_factory=time.monotonic)
+
+
+# Open uploads for this server process, keyed by upload ID
+_uploads: dict[str, TranscriptUpload] = {}
+
+# Seconds an upload may go without a chunk before it is aborted
+UPLOAD_IDLE_TIMEOUT = 3600.0
+
+
+def _expire_uploads(now: Optional[float] = None) -> List[str]:
+    """Abort uploads idle for longer than UPLOAD_IDLE_TIMEOUT.
+
+    Their writers are closed and the partial files deleted.
+
+    Returns:
+        IDs of the aborted uploads
+    """
+    now = time.monotonic() if now is None else now
+    expired = [
+        upload_id
+        for upload_id, upload in _uploads.items()
+        if now - upload.last_active > UPLOAD_IDLE_TIMEOUT
+    ]
+    for upload_id in expired:
+        _uploads.pop(upload_id).writer.abort()
+    return expired
+
+
+def _parse_transcript_date(date_str: Optional[str]) -> datetime:
+    """Parse a YYYY-MM-DD date or default to today."""
+    if date_str:
+        return datetime.strptime(date_str, "%Y-%m-%d")
+    return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _format_created(new_transcript, tags: Optional[List[str]]) -> str:
+    """Format the confirmation message for a newly created transcript."""
+    tags_str = f"\nTags: {', '.join(tags)}" if tags else ""
+    words_str = f"\nWords: {new_transcript.word_count}" if new_transcript.word_count else ""
+
+    return (
+        f"Transcript created successfully!\n"
+        f"ID: {new_transcript.id}\n"
+        f"Title: {new_transcript.title}\n"
+        f"Type: {new_transcript.transcript_type}\n"
+        f"Date: {new_transcript.transcript_date.strftime('%Y-%m-%d')}{tags_str}{words_str}\n\n"
+        f"Raw file: {new_transcript.raw_path}\n"
+        f"Processed file: {new_transcript.processed_path}\n\n"
+        f"Use the update_transcript tool to add summary, action items, and link to projects."
+    )
+
+
 def create_transcript_tool(engine):
     """Create a new transcript tool."""
 
@@ -61,36 +146,140 @@ def create_transcript_tool(engine):
             indexer = StorageIndexer(session)
 
             # Parse date or use today
-            if transcript.transcript_date:
-                trans_date = datetime.strptime(transcript.transcript_date, "%Y-%m-%d")
-            else:
-                trans_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            trans_date = _parse_transcript_date(transcript.transcript_date)
 
             # Create transcript
-            new_transcript = indexer.create_transcript(
-                title=transcript.title,
-                raw_content=transcript.raw_content,
+            try:
+                new_transcript = indexer.create_transcript(
+                    title=transcript.title,
+                    raw_content=transcript.raw_content,
+                    transcript_date=trans_date,
+                    transcript_type=transcript.transcript_type,
+                    tags=transcript.tags,
+                )
+            except DuplicateTranscriptError as e:
+                return f"Error: {e}"
+
+            return _format_created(new_transcript, transcript.tags)
+        finally:
+            session.close()
+
+    return create_transcript
+
+
+def begin_transcript_upload_tool(engine):
+    """Start a chunked transcript upload tool."""
+
+    async def begin_transcript_upload(upload: TranscriptUploadBeginInput) -> str:
+        """
+        Start a chunked upload for a large transcript.
+
+        Returns an upload ID. Send the text with append_transcript_chunk and
+        complete it with finish_transcript_upload. Each chunk is written to
+        disk immediately, so transcripts of any size can be imported.
+        """
+        _expire_uploads()
+        session = get_session(engine)
+        try:
+            storage = StorageIndexer(session).storage
+            trans_date = _parse_transcript_date(upload.transcript_date)
+
+            upload_id = uuid.uuid4().hex
+            _uploads[upload_id] = TranscriptUpload(
+                writer=storage.open_transcript_writer(),
+                title=upload.title,
                 transcript_date=trans_date,
-                transcript_type=transcript.transcript_type,
-                tags=transcript.tags,
+                transcript_type=upload.transcript_type,
+                tags=upload.tags,
             )
 
-            tags_str = f"\nTags: {', '.join(transcript.tags)}" if transcript.tags else ""
-
             return (
-                f"Transcript created successfully!\n"
-                f"ID: {new_transcript.id}\n"
-                f"Title: {new_transcript.title}\n"
-                f"Type: {new_transcript.transcript_type}\n"
-                f"Date: {trans_date.strftime('%Y-%m-%d')}{tags_str}\n\n"
-                f"Raw file: {new_transcript.raw_path}\n"
-                f"Processed file: {new_transcript.processed_path}\n\n"
-                f"Use the update_transcript tool to add summary, action items, and link to projects."
+                f"Upload started.\n"
+                f"Upload ID: {upload_id}\n\n"
+                f"Send text with append_transcript_chunk, then call finish_transcript_upload."
             )
         finally:
             session.close()
 
-    return create_transcript
+    return begin_transcript_upload
+
+
+def append_transcript_chunk_tool(engine):
+    """Append a chunk to a transcript upload tool."""
+
+    async def append_transcript_chunk(chunk_input: TranscriptChunkInput) -> str:
+        """
+        Append the next chunk of text to a transcript upload.
+
+        Chunks are concatenated in the order they are sent. An upload that
+        receives no chunk for an hour is aborted.
+        """
+        _expire_uploads()
+        upload = _uploads.get(chunk_input.upload_id)
+        if not upload:
+            return f"Error: Upload '{chunk_input.upload_id}' not found"
+
+        upload.writer.write(chunk_input.chunk)
+        upload.chunks += 1
+        upload.last_active = time.monotonic()
+
+        return (
+            f"Chunk {upload.chunks} received "
+            f"({upload.writer.char_count} characters, {upload.writer.word_count} words so far)"
+        )
+
+    return append_transcript_chunk
+
+
+def finish_transcript_upload_tool(engine):
+    """Finish a chunked transcript upload tool."""
+
+    async def finish_transcript_upload(upload_id: str) -> str:
+        """
+        Finish a chunked transcript upload and create the transcript.
+        """
+        _expire_uploads()
+        upload = _uploads.pop(upload_id, None)
+        if not upload:
+            return f"Error: Upload '{upload_id}' not found"
+
+        session = get_session(engine)
+        try:
+            indexer = StorageIndexer(session)
+            new_transcript = indexer.finish_transcript(
+                upload.writer,
+                title=upload.title,
+                transcript_date=upload.transcript_date,
+                transcript_type=upload.transcript_type,
+                tags=upload.tags,
+            )
+            return _format_created(new_transcript, upload.tags)
+        except DuplicateTranscriptError as e:
+            return f"Error: {e}"
+        except Exception:
+            upload.writer.abort()
+            raise
+        finally:
+            session.close()
+
+    return finish_transcript_upload
+
+
+def abort_transcript_upload_tool(engine):
+    """Abort a chunked transcript upload tool."""
+
+    async def abort_transcript_upload(upload_id: str) -> str:
+        """
+        Abort a chunked transcript upload and discard the partial file.
+        """
+        upload = _uploads.pop(upload_id, None)
+        if not upload:
+            return f"Error: Upload '{upload_id}' not found"
+
+        upload.writer.abort()
+        return f"Upload {upload_id} aborted"
+
+    return abort_transcript_upload
 
 
 def update_transcript_tool(engine):
@@ -194,9 +383,11 @@ def get_transcripts_tool(engine):
                 if t.tags:
                     result += f"**Tags:** {t.tags}\n"
 
-                if t.summary:
+                if t.summary_snippet:
                     summary_preview = (
-                        t.summary[:150] + "..." if len(t.summary) > 150 else t.summary
+                        t.summary_snippet[:150] + "..."
+                        if len(t.summary_snippet) > 150
+                        else t.summary_snippet
                     )
                     result += f"**Summary:** {summary_preview}\n"
 
@@ -219,11 +410,13 @@ def get_transcripts_tool(engine):
 def get_transcript_content_tool(engine):
     """Get the full content of a specific transcript tool."""
 
-    async def get_transcript_content(transcript_id: int) -> str:
+    async def get_transcript_content(transcript_id: int, offset: int = 0, limit: int = 5000) -> str:
         """
-        Get the full content of a specific transcript.
+        Get the content of a specific transcript, one page at a time.
 
-        Retrieves both the raw transcript text and any processed notes.
+        Retrieves the processed notes (on the first page) and a page of the
+        raw transcript text. Long transcripts are paged by character offset;
+        the raw file is streamed so only the requested page is held in memory.
         Useful when an agent needs to analyze or summarize the full transcript.
         """
         session = get_session(engine)
@@ -232,6 +425,9 @@ def get_transcript_content_tool(engine):
             if not transcript:
                 return f"Error: Transcript with ID {transcript_id} not found"
 
+            offset = max(offset, 0)
+            limit = max(limit, 1)
+
             # Read the files
             indexer = StorageIndexer(session)
             storage = indexer.storage
@@ -251,19 +447,28 @@ def get_transcript_content_tool(engine):
 
             result += "\n---\n\n"
 
-            if processed_data and processed_data.get("content"):
+            if offset == 0 and processed_data and processed_data.get("content"):
                 result += "## Processed Notes\n\n"
                 result += processed_data["content"]
                 result += "\n\n---\n\n"
 
-            if processed_data and processed_data.get("raw_content"):
+            raw = processed_data.get("raw") if processed_data else None
+            if raw:
                 result += "## Raw Transcript\n\n"
-                # Truncate if too long
-                raw = processed_data["raw_content"]
-                if len(raw) > 5000:
-                    result += f"{raw[:5000]}\n\n... [truncated, {len(raw)} characters total]"
+                text, has_more = raw.read_page(offset, limit)
+                if not text and offset > 0:
+                    result += f"(No content at offset {offset}; the transcript is shorter.)"
                 else:
-                    result += raw
+                    result += text
+                    end = offset + len(text)
+                    result += f"\n\n[characters {offset}-{end}"
+                    if has_more:
+                        result += (
+                            f", more available; call get_transcript_content with "
+                            f"offset={end} for the next page]"
+                        )
+                    else:
+                        result += ", end of transcript]"
             else:
                 result += "## Raw Transcript\n\n"
                 result += f"Raw file path: {transcript.raw_path}\n"
@@ -1,5 +1,23 @@
 """Utility modules for Second Brain."""
 
-from .datetime_utils import now, utcnow, to_local, to_utc, format_datetime, parse_datetime
+from .datetime_utils import (
+    now,
+    utcnow,
+    to_local,
+    to_utc,
+    format_datetime,
+    parse_datetime,
+    day_key,
+    day_key_to_date,
+)
 
-__all__ = ["now", "utcnow", "to_local", "to_utc", "format_datetime", "parse_datetime"]
+__all__ = [
+    "now",
+    "utcnow",
+    "to_local",
+    "to_utc",
+    "format_datetime",
+    "parse_datetime",
+    "day_key",
+    "day_key_to_date",
+]
@@ -1,11 +1,13 @@
 """Timezone-aware datetime utilities for Second Brain."""
 
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from zoneinfo import ZoneInfo
-from typing import Optional
+from typing import Optional, Union
 
 from ..config import get_config
 
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
 
 def get_timezone() -> ZoneInfo:
     """Get configured timezone.
@@ -110,3 +112,40 @@ def parse_datetime(dt_string: str) -> datetime:
         dt = dt.replace(tzinfo=tz)
 
     return dt
+
+
+def day_key(
+    value: Union[date, datetime], naive_utc: bool = False, tz: Optional[ZoneInfo] = None
+) -> int:
+    """Get the day key (days since 1970-01-01) of a date in the configured timezone.
+
+    Args:
+        value: Date or datetime. Aware datetimes are converted to the
+            configured timezone first
+        naive_utc: Treat naive datetimes as UTC timestamps (e.g.
+            ``completed_at``) instead of local calendar dates (e.g. a work
+            log date)
+        tz: Timezone to use instead of looking up the configured one
+
+    Returns:
+        Integer day key, comparable across aware and naive inputs
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is None and naive_utc:
+            value = value.replace(tzinfo=timezone.utc)
+        if value.tzinfo is not None:
+            value = value.astimezone(tz or get_timezone())
+        value = value.date()
+    return value.toordinal() - EPOCH_ORDINAL
+
+
+def day_key_to_date(key: int) -> date:
+    """Convert a day key back to a date.
+
+    Args:
+        key: Days since 1970-01-01
+
+    Returns:
+        Calendar date
+    """
+    return date.fromordinal(int(key) + EPOCH_ORDINAL)
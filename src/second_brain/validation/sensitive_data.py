@@ -7,7 +7,8 @@ from pathlib import Path
 from typing import List, Optional
 from dataclasses import dataclass, field
 import re
-import frontmatter
+
+from ..storage import frontmatter_codec
 
 from .patterns import (
     HIGH_CONFIDENCE_PATTERNS,
@@ -195,7 +196,7 @@ class SensitiveDataValidator:
 
         if file_path.endswith('.md'):
             try:
-                post = frontmatter.loads(content)
+                post = frontmatter_codec.loads(content)
                 metadata = post.metadata
                 body = post.content
             except Exception:
@@ -196,6 +196,1879 @@ class TestStorageIndexer:
         assert work_log.entries[0].entry_text == "Completed feature X"
 
 
+class TestStorageLayout:
+    """Test sharded note and monthly transcript layouts."""
+
+    def test_sharded_note_path(self, temp_data_dir):
+        """Test that sharded notes are split into id-derived directories."""
+        storage = MarkdownStorage(temp_data_dir, note_layout="sharded")
+        filepath = storage.create_note_file(1234, "Sharded", "Body")
+
+        assert Path(filepath) == Path(temp_data_dir) / "notes" / "00" / "12" / "note-1234.md"
+        assert storage.read_note_file(1234)["metadata"]["title"] == "Sharded"
+        assert len(storage.list_note_files()) == 1
+
+    def test_flat_notes_found_after_layout_change(self, temp_data_dir):
+        """Test that notes written flat are still resolved under the sharded layout."""
+        MarkdownStorage(temp_data_dir).create_note_file(7, "Flat", "Body")
+
+        storage = MarkdownStorage(temp_data_dir, note_layout="sharded")
+        assert storage.read_note_file(7) is not None
+
+    def test_migrate_layout(self, indexer):
+        """Test moving existing notes and transcripts and updating stored paths."""
+        note = indexer.create_note("Migrate me", "Body")
+        transcript = indexer.create_transcript(
+            "Standup", "raw text", datetime(2024, 3, 5), transcript_type="meeting"
+        )
+
+        moved = indexer.migrate_layout(note_layout="sharded", transcript_layout="monthly")
+
+        assert moved == {"notes": 1, "transcripts": 1}
+        assert Path(note.markdown_path).parent.name == "00"
+        assert Path(note.markdown_path).exists()
+        assert Path(transcript.processed_path).parent.parts[-2:] == ("2024", "03")
+        data = indexer.storage.read_transcript_file(transcript.processed_path)
+        assert data["metadata"]["raw_file"] == transcript.raw_path
+        assert data["raw"].read() == "raw text"
+
+    def test_migrate_keeps_missing_paths(self, temp_data_dir):
+        """Test that a transcript file that doesn't exist keeps its recorded path."""
+        storage = MarkdownStorage(temp_data_dir)
+        missing = str(Path(temp_data_dir) / "transcripts" / "raw" / "gone.txt")
+
+        raw, processed = storage.migrate_transcript_files(
+            missing, None, datetime(2024, 3, 5), "monthly"
+        )
+        assert (raw, processed) == (missing, None)
+
+
+class TestWorkLogArchive:
+    """Test packing closed months of work logs."""
+
+    def test_pack_and_read_archived_day(self, storage):
+        """Test that packed days are read transparently from the archive."""
+        storage.append_to_work_log(datetime(2024, 1, 15), "Archived work")
+        storage.append_to_work_log(datetime(2024, 1, 16), "More archived work")
+        storage.append_to_work_log(datetime(2024, 2, 1), "Current month")
+
+        packed = storage.pack_work_logs(datetime(2024, 2, 1))
+
+        assert packed == [(2024, 1, 2)]
+        assert not storage.work_log_path(datetime(2024, 1, 15)).exists()
+        assert storage.work_log_path(datetime(2024, 2, 1)).exists()
+
+        data = storage.read_work_log_file(datetime(2024, 1, 15))
+        assert data["archived"] is True
+        assert "Archived work" in data["content"]
+        assert storage.read_work_log_file(datetime(2024, 1, 17)) is None
+
+    def test_append_to_archived_day_and_repack(self, storage):
+        """Test that appending restores the day and repacking keeps the new entry."""
+        date = datetime(2024, 1, 15)
+        storage.append_to_work_log(date, "First entry")
+        storage.pack_work_logs(datetime(2024, 2, 1))
+
+        storage.append_to_work_log(date, "Late entry")
+        storage.pack_work_logs(datetime(2024, 2, 1))
+
+        content = storage.read_work_log_file(date)["content"]
+        assert "First entry" in content
+        assert "Late entry" in content
+
+    def test_unpack(self, storage):
+        """Test unpacking a month back into daily files."""
+        date = datetime(2024, 1, 15)
+        storage.append_to_work_log(date, "Round trip")
+        original = storage.work_log_path(date).read_bytes()
+        storage.pack_work_logs(datetime(2024, 2, 1))
+
+        assert storage.unpack_work_logs(2024, 1) == 1
+        assert storage.work_log_path(date).read_bytes() == original
+        assert storage.archive.list_months() == []
+
+
+class TestRawTranscripts:
+    """Test lazy and compressed raw transcript storage."""
+
+    @pytest.mark.parametrize("compression", ["none", "gzip"])
+    def test_compressed_round_trip(self, temp_data_dir, compression):
+        """Test writing and paging through a (compressed) raw transcript."""
+        storage = MarkdownStorage(temp_data_dir, raw_compression=compression)
+        text = "".join(f"line {i}\n" for i in range(1000))
+        raw_path, processed_path = storage.create_transcript_file(
+            "Long call", datetime(2024, 3, 5), text
+        )
+
+        raw = storage.read_transcript_file(processed_path)["raw"]
+        assert str(raw.path) == raw_path
+        assert raw.read() == text
+
+        page, has_more = raw.read_page(offset=10, limit=20)
+        assert page == text[10:30]
+        assert has_more is True
+
+        page, has_more = raw.read_page(offset=len(text) - 5, limit=20)
+        assert page == text[-5:]
+        assert has_more is False
+
+    @pytest.mark.parametrize("compression", ["none", "gzip"])
+    def test_read_page_resumes_from_cursor(self, temp_data_dir, compression):
+        """Test that sequential pages resume where the previous page ended."""
+        from second_brain.storage import raw_transcript
+
+        storage = MarkdownStorage(temp_data_dir, raw_compression=compression)
+        text = "".join(f"línea {i} ✓\\n" for i in range(3000))
+        _, processed_path = storage.create_transcript_file("Long call", datetime(2024, 3, 5), text)
+        raw = storage.read_transcript_file(processed_path)["raw"]
+
+        pages, offset, has_more = [], 0, True
+        while has_more:
+            page, has_more = raw.read_page(offset, limit=7000)
+            pages.append(page)
+            offset += len(page)
+            if has_more:
+                assert any(key[3] == offset for key in raw_transcript._page_cursors)
+        assert "".join(pages) == text
+
+        # Jumping back still reads the right range
+        assert raw.read_page(offset=5, limit=10) == (text[5:15], True)
+
+    def test_gzip_suffix(self, temp_data_dir):
+        """Test that compressed raw files get a compression suffix."""
+        storage = MarkdownStorage(temp_data_dir, raw_compression="gzip")
+        raw_path, _ = storage.create_transcript_file("Call", datetime(2024, 3, 5), "hi")
+        assert raw_path.endswith(".gz")
+
+
+class TestTranscriptImport:
+    """Test streaming transcript ingest."""
+
+    def test_import_chunks(self, indexer):
+        """Test that hash and word count are computed across chunk boundaries."""
+        import hashlib
+
+        text = "alpha beta gamma\ndelta epsilon"
+        chunks = ["alpha be", "ta gam", "ma\n", "delta ", "epsilon"]
+        transcript = indexer.import_transcript("Streamed", chunks, datetime(2024, 3, 5))
+
+        assert transcript.word_count == 5
+        assert transcript.content_hash == hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+        raw = indexer.storage.read_transcript_file(transcript.processed_path)["raw"]
+        assert raw.read() == text
+
+    def test_failed_import_leaves_no_files(self, indexer):
+        """Test that an interrupted import discards the partial file."""
+
+        def chunks():
+            yield "partial text"
+            raise RuntimeError("connection lost")
+
+        with pytest.raises(RuntimeError):
+            indexer.import_transcript("Broken", chunks(), datetime(2024, 3, 5))
+
+        assert list(indexer.storage.blobs.tmp_path.glob("*")) == []
+
+    def test_idle_uploads_expire(self, storage, monkeypatch):
+        """Test that abandoned chunked uploads are closed and their partial files deleted."""
+        from second_brain.tools import transcripts
+
+        monkeypatch.setattr(transcripts, "_uploads", {})
+        uploads = {}
+        for name in ("idle", "busy"):
+            writer = storage.open_transcript_writer()
+            writer.write("partial text")
+            uploads[name] = transcripts.TranscriptUpload(writer, name, datetime(2024, 3, 5))
+            transcripts._uploads[name] = uploads[name]
+        uploads["idle"].last_active -= transcripts.UPLOAD_IDLE_TIMEOUT + 1
+
+        assert transcripts._expire_uploads() == ["idle"]
+        assert uploads["idle"].writer.closed
+        assert not uploads["idle"].writer.part_path.exists()
+        assert list(transcripts._uploads) == ["busy"]
+        uploads["busy"].writer.abort()
+
+
+class TestFrontmatterCodec:
+    """Test the fast frontmatter codec against python-frontmatter."""
+
+    def test_matches_library(self, temp_data_dir):
+        """Test that files we write load and dump identically."""
+        import frontmatter
+        from second_brain.storage import frontmatter_codec
+
+        storage = MarkdownStorage(temp_data_dir)
+        paths = [
+            storage.create_project_file("Demo", "demo", "Desc", tags=["a", "b c"]),
+            storage.create_note_file(7, "Note", "Body", project_id=1, tags=[]),
+            storage.create_work_log_file(datetime(2024, 3, 5)),
+        ]
+
+        for path in paths:
+            text = Path(path).read_text(encoding="utf-8")
+            expected = frontmatter.loads(text)
+            post = frontmatter_codec.loads(text)
+            assert post.metadata == expected.metadata
+            assert post.content == expected.content
+            assert frontmatter_codec.dumps(post) == text
+
+    @pytest.mark.parametrize(
+        "value",
+        ["yes", "2024-01-01", "123", "", "a: b", "Café", {"nested": 1}, 1.5, "x " * 50, None],
+    )
+    def test_edge_values(self, value):
+        """Test values that need quoting or fall back to PyYAML."""
+        import frontmatter
+        from second_brain.storage import frontmatter_codec
+
+        metadata = {"value": value, "tags": ["yes", "plain"]}
+        expected = frontmatter.dumps(frontmatter.Post("Body", **metadata))
+        assert frontmatter_codec.dumps(frontmatter_codec.Post("Body", **metadata)) == expected
+        assert frontmatter_codec.loads(expected).metadata == frontmatter.loads(expected).metadata
+
+
+class TestBlobStore:
+    """Test content-addressed storage of transcripts and attachments."""
+
+    def test_duplicate_transcript_detected(self, indexer):
+        """Test that re-importing identical text reuses the blob and is rejected."""
+        from second_brain.storage import DuplicateTranscriptError
+        from second_brain.db import BlobOps
+
+        first = indexer.create_transcript("Call", "same text", datetime(2024, 3, 5))
+        with pytest.raises(DuplicateTranscriptError) as excinfo:
+            indexer.create_transcript("Call again", "same text", datetime(2024, 3, 6))
+
+        assert excinfo.value.transcript.id == first.id
+        assert Path(first.raw_path).parent.parent.parent == indexer.storage.blobs.blobs_path
+        assert BlobOps.get(indexer.session, first.content_hash).ref_count == 1
+        assert list(indexer.storage.blobs.tmp_path.glob("*")) == []
+
+    def test_note_attachments_share_blobs(self, indexer, temp_data_dir):
+        """Test that identical attachments are stored once and refcounted."""
+        from second_brain.db import BlobOps
+
+        source = Path(temp_data_dir) / "diagram.png"
+        source.write_bytes(b"\x89PNG fake image")
+        note_a = indexer.create_note("A", "Body")
+        note_b = indexer.create_note("B", "Body")
+
+        first = indexer.attach_file_to_note(note_a.id, str(source))
+        second = indexer.attach_file_to_note(note_b.id, str(source), filename="copy.png")
+
+        assert first.content_hash == second.content_hash
+        assert BlobOps.get(indexer.session, first.content_hash).ref_count == 2
+        metadata = indexer.storage.read_note_file(note_b.id)["metadata"]
+        assert metadata["attachments"] == [f"{second.content_hash} copy.png"]
+
+        blob_path = indexer.storage.blobs.find(first.content_hash)
+        assert indexer.detach_from_note(first.id)
+        assert blob_path.exists()
+        assert indexer.detach_from_note(second.id)
+        assert not blob_path.exists()
+        assert BlobOps.get(indexer.session, first.content_hash) is None
+        assert "attachments" not in indexer.storage.read_note_file(note_b.id)["metadata"]
+
+    def test_attachment_ignores_compressed_blob(self, temp_data_dir, db_session):
+        """Test that an attachment never resolves to a compressed transcript blob."""
+        from second_brain.db import BlobOps
+
+        indexer = StorageIndexer(db_session, temp_data_dir)
+        indexer.storage = MarkdownStorage(temp_data_dir, raw_compression="gzip")
+        transcript = indexer.create_transcript("Call", "shared words", datetime(2024, 3, 5))
+        source = Path(temp_data_dir) / "words.txt"
+        source.write_text("shared words", encoding="utf-8")
+
+        attachment = indexer.attach_file_to_note(indexer.create_note("N", "Body").id, str(source))
+        assert attachment.content_hash == transcript.content_hash
+        assert Path(attachment.blob.path).read_bytes() == b"shared words"
+        assert Path(transcript.raw_path).suffix == ".gz"
+        assert BlobOps.get(db_session, attachment.content_hash).ref_count == 2
+
+    def test_note_delete_releases_attachments(self, indexer, temp_data_dir):
+        """Test that deleting a note drops its attachments' blob references."""
+        from second_brain.db import BlobOps, NoteOps
+
+        source = Path(temp_data_dir) / "diagram.png"
+        source.write_bytes(b"\x89PNG fake image")
+        note_a = indexer.create_note("A", "Body")
+        note_b = indexer.create_note("B", "Body")
+        attachment = indexer.attach_file_to_note(note_a.id, str(source))
+        indexer.attach_file_to_note(note_a.id, str(source), filename="again.png")
+        indexer.attach_file_to_note(note_b.id, str(source))
+        content_hash = attachment.content_hash
+
+        assert NoteOps.delete(indexer.session, note_a) == []
+        assert BlobOps.get(indexer.session, content_hash).ref_count == 1
+        assert NoteOps.delete(indexer.session, note_b) == [content_hash]
+        assert BlobOps.get(indexer.session, content_hash) is None
+
+
+class TestChangeTracking:
+    """Test skipping no-op database updates and markdown rewrites."""
+
+    def test_noop_task_update(self, indexer):
+        """Test that updating a task with its current values writes nothing."""
+        task = TaskOps.create(indexer.session, title="Same", status="todo")
+        updated_at = task.updated_at
+
+        TaskOps.update(indexer.session, task, title="Same", status="todo")
+        assert task.updated_at == updated_at
+
+        TaskOps.update(indexer.session, task, status="done")
+        assert task.updated_at > updated_at
+        assert task.completed_at is not None
+
+    def test_unchanged_project_not_rewritten(self, indexer):
+        """Test that syncing an unchanged project leaves its file alone."""
+        project = indexer.create_project("Quiet", "Nothing changes", tags=["a"])
+        path = Path(project.markdown_path)
+        before = path.read_text(encoding="utf-8")
+        updated_at = project.updated_at
+
+        assert indexer.sync_project_to_markdown(project) is False
+        assert indexer.sync_project_to_markdown(project) is False
+        assert path.read_text(encoding="utf-8") == before
+        assert project.updated_at == updated_at
+
+        ProjectOps.update(indexer.session, project, status="completed")
+        assert indexer.sync_project_to_markdown(project) is True
+        assert indexer.storage.read_project_file("quiet")["metadata"]["status"] == "completed"
+
+    def test_flush_dirty(self, indexer):
+        """Test that a dirty batch only writes entities that changed."""
+        changed = indexer.create_project("Changed")
+        unchanged = indexer.create_project("Unchanged")
+        indexer.sync_all_to_markdown()
+
+        ProjectOps.update(indexer.session, changed, description="New description")
+        indexer.mark_dirty(changed)
+        indexer.mark_dirty(changed)
+        indexer.mark_dirty(unchanged)
+
+        assert indexer.flush_dirty() == {"written": 1, "skipped": 1}
+        assert len(indexer.dirty) == 0
+
+
+class TestWrites:
+    """Test atomic markdown writes and the write-behind queue."""
+
+    def test_atomic_write_leaves_no_temp_files(self, storage, temp_data_dir):
+        """Test that updates replace files without leftover temp files."""
+        storage.create_note_file(1, "Atomic", "Body")
+        storage.append_to_note(1, "More")
+
+        assert [p.name for p in Path(temp_data_dir, "notes").iterdir()] == ["note-1.md"]
+        assert "More" in storage.read_note_file(1)["content"]
+
+    def test_atomic_write_keeps_mode(self, temp_data_dir):
+        """Test that rewritten files keep their permissions and new ones follow the umask."""
+        import os
+        from second_brain.storage import writes
+
+        path = Path(temp_data_dir) / "shared.md"
+        writes.atomic_write_text(path, "One")
+        assert path.stat().st_mode & 0o777 == 0o666 & ~writes._UMASK
+
+        os.chmod(path, 0o640)
+        writes.atomic_write_text(path, "Two")
+        assert path.stat().st_mode & 0o777 == 0o640
+
+    def test_write_behind_coalesces(self, storage):
+        """Test that repeated appends are held in memory and written once on flush."""
+        from second_brain.storage import writes
+
+        path = Path(storage.create_note_file(1, "Busy", "Body"))
+        on_disk = path.read_text(encoding="utf-8")
+
+        queue = writes.enable_write_behind(delay=60)
+        try:
+            for i in range(5):
+                storage.append_to_note(1, f"Entry {i}")
+
+            assert path.read_text(encoding="utf-8") == on_disk
+            assert "Entry 4" in storage.read_note_file(1)["content"]
+            assert len(queue) == 1
+
+            assert storage.flush() == 1
+            assert "Entry 4" in path.read_text(encoding="utf-8")
+            assert queue.writes_requested == 5
+            assert queue.writes_performed == 1
+        finally:
+            writes.disable_write_behind()
+
+    def test_failed_flush_keeps_pending(self, temp_data_dir):
+        """Test that one failing write neither drops it nor the files after it."""
+        from second_brain.storage import writes
+
+        queue = writes.WriteBehindQueue(delay=60)
+        missing = Path(temp_data_dir) / "gone" / "a.md"
+        path = Path(temp_data_dir) / "b.md"
+        queue.put(missing, "Lost?")
+        queue.put(path, "Kept")
+
+        with pytest.raises(OSError):
+            queue.flush()
+        assert path.read_text(encoding="utf-8") == "Kept"
+        assert queue.get(missing) == "Lost?"
+
+        missing.parent.mkdir()
+        assert queue.flush() == 1
+        assert missing.read_text(encoding="utf-8") == "Lost?"
+        assert len(queue) == 0
+
+    def test_fsync_durability(self, temp_data_dir):
+        """Test that the fsync durability level writes normally."""
+        storage = MarkdownStorage(temp_data_dir, durability="fsync")
+        storage.create_note_file(1, "Durable", "Body")
+        storage.append_to_note(1, "Synced")
+        assert "Synced" in storage.read_note_file(1)["content"]
+
+        with pytest.raises(ValueError):
+            MarkdownStorage(temp_data_dir, durability="sometimes")
+
+
+class TestNoteChunks:
+    """Test chunked note appends."""
+
+    def test_append_stores_chunks(self, indexer):
+        """Test that appends add chunks and leave the base content alone."""
+        note = indexer.create_note("Journal", "Day one")
+        indexer.append_to_note(note.id, "Day two")
+        indexer.append_to_note(note.id, "Day three")
+
+        note = indexer.session.get(type(note), note.id)
+        assert note.content == "Day one"
+        assert [chunk.seq for chunk in note.chunks] == [1, 2]
+        assert note.full_content == "Day one\n\nDay two\n\nDay three"
+
+        content = indexer.storage.read_note_file(note.id)["content"]
+        assert content.index("Day one") < content.index("Day two") < content.index("Day three")
+
+    def test_concurrent_appends(self, db_session):
+        """Test that appends from several connections get distinct sequence numbers."""
+        from concurrent.futures import ThreadPoolExecutor
+        from second_brain.db.operations import NoteOps
+
+        note = NoteOps.create(db_session, "Shared", "Start", "note-1.md")
+        engine = db_session.get_bind()
+
+        def append(worker):
+            session = get_session(engine)
+            try:
+                for i in range(10):
+                    NoteOps.append_chunk(session, note.id, f"{worker}-{i}")
+            finally:
+                session.close()
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(append, range(4)))
+
+        db_session.expire_all()
+        assert [chunk.seq for chunk in note.chunks] == list(range(1, 41))
+
+    def test_append_does_not_rewrite_file(self, indexer):
+        """Test that appends only add to the end of the markdown file."""
+        note = indexer.create_note("Log", "Start")
+        path = Path(note.markdown_path)
+        before = path.read_text(encoding="utf-8")
+
+        indexer.append_to_note(note.id, "Next")
+
+        after = path.read_text(encoding="utf-8")
+        assert after.startswith(before)
+        assert after.endswith("Next")
+
+    def test_search_matches_chunks(self, indexer):
+        """Test that search finds text in appended chunks."""
+        from second_brain.db.operations import NoteOps
+
+        note = indexer.create_note("Findings", "Nothing yet")
+        indexer.append_to_note(note.id, "Found the flaky test")
+
+        assert [n.id for n in NoteOps.search(indexer.session, "flaky")] == [note.id]
+
+    def test_update_replaces_chunks(self, indexer):
+        """Test that updating a note folds its chunks into the content."""
+        note = indexer.create_note("Draft", "First")
+        indexer.append_to_note(note.id, "Second")
+
+        note = indexer.update_note(note.id, title="Final")
+
+        assert note.chunks == []
+        assert note.content == "First\n\nSecond"
+        assert "Second" in indexer.storage.read_note_file(note.id)["content"]
+
+
+class TestListSnippets:
+    """Test that list queries defer long text columns."""
+
+    def test_note_list_defers_content(self, indexer):
+        """Test that listed notes carry a snippet and leave content unloaded."""
+        from sqlalchemy import inspect as sa_inspect
+        from second_brain.db.operations import NoteOps
+
+        indexer.create_note("Long", "x" * 1000)
+        indexer.session.expunge_all()
+
+        [note] = NoteOps.list_all(indexer.session)
+        assert "content" in sa_inspect(note).unloaded
+        assert note.snippet == "x" * 151
+
+        # The full content still loads on access
+        assert len(note.content) == 1000
+
+    def test_task_and_transcript_snippets(self, indexer, db_session):
+        """Test description and summary snippets on tasks and transcripts."""
+        from second_brain.db.operations import TranscriptOps
+
+        TaskOps.create(db_session, "Short", "A short description")
+        transcript = indexer.create_transcript("Call", "Hello", datetime(2024, 3, 1))
+        TranscriptOps.update(db_session, transcript, summary="s" * 400)
+        db_session.expunge_all()
+
+        [task] = TaskOps.list_all(db_session)
+        assert task.description_snippet == "A short description"
+
+        [listed] = TranscriptOps.list_all(db_session)
+        assert len(listed.summary_snippet) == 151
+        assert TranscriptOps.list_all(db_session, load_text=True)[0].summary == "s" * 400
+
+
+class TestReadViews:
+    """Test the slotted read rows used by list and report paths."""
+
+    def test_task_rows(self, indexer, db_session):
+        """Test that task rows carry project names and honor filters."""
+        from second_brain.db import task_rows
+
+        project = indexer.create_project("Views")
+        TaskOps.create(db_session, "In project", "Details", priority="high", project_id=project.id)
+        TaskOps.create(db_session, "Loose")
+
+        rows = task_rows(db_session)
+        assert [(r.title, r.project_name) for r in rows] == [
+            ("In project", "Views"),
+            ("Loose", None),
+        ]
+        assert [r.title for r in task_rows(db_session, priority="high")] == ["In project"]
+        assert not hasattr(rows[0], "__dict__")
+
+    def test_note_rows_and_work_log_entries(self, indexer, db_session):
+        """Test note search rows and work log entry rows."""
+        from second_brain.db import note_rows, work_log_entry_rows
+
+        note = indexer.create_note("Searchable", "Base")
+        indexer.append_to_note(note.id, "needle")
+        assert [r.id for r in note_rows(db_session, query_text="needle")] == [note.id]
+
+        task = TaskOps.create(db_session, "Logged")
+        day = datetime(2024, 5, 1, 9)
+        indexer.add_work_log_entry(day, "Worked", task_id=task.id, time_spent_minutes=15)
+        indexer.add_work_log_entry(day, "Reviewed")
+
+        rows = work_log_entry_rows(db_session, datetime(2024, 5, 1), datetime(2024, 5, 2))
+        assert [(r.entry_text, r.task_title) for r in rows] == [
+            ("Worked", "Logged"),
+            ("Reviewed", None),
+        ]
+
+
+class TestAnalytics:
+    """Test the columnar analytics snapshot."""
+
+    def test_weekly_minutes_and_throughput(self, indexer, db_session):
+        """Test per-project weekly minutes, throughput and cycle time."""
+        pytest.importorskip("numpy")
+        from datetime import date
+        from second_brain.analytics import AnalyticsSnapshot
+
+        alpha = indexer.create_project("Alpha")
+        beta = indexer.create_project("Beta")
+        a = TaskOps.create(db_session, "A", project_id=alpha.id)
+        b = TaskOps.create(db_session, "B", project_id=beta.id)
+        TaskOps.update(db_session, a, status="done")
+        a.created_at = datetime(2024, 5, 1, 12)
+        a.completed_at = datetime(2024, 5, 8, 12)
+        db_session.commit()
+
+        # Wednesday and Thursday of one week, Monday of the next
+        indexer.add_work_log_entry(datetime(2024, 5, 1), "a1", task_id=a.id, time_spent_minutes=30)
+        indexer.add_work_log_entry(datetime(2024, 5, 2), "b1", task_id=b.id, time_spent_minutes=45)
+        indexer.add_work_log_entry(datetime(2024, 5, 6), "a2", task_id=a.id, time_spent_minutes=60)
+
+        snapshot = AnalyticsSnapshot.load(db_session)
+        summary = snapshot.summary(weeks=2, today=date(2024, 5, 8))
+
+        assert summary["weeks"] == ["2024-04-29", "2024-05-06"]
+        assert summary["throughput"] == [0, 1]
+        assert summary["status_counts"]["done"] == 1
+        assert summary["status_counts"]["todo"] == 1
+        assert summary["project_minutes"] == [
+            {"project": "Alpha", "minutes": [30, 60], "total": 90},
+            {"project": "Beta", "minutes": [45, 0], "total": 45},
+        ]
+        assert summary["cycle_time"]["p50"] == 7.0
+
+        alpha_only = snapshot.summary(weeks=2, today=date(2024, 5, 8), project_id=alpha.id)
+        assert [p["project"] for p in alpha_only["project_minutes"]] == ["Alpha"]
+
+    def test_empty_database(self, db_session):
+        """Test that analytics work with no data."""
+        pytest.importorskip("numpy")
+        from second_brain.analytics import AnalyticsSnapshot
+
+        summary = AnalyticsSnapshot.load(db_session).summary(weeks=4)
+        assert summary["throughput"] == [0, 0, 0, 0]
+        assert summary["project_minutes"] == []
+        assert summary["cycle_time"] is None
+
+
+class TestForecast:
+    """Test Monte Carlo completion forecasts."""
+
+    def test_history_refreshes_incrementally(self, db_session):
+        """Test that a refresh only reads tasks changed since the last one."""
+        pytest.importorskip("numpy")
+        from second_brain.analytics import ThroughputHistory
+
+        tasks = [TaskOps.create(db_session, f"Task {i}") for i in range(5)]
+        for task in tasks[:3]:
+            TaskOps.update(db_session, task, status="done")
+
+        history = ThroughputHistory()
+        assert history.refresh(db_session) == 5
+        assert len(history.task_ids) == 3
+
+        TaskOps.update(db_session, tasks[3], status="done")
+        TaskOps.update(db_session, tasks[0], status="todo")
+        assert history.refresh(db_session) <= 3
+        assert sorted(history.task_ids.tolist()) == [tasks[1].id, tasks[2].id, tasks[3].id]
+
+    def test_history_catches_writes_behind_watermark(self, db_session):
+        """Test that a done/undone swap stamped before the watermark still reloads."""
+        pytest.importorskip("numpy")
+        from sqlalchemy import update
+        from second_brain.analytics import ThroughputHistory
+        from second_brain.db.models import Task
+
+        tasks = [TaskOps.create(db_session, f"Task {i}") for i in range(3)]
+        TaskOps.update(db_session, tasks[0], status="done")
+        TaskOps.update(db_session, tasks[1], status="done")
+        history = ThroughputHistory()
+        history.refresh(db_session)
+
+        # A late-committing writer: same done count, timestamps behind the watermark
+        stale = datetime(2000, 1, 1)
+        db_session.execute(
+            update(Task).where(Task.id == tasks[0].id).values(status="todo", updated_at=stale)
+        )
+        db_session.execute(
+            update(Task)
+            .where(Task.id == tasks[2].id)
+            .values(status="done", completed_day=tasks[1].completed_day, updated_at=stale)
+        )
+        db_session.commit()
+
+        history.refresh(db_session)
+        assert sorted(history.task_ids.tolist()) == [tasks[1].id, tasks[2].id]
+
+    def test_forecast_project(self, indexer, db_session):
+        """Test percentiles for a project with steady throughput."""
+        pytest.importorskip("numpy")
+        import asyncio
+        from datetime import date, time, timedelta
+        from second_brain.analytics import (
+            ThroughputHistory,
+            forecast_completion,
+            remaining_items,
+        )
+
+        project = indexer.create_project("Steady")
+        today = date(2024, 6, 1)
+        # One task completed every day for the last 30 days
+        for i in range(1, 31):
+            task = TaskOps.create(db_session, f"Done {i}", project_id=project.id)
+            TaskOps.update(db_session, task, status="done")
+            task.completed_at = datetime.combine(today - timedelta(days=i), time(12))
+        db_session.commit()
+        for i in range(10):
+            TaskOps.create(db_session, f"Open {i}", project_id=project.id)
+
+        label, remaining, project_id = asyncio.run(remaining_items(db_session, "steady"))
+        assert (label, remaining, project_id) == ("Project: Steady", 10, project.id)
+
+        history = ThroughputHistory()
+        history.refresh(db_session)
+        forecast = forecast_completion(
+            history, remaining, project_id=project_id, history_days=30, today=today, seed=1
+        )
+        assert forecast.completed_in_history == 30
+        assert forecast.dates == {p: today + timedelta(days=10) for p in (50, 85, 95)}
+
+    def test_forecast_without_history(self, db_session):
+        """Test that forecasting with no completed tasks is an error."""
+        pytest.importorskip("numpy")
+        from second_brain.analytics import ThroughputHistory, forecast_completion
+
+        history = ThroughputHistory()
+        history.refresh(db_session)
+        with pytest.raises(ValueError):
+            forecast_completion(history, 5)
+
+
+class TestDayKeys:
+    """Test integer day keys for date-range queries."""
+
+    def test_aware_and_naive_dates_share_a_day(self, db_session):
+        """Test that aware and naive datetimes for one local day find the same log."""
+        from second_brain.utils.datetime_utils import day_key, day_key_to_date, get_timezone
+
+        naive = datetime(2024, 3, 10)
+        aware = datetime(2024, 3, 10, 9, 30, tzinfo=get_timezone())
+        assert day_key(naive) == day_key(aware) == day_key(naive.date())
+        assert day_key_to_date(day_key(naive)) == naive.date()
+
+        work_log = WorkLogOps.get_or_create(db_session, aware, "logs/2024-03-10.md")
+        assert work_log.day_key == day_key(naive)
+        assert WorkLogOps.get_or_create(db_session, naive, "other.md").id == work_log.id
+
+        entry = WorkLogOps.add_entry(db_session, work_log, "Did things")
+        assert entry.day_key == work_log.day_key
+
+    def test_range_queries_are_inclusive(self, db_session):
+        """Test work log and completed task ranges include both end days."""
+        from second_brain.db import task_rows, work_log_entry_rows
+
+        for day in (1, 2, 3, 4):
+            WorkLogOps.create(db_session, datetime(2024, 3, day), f"logs/{day}.md")
+        logs = WorkLogOps.list_by_date_range(db_session, datetime(2024, 3, 2), datetime(2024, 3, 3))
+        assert [log.date.day for log in logs] == [2, 3]
+        rows = work_log_entry_rows(db_session, datetime(2024, 3, 2), datetime(2024, 3, 3))
+        assert [row.date.day for row in rows] == [2, 3]
+
+        task = TaskOps.create(db_session, "Ship it")
+        TaskOps.update(db_session, task, status="done", completed_at=datetime(2024, 3, 3, 12))
+        assert task.completed_day is not None
+        completed = task_rows(
+            db_session, completed_between=(datetime(2024, 3, 2), datetime(2024, 3, 3))
+        )
+        assert [row.id for row in completed] == [task.id]
+        later = (datetime(2024, 3, 4), datetime(2024, 3, 5))
+        assert task_rows(db_session, completed_between=later) == []
+
+    def test_missing_keys_are_filled(self, db_session):
+        """Test that init_db fills keys for rows written without them."""
+        from sqlalchemy import update
+        from second_brain.db.models import Task, WorkLog, WorkLogEntry, fill_day_keys
+
+        work_log = WorkLogOps.create(db_session, datetime(2024, 3, 10), "logs/x.md")
+        WorkLogOps.add_entry(db_session, work_log, "Entry")
+        task = TaskOps.create(db_session, "Done")
+        TaskOps.update(db_session, task, status="done")
+        expected = (work_log.day_key, task.completed_day)
+
+        db_session.execute(update(WorkLog).values(day_key=None))
+        db_session.execute(update(WorkLogEntry).values(day_key=None))
+        db_session.execute(update(Task).values(completed_day=None))
+        db_session.commit()
+
+        assert fill_day_keys(db_session.get_bind()) == 3
+        db_session.expire_all()
+        assert (work_log.day_key, task.completed_day) == expected
+        assert work_log.entries[0].day_key == expected[0]
+        assert fill_day_keys(db_session.get_bind()) == 0
+
+
+class TestTimeLedger:
+    """Test the append-only time ledger."""
+
+    def test_entries_update_cached_total(self, indexer, db_session):
+        """Test that logged time lands in the ledger and the task's total."""
+        from second_brain.db import TimeEntry, TimeEntryOps
+
+        project = ProjectOps.create(db_session, "Ledger", "ledger", "p.md")
+        task = TaskOps.create(db_session, "Track me", project_id=project.id)
+        indexer.add_work_log_entry(
+            datetime(2024, 3, 1), "Work", task_id=task.id, time_spent_minutes=30
+        )
+        TimeEntryOps.record(db_session, 15, task_id=task.id, day=datetime(2024, 3, 5))
+
+        assert task.time_spent_minutes == 45
+        entries = db_session.query(TimeEntry).order_by(TimeEntry.id).all()
+        assert [(e.source, e.minutes, e.project_id) for e in entries] == [
+            ("work_log", 30, project.id),
+            ("task_update", 15, project.id),
+        ]
+        assert TimeEntryOps.total(db_session, datetime(2024, 3, 1), datetime(2024, 3, 1)) == 30
+        assert TimeEntryOps.total(db_session, task_id=task.id) == 45
+        by_project = TimeEntryOps.minutes_by_project(
+            db_session, datetime(2024, 3, 2), datetime(2024, 3, 9)
+        )
+        assert by_project == {project.id: 15}
+
+    def test_concurrent_sessions_keep_all_time(self, db_session):
+        """Test that two sessions holding the same task both keep their time."""
+        from second_brain.db import TimeEntryOps
+
+        task = TaskOps.create(db_session, "Shared")
+        other = get_session(db_session.get_bind())
+        try:
+            stale = TaskOps.get_by_id(other, task.id)
+            assert stale.time_spent_minutes == 0
+            TimeEntryOps.record(db_session, 20, task_id=task.id)
+            TimeEntryOps.record(other, 25, task_id=stale.id)
+        finally:
+            other.close()
+
+        db_session.expire_all()
+        assert task.time_spent_minutes == 45
+
+    def test_existing_time_is_seeded(self, db_session):
+        """Test that an empty ledger is filled from time tracked before it."""
+        from sqlalchemy import delete, update
+        from second_brain.db import Task, TimeEntry, TimeEntryOps
+        from second_brain.db.models import seed_time_entries
+
+        task = TaskOps.create(db_session, "Old")
+        work_log = WorkLogOps.create(db_session, datetime(2024, 3, 1), "logs/old.md")
+        WorkLogOps.add_entry(db_session, work_log, "Logged", task_id=task.id, time_spent_minutes=40)
+        db_session.execute(delete(TimeEntry))
+        db_session.execute(update(Task).values(time_spent_minutes=100))
+        db_session.commit()
+
+        assert seed_time_entries(db_session.get_bind()) == 2
+        assert TimeEntryOps.total(db_session, task_id=task.id) == 100
+        assert TimeEntryOps.total(db_session, datetime(2024, 3, 1), datetime(2024, 3, 1)) == 40
+        assert seed_time_entries(db_session.get_bind()) == 0
+
+
+class FakeJiraClient:
+    """In-memory stand-in for JiraClient that records the JQL it is asked for."""
+
+    def __init__(self, issues, delay=0.0):
+        self.issues = issues
+        self.delay = delay
+        self.queries = []
+        self.lookups = []
+        self.unreachable = False
+
+    def get_timezone(self):
+        from zoneinfo import ZoneInfo
+
+        return ZoneInfo("UTC")
+
+    def iter_issue_pages(self, jql, page_size=100, budget=None):
+        import re
+        import time
+
+        self.queries.append(jql)
+        keys = set(re.findall(r'"([A-Z]+)"', jql.split(" AND ")[0]))
+        issues = [issue for issue in self.issues if issue["project_key"] in keys]
+        time.sleep(self.delay)
+        for start in range(0, len(issues), page_size):
+            yield issues[start : start + page_size]
+
+    def _lookup(self, kind, issue_key):
+        import requests
+
+        if self.unreachable:
+            raise requests.ConnectionError("Jira is unreachable")
+        self.lookups.append((kind, issue_key))
+        return next((issue for issue in self.issues if issue["key"] == issue_key), None)
+
+    def get_issue(self, issue_key):
+        return self._lookup("issue", issue_key)
+
+    def get_issue_updated(self, issue_key):
+        issue = self._lookup("updated", issue_key)
+        return issue["updated"] if issue else None
+
+
+def bare_jira_client(api, fields=None, rate_limit=1000.0, max_retries=5):
+    """Build a JiraClient around a stand-in for the jira library's client."""
+    import threading
+    from second_brain.integrations.jira_client import ISSUE_FIELDS, JiraClient
+    from second_brain.integrations.jira_ratelimit import RequestStats, TokenBucket
+
+    client = JiraClient.__new__(JiraClient)
+    client.client = api
+    client._request_slots = threading.BoundedSemaphore(1)
+    client.fields = list(fields or ISSUE_FIELDS)
+    client._bucket = TokenBucket(rate_limit)
+    client.max_retries = max_retries
+    client.stats = RequestStats()
+    client._stats_lock = threading.Lock()
+    client._transition_ids = {}
+    return client
+
+
+def make_jira_issue(number, updated="2024-05-01T10:00:00.000+0000", status="To Do", project="PROJ"):
+    """Build an issue dict shaped like JiraClient._format_issue output."""
+    return {
+        "key": f"{project}-{number}",
+        "id": str(10000 + number),
+        "summary": f"Issue {number}",
+        "description": "",
+        "status": status,
+        "priority": "Medium",
+        "updated": updated,
+        "project_key": project,
+        "labels": [],
+    }
+
+
+class TestJiraSync:
+    """Test paginated, watermark-based Jira sync."""
+
+    def test_client_pages_with_start_at(self):
+        """Test that the client follows startAt until the reported total."""
+        from types import SimpleNamespace
+        from jira.client import ResultList
+
+        calls = []
+
+        def search_issues(jql, startAt=0, maxResults=50, **kwargs):
+            calls.append(startAt)
+            numbers = range(startAt, min(startAt + maxResults, 5))
+            return ResultList([number for number in numbers], _startAt=startAt, _total=5)
+
+        client = bare_jira_client(SimpleNamespace(search_issues=search_issues), ["summary"])
+        client._format_issue = lambda number: number
+        pages = list(client.iter_issue_pages("project = PROJ", page_size=2))
+
+        assert pages == [[0, 1], [2, 3], [4]]
+        assert calls == [0, 2, 4]
+
+    def test_jql_and_timestamps(self):
+        """Test the incremental JQL and Jira timestamp parsing."""
+        from zoneinfo import ZoneInfo
+        from second_brain.integrations.jira_client import parse_jira_datetime, project_issues_jql
+
+        parsed = parse_jira_datetime("2024-05-01T10:22:33.000-0200")
+        assert parsed == datetime(2024, 5, 1, 12, 22, 33)
+        jql = project_issues_jql(
+            "PROJ", updated_since=datetime(2024, 5, 1, 12, 22, 33), tz=ZoneInfo("Europe/Berlin")
+        )
+        assert 'updated >= "2024/05/01 14:22"' in jql
+        assert jql.endswith("ORDER BY created ASC, key ASC")
+
+    def test_incremental_sync_uses_watermark(self, db_session):
+        """Test full first sync across pages, then an incremental one."""
+        from second_brain.integrations.jira_sync import JiraSyncEngine
+
+        project = ProjectOps.create(db_session, "Jira", "jira", "p.md", jira_project_key="PROJ")
+        client = FakeJiraClient([make_jira_issue(n) for n in range(1, 6)])
+        syncer = JiraSyncEngine(db_session, client, page_size=2)
+
+        first = syncer.sync_project(project)
+        assert (first.full, first.fetched, first.created, first.updated) == (True, 5, 5, 0)
+        assert "updated >=" not in client.queries[0]
+        assert project.jira_last_synced_updated == datetime(2024, 5, 1, 10, 0)
+
+        client.issues = [make_jira_issue(3, "2024-05-02T09:30:00.000+0000", status="Done")]
+        second = syncer.sync_project(project)
+        assert (second.full, second.fetched, second.created, second.updated) == (False, 1, 0, 1)
+        assert 'updated >= "2024/05/01 09:55"' in client.queries[1]
+        assert TaskOps.get_by_jira_key(db_session, "PROJ-3").status == "done"
+        assert project.jira_last_synced_updated == datetime(2024, 5, 2, 9, 30)
+
+        assert syncer.sync_project(project, full=True).full
+        assert "updated >=" not in client.queries[2]
+
+    def test_watermark_never_passes_sync_start(self, db_session):
+        """Test that issues stamped after the sync started are fetched again."""
+        from second_brain.integrations.jira_sync import JiraSyncEngine
+
+        project = ProjectOps.create(db_session, "Jira", "jira", "p.md", jira_project_key="PROJ")
+        client = FakeJiraClient([make_jira_issue(1, "2999-01-01T00:00:00.000+0000")])
+        syncer = JiraSyncEngine(db_session, client)
+
+        before = datetime.utcnow()
+        syncer.sync_project(project)
+        assert before <= project.jira_last_synced_updated <= datetime.utcnow()
+
+        watermark = project.jira_last_synced_updated
+        syncer.sync_project(project, status="Done")
+        assert project.jira_last_synced_updated == watermark
+
+
+class TestJiraBulkUpsert:
+    """Test batched upserts of Jira issues into tasks."""
+
+    def test_counts_and_batched_writes(self, db_session):
+        """Test created/updated/unchanged counts and that only changes are written."""
+        from sqlalchemy import event
+        from second_brain.integrations.jira_sync import JiraSyncEngine, JiraSyncResult
+
+        project = ProjectOps.create(db_session, "Jira", "jira", "p.md", jira_project_key="PROJ")
+        syncer = JiraSyncEngine(db_session, FakeJiraClient([]))
+        issues = [make_jira_issue(n) for n in range(1, 5)]
+        issues[1]["status"] = "Done"
+        first = JiraSyncResult(project_key="PROJ", full=True)
+        syncer.apply_issues(project, issues, first)
+        db_session.commit()
+        assert (first.created, first.updated, first.unchanged) == (4, 0, 0)
+        assert TaskOps.get_by_jira_key(db_session, "PROJ-2").completed_day is not None
+
+        issues[0]["summary"] = "Renamed"
+        issues[2]["status"] = "Done"
+        issues.append(make_jira_issue(5))
+
+        statements = []
+        bind = db_session.get_bind()
+
+        def listener(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(bind, "before_cursor_execute", listener)
+        try:
+            second = JiraSyncResult(project_key="PROJ", full=True)
+            syncer.apply_issues(project, issues, second)
+            db_session.commit()
+        finally:
+            event.remove(bind, "before_cursor_execute", listener)
+
+        assert (second.created, second.updated, second.unchanged) == (1, 2, 2)
+        writes = [sql.split()[0] for sql in statements if not sql.startswith("SELECT")]
+        # One executemany each for new and changed tasks, then the snapshot upsert
+        assert writes == ["INSERT", "UPDATE", "INSERT"]
+        assert sum("jira_ticket_key IN" in sql for sql in statements) == 1
+        assert TaskOps.get_by_jira_key(db_session, "PROJ-1").title == "Renamed"
+        done = TaskOps.get_by_jira_key(db_session, "PROJ-3")
+        assert done.status == "done" and done.completed_at is not None
+        assert len(TaskOps.list_all(db_session)) == 5
+
+    def test_older_copy_does_not_win(self, db_session):
+        """Test that a stale copy of an issue leaves a newer task and snapshot alone."""
+        from second_brain.db import JiraIssueOps
+        from second_brain.integrations.jira_sync import JiraSyncEngine, JiraSyncResult
+
+        project = ProjectOps.create(db_session, "Jira", "jira", "p.md", jira_project_key="PROJ")
+        syncer = JiraSyncEngine(db_session, FakeJiraClient([]))
+        newer = make_jira_issue(1, "2024-05-02T10:00:00.000+0000", status="Done")
+        older = make_jira_issue(1, "2024-05-01T10:00:00.000+0000")
+        older["summary"] = "Stale"
+
+        syncer.apply_issues(project, [newer], JiraSyncResult(project_key="PROJ", full=False))
+        stale = JiraSyncResult(project_key="PROJ", full=False)
+        syncer.apply_issues(project, [older], stale)
+        db_session.commit()
+
+        assert (stale.updated, stale.unchanged) == (0, 1)
+        task = TaskOps.get_by_jira_key(db_session, "PROJ-1")
+        assert (task.title, task.status) == ("Issue 1", "done")
+        assert JiraIssueOps.get(db_session, "PROJ-1").issue["status"] == "Done"
+
+    def test_queued_status_survives_sync(self, db_session):
+        """Test that a sync keeps a local status whose push to Jira was deferred."""
+        from types import SimpleNamespace
+        from jira.exceptions import JIRAError
+        from second_brain.db import JiraOutboxOps
+        from second_brain.integrations.jira_sync import JiraSyncEngine
+
+        class ThrottledClient(FakeJiraClient):
+            def transition_to(self, issue_key, status):
+                raise JIRAError(status_code=429, response=SimpleNamespace(headers={}))
+
+        project = ProjectOps.create(db_session, "Jira", "jira", "p.md", jira_project_key="PROJ")
+        issue = make_jira_issue(1)
+        syncer = JiraSyncEngine(db_session, ThrottledClient([issue]))
+        syncer.sync_project(project)
+        task = TaskOps.get_by_jira_key(db_session, "PROJ-1")
+        TaskOps.update(db_session, task, status="done")
+        JiraOutboxOps.enqueue(db_session, "PROJ-1", "transition", {"status": "Done"})
+
+        issue["summary"] = "Renamed"
+        issue["updated"] = "2024-05-02T10:00:00.000+0000"
+        assert syncer.sync_project(project).updated == 1
+        task = TaskOps.get_by_jira_key(db_session, "PROJ-1")
+        assert (task.title, task.status) == ("Renamed", "done")
+        assert JiraOutboxOps.waiting_issues(db_session) == {"PROJ-1"}
+
+        # Once the transition is sent, Jira's status is followed again
+        [item] = JiraOutboxOps.list_by_state(db_session, "pending")
+        item.state = "sent"
+        db_session.commit()
+        issue["status"] = "In Progress"
+        syncer.sync_project(project)
+        assert TaskOps.get_by_jira_key(db_session, "PROJ-1").status == "in_progress"
+
+
+class TestJiraFields:
+    """Test Jira field projection and the keys+updated probe."""
+
+    def _client(self, search_issues, fields=None):
+        from types import SimpleNamespace
+
+        return bare_jira_client(
+            SimpleNamespace(search_issues=search_issues, _is_cloud=False), fields
+        )
+
+    def test_search_requests_only_mapped_fields(self):
+        """Test that searches ask for the configured fields and format extras."""
+        from jira.client import ResultList
+        from jira.resources import Issue
+
+        options = {
+            "server": "https://jira.example.com",
+            "rest_path": "api",
+            "rest_api_version": "2",
+            "agile_rest_path": "agile",
+            "agile_rest_api_version": "1.0",
+        }
+        raw = {
+            "key": "PROJ-1",
+            "id": "1",
+            "fields": {"summary": "Trimmed", "status": {"name": "Done"}, "customfield_10016": 5},
+        }
+        requested = []
+
+        def search_issues(jql, startAt=0, maxResults=50, fields=None, json_result=False):
+            requested.append(fields)
+            return ResultList([Issue(options, None, raw=raw)], _total=1)
+
+        client = self._client(search_issues, fields=["summary", "status", "customfield_10016"])
+        [[issue]] = list(client.iter_issue_pages("project = PROJ"))
+
+        assert requested == [["summary", "status", "customfield_10016"]]
+        assert (issue["summary"], issue["status"], issue["priority"]) == ("Trimmed", "Done", None)
+        assert issue["extra_fields"] == {"customfield_10016": 5}
+
+    def test_probe_reads_keys_and_updated(self):
+        """Test that the probe pages through JSON results asking only for updated."""
+        requested = []
+
+        def search_issues(jql, startAt=0, maxResults=50, fields=None, json_result=False):
+            requested.append((startAt, fields, json_result))
+            issues = [
+                {"key": f"PROJ-{n}", "fields": {"updated": f"2024-05-0{n}T00:00:00.000+0000"}}
+                for n in range(startAt + 1, min(startAt + maxResults, 3) + 1)
+            ]
+            return {"issues": issues, "startAt": startAt, "total": 3}
+
+        client = self._client(search_issues)
+        pages = list(client.iter_issue_updates("project = PROJ", page_size=2))
+
+        assert pages == [
+            {"PROJ-1": "2024-05-01T00:00:00.000+0000", "PROJ-2": "2024-05-02T00:00:00.000+0000"},
+            {"PROJ-3": "2024-05-03T00:00:00.000+0000"},
+        ]
+        assert requested == [(0, ["updated"], True), (2, ["updated"], True)]
+
+
+class TestJiraConcurrentSync:
+    """Test concurrent and combined multi-project Jira fetches."""
+
+    def _projects(self, db_session, keys):
+        return [
+            ProjectOps.create(db_session, key, key.lower(), f"{key}.md", jira_project_key=key)
+            for key in keys
+        ]
+
+    def test_projects_fetch_concurrently(self, db_session):
+        """Test that wall time tracks the slowest project, not the sum."""
+        import time
+        from second_brain.integrations.jira_sync import JiraSyncEngine
+
+        keys = ["AAA", "BBB", "CCC", "DDD"]
+        projects = self._projects(db_session, keys)
+        issues = [make_jira_issue(n, project=key) for key in keys for n in range(1, 4)]
+        syncer = JiraSyncEngine(db_session, FakeJiraClient(issues, delay=0.2))
+
+        start = time.perf_counter()
+        results = syncer.sync_projects(projects)
+        assert time.perf_counter() - start < 0.6
+        assert [(r.project_key, r.created) for r in results] == [(key, 3) for key in keys]
+        assert all(p.jira_last_synced_updated is not None for p in projects)
+
+    def test_combined_query(self, db_session):
+        """Test one project in (...) query split back into per-project results."""
+        from second_brain.integrations.jira_sync import JiraSyncEngine
+
+        projects = self._projects(db_session, ["AAA", "BBB"])
+        issues = [
+            make_jira_issue(1, project="AAA"),
+            make_jira_issue(1, project="BBB"),
+            make_jira_issue(2, project="BBB"),
+        ]
+        client = FakeJiraClient(issues)
+
+        results = JiraSyncEngine(db_session, client).sync_projects(projects, combined=True)
+        assert client.queries == ['project in ("AAA", "BBB") ORDER BY created ASC, key ASC']
+        assert [(r.fetched, r.created) for r in results] == [(1, 1), (2, 2)]
+        assert TaskOps.get_by_jira_key(db_session, "BBB-2").project_id == projects[1].id
+
+    def test_client_is_shared(self, monkeypatch):
+        """Test that the process-wide client is built once per credentials."""
+        from second_brain.integrations import jira_client
+
+        built = []
+        monkeypatch.setattr(jira_client, "_clients", {})
+        monkeypatch.setattr(jira_client, "JiraClient", lambda *key: built.append(key) or object())
+        monkeypatch.setenv("JIRA_SERVER", "https://jira.example.com")
+        monkeypatch.setenv("JIRA_EMAIL", "me@example.com")
+        monkeypatch.setenv("JIRA_API_TOKEN", "token")
+
+        assert jira_client.get_jira_client() is jira_client.get_jira_client()
+        assert len(built) == 1
+
+
+class TestJiraIssueCache:
+    """Test the local Jira issue snapshots and offline lookups."""
+
+    def test_sync_stores_snapshots(self, db_session):
+        """Test that a sync leaves a snapshot of every fetched issue."""
+        from second_brain.db import JiraIssueOps
+        from second_brain.integrations.jira_sync import JiraSyncEngine
+
+        project = ProjectOps.create(db_session, "Jira", "jira", "p.md", jira_project_key="PROJ")
+        JiraSyncEngine(
+            db_session, FakeJiraClient([make_jira_issue(n) for n in (1, 2)])
+        ).sync_project(project)
+
+        snapshot = JiraIssueOps.get(db_session, "PROJ-2")
+        assert snapshot.issue["summary"] == "Issue 2"
+        assert snapshot.updated == datetime(2024, 5, 1, 10, 0)
+
+    def test_lookup_serves_revalidates_and_refetches(self, db_session):
+        """Test fresh hits, cheap revalidation and refetching changed issues."""
+        from datetime import timedelta
+        from second_brain.integrations import jira_cache
+
+        client = FakeJiraClient([make_jira_issue(1)])
+
+        def lookup(**kwargs):
+            return jira_cache.get_issue(
+                db_session, "proj-1", client_factory=lambda: client, **kwargs
+            )
+
+        assert lookup().source == jira_cache.SOURCE_JIRA
+        assert lookup().source == jira_cache.SOURCE_CACHE
+        assert client.lookups == [("issue", "PROJ-1")]
+
+        assert lookup(max_age=timedelta(0)).source == jira_cache.SOURCE_REVALIDATED
+        assert client.lookups[-1] == ("updated", "PROJ-1")
+
+        client.issues = [{**make_jira_issue(1, "2024-05-03T10:00:00.000+0000"), "summary": "New"}]
+        result = lookup(max_age=timedelta(0))
+        assert (result.source, result.issue["summary"]) == (jira_cache.SOURCE_JIRA, "New")
+        assert client.lookups[-2:] == [("updated", "PROJ-1"), ("issue", "PROJ-1")]
+
+    def test_offline_and_unreachable_fall_back_to_snapshot(self, db_session):
+        """Test that stale snapshots are served offline or when Jira fails."""
+        from datetime import timedelta
+        from second_brain.integrations import jira_cache
+
+        client = FakeJiraClient([make_jira_issue(1)])
+        jira_cache.get_issue(db_session, "PROJ-1", client_factory=lambda: client)
+        client.unreachable = True
+
+        offline = jira_cache.get_issue(
+            db_session, "PROJ-1", max_age=timedelta(0), offline=True, client_factory=None
+        )
+        assert (offline.source, offline.issue["key"], offline.error) == ("stale", "PROJ-1", None)
+
+        failed = jira_cache.get_issue(
+            db_session, "PROJ-1", max_age=timedelta(0), client_factory=lambda: client
+        )
+        assert failed.source == jira_cache.SOURCE_STALE
+        assert "unreachable" in failed.error
+
+        missing = jira_cache.get_issue(db_session, "PROJ-9", offline=True, client_factory=None)
+        assert missing.issue is None
+
+
+class TestJiraRateLimit:
+    """Test the Jira token bucket, backoff and retry budget."""
+
+    def _throttled(self, status=429, retry_after=None):
+        from types import SimpleNamespace
+        from jira.exceptions import JIRAError
+
+        headers = {"Retry-After": retry_after} if retry_after else {}
+        return JIRAError(status_code=status, response=SimpleNamespace(headers=headers))
+
+    def test_bucket_paces_and_adapts(self):
+        """Test that the bucket waits for tokens, halves on 429 and pauses."""
+        from second_brain.integrations.jira_ratelimit import TokenBucket
+
+        now = [0.0]
+        slept = []
+
+        def sleep(seconds):
+            slept.append(seconds)
+            now[0] += seconds
+
+        bucket = TokenBucket(rate=2, burst=1, clock=lambda: now[0], sleep=sleep)
+        assert bucket.acquire() == 0
+        assert bucket.acquire() == 0.5
+
+        bucket.throttled(retry_after=3)
+        assert bucket.rate == 1
+        assert bucket.acquire() == 3
+        bucket.succeeded()
+        assert bucket.rate > 1
+
+    def test_retry_after_and_backoff(self):
+        """Test Retry-After parsing and that backoff never undercuts it."""
+        from email.utils import format_datetime
+        from datetime import timedelta, timezone
+        from second_brain.integrations.jira_ratelimit import backoff_delay, parse_retry_after
+
+        assert parse_retry_after("7") == 7
+        later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+        assert 25 < parse_retry_after(later) <= 30
+        assert parse_retry_after("soon") is None
+        assert all(0 <= backoff_delay(3, cap=2) <= 2 for _ in range(20))
+        assert backoff_delay(0, retry_after=5) >= 5
+
+    def test_call_retries_throttled_requests(self, monkeypatch):
+        """Test that 429s are retried, counted, and spend the run's budget."""
+        from types import SimpleNamespace
+        from jira.exceptions import JIRAError
+        from second_brain.integrations import jira_client
+        from second_brain.integrations.jira_ratelimit import RetryBudget
+
+        monkeypatch.setattr(jira_client, "backoff_delay", lambda attempt, retry_after: 0.01)
+        failures = [self._throttled(retry_after="0"), self._throttled(503)]
+
+        def myself():
+            if failures:
+                raise failures.pop(0)
+            return {"timeZone": "UTC"}
+
+        client = bare_jira_client(SimpleNamespace(myself=myself))
+        budget = RetryBudget(retries=5)
+        assert client._call(client.client.myself, budget=budget) == {"timeZone": "UTC"}
+        assert (budget.stats.requests, budget.stats.retries, budget.stats.throttled) == (3, 2, 1)
+        assert budget.remaining == 3
+        assert budget.stats.throttled_seconds >= 0.02
+        assert client.stats.requests == 3
+
+        failures.extend(self._throttled() for _ in range(3))
+        with pytest.raises(JIRAError):
+            client._call(client.client.myself, budget=RetryBudget(retries=2))
+
+    def test_writes_and_client_errors_are_not_retried(self):
+        """Test that 4xx errors and possibly-applied writes fail at once."""
+        import requests
+        from types import SimpleNamespace
+        from jira.exceptions import JIRAError
+
+        calls = []
+
+        def fail(error):
+            calls.append(error)
+            raise error
+
+        client = bare_jira_client(SimpleNamespace())
+        with pytest.raises(JIRAError):
+            client._call(fail, self._throttled(404))
+        with pytest.raises(requests.ConnectionError):
+            client._call(fail, requests.ConnectionError("reset"), idempotent=False)
+        assert len(calls) == 2
+
+
+class TestJiraOutbox:
+    """Test the outbound Jira queue and its drainer."""
+
+    class Sender:
+        """Stand-in for JiraClient's write methods."""
+
+        def __init__(self, errors=None):
+            self.errors = errors or {}
+            self.sent = []
+
+        def transition_to(self, issue_key, status):
+            if issue_key in self.errors:
+                raise self.errors.pop(issue_key)
+            self.sent.append((issue_key, status))
+            return status != "Nowhere"
+
+        def post_comment(self, issue_key, body, skip_if_present=False):
+            self.sent.append((issue_key, body, skip_if_present))
+
+    def test_pending_transitions_coalesce(self, db_session):
+        """Test that a newer status replaces a pending transition."""
+        from second_brain.db import JiraOutboxOps
+
+        JiraOutboxOps.enqueue(db_session, "PROJ-1", "transition", {"status": "In Progress"})
+        JiraOutboxOps.enqueue(db_session, "PROJ-1", "comment", {"body": "Started"})
+        JiraOutboxOps.enqueue(db_session, "PROJ-1", "transition", {"status": "Done"})
+
+        items = JiraOutboxOps.due(db_session, 10)
+        assert [(item.action, item.arguments) for item in items] == [
+            ("transition", {"status": "Done"}),
+            ("comment", {"body": "Started"}),
+        ]
+
+    def test_drain_defers_transient_and_fails_permanent(self, db_session):
+        """Test per-issue ordering, retry scheduling and permanent failures."""
+        from types import SimpleNamespace
+        from jira.exceptions import JIRAError
+        from second_brain.db import JiraOutboxOps
+        from second_brain.integrations.jira_outbox import drain_outbox
+
+        JiraOutboxOps.enqueue(db_session, "PROJ-1", "transition", {"status": "Done"})
+        JiraOutboxOps.enqueue(db_session, "PROJ-1", "comment", {"body": "Shipped"})
+        JiraOutboxOps.enqueue(db_session, "PROJ-2", "transition", {"status": "Nowhere"})
+        JiraOutboxOps.enqueue(db_session, "PROJ-3", "comment", {"body": "Hi"})
+        unavailable = JIRAError(status_code=503, response=SimpleNamespace(headers={}))
+        sender = self.Sender({"PROJ-1": unavailable})
+
+        result = drain_outbox(db_session, sender, batch_size=2)
+        assert (result.sent, result.deferred, result.failed) == (1, 1, 1)
+        assert sender.sent == [("PROJ-2", "Nowhere"), ("PROJ-3", "Hi", False)]
+        assert JiraOutboxOps.counts(db_session) == {"pending": 2, "failed": 1, "sent": 1}
+        [failed] = JiraOutboxOps.list_by_state(db_session, "failed")
+        assert "No transition" in failed.last_error
+        # The comment stays behind the transition that is waiting for a retry
+        assert drain_outbox(db_session, sender).sent == 0
+        assert JiraOutboxOps.waiting_issues(db_session) == {"PROJ-1"}
+
+    def test_claimed_items_are_sent_once(self, db_session):
+        """Test that concurrent drainers don't share items and claimed items aren't rewritten."""
+        from second_brain.db import JiraOutboxOps
+        from second_brain.integrations.jira_outbox import drain_outbox
+
+        JiraOutboxOps.enqueue(db_session, "PROJ-1", "transition", {"status": "In Progress"})
+        JiraOutboxOps.enqueue(db_session, "PROJ-2", "comment", {"body": "Hi"})
+        other_session = get_session(db_session.get_bind())
+        other = self.Sender()
+
+        class Racing(self.Sender):
+            def transition_to(self, issue_key, status):
+                # Another drainer runs, and the status changes again, mid-send
+                drain_outbox(other_session, other)
+                JiraOutboxOps.enqueue(other_session, issue_key, "transition", {"status": "Done"})
+                return super().transition_to(issue_key, status)
+
+        sender = Racing()
+        try:
+            result = drain_outbox(db_session, sender)
+        finally:
+            other_session.close()
+        assert result.sent == 1
+        assert sender.sent == [("PROJ-1", "In Progress")]
+        assert other.sent == [("PROJ-2", "Hi", False)]
+        # The newer status was queued behind the item being sent, not merged into it
+        later = self.Sender()
+        assert drain_outbox(db_session, later).sent == 1
+        assert later.sent == [("PROJ-1", "Done")]
+        assert JiraOutboxOps.counts(db_session) == {"sent": 3}
+
+    def test_transition_ids_are_cached(self):
+        """Test that transitions are looked up once per workflow state."""
+        from types import SimpleNamespace
+
+        calls = []
+
+        def issue(key, fields=None):
+            calls.append("issue")
+            return SimpleNamespace(
+                key=key,
+                fields=SimpleNamespace(
+                    status=SimpleNamespace(name="To Do"),
+                    issuetype=SimpleNamespace(name="Task"),
+                    project=SimpleNamespace(key="PROJ"),
+                ),
+            )
+
+        def transitions(issue):
+            calls.append("transitions")
+            return [{"id": "31", "name": "Finish", "to": {"name": "Done"}}]
+
+        def transition_issue(issue, transition_id):
+            calls.append(("transition", issue.key, transition_id))
+
+        client = bare_jira_client(
+            SimpleNamespace(issue=issue, transitions=transitions, transition_issue=transition_issue)
+        )
+        assert client.transition_to("PROJ-1", "Done")
+        assert client.transition_to("PROJ-2", "done")
+        assert not client.transition_to("PROJ-3", "Blocked")
+        assert calls.count("transitions") == 1
+        assert ("transition", "PROJ-2", "31") in calls
+
+    def test_status_push_needs_opt_in(self, db_session, monkeypatch):
+        """Test that linked task status changes queue only when enabled."""
+        from types import SimpleNamespace
+        from second_brain.db import JiraOutboxOps
+        from second_brain.integrations import jira_outbox
+
+        task = TaskOps.create(db_session, "Linked", status="done", jira_ticket_key="PROJ-7")
+        settings = {"push_status": False}
+        config = SimpleNamespace(get_jira_config=lambda: settings)
+        monkeypatch.setattr(jira_outbox, "get_config", lambda: config)
+
+        assert not jira_outbox.queue_status_push(db_session, task)
+        settings["push_status"] = True
+        assert jira_outbox.queue_status_push(db_session, task)
+        [item] = JiraOutboxOps.due(db_session, 10)
+        assert (item.issue_key, item.arguments) == ("PROJ-7", {"status": "Done"})
+
+
+class TestJiraStandIn:
+    """Test the Jira client end to end against the local stand-in server."""
+
+    def _client(self, standin):
+        from second_brain.integrations.jira_client import JiraClient
+
+        return JiraClient(standin.url, "test", "test", rate_limit=1000)
+
+    def test_sync_over_http(self, db_session):
+        """Test full and incremental syncs through real HTTP and the jira library."""
+        from sqlalchemy import event
+        from second_brain.integrations.jira_standin import JiraStandIn
+        from second_brain.integrations.jira_sync import JiraSyncEngine
+
+        standin = JiraStandIn()
+        standin.seed_project("AAA", 150)
+        standin.seed_project("BBB", 100)
+        projects = [
+            ProjectOps.create(db_session, key, key.lower(), f"{key}.md", jira_project_key=key)
+            for key in ("AAA", "BBB")
+        ]
+        inserts = []
+
+        def count_inserts(conn, cursor, statement, *args):
+            if statement.startswith("INSERT INTO tasks"):
+                inserts.append(statement)
+
+        with standin:
+            syncer = JiraSyncEngine(db_session, self._client(standin), page_size=40)
+            event.listen(db_session.get_bind(), "before_cursor_execute", count_inserts)
+            try:
+                full = syncer.sync_projects(projects, full=True)
+            finally:
+                event.remove(db_session.get_bind(), "before_cursor_execute", count_inserts)
+            assert [result.created for result in full] == [150, 100]
+            assert len(inserts) == 2  # one executemany per project, done or not
+            assert standin.requests["GET search"] == 7
+
+            edited = standin.touch(5, project_key="AAA")
+            again = syncer.sync_projects(projects)
+
+        assert again[0].updated == 5
+        assert TaskOps.get_by_jira_key(db_session, edited[0]).title.endswith("(edited)")
+
+    def test_throttled_sync_recovers(self, db_session, monkeypatch):
+        """Test that injected 429s are retried and counted rather than failing the sync."""
+        from second_brain.integrations import jira_client
+        from second_brain.integrations.jira_standin import JiraStandIn
+        from second_brain.integrations.jira_sync import JiraSyncEngine
+
+        monkeypatch.setattr(jira_client, "backoff_delay", lambda attempt, retry_after: 0.001)
+        standin = JiraStandIn(throttle_probability=0.3, retry_after=0, seed=3)
+        standin.seed_project("AAA", 200)
+        project = ProjectOps.create(db_session, "A", "a", "a.md", jira_project_key="AAA")
+
+        with standin:
+            client = self._client(standin)
+            client.max_retries = 20
+            syncer = JiraSyncEngine(db_session, client, page_size=20)
+            result = syncer.sync_project(project, full=True)
+
+        assert result.created == 200
+        assert standin.throttled > 0 and syncer.stats.retries > 0
+        assert client.stats.throttled == standin.throttled
+
+    def test_outbox_drains_to_standin(self, db_session):
+        """Test transitions and comments sent through the outbox."""
+        from second_brain.db import JiraOutboxOps
+        from second_brain.integrations.jira_outbox import drain_outbox
+        from second_brain.integrations.jira_standin import WORKFLOW, JiraStandIn
+
+        standin = JiraStandIn()
+        standin.seed_project("AAA", 3)
+        current = standin.issues["AAA-1"]["fields"]["status"]["name"]
+        target = WORKFLOW[current][0]
+        JiraOutboxOps.enqueue(db_session, "AAA-1", "transition", {"status": target})
+        JiraOutboxOps.enqueue(db_session, "AAA-1", "comment", {"body": "Moved"})
+
+        with standin:
+            result = drain_outbox(db_session, self._client(standin))
+
+        assert (result.sent, result.failed) == (2, 0)
+        assert standin.issues["AAA-1"]["fields"]["status"]["name"] == target
+        assert [comment["body"] for comment in standin.comments["AAA-1"]] == ["Moved"]
+
+
+class TestJiraAsync:
+    """Test the async Jira client and the non-blocking sync used by the MCP tools."""
+
+    def _client(self, standin, **kwargs):
+        from second_brain.integrations.jira_async import AsyncJiraClient
+
+        return AsyncJiraClient(standin.url, "test", "test", rate_limit=1000, **kwargs)
+
+    def _projects(self, db_session, keys):
+        return [
+            ProjectOps.create(db_session, key, key.lower(), f"{key}.md", jira_project_key=key)
+            for key in keys
+        ]
+
+    def test_async_sync_matches_blocking_client(self, db_session):
+        """Test full and incremental async syncs, and issue dicts equal to JiraClient's."""
+        import asyncio
+        from second_brain.integrations.jira_client import JiraClient
+        from second_brain.integrations.jira_standin import JiraStandIn
+        from second_brain.integrations.jira_sync import JiraSyncEngine
+
+        standin = JiraStandIn()
+        standin.seed_project("AAA", 120)
+        standin.seed_project("BBB", 30)
+        projects = self._projects(db_session, ["AAA", "BBB"])
+
+        async def run():
+            async with self._client(standin) as client:
+                syncer = JiraSyncEngine(db_session, client, page_size=50)
+                full = await syncer.sync_projects_async(projects, full=True)
+                edited = standin.touch(3, project_key="AAA")
+                again = await syncer.sync_projects_async(projects, combined=True)
+                return full, again, edited, await client.get_issue("AAA-7")
+
+        with standin:
+            full, again, edited, issue = asyncio.run(run())
+            blocking = JiraClient(standin.url, "test", "test").get_issue("AAA-7")
+
+        assert [result.created for result in full] == [120, 30]
+        assert again[0].updated == 3 and again[1].updated == 0
+        assert TaskOps.get_by_jira_key(db_session, edited[0]).title.endswith("(edited)")
+        assert issue == blocking
+
+    def test_sync_keeps_event_loop_responsive(self, db_session):
+        """Test that other coroutines run during a sync and requests overlap."""
+        import asyncio
+        import time
+        from second_brain.integrations.jira_standin import JiraStandIn
+        from second_brain.integrations.jira_sync import JiraSyncEngine
+
+        keys = ["AAA", "BBB", "CCC", "DDD"]
+        standin = JiraStandIn(latency=0.05)
+        for key in keys:
+            standin.seed_project(key, 100)
+        projects = self._projects(db_session, keys)
+        gaps = []
+
+        async def heartbeat(done):
+            last = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        async def run():
+            done = asyncio.Event()
+            beat = asyncio.create_task(heartbeat(done))
+            async with self._client(standin) as client:
+                syncer = JiraSyncEngine(db_session, client, page_size=25)
+                start = time.perf_counter()
+                results = await syncer.sync_projects_async(projects, full=True)
+                elapsed = time.perf_counter() - start
+            done.set()
+            await beat
+            return results, elapsed
+
+        with standin:
+            results, elapsed = asyncio.run(run())
+
+        assert [result.created for result in results] == [100] * 4
+        # 18 requests of 50 ms or more take over a second one at a time
+        assert standin.requests["GET search"] == 16 and standin.requests["GET myself"] == 1
+        assert elapsed < 0.8
+        assert len(gaps) > 10 and max(gaps) < 0.25
+
+    def test_throttling_and_outbox(self, db_session, monkeypatch):
+        """Test retried 429s and an outbox drained through the async client."""
+        import asyncio
+        from second_brain.db import JiraOutboxOps
+        from second_brain.integrations import jira_async
+        from second_brain.integrations.jira_outbox import drain_outbox_async
+        from second_brain.integrations.jira_standin import WORKFLOW, JiraStandIn
+        from second_brain.integrations.jira_sync import JiraSyncEngine
+
+        monkeypatch.setattr(jira_async, "backoff_delay", lambda attempt, retry_after: 0.001)
+        standin = JiraStandIn(throttle_probability=0.3, retry_after=0, seed=5)
+        standin.seed_project("AAA", 100)
+        project = self._projects(db_session, ["AAA"])[0]
+        target = WORKFLOW[standin.issues["AAA-1"]["fields"]["status"]["name"]][0]
+        JiraOutboxOps.enqueue(db_session, "AAA-1", "transition", {"status": target})
+        JiraOutboxOps.enqueue(db_session, "AAA-1", "comment", {"body": "Moved"})
+
+        async def run():
+            async with self._client(standin, max_retries=20) as client:
+                syncer = JiraSyncEngine(db_session, client, page_size=20)
+                drained = await drain_outbox_async(db_session, client)
+                results = await syncer.sync_projects_async([project], full=True)
+                return drained, results, syncer.stats, client.stats
+
+        with standin:
+            drained, results, run_stats, client_stats = asyncio.run(run())
+
+        assert (drained.sent, drained.failed) == (2, 0)
+        assert standin.issues["AAA-1"]["fields"]["status"]["name"] == target
+        assert [comment["body"] for comment in standin.comments["AAA-1"]] == ["Moved"]
+        assert results[0].created == 100
+        assert run_stats.retries > 0 and client_stats.throttled == standin.throttled
+
+    def test_client_is_shared_per_loop(self, monkeypatch):
+        """Test that each event loop gets one client per set of credentials."""
+        import asyncio
+        from second_brain.integrations import jira_async
+
+        monkeypatch.setattr(jira_async, "_clients", __import__("weakref").WeakKeyDictionary())
+        monkeypatch.setenv("JIRA_SERVER", "https://jira.example.com")
+        monkeypatch.setenv("JIRA_EMAIL", "me@example.com")
+        monkeypatch.setenv("JIRA_API_TOKEN", "token")
+
+        async def pair():
+            client = jira_async.get_async_jira_client()
+            assert client is jira_async.get_async_jira_client()
+            await client.aclose()
+            return client
+
+        assert asyncio.run(pair()) is not asyncio.run(pair())
+
+
+def jira_webhook_payload(
+    event, number, updated="2024-05-01T10:00:00.000+0000", summary=None, project="AAA"
+):
+    """Build a webhook payload shaped like Jira's issue events."""
+    return {
+        "timestamp": 1714557600000,
+        "webhookEvent": f"jira:issue_{event}",
+        "issue": {
+            "id": str(10000 + number),
+            "key": f"{project}-{number}",
+            "fields": {
+                "summary": summary or f"Issue {number}",
+                "description": None,
+                "status": {"name": "In Progress"},
+                "priority": {"name": "High"},
+                "updated": updated,
+                "project": {"key": project},
+                "issuetype": {"name": "Task"},
+                "labels": ["backend"],
+            },
+        },
+    }
+
+
+class TestJiraWebhook:
+    """Test the Jira webhook receiver."""
+
+    def test_unsigned_receiver_stays_local(self, db_session):
+        """Test that a receiver without a secret refuses to listen beyond loopback."""
+        from second_brain.integrations.jira_webhook import JiraWebhookReceiver, is_loopback
+
+        assert is_loopback("127.0.0.1") and is_loopback("::1") and is_loopback("localhost")
+        assert not is_loopback("0.0.0.0") and not is_loopback("")
+        with pytest.raises(ValueError):
+            JiraWebhookReceiver(db_session.get_bind(), host="0.0.0.0").start()
+
+    def test_signed_deliveries_apply_in_one_batch(self, db_session):
+        """Test verification, batching and the resulting tasks and snapshots."""
+        import json
+        from sqlalchemy import event
+        from second_brain.db import JiraIssueOps
+        from second_brain.integrations.jira_webhook import JiraWebhookReceiver, post_webhook
+
+        ProjectOps.create(db_session, "A", "a", "a.md", jira_project_key="AAA")
+        engine = db_session.get_bind()
+        commits = []
+
+        def count_commit(conn):
+            commits.append(conn)
+
+        event.listen(engine, "commit", count_commit)
+        receiver = JiraWebhookReceiver(engine, secret="s3cret", batch_window=0.3)
+        try:
+            with receiver:
+                url = receiver.url
+                statuses = [
+                    post_webhook(url, jira_webhook_payload("created", 1), "s3cret")[0],
+                    post_webhook(url, jira_webhook_payload("created", 2), "s3cret")[0],
+                    post_webhook(
+                        url,
+                        jira_webhook_payload(
+                            "updated", 1, "2024-05-01T11:00:00.000+0000", "Renamed"
+                        ),
+                        "s3cret",
+                    )[0],
+                    post_webhook(url, jira_webhook_payload("created", 3))[0],
+                    post_webhook(url, jira_webhook_payload("created", 4), "wrong")[0],
+                    post_webhook(url, b"{not json", "s3cret")[0],
+                    post_webhook(url, {"webhookEvent": "comment_created"}, "s3cret")[0],
+                ]
+                receiver.flush()
+        finally:
+            event.remove(engine, "commit", count_commit)
+
+        assert statuses == [202, 202, 202, 401, 401, 400, 200]
+        assert len(commits) == 1
+        assert (receiver.totals.created, receiver.totals.skipped, receiver.rejected) == (2, 1, 3)
+        task = TaskOps.get_by_jira_key(db_session, "AAA-1")
+        assert (task.title, task.status, task.priority) == ("Renamed", "in_progress", "high")
+        assert json.loads(JiraIssueOps.get(db_session, "AAA-2").data)["labels"] == ["backend"]
+        assert TaskOps.get_by_jira_key(db_session, "AAA-3") is None
+
+    def test_redelivered_and_late_events_are_skipped(self, db_session):
+        """Test that repeats and out-of-order deliveries don't change anything."""
+        import json
+        from second_brain.integrations.jira_client import ISSUE_FIELDS
+        from second_brain.integrations.jira_webhook import (
+            JiraWebhookReceiver,
+            apply_events,
+            parse_event,
+        )
+
+        ProjectOps.create(db_session, "A", "a", "a.md", jira_project_key="AAA")
+        newer = json.dumps(
+            jira_webhook_payload("updated", 1, "2024-05-02T10:00:00.000+0000", "Newer")
+        ).encode()
+        older = json.dumps(
+            jira_webhook_payload("updated", 1, "2024-05-01T10:00:00.000+0000", "Older")
+        ).encode()
+
+        def events(*bodies):
+            return [parse_event(body, ISSUE_FIELDS) for body in bodies]
+
+        first = apply_events(db_session, events(newer))
+        again = apply_events(db_session, events(newer))
+        late = apply_events(db_session, events(older))
+        assert (first.created, again.unchanged, late.skipped) == (1, 1, 1)
+        assert TaskOps.get_by_jira_key(db_session, "AAA-1").title == "Newer"
+
+        receiver = JiraWebhookReceiver(db_session.get_bind())
+        headers = {"X-Atlassian-Webhook-Identifier": "delivery-1"}
+        assert receiver.submit(newer, headers) == (202, "Accepted")
+        assert receiver.submit(newer, headers) == (200, "Duplicate")
+
+    def test_deleted_issue_unlinks_task(self, db_session):
+        """Test that a deleted issue drops its snapshot and keeps the task unlinked."""
+        import json
+        from second_brain.db import JiraIssueOps
+        from second_brain.integrations.jira_client import ISSUE_FIELDS
+        from second_brain.integrations.jira_webhook import apply_events, parse_event
+
+        def apply(event):
+            payload = json.dumps(jira_webhook_payload(event, 1)).encode()
+            return apply_events(db_session, [parse_event(payload, ISSUE_FIELDS)])
+
+        ProjectOps.create(db_session, "A", "a", "a.md", jira_project_key="AAA")
+        apply("created")
+        task = TaskOps.get_by_jira_key(db_session, "AAA-1")
+        assert apply("deleted").deleted == 1
+
+        db_session.refresh(task)
+        assert task.jira_ticket_key is None and task.title == "Issue 1"
+        assert JiraIssueOps.get(db_session, "AAA-1") is None
+
+
 class TestIntegration:
     """Integration tests."""
 